@@ -1,46 +1,51 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
-from app.models.trading_account import TradingAccount
 from app.models.balance import Balance
 from app.schemas.balance import BalanceResponse
-from app.api.dependencies import get_current_user
-from app.services.kis_api import KISAPIClient
+from app.api.dependencies import get_current_user, get_user_trading_account
+from app.services.event_bus import event_bus
+from app.services.kis_api import AsyncKISAPIClient
 
 router = APIRouter(prefix="/api/balance", tags=["balance"])
 
 
+def _save_balances(db: Session, balances: List[Balance]) -> List[BalanceResponse]:
+    """잔고 스냅샷 저장 (flush로 ID를 받은 뒤 커밋 전에 응답 생성)"""
+    db.add_all(balances)
+    db.flush()
+    response = [BalanceResponse.model_validate(balance) for balance in balances]
+    db.commit()
+    return response
+
+
 @router.get("", response_model=list[BalanceResponse])
-def get_balance(
+async def get_balance(
     trading_account_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """계좌 잔고 조회"""
-    # 거래 계정 확인
-    trading_account = db.query(TradingAccount).filter(
-        TradingAccount.id == trading_account_id,
-        TradingAccount.user_id == current_user.id,
-        TradingAccount.is_active == True
-    ).first()
-    
-    if not trading_account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Trading account not found"
-        )
+    # 거래 계정 확인 (동기 DB 조회는 스레드풀에서)
+    user_id = current_user.id
+    trading_account = await asyncio.to_thread(get_user_trading_account, db, user_id, trading_account_id)
     
     try:
-        client = KISAPIClient(trading_account, db)
-        result = client.get_balance(trading_account.account_number)
+        # KIS 응답을 기다리는 동안 DB 커넥션을 점유하지 않도록 풀에 반환
+        db.close()
+        client = AsyncKISAPIClient(trading_account, db)
         
-        # 결과를 Balance 모델로 변환하여 저장
+        # 연속조회로 전체 보유 종목을 페이지 단위로 받아 Balance 모델로 변환 (원본 페이지는 보관하지 않음)
+        snapshot_at = datetime.now(timezone.utc)
         balances = []
-        if "output1" in result:
-            for item in result["output1"]:
+        async for holdings in client.iter_balance(trading_account.account_number):
+            for item in holdings:
                 balance = Balance(
-                    user_id=current_user.id,
+                    user_id=user_id,
                     trading_account_id=trading_account_id,
                     symbol=item.get("pdno", ""),
                     quantity=int(item.get("hldg_qty", 0)),
@@ -48,11 +53,15 @@ def get_balance(
                     current_price=float(item.get("prpr", 0)) if item.get("prpr") else None,
                     total_value=float(item.get("evlu_amt", 0)) if item.get("evlu_amt") else None,
                     profit_loss=float(item.get("evlu_pfls_amt", 0)) if item.get("evlu_pfls_amt") else None,
-                    profit_loss_rate=float(item.get("evlu_pfls_rt", 0)) if item.get("evlu_pfls_rt") else None
+                    profit_loss_rate=float(item.get("evlu_pfls_rt", 0)) if item.get("evlu_pfls_rt") else None,
+                    snapshot_at=snapshot_at
                 )
                 balances.append(balance)
         
-        return balances
+        response = await asyncio.to_thread(_save_balances, db, balances)
+        event_bus.publish_balance(trading_account_id, response)
+        
+        return response
         
     except Exception as e:
         raise HTTPException(
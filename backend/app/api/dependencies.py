@@ -4,15 +4,17 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
+from app.models.trading_account import TradingAccount
 from app.utils.auth import decode_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 
-async def get_current_user(
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> User:
+    # 동기 DB 조회이므로 스레드풀에서 실행 (이벤트 루프에서 커넥션 풀을 기다리면 요청이 몰릴 때 멈춤)
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -33,3 +35,43 @@ async def get_current_user(
     
     return user
 
+
+
+def get_active_trading_account(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> TradingAccount:
+    """사용자의 활성 거래 계정 (동기 DB 조회라 스레드풀에서 실행)"""
+    trading_account = db.query(TradingAccount).filter(
+        TradingAccount.user_id == current_user.id,
+        TradingAccount.is_active == True
+    ).first()
+    
+    if not trading_account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Trading account not found"
+        )
+    
+    return trading_account
+
+
+def get_user_trading_account(db: Session, user_id: int, trading_account_id: int) -> TradingAccount:
+    """사용자의 활성 거래 계정을 ID로 조회합니다 (async 핸들러에서는 asyncio.to_thread로 호출).
+
+    Raises:
+        HTTPException: 계정이 없거나 비활성 (404)
+    """
+    trading_account = db.query(TradingAccount).filter(
+        TradingAccount.id == trading_account_id,
+        TradingAccount.user_id == user_id,
+        TradingAccount.is_active == True
+    ).first()
+    
+    if not trading_account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Trading account not found"
+        )
+    
+    return trading_account
@@ -0,0 +1,80 @@
+import asyncio
+import json
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import get_db
+from app.models.user import User
+from app.models.trading_account import TradingAccount
+from app.api.dependencies import get_current_user
+from app.services.event_bus import BALANCE, FILL, ORDER, QUOTE, SIGNAL, Event, event_bus
+from app.services.kis_realtime import quote_ingester
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+
+def _format_event(event: Event) -> str:
+    payload = event.payload._asdict() if event.kind == QUOTE else event.payload
+    data = json.dumps({"key": event.key, "data": payload}, ensure_ascii=False)
+    return f"id: {event.sequence}\nevent: {event.kind}\ndata: {data}\n\n"
+
+
+def _account_ids(db: Session, user_id: int) -> List[str]:
+    return [
+        str(account_id) for (account_id,) in db.query(TradingAccount.id).filter(
+            TradingAccount.user_id == user_id
+        ).all()
+    ]
+
+
+@router.get("/stream")
+async def stream_events(
+    symbols: Optional[str] = Query(None, description="시세를 받을 종목 코드 (쉼표로 구분)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """실시간 이벤트 스트림 (Server-Sent Events)
+
+    내 거래 계정의 주문 결정(signal), 주문(order), 체결(fill), 잔고(balance)와 요청한 종목의
+    시세(quote)를 보냅니다. 시세와 잔고는 밀리면 최신 값으로 합치고, 그 밖의 이벤트는 대기열이
+    차면 오래된 것부터 버립니다.
+    """
+    # 동기 DB 조회는 스레드풀에서
+    account_ids = await asyncio.to_thread(_account_ids, db, current_user.id)
+    # 스트림이 열려 있는 동안 DB 커넥션을 점유하지 않도록 풀에 반환
+    db.close()
+    quote_symbols = list(dict.fromkeys(symbol.strip() for symbol in (symbols or "").split(",") if symbol.strip()))
+    topics = {
+        QUOTE: quote_symbols,
+        SIGNAL: account_ids,
+        ORDER: account_ids,
+        BALANCE: account_ids,
+        FILL: account_ids,
+    }
+
+    async def stream():
+        subscription = event_bus.subscribe(topics, coalesce=(QUOTE, BALANCE), name=f"sse:{current_user.id}")
+        # 활성 전략이 없는 종목도 시세를 받도록 스트림이 열려 있는 동안 실시간 구독
+        quote_ingester.watch(quote_symbols)
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    events = await asyncio.wait_for(
+                        subscription.get_batch(), settings.EVENT_BUS_SSE_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield "".join(_format_event(event) for event in events)
+        finally:
+            quote_ingester.unwatch(quote_symbols)
+            subscription.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,182 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import get_db
+from app.models.user import User
+from app.models.trading_account import TradingAccount
+from app.models.order import Order
+from app.models.parent_order import ACTIVE_PARENT_STATUSES, ParentOrder
+from app.schemas.execution import ParentOrderCreate, ParentOrderDetail, ParentOrderResponse
+from app.api.dependencies import get_current_user, get_user_trading_account
+from app.services.execution_algos import execution_scheduler, plan_schedule
+from app.services.kis_api import AsyncKISAPIClient
+from app.services.tick_store import tick_store
+
+router = APIRouter(prefix="/api/execution", tags=["execution"])
+
+
+async def _arrival_price(trading_account: TradingAccount, db: Session, symbol: str) -> Optional[float]:
+    """접수 시점 가격 (당일 마지막 틱, 없으면 현재가 조회)"""
+    view = tick_store.view(symbol)
+    if view is not None and len(view):
+        return float(view.prices[-1])
+    try:
+        quote = await AsyncKISAPIClient(trading_account, db).get_current_price(symbol)
+        price = float((quote.get("output") or {}).get("stck_prpr") or 0)
+        return price or None
+    except Exception:
+        return None
+
+
+def _get_parent(db: Session, user_id: int, parent_id: int) -> ParentOrder:
+    parent = db.query(ParentOrder).filter(
+        ParentOrder.id == parent_id,
+        ParentOrder.user_id == user_id
+    ).first()
+    if not parent:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Parent order not found"
+        )
+    return parent
+
+
+def _insert_parent(db: Session, parent: ParentOrder) -> ParentOrderDetail:
+    db.add(parent)
+    db.commit()
+    db.refresh(parent)
+    return _detail(db, parent)
+
+
+def _cancel_parent(db: Session, user_id: int, parent_id: int) -> ParentOrderDetail:
+    parent = _get_parent(db, user_id, parent_id)
+    if parent.status in ACTIVE_PARENT_STATUSES:
+        # 스케줄러의 자식 주문 기록과 겹치지 않도록 잠금
+        db.query(ParentOrder).filter(ParentOrder.id == parent.id).with_for_update().first()
+        db.refresh(parent)
+        if parent.status in ACTIVE_PARENT_STATUSES:
+            parent.status = "CANCELLED"
+            parent.updated_at = datetime.now(timezone.utc)
+            db.commit()
+    return _detail(db, parent)
+
+
+def _detail(db: Session, parent: ParentOrder) -> ParentOrderDetail:
+    children = db.query(Order).filter(Order.parent_order_id == parent.id).order_by(Order.id).all()
+    detail = ParentOrderDetail.model_validate(parent)
+    detail.schedule = list(parent.schedule or [])
+    detail.children = children
+    return detail
+
+
+@router.post("/orders", response_model=ParentOrderDetail, status_code=status.HTTP_201_CREATED)
+async def create_parent_order(
+    request: ParentOrderCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """실행 알고리즘(TWAP/VWAP) 부모 주문 생성
+
+    [start_time, end_time) 구간을 slice_seconds 간격으로 나눠 구간마다 시장가 자식 주문을 냅니다.
+    VWAP은 과거 1분봉 거래량 곡선을 따라 수량을 나눕니다 (과거 봉이 없으면 TWAP과 같음).
+    """
+    if request.order_type not in ("BUY", "SELL") or request.quantity <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="order_type must be BUY or SELL and quantity positive"
+        )
+
+    # 동기 DB 조회는 스레드풀에서
+    user_id = current_user.id
+    trading_account = await asyncio.to_thread(
+        get_user_trading_account, db, user_id, request.trading_account_id
+    )
+
+    start_time = request.start_time or datetime.now(timezone.utc)
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=timezone.utc)
+    end_time = request.end_time
+    if end_time is None and request.duration_minutes is not None:
+        end_time = start_time + timedelta(minutes=request.duration_minutes)
+    if end_time is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Specify end_time or duration_minutes"
+        )
+    if end_time.tzinfo is None:
+        end_time = end_time.replace(tzinfo=timezone.utc)
+    slice_seconds = request.slice_seconds or settings.EXECUTION_ALGO_SLICE_SECONDS
+    algorithm = request.algorithm.upper()
+
+    try:
+        schedule = await asyncio.to_thread(
+            plan_schedule, algorithm, request.symbol, start_time, end_time, slice_seconds
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    # 현재가 조회를 기다리는 동안 DB 커넥션을 점유하지 않도록 풀에 반환
+    db.close()
+    arrival_price = await _arrival_price(trading_account, db, request.symbol)
+    parent = ParentOrder(
+        user_id=user_id,
+        trading_account_id=trading_account.id,
+        symbol=request.symbol,
+        order_type=request.order_type,
+        quantity=request.quantity,
+        algorithm=algorithm,
+        start_time=start_time,
+        end_time=end_time,
+        slice_seconds=slice_seconds,
+        schedule=schedule,
+        arrival_price=arrival_price
+    )
+    detail = await asyncio.to_thread(_insert_parent, db, parent)
+    execution_scheduler.add(parent)
+
+    return detail
+
+
+@router.get("/orders", response_model=list[ParentOrderResponse])
+def get_parent_orders(
+    skip: int = 0,
+    limit: int = 100,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """부모 주문 목록 조회 (최근 순)"""
+    return db.query(ParentOrder).filter(
+        ParentOrder.user_id == current_user.id
+    ).order_by(ParentOrder.id.desc()).offset(skip).limit(limit).all()
+
+
+@router.get("/orders/{parent_id}", response_model=ParentOrderDetail)
+def get_parent_order(
+    parent_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """부모 주문 조회 (일정, 자식 주문, 체결 평균가와 슬리피지 포함)"""
+    return _detail(db, _get_parent(db, current_user.id, parent_id))
+
+
+@router.post("/orders/{parent_id}/cancel", response_model=ParentOrderDetail)
+async def cancel_parent_order(
+    parent_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """부모 주문 취소
+
+    이후 구간의 자식 주문을 내지 않습니다. 이미 낸 자식 주문은 취소하지 않습니다.
+    """
+    detail = await asyncio.to_thread(_cancel_parent, db, current_user.id, parent_id)
+    if detail.status not in ACTIVE_PARENT_STATUSES:
+        execution_scheduler.cancel(parent_id)
+    return detail
@@ -1,38 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Any, Dict, Optional
 from app.database import get_db
 from app.models.user import User
 from app.models.trading_account import TradingAccount
-from app.api.dependencies import get_current_user
-from app.services.kis_api import KISAPIClient
+from app.schemas.market import BarsResponse, QuotePrice, QuotePricesRequest, QuotePricesResponse
+from app.api.dependencies import get_active_trading_account, get_current_user
+from app.services.bar_store import bar_store, date_range_ms
+from app.services.kis_api import AsyncKISAPIClient
 
 router = APIRouter(prefix="/api/market", tags=["market"])
 
 
+def _to_float(value: Optional[str]) -> Optional[float]:
+    return float(value) if value not in (None, "") else None
+
+
+def _to_quote_price(symbol: str, market_code: str, result: Dict[str, Any]) -> QuotePrice:
+    """현재가 조회 응답을 요약 형태로 변환합니다."""
+    if result.get("rt_cd") not in (None, "0"):
+        return QuotePrice(symbol=symbol, market_code=market_code, error=result.get("msg1", "KIS error"))
+    
+    output = result.get("output") or {}
+    volume = output.get("acml_vol")
+    return QuotePrice(
+        symbol=symbol,
+        market_code=market_code,
+        price=_to_float(output.get("stck_prpr")),
+        change=_to_float(output.get("prdy_vrss")),
+        change_rate=_to_float(output.get("prdy_ctrt")),
+        volume=int(volume) if volume else None
+    )
+
+
 @router.get("/current-price/{symbol}")
-def get_current_price(
+async def get_current_price(
     symbol: str,
     market_code: str = "J",
-    current_user: User = Depends(get_current_user),
+    trading_account: TradingAccount = Depends(get_active_trading_account),
     db: Session = Depends(get_db)
 ):
     """현재가 조회"""
-    # 사용자의 활성 계정 조회
-    trading_account = db.query(TradingAccount).filter(
-        TradingAccount.user_id == current_user.id,
-        TradingAccount.is_active == True
-    ).first()
-    
-    if not trading_account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Trading account not found"
-        )
-    
     try:
-        client = KISAPIClient(trading_account, db)
-        result = client.get_current_price(symbol, market_code)
+        # KIS 응답을 기다리는 동안 DB 커넥션을 점유하지 않도록 풀에 반환
+        db.close()
+        client = AsyncKISAPIClient(trading_account, db)
+        result = await client.get_current_price(symbol, market_code)
         return result
     except Exception as e:
         raise HTTPException(
@@ -40,3 +55,63 @@ def get_current_price(
             detail=f"Failed to get current price: {str(e)}"
         )
 
+
+@router.post("/prices", response_model=QuotePricesResponse)
+async def get_prices(
+    request: QuotePricesRequest,
+    trading_account: TradingAccount = Depends(get_active_trading_account),
+    db: Session = Depends(get_db)
+):
+    """여러 종목 현재가 일괄 조회 (동시 조회, 종목별 실패 보고)"""
+    # 계정 조회(스레드풀의 의존성)와 클라이언트 생성은 한 번만 수행
+    # KIS 응답을 기다리는 동안 DB 커넥션을 점유하지 않도록 풀에 반환
+    db.close()
+    client = AsyncKISAPIClient(trading_account, db)
+    
+    # 중복 종목은 한 번만 조회
+    keys = list(dict.fromkeys((item.symbol, item.market_code) for item in request.symbols))
+    results = await asyncio.gather(
+        *(client.get_current_price(symbol, market_code) for symbol, market_code in keys),
+        return_exceptions=True
+    )
+    
+    prices = []
+    for (symbol, market_code), result in zip(keys, results):
+        if isinstance(result, Exception):
+            prices.append(QuotePrice(symbol=symbol, market_code=market_code, error=str(result)))
+        else:
+            prices.append(_to_quote_price(symbol, market_code, result))
+    
+    return QuotePricesResponse(
+        prices=prices,
+        failed=sum(1 for price in prices if price.error)
+    )
+
+
+@router.get("/bars/{symbol}", response_model=BarsResponse)
+def get_bars(
+    symbol: str,
+    interval: str = "1m",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    limit: int = Query(5000, ge=1, le=100_000),
+    current_user: User = Depends(get_current_user)
+):
+    """과거 봉 조회 (차트용, 저장소에 있는 구간만 반환)
+    
+    start/end는 KST 거래일(양 끝 포함)이며, 구간 안의 봉이 limit개를 넘으면 최근 limit개를 반환합니다.
+    """
+    start_ms, end_ms = date_range_ms(start, end)
+    try:
+        bars = bar_store.read(symbol, interval, start_ms, end_ms)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return {
+        "symbol": symbol,
+        "interval": interval,
+        **{name: column[-limit:].tolist() for name, column in zip(bars._fields, bars)}
+    }
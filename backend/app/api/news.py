@@ -2,36 +2,25 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import Optional
 from app.database import get_db
-from app.models.user import User
 from app.models.trading_account import TradingAccount
-from app.api.dependencies import get_current_user
-from app.services.kis_api import KISAPIClient
+from app.api.dependencies import get_active_trading_account
+from app.services.kis_api import AsyncKISAPIClient
 
 router = APIRouter(prefix="/api/news", tags=["news"])
 
 
 @router.get("")
-def get_news(
+async def get_news(
     symbol: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
+    trading_account: TradingAccount = Depends(get_active_trading_account),
     db: Session = Depends(get_db)
 ):
     """뉴스 조회"""
-    # 사용자의 활성 계정 조회
-    trading_account = db.query(TradingAccount).filter(
-        TradingAccount.user_id == current_user.id,
-        TradingAccount.is_active == True
-    ).first()
-    
-    if not trading_account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Trading account not found"
-        )
-    
     try:
-        client = KISAPIClient(trading_account, db)
-        result = client.get_news(symbol)
+        # KIS 응답을 기다리는 동안 DB 커넥션을 점유하지 않도록 풀에 반환
+        db.close()
+        client = AsyncKISAPIClient(trading_account, db)
+        result = await client.get_news(symbol)
         return result
     except Exception as e:
         raise HTTPException(
@@ -1,23 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import time
+import uuid
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
 from app.models.trading_account import TradingAccount
 from app.models.order import Order
-from app.schemas.order import OrderCreate, OrderResponse
-from app.api.dependencies import get_current_user
-from app.services.kis_api import KISAPIClient
+from app.schemas.order import BasketLegResult, BasketOrderCreate, BasketOrderResponse, OrderCreate, OrderResponse
+from app.api.dependencies import get_current_user, get_user_trading_account
+from app.services.basket_orders import (
+    build_basket_response, create_basket_orders, load_basket_orders, load_portfolio, plan_rebalance, wait_for_legs
+)
+from app.services.event_bus import ORDER, event_bus
+from app.services.kis_api import AsyncKISAPIClient
+from app.services.order_submitter import order_submitter
 
 router = APIRouter(prefix="/api/order", tags=["order"])
 
 
-@router.post("", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
+@router.post("", response_model=OrderResponse, status_code=status.HTTP_202_ACCEPTED)
 def create_order(
     order: OrderCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """주문 생성"""
+    """주문 생성
+
+    주문을 QUEUED로 기록하고 KIS 응답을 기다리지 않고 반환합니다 (202). KIS 전송은 order_submitter가
+    하며, 결과(PENDING + 주문번호 또는 REJECTED)는 주문 조회나 order 이벤트로 확인합니다.
+    멱등성 키(client_order_id 또는 Idempotency-Key 헤더)가 같은 요청은 새 주문을 만들지 않고
+    기존 주문을 반환합니다.
+    """
     # 거래 계정 확인
     trading_account = db.query(TradingAccount).filter(
         TradingAccount.id == order.trading_account_id,
@@ -31,51 +49,47 @@ def create_order(
             detail="Trading account not found"
         )
     
+    client_order_id = order.client_order_id or idempotency_key
+    if client_order_id:
+        existing = _find_by_client_order_id(db, current_user.id, client_order_id)
+        if existing:
+            return existing
+    
+    db_order = Order(
+        user_id=current_user.id,
+        trading_account_id=order.trading_account_id,
+        symbol=order.symbol,
+        order_type=order.order_type,
+        order_method=order.order_method,
+        quantity=order.quantity,
+        price=order.price,
+        status="QUEUED",
+        client_order_id=client_order_id or uuid.uuid4().hex,
+        strategy_id=order.strategy_id,
+        order_metadata=order.metadata
+    )
+    db.add(db_order)
     try:
-        client = KISAPIClient(trading_account, db)
-        
-        # 주문 타입 변환
-        order_type_code = "02" if order.order_type == "BUY" else "01"
-        order_method_code = "01" if order.order_method == "MARKET" else "00"
-        
-        # 한국투자증권 API로 주문 실행
-        result = client.place_order(
-            account_number=trading_account.account_number,
-            symbol=order.symbol,
-            order_type=order.order_type,
-            quantity=order.quantity,
-            price=int(order.price) if order.price else None,
-            order_method=order_method_code
-        )
-        
-        # DB에 주문 저장
-        db_order = Order(
-            user_id=current_user.id,
-            trading_account_id=order.trading_account_id,
-            symbol=order.symbol,
-            order_type=order.order_type,
-            order_method=order.order_method,
-            quantity=order.quantity,
-            price=order.price,
-            status="PENDING",
-            strategy_id=order.strategy_id,
-            order_metadata=order.metadata
-        )
-        
-        if "output" in result and "ODNO" in result["output"]:
-            db_order.kis_order_no = result["output"]["ODNO"]
-        
-        db.add(db_order)
         db.commit()
-        db.refresh(db_order)
-        
-        return db_order
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to place order: {str(e)}"
-        )
+    except IntegrityError:
+        # 같은 키로 동시에 들어온 요청이 먼저 기록함
+        db.rollback()
+        existing = _find_by_client_order_id(db, current_user.id, client_order_id)
+        if existing:
+            return existing
+        raise
+    db.refresh(db_order)
+    event_bus.publish_order(db_order)
+    order_submitter.notify()
+    
+    return db_order
+
+
+def _find_by_client_order_id(db: Session, user_id: int, client_order_id: str) -> Optional[Order]:
+    return db.query(Order).filter(
+        Order.user_id == user_id,
+        Order.client_order_id == client_order_id
+    ).first()
 
 
 @router.get("", response_model=list[OrderResponse])
@@ -92,3 +106,121 @@ def get_orders(
     
     return orders
 
+
+
+@router.post("/basket", response_model=BasketOrderResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_basket_order(
+    basket: BasketOrderCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """바스켓(리밸런싱) 주문
+
+    목표 비중(targets)이나 주문 목록(legs)을 받아 매도 먼저, 매수는 매도 전송 뒤에 보내도록 한 번에
+    기록하고, BASKET_ORDER_WAIT_SECONDS까지 전송 결과를 기다려 주문별 지연(latency_ms)과 전체 완료
+    시간(total_ms)을 반환합니다. 끝나지 않은 주문은 GET /api/order/basket/{basket_id}로 확인합니다.
+    """
+    if (basket.targets is None) == (basket.legs is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Specify either targets or legs"
+        )
+    if basket.targets is not None and (
+        any(weight < 0 for weight in basket.targets.values()) or sum(basket.targets.values()) > 1.0 + 1e-9
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Target weights must be non-negative and sum to at most 1"
+        )
+    if basket.legs is not None and any(
+        leg.order_type not in ("BUY", "SELL") or leg.quantity <= 0 for leg in basket.legs
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Legs need order_type BUY or SELL and a positive quantity"
+        )
+    
+    # 거래 계정 확인 (바스켓 전체에 한 번, 동기 DB 조회는 스레드풀에서)
+    user_id = current_user.id
+    trading_account = await asyncio.to_thread(
+        get_user_trading_account, db, user_id, basket.trading_account_id
+    )
+    
+    basket_id = basket.client_basket_id or uuid.uuid4().hex
+    # KIS 조회/전송을 기다리는 동안 DB 커넥션을 점유하지 않도록 풀에 반환
+    db.close()
+    
+    if basket.client_basket_id:
+        existing = await asyncio.to_thread(load_basket_orders, user_id, basket_id)
+        if existing:
+            return build_basket_response(basket_id, existing)
+    
+    total_value = None
+    plan_ms = None
+    if basket.targets is not None:
+        started = time.perf_counter()
+        try:
+            client = AsyncKISAPIClient(trading_account, db)
+            holdings, prices, total_value = await load_portfolio(
+                client, trading_account.account_number, basket.targets.keys()
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to plan basket: {str(e)}"
+            )
+        try:
+            legs = plan_rebalance(
+                basket.targets, holdings, prices, total_value, basket.sell_unlisted, basket.min_trade_value
+            )
+        except ValueError as e:
+            # 현재가가 없는(잘못된) 종목 등 요청 값 문제
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        plan_ms = (time.perf_counter() - started) * 1000
+    else:
+        # 직접 지정한 주문도 매도 먼저
+        legs = sorted(basket.legs, key=lambda leg: leg.order_type != "SELL")
+    
+    if basket.dry_run:
+        return BasketOrderResponse(
+            basket_id=basket_id,
+            status="PLANNED",
+            legs=[BasketLegResult(status="PLANNED", **leg.model_dump()) for leg in legs],
+            total_value=total_value,
+            plan_ms=round(plan_ms, 3) if plan_ms is not None else None
+        )
+    
+    # 주문 기록 전에 구독해야 전송 결과 이벤트를 놓치지 않음
+    subscription = event_bus.subscribe({ORDER: [str(trading_account.id)]}, name=f"basket:{basket_id}")
+    try:
+        started = time.perf_counter()
+        orders = await asyncio.to_thread(
+            create_basket_orders, user_id, trading_account.id, basket_id, legs, basket.strategy_id
+        )
+        order_submitter.notify()
+        latencies = await wait_for_legs(
+            subscription, [order.id for order in orders], started, settings.BASKET_ORDER_WAIT_SECONDS
+        )
+    finally:
+        subscription.close()
+    
+    orders = await asyncio.to_thread(load_basket_orders, user_id, basket_id)
+    return build_basket_response(basket_id, orders, latencies, total_value, plan_ms)
+
+
+@router.get("/basket/{basket_id}", response_model=BasketOrderResponse)
+def get_basket_order(
+    basket_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """바스켓 주문 상태 조회"""
+    orders = load_basket_orders(current_user.id, basket_id)
+    if not orders:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Basket not found"
+        )
+    return build_basket_response(basket_id, orders)
@@ -1,15 +1,64 @@
+import json
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import Dict, List, Union
+from datetime import datetime
+from app.config import settings
+from app.database import SessionLocal, get_db
 from app.models.user import User
 from app.models.strategy import Strategy
 from app.schemas.strategy import StrategyCreate, StrategyUpdate, StrategyResponse
+from app.schemas.backtest import (
+    BacktestRequest, BacktestResponse, OptimizeRequest, OptimizeResponse
+)
 from app.api.dependencies import get_current_user
+from app.services.bar_store import bar_store, date_range_ms
+from app.services.backtest import KST, BacktestParams, BarSeries, bars_from_records, run_backtest
+from app.services.optimizer import PARAM_NAMES, combination_count, grid_combinations, iter_optimize, random_combinations, rank_results
+from app.services.strategy_runner import strategy_runner
 
 router = APIRouter(prefix="/api/strategy", tags=["strategy"])
 
 
+def _get_user_strategy(db: Session, user: User, strategy_id: int) -> Strategy:
+    """사용자의 전략을 조회합니다."""
+    strategy = db.query(Strategy).filter(
+        Strategy.id == strategy_id,
+        Strategy.user_id == user.id
+    ).first()
+    
+    if not strategy:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Strategy not found"
+        )
+    
+    return strategy
+
+
+def _bars_by_symbol(request: Union[BacktestRequest, OptimizeRequest]) -> Dict[str, BarSeries]:
+    """요청의 종목별 봉을 배열로 변환합니다 (bars를 생략한 종목은 과거 봉 저장소에서 조회)."""
+    start_ms, end_ms = date_range_ms(request.start, request.end)
+    bars_by_symbol = {}
+    for item in request.symbols:
+        if item.bars is not None:
+            bars_by_symbol[item.symbol] = bars_from_records([bar.model_dump() for bar in item.bars])
+            continue
+        
+        try:
+            bars = bar_store.read(item.symbol, request.interval, start_ms, end_ms)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if not len(bars):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No stored {request.interval} bars for {item.symbol}"
+            )
+        bars_by_symbol[item.symbol] = bars
+    return bars_by_symbol
+
+
 @router.post("", response_model=StrategyResponse, status_code=status.HTTP_201_CREATED)
 def create_strategy(
     strategy: StrategyCreate,
@@ -24,6 +73,7 @@ def create_strategy(
     db.add(db_strategy)
     db.commit()
     db.refresh(db_strategy)
+    strategy_runner.notify_changed(db_strategy.id)
     return db_strategy
 
 
@@ -85,6 +135,7 @@ def update_strategy(
     
     db.commit()
     db.refresh(strategy)
+    strategy_runner.notify_changed(strategy.id)
     return strategy
 
 
@@ -108,5 +159,120 @@ def delete_strategy(
     
     db.delete(strategy)
     db.commit()
+    strategy_runner.notify_changed(strategy_id)
     return None
 
+
+
+@router.post("/{strategy_id}/backtest", response_model=BacktestResponse)
+def backtest_strategy(
+    strategy_id: int,
+    request: BacktestRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """전략 백테스트 (요청에 포함된 과거 봉 또는 과거 봉 저장소 사용)"""
+    strategy = _get_user_strategy(db, current_user, strategy_id)
+    params = BacktestParams.from_strategy(
+        strategy,
+        **request.model_dump(include=set(BacktestParams.__dataclass_fields__))
+    )
+    bars_by_symbol = _bars_by_symbol(request)
+    result = run_backtest(
+        bars_by_symbol,
+        params,
+        initial_capital=request.initial_capital,
+        fee_rate=request.fee_rate,
+        sell_tax_rate=request.sell_tax_rate
+    )
+    
+    return {
+        "strategy_id": strategy.id,
+        "summary": result["summary"],
+        "trades": [
+            {
+                **trade._asdict(),
+                "entry_time": datetime.fromtimestamp(trade.entry_time / 1000, KST),
+                "exit_time": datetime.fromtimestamp(trade.exit_time / 1000, KST)
+            }
+            for trade in result["trades"]
+        ],
+        "equity_curve": result["equity_curve"]
+    }
+
+
+@router.post("/{strategy_id}/optimize", response_model=OptimizeResponse)
+def optimize_strategy(
+    strategy_id: int,
+    request: OptimizeRequest,
+    stream: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """전략 파라미터 탐색
+    
+    stream=true이면 평가가 끝나는 대로 결과를 한 줄씩(NDJSON) 보내고,
+    마지막 줄에 {"ranked": [...]} 형태로 상위 top_n 결과를 보냅니다.
+    """
+    strategy = _get_user_strategy(db, current_user, strategy_id)
+    unknown = set(request.grid) - set(PARAM_NAMES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown parameters: {', '.join(sorted(unknown))}"
+        )
+    
+    # 조합 목록을 만들기 전에 개수로 제한
+    count = combination_count(request.grid)
+    if request.search == "random":
+        count = min(request.samples, count)
+    if count > settings.OPTIMIZER_MAX_COMBINATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many combinations: {count} > {settings.OPTIMIZER_MAX_COMBINATIONS}"
+        )
+    
+    if request.search == "random":
+        combinations = random_combinations(request.grid, request.samples, request.seed)
+    else:
+        combinations = grid_combinations(request.grid)
+    
+    base_params = BacktestParams.from_strategy(strategy)
+    bars_by_symbol = _bars_by_symbol(request)
+    # 스트리밍 중에도 캐시를 저장할 수 있도록 요청 세션과 별도 세션 사용
+    db.close()
+    
+    def evaluate():
+        cache_db = SessionLocal()
+        try:
+            yield from iter_optimize(
+                bars_by_symbol,
+                base_params,
+                combinations,
+                objective=request.objective,
+                initial_capital=request.initial_capital,
+                fee_rate=request.fee_rate,
+                sell_tax_rate=request.sell_tax_rate,
+                workers=settings.OPTIMIZER_WORKERS or None,
+                db=cache_db
+            )
+        finally:
+            cache_db.close()
+    
+    if stream:
+        def ndjson():
+            results = []
+            for result in evaluate():
+                results.append(result)
+                yield json.dumps(result) + "\n"
+            yield json.dumps({"ranked": rank_results(results, request.top_n)}) + "\n"
+        
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    
+    results = list(evaluate())
+    return {
+        "strategy_id": strategy_id,
+        "evaluated": len(results),
+        "cached": sum(1 for result in results if result["cached"]),
+        "results": rank_results(results, request.top_n)
+    }
@@ -4,6 +4,18 @@ from app.database import get_db
 from app.models.user import User
 from app.models.trading_account import TradingAccount
 from app.api.dependencies import get_current_user
+from app.services.bar_store import bar_store
+from app.services.event_bus import event_bus
+from app.services.execution_algos import execution_scheduler
+from app.services.fill_notices import fill_notice_ingester
+from app.services.kis_rate_limiter import rate_limiter_metrics
+from app.services.quote_cache import quote_cache
+from app.services.kis_realtime import quote_ingester
+from app.services.order_reconciler import order_reconciler
+from app.services.order_submitter import order_submitter
+from app.services.strategy_runner import strategy_runner
+from app.services.tick_store import tick_store
+from app.services.vwap_engine import vwap_engine
 
 router = APIRouter(prefix="/api/system", tags=["system"])
 
@@ -29,3 +41,22 @@ def get_system_status(
         "user_id": current_user.id
     }
 
+
+
+@router.get("/metrics")
+def get_system_metrics(current_user: User = Depends(get_current_user)):
+    """KIS 연동 지표 조회"""
+    return {
+        "kis_rate_limiter": rate_limiter_metrics(),
+        "quote_cache": quote_cache.stats(),
+        "realtime_quotes": quote_ingester.stats(),
+        "tick_store": tick_store.stats(),
+        "vwap_engine": vwap_engine.stats(),
+        "bar_store": bar_store.stats(),
+        "strategy_runner": strategy_runner.stats(),
+        "event_bus": event_bus.stats(),
+        "order_reconciler": order_reconciler.stats(),
+        "order_submitter": order_submitter.stats(),
+        "execution_algos": execution_scheduler.stats(),
+        "fill_notices": fill_notice_ingester.stats()
+    }
@@ -6,6 +6,7 @@ from app.models.user import User
 from app.models.trading_account import TradingAccount
 from app.schemas.trading_account import TradingAccountCreate, TradingAccountResponse
 from app.api.dependencies import get_current_user
+from app.services.fill_notices import fill_notice_ingester
 
 router = APIRouter(prefix="/api/trading-account", tags=["trading-account"])
 
@@ -24,6 +25,8 @@ def create_trading_account(
     db.add(db_account)
     db.commit()
     db.refresh(db_account)
+    if db_account.hts_id:
+        fill_notice_ingester.notify_changed()
     return db_account
 
 
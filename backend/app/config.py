@@ -16,6 +16,91 @@ class Settings(BaseSettings):
     KIS_APP_KEY: str = ""
     KIS_APP_SECRET: str = ""
     
+    # KIS API HTTP 커넥션 풀 (모든 KISAPIClient가 base URL별로 공유)
+    KIS_HTTP_TIMEOUT: float = 10.0  # seconds
+    KIS_HTTP_CONNECT_TIMEOUT: float = 5.0  # seconds
+    KIS_HTTP_MAX_CONNECTIONS: int = 100
+    KIS_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    KIS_HTTP_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    KIS_HTTP2: bool = True  # h2 패키지가 설치된 경우에만 적용
+    KIS_HTTP_VERIFY_SSL: bool = True  # 로컬 대역 서버(자체 서명 인증서) 사용 시 False
+    
+    # KIS API 앱키별 초당 요청 제한 (모의투자 도메인은 openapivts)
+    KIS_RATE_LIMIT_REAL_PER_SEC: float = 18.0
+    KIS_RATE_LIMIT_VIRTUAL_PER_SEC: float = 4.0
+    KIS_RATE_LIMIT_BURST: float = 1.0  # KIS는 1초 슬라이딩 윈도우로 세므로 순간 허용량을 작게 유지
+    KIS_RATE_LIMIT_RETRIES: int = 3  # EGW00201(초당 거래건수 초과) 재시도 횟수
+    
+    # 현재가 공유 캐시
+    QUOTE_CACHE_TTL_SECONDS: float = 1.0
+    QUOTE_CACHE_MAX_ENTRIES: int = 5000
+
+    # KIS 실시간(WebSocket) 시세 수신 (모의투자: ws://ops.koreainvestment.com:31000)
+    KIS_REALTIME_ENABLED: bool = False
+    KIS_WS_URL: str = "ws://ops.koreainvestment.com:21000"
+    KIS_WS_MAX_SUBSCRIPTIONS: int = 41  # 접속키당 최대 실시간 등록 수
+    KIS_WS_RECONNECT_MAX_DELAY: float = 30.0  # seconds
+    KIS_REALTIME_SYMBOL_REFRESH_SECONDS: float = 30.0  # 활성 전략 종목 재조회 주기
+
+    # 당일 틱 저장소 (틱당 24바이트)
+    TICK_STORE_MEMORY_MB: int = 512
+    TICK_STORE_INITIAL_CAPACITY: int = 4096  # 종목별 최초 할당 틱 수
+
+    # 증분 VWAP 엔진이 세션 VWAP와 함께 유지할 롤링 윈도우 (분, 쉼표 구분, 예: "5,30")
+    VWAP_ROLLING_WINDOWS_MINUTES: str = ""
+
+    # 전략 파라미터 탐색
+    OPTIMIZER_WORKERS: int = 0  # 프로세스 수 (0이면 CPU 수)
+    OPTIMIZER_MAX_COMBINATIONS: int = 10000  # 요청당 최대 평가 조합 수
+
+    # 과거 봉 저장소 (종목/봉 주기/연도별 메모리 매핑 파일)
+    BAR_STORE_PATH: str = "data/bars"
+    BAR_STORE_RECORD_TICKS: bool = True  # 실시간 수신 시 거래일 마감마다 당일 틱을 1분봉으로 저장
+
+    # KIS 차트 이력 동기화 (scripts/sync-history.py)
+    HISTORY_SYNC_CONCURRENCY: int = 8  # 동시에 처리할 종목 수
+    HISTORY_SYNC_DAILY_LOOKBACK_DAYS: int = 1095  # 저장된 일봉이 없을 때 받을 기간
+    HISTORY_SYNC_MINUTE_LOOKBACK_DAYS: int = 30  # 저장된 분봉이 없을 때 받을 기간 (KIS 최대 1년)
+    HISTORY_SYNC_WRITE_BATCH_DAYS: int = 5  # 분봉을 이 거래일 수만큼 모아 한 번에 저장
+
+    # 활성 전략 실행기 (앱과 함께 시작하거나 scripts/run-strategies.py로 따로 실행)
+    STRATEGY_RUNNER_ENABLED: bool = False
+    STRATEGY_RUNNER_ORDER_AMOUNT: float = 1000000  # 종목당 1회 매수 금액 (전략 additional_params["order_amount"]로 변경)
+    STRATEGY_RUNNER_SESSION: str = "0900-1520"  # 평가/주문 시간대 (KST HHMM-HHMM)
+    STRATEGY_RUNNER_POLL_SECONDS: float = 1.0  # 실시간 수신을 끈 경우 현재가 조회 주기
+    STRATEGY_RUNNER_ORDER_COOLDOWN_SECONDS: float = 30.0  # 주문 실패 후 같은 종목 재평가 대기
+    STRATEGY_RUNNER_SHARDS: int = 0  # 평가 워커 프로세스 수 (0이면 앱 프로세스에서 평가)
+
+    # 프로세스 내 이벤트 버스 (시세/신호/주문/잔고)
+    EVENT_BUS_QUEUE_SIZE: int = 1000  # 구독자별 최대 대기 이벤트 수 (초과 시 오래된 이벤트부터 버림)
+    EVENT_BUS_SSE_KEEPALIVE_SECONDS: float = 15.0  # 이벤트가 없을 때 SSE 연결 유지 주석 전송 주기
+
+    # KIS 실시간 체결통보 (H0STCNI0, 거래 계정 hts_id로 구독)
+    KIS_FILL_NOTICES_ENABLED: bool = False
+    KIS_FILL_NOTICE_MATCH_TIMEOUT_SECONDS: float = 5.0  # 주문 기록 전에 도착한 통보를 다시 맞춰 보는 시간
+    KIS_FILL_NOTICE_ACCOUNT_REFRESH_SECONDS: float = 60.0  # 구독할 거래 계정 목록 갱신 주기
+
+    # 주문 전송 (QUEUED 주문 outbox → KIS)
+    ORDER_SUBMITTER_ENABLED: bool = True
+    ORDER_SUBMITTER_CONCURRENCY: int = 8  # 동시에 전송 중인 주문 수
+    ORDER_SUBMITTER_MAX_ATTEMPTS: int = 5
+    ORDER_SUBMITTER_RETRY_BASE_SECONDS: float = 1.0  # 재시도 대기 (시도마다 두 배, 최대 30초)
+    ORDER_SUBMITTER_POLL_SECONDS: float = 1.0  # 다른 프로세스가 넣은 주문/재시도 예정 주문 확인 주기
+    BASKET_ORDER_WAIT_SECONDS: float = 10.0  # 바스켓 주문 응답 전 전송 결과를 기다리는 최대 시간
+
+    # 실행 알고리즘 (TWAP/VWAP 부모 주문 분할)
+    EXECUTION_ALGOS_ENABLED: bool = True
+    EXECUTION_ALGO_SLICE_SECONDS: int = 60  # 기본 분할 간격
+    EXECUTION_ALGO_VOLUME_SESSIONS: int = 20  # VWAP 거래량 곡선에 쓰는 과거 거래일 수 (1분봉)
+    EXECUTION_ALGO_MIN_CHILD_QUANTITY: int = 1  # 이보다 작은 자식 주문은 다음 구간으로 미룸 (마지막 구간 제외)
+    EXECUTION_ALGO_COMPLETION_GRACE_SECONDS: float = 300.0  # 종료 시각 뒤 미체결 자식 주문을 기다리는 시간
+
+    # 주문 체결 대사 (KIS 일별 주문 체결 조회)
+    ORDER_RECONCILER_ENABLED: bool = True
+    ORDER_RECONCILER_INTERVAL_SECONDS: float = 5.0  # 미체결 주문이 있을 때 계정별 조회 주기
+    ORDER_RECONCILER_IDLE_SECONDS: float = 60.0  # 미체결 주문이 없을 때 최대 대기 (두 배씩 늘림)
+    ORDER_RECONCILER_LOOKBACK_DAYS: int = 7  # 이보다 오래된 미체결 주문은 대사하지 않음
+    
     # CORS
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
     
@@ -27,6 +112,20 @@ class Settings(BaseSettings):
     @property
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
+    
+    @property
+    def vwap_rolling_windows_ms(self) -> List[int]:
+        return [int(float(minutes) * 60_000) for minutes in self.VWAP_ROLLING_WINDOWS_MINUTES.split(",") if minutes.strip()]
+    
+    @property
+    def kis_is_virtual(self) -> bool:
+        return "openapivts" in self.KIS_BASE_URL
+    
+    @property
+    def kis_rate_limit_per_sec(self) -> float:
+        if self.kis_is_virtual:
+            return self.KIS_RATE_LIMIT_VIRTUAL_PER_SEC
+        return self.KIS_RATE_LIMIT_REAL_PER_SEC
 
 
 settings = Settings()
@@ -1,8 +1,20 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.database import engine, Base
-from app.api import auth, market, order, balance, news, strategy, system, trading_account, kis_test
+from app.api import auth, events, execution, market, order, balance, news, strategy, system, trading_account, kis_test
+from app.services.bar_store import bar_store
+from app.services.event_bus import event_bus
+from app.services.execution_algos import execution_scheduler
+from app.services.fill_notices import fill_notice_ingester
+from app.services.kis_http import aclose_http_clients
+from app.services.kis_realtime import quote_ingester
+from app.services.order_reconciler import order_reconciler
+from app.services.order_submitter import order_submitter
+from app.services.strategy_runner import strategy_runner
+from app.services.tick_store import tick_store
+from app.services.vwap_engine import vwap_engine
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,10 +26,50 @@ try:
 except Exception as e:
     logger.warning(f"Failed to create database tables: {e}. Please ensure PostgreSQL is running and DATABASE_URL is correct.")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    event_bus.start()
+    if settings.KIS_REALTIME_ENABLED:
+        quote_ingester.add_listener(tick_store.append_ticks)
+        quote_ingester.add_listener(vwap_engine.on_ticks)
+        quote_ingester.add_listener(event_bus.publish_ticks)
+        if settings.BAR_STORE_RECORD_TICKS:
+            tick_store.on_session_end = bar_store.write_ticks
+        quote_ingester.start()
+    if settings.STRATEGY_RUNNER_ENABLED:
+        # VWAP 엔진 다음에 시세를 받아 갱신된 VWAP으로 평가
+        strategy_runner.start()
+    if settings.KIS_FILL_NOTICES_ENABLED:
+        # 시세 수신기와 앱키가 같으면 그 세션에 체결통보 구독을 더함
+        fill_notice_ingester.start()
+    if settings.ORDER_RECONCILER_ENABLED:
+        order_reconciler.start()
+    if settings.ORDER_SUBMITTER_ENABLED:
+        order_submitter.start()
+    if settings.EXECUTION_ALGOS_ENABLED:
+        # 재시작 시 ACTIVE 부모 주문을 다시 읽어 놓친 구간을 따라잡음
+        execution_scheduler.start()
+    yield
+    # 새 주문을 먼저 막고 전송 중인 주문은 마저 기록
+    await execution_scheduler.stop()
+    await order_submitter.stop()
+    await strategy_runner.stop()
+    await order_reconciler.stop()
+    await fill_notice_ingester.stop()
+    await quote_ingester.stop()
+    # 종료 시점까지 받은 당일 틱도 1분봉으로 저장 (재시작 후 같은 시각 봉은 새로 집계한 값으로 대체)
+    if tick_store.on_session_end is not None:
+        tick_store.on_session_end(tick_store.views())
+    # 공유 KIS 커넥션 풀 정리
+    await aclose_http_clients()
+
+
 app = FastAPI(
     title="ETF 자동매매 시스템",
     description="한국투자증권 API를 이용한 ETF 자동매매 시스템",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -31,8 +83,10 @@ app.add_middleware(
 
 # API 라우터 등록
 app.include_router(auth.router)
+app.include_router(events.router)
 app.include_router(market.router)
 app.include_router(order.router)
+app.include_router(execution.router)
 app.include_router(balance.router)
 app.include_router(news.router)
 app.include_router(strategy.router)
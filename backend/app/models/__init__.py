@@ -3,7 +3,9 @@ from app.models.trading_account import TradingAccount
 from app.models.kis_token import KISToken
 from app.models.strategy import Strategy
 from app.models.order import Order
+from app.models.parent_order import ParentOrder
 from app.models.balance import Balance
+from app.models.strategy_evaluation import StrategyEvaluation
 
-__all__ = ["User", "TradingAccount", "KISToken", "Strategy", "Order", "Balance"]
+__all__ = ["User", "TradingAccount", "KISToken", "Strategy", "Order", "ParentOrder", "Balance", "StrategyEvaluation"]
 
@@ -1,11 +1,20 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, Boolean, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, Boolean, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
+# 체결 결과를 기다리는 주문 상태 (체결 대사/체결통보 반영 대상)
+OPEN_ORDER_STATUSES = ("PENDING", "PARTIAL")
+# 주문 전송 outbox에서 아직 KIS 전송 결과가 나오지 않은 상태
+UNSENT_ORDER_STATUSES = ("QUEUED", "SUBMITTING")
+
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # 같은 사용자의 같은 멱등성 키로는 주문을 하나만 만듦
+        UniqueConstraint("user_id", "client_order_id", name="uq_orders_user_client_order_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -19,11 +28,20 @@ class Order(Base):
     price = Column(Float)  # Limit order price
     executed_price = Column(Float)  # 실제 체결가
     executed_quantity = Column(Integer, default=0)
+    notice_quantity = Column(Integer, default=0)  # 체결통보로 받은 누적 체결 수량 (fill_notices)
     
     # Status
-    status = Column(String, default="PENDING")  # PENDING, EXECUTED, CANCELLED, PARTIAL
+    status = Column(String, default="PENDING")  # QUEUED, SUBMITTING, PENDING, EXECUTED, CANCELLED, PARTIAL, REJECTED
     kis_order_no = Column(String)  # 한국투자증권 주문번호
     
+    # Outbox (order_submitter)
+    client_order_id = Column(String, nullable=True)  # 클라이언트 멱등성 키
+    submit_attempts = Column(Integer, default=0)
+    next_submit_at = Column(DateTime(timezone=True), nullable=True)  # 재시도 예정 시각
+    last_submit_at = Column(DateTime(timezone=True), nullable=True)  # 결과를 모르는 마지막 전송 시각
+    basket_id = Column(String, nullable=True, index=True)  # 바스켓 주문 (같은 바스켓의 매수는 매도 전송 후)
+    parent_order_id = Column(Integer, ForeignKey("parent_orders.id"), nullable=True, index=True)  # 실행 알고리즘 자식 주문
+    
     # Strategy info
     strategy_id = Column(Integer, ForeignKey("strategies.id"), nullable=True)
     
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, JSON
+from sqlalchemy.sql import func
+from app.database import Base
+
+# 자식 주문을 더 낼 수 있는 부모 주문 상태
+ACTIVE_PARENT_STATUSES = ("ACTIVE",)
+
+
+class ParentOrder(Base):
+    """실행 알고리즘(TWAP/VWAP)으로 시간 구간에 나눠 내는 부모 주문 (자식 주문은 Order.parent_order_id)"""
+    __tablename__ = "parent_orders"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    trading_account_id = Column(Integer, ForeignKey("trading_accounts.id"), nullable=False)
+    
+    # Order details
+    symbol = Column(String, nullable=False)  # 종목코드
+    order_type = Column(String, nullable=False)  # BUY, SELL
+    quantity = Column(Integer, nullable=False)
+    
+    # Schedule
+    algorithm = Column(String, nullable=False)  # TWAP, VWAP
+    start_time = Column(DateTime(timezone=True), nullable=False)
+    end_time = Column(DateTime(timezone=True), nullable=False)
+    slice_seconds = Column(Integer, nullable=False)
+    schedule = Column(JSON, default=[])  # 구간별 누적 목표 비율
+    slices_sent = Column(Integer, default=0)  # 자식 주문을 낸 구간 수
+    
+    # Status
+    status = Column(String, default="ACTIVE")  # ACTIVE, COMPLETED, EXPIRED, CANCELLED
+    ordered_quantity = Column(Integer, default=0)  # 자식 주문 수량 합 (거부 제외)
+    executed_quantity = Column(Integer, default=0)
+    executed_price = Column(Float)  # 평균 체결가
+    
+    # Slippage (매수는 비싸게, 매도는 싸게 체결될수록 양수, bp)
+    arrival_price = Column(Float)  # 부모 주문 접수 시점 현재가
+    interval_vwap = Column(Float)  # 실행 구간 VWAP
+    slippage_arrival_bps = Column(Float)
+    slippage_vwap_bps = Column(Float)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -1,3 +1,4 @@
+from typing import List
 from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Float, DateTime, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -30,3 +31,8 @@ class Strategy(Base):
     # Relationships
     user = relationship("User", back_populates="strategies")
 
+    @property
+    def symbols(self) -> List[str]:
+        """전략이 거래하는 종목 코드 (additional_params["symbols"])"""
+        return list((self.additional_params or {}).get("symbols") or [])
+
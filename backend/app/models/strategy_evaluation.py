@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class StrategyEvaluation(Base):
+    """파라미터 탐색 결과 캐시 (같은 데이터셋/파라미터 조합은 다시 계산하지 않음)"""
+    __tablename__ = "strategy_evaluations"
+    __table_args__ = (UniqueConstraint("dataset_key", "params_key", name="uq_strategy_evaluation"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    dataset_key = Column(String, nullable=False, index=True)  # 봉 데이터와 체결 조건 해시
+    params_key = Column(String, nullable=False)  # 정렬된 파라미터 JSON
+    params = Column(JSON, nullable=False)
+    summary = Column(JSON, nullable=False)  # 백테스트 요약 통계
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -12,6 +12,7 @@ class TradingAccount(Base):
     account_number = Column(String, nullable=False)
     app_key = Column(String, nullable=False)
     app_secret = Column(String, nullable=False)
+    hts_id = Column(String, nullable=True)  # HTS ID (실시간 체결통보 구독 키)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
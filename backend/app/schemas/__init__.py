@@ -1,14 +1,22 @@
 from app.schemas.user import UserCreate, UserResponse, Token
 from app.schemas.trading_account import TradingAccountCreate, TradingAccountResponse
 from app.schemas.strategy import StrategyCreate, StrategyUpdate, StrategyResponse
-from app.schemas.order import OrderCreate, OrderResponse
+from app.schemas.order import (
+    OrderCreate, OrderResponse, BasketLeg, BasketOrderCreate, BasketLegResult, BasketOrderResponse
+)
 from app.schemas.balance import BalanceResponse
+from app.schemas.market import QuoteSymbol, QuotePricesRequest, QuotePrice, QuotePricesResponse, BarsResponse
+from app.schemas.backtest import BacktestRequest, BacktestResponse, OptimizeRequest, OptimizeResponse
+from app.schemas.execution import ParentOrderCreate, ParentOrderResponse, ParentOrderDetail
 
 __all__ = [
     "UserCreate", "UserResponse", "Token",
     "TradingAccountCreate", "TradingAccountResponse",
     "StrategyCreate", "StrategyUpdate", "StrategyResponse",
-    "OrderCreate", "OrderResponse",
-    "BalanceResponse"
+    "OrderCreate", "OrderResponse", "BasketLeg", "BasketOrderCreate", "BasketLegResult", "BasketOrderResponse",
+    "BalanceResponse",
+    "QuoteSymbol", "QuotePricesRequest", "QuotePrice", "QuotePricesResponse", "BarsResponse",
+    "BacktestRequest", "BacktestResponse", "OptimizeRequest", "OptimizeResponse",
+    "ParentOrderCreate", "ParentOrderResponse", "ParentOrderDetail"
 ]
 
@@ -0,0 +1,108 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional
+from datetime import date, datetime
+
+
+class BacktestBar(BaseModel):
+    timestamp: datetime  # 타임존이 없으면 KST
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+class BacktestSymbolBars(BaseModel):
+    symbol: str
+    bars: Optional[List[BacktestBar]] = None  # 생략 시 과거 봉 저장소에서 조회
+
+
+class StoredBarsRange(BaseModel):
+    # bars를 생략한 종목에 사용할 저장소 조회 조건 (start/end는 KST 거래일, 양 끝 포함)
+    interval: str = "1m"
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+
+class BacktestRequest(StoredBarsRange):
+    symbols: List[BacktestSymbolBars] = Field(..., min_length=1)
+    initial_capital: float = Field(10_000_000, gt=0)
+    fee_rate: float = Field(0.00015, ge=0)  # 매수/매도 수수료율
+    sell_tax_rate: float = Field(0.0, ge=0)  # 매도 거래세율 (국내 주식형 ETF는 면제)
+    # 지정 시 전략 값 대신 사용
+    vwap_period: Optional[int] = Field(None, ge=1)
+    entry_threshold: Optional[float] = None
+    exit_threshold: Optional[float] = None
+    stop_loss_percent: Optional[float] = None
+    take_profit_percent: Optional[float] = None
+    max_holding_days: Optional[int] = Field(None, ge=0)
+
+
+class BacktestTrade(BaseModel):
+    symbol: str
+    entry_time: datetime
+    exit_time: datetime
+    entry_price: float
+    exit_price: float
+    quantity: int
+    pnl: float
+    return_percent: float
+    fees: float
+    exit_reason: str  # STOP_LOSS, TAKE_PROFIT, SELL_SIGNAL, MAX_HOLDING, END
+
+
+class BacktestEquityPoint(BaseModel):
+    date: date
+    equity: float
+
+
+class BacktestSummary(BaseModel):
+    initial_capital: float
+    final_equity: float
+    total_return_percent: float
+    annualized_return_percent: float
+    max_drawdown_percent: float
+    sharpe_ratio: float
+    trades: int
+    win_rate_percent: float
+    avg_trade_return_percent: float
+    profit_factor: float
+    total_fees: float
+
+
+class BacktestResponse(BaseModel):
+    strategy_id: int
+    summary: BacktestSummary
+    trades: List[BacktestTrade]
+    equity_curve: List[BacktestEquityPoint]
+
+
+class OptimizeRequest(StoredBarsRange):
+    symbols: List[BacktestSymbolBars] = Field(..., min_length=1)
+    # 파라미터별 후보 값 (vwap_period, entry_threshold, exit_threshold,
+    # stop_loss_percent, take_profit_percent, max_holding_days)
+    grid: Dict[str, List[float]] = Field(..., min_length=1)
+    search: Literal["grid", "random"] = "grid"
+    samples: int = Field(100, ge=1)  # random 탐색 시 평가할 조합 수
+    seed: Optional[int] = None
+    objective: Literal[
+        "sharpe_ratio", "total_return_percent", "annualized_return_percent", "profit_factor", "win_rate_percent"
+    ] = "sharpe_ratio"
+    top_n: int = Field(20, ge=1)
+    initial_capital: float = Field(10_000_000, gt=0)
+    fee_rate: float = Field(0.00015, ge=0)
+    sell_tax_rate: float = Field(0.0, ge=0)
+
+
+class OptimizationResult(BaseModel):
+    params: Dict[str, float]
+    summary: BacktestSummary
+    objective: float
+    cached: bool  # 저장된 평가 재사용 여부
+
+
+class OptimizeResponse(BaseModel):
+    strategy_id: int
+    evaluated: int
+    cached: int
+    results: List[OptimizationResult]
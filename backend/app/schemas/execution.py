@@ -0,0 +1,47 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+from app.schemas.order import OrderResponse
+
+
+class ParentOrderCreate(BaseModel):
+    trading_account_id: int
+    symbol: str
+    order_type: str  # BUY, SELL
+    quantity: int
+    algorithm: str = "TWAP"  # TWAP (균등), VWAP (과거 분봉 거래량 곡선)
+    start_time: Optional[datetime] = None  # 기본값: 지금
+    end_time: Optional[datetime] = None  # 없으면 start_time + duration_minutes
+    duration_minutes: Optional[float] = None
+    slice_seconds: Optional[int] = None  # 기본값: EXECUTION_ALGO_SLICE_SECONDS
+
+
+class ParentOrderResponse(BaseModel):
+    id: int
+    trading_account_id: int
+    symbol: str
+    order_type: str
+    quantity: int
+    algorithm: str
+    start_time: datetime
+    end_time: datetime
+    slice_seconds: int
+    slices_sent: int
+    status: str
+    ordered_quantity: int
+    executed_quantity: int
+    executed_price: Optional[float]
+    arrival_price: Optional[float]
+    interval_vwap: Optional[float]
+    slippage_arrival_bps: Optional[float]
+    slippage_vwap_bps: Optional[float]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
+class ParentOrderDetail(ParentOrderResponse):
+    schedule: List[float] = []  # 구간별 누적 목표 비율
+    children: List[OrderResponse] = []
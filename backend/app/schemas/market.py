@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class QuoteSymbol(BaseModel):
+    symbol: str
+    market_code: str = "J"  # J: 주식, Q: 코스닥
+
+
+class QuotePricesRequest(BaseModel):
+    symbols: List[QuoteSymbol] = Field(..., min_length=1, max_length=100)
+
+
+class QuotePrice(BaseModel):
+    symbol: str
+    market_code: str
+    price: Optional[float] = None  # 현재가
+    change: Optional[float] = None  # 전일 대비
+    change_rate: Optional[float] = None  # 전일 대비율 (%)
+    volume: Optional[int] = None  # 누적 거래량
+    error: Optional[str] = None
+
+
+class QuotePricesResponse(BaseModel):
+    prices: List[QuotePrice]
+    failed: int
+
+
+class BarsResponse(BaseModel):
+    symbol: str
+    interval: str
+    # 열 지향 배열 (같은 인덱스가 한 봉, timestamps는 봉 시작 시각 epoch ms)
+    timestamps: List[int]
+    open: List[float]
+    high: List[float]
+    low: List[float]
+    close: List[float]
+    volume: List[float]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from datetime import datetime
 
 
@@ -12,6 +12,7 @@ class OrderCreate(BaseModel):
     price: Optional[float] = None
     strategy_id: Optional[int] = None
     metadata: Optional[Dict] = {}
+    client_order_id: Optional[str] = None  # 멱등성 키 (같은 키로 재요청하면 기존 주문 반환)
 
 
 class OrderResponse(BaseModel):
@@ -25,6 +26,10 @@ class OrderResponse(BaseModel):
     executed_quantity: int
     status: str
     kis_order_no: Optional[str]
+    client_order_id: Optional[str] = None
+    submit_attempts: Optional[int] = 0
+    basket_id: Optional[str] = None
+    parent_order_id: Optional[int] = None
     strategy_id: Optional[int]
     order_metadata: Optional[Dict] = {}
     created_at: datetime
@@ -33,3 +38,45 @@ class OrderResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class BasketLeg(BaseModel):
+    symbol: str
+    order_type: str  # BUY, SELL
+    quantity: int
+    order_method: str = "MARKET"  # MARKET, LIMIT
+    price: Optional[float] = None
+
+
+class BasketOrderCreate(BaseModel):
+    trading_account_id: int
+    targets: Optional[Dict[str, float]] = None  # 종목 → 목표 비중 (합 1 이하, 나머지는 현금)
+    legs: Optional[List[BasketLeg]] = None  # 목표 비중 대신 직접 지정한 주문
+    sell_unlisted: bool = True  # 목표 비중에 없는 보유 종목 전량 매도
+    min_trade_value: float = 0.0  # 이보다 작은 금액의 주문은 생략
+    client_basket_id: Optional[str] = None  # 멱등성 키 (같은 키로 재요청하면 기존 바스켓 반환)
+    strategy_id: Optional[int] = None
+    dry_run: bool = False  # 주문 없이 계산 결과만 반환
+
+
+class BasketLegResult(BaseModel):
+    order_id: Optional[int] = None
+    symbol: str
+    order_type: str
+    order_method: str
+    quantity: int
+    price: Optional[float] = None
+    status: str
+    kis_order_no: Optional[str] = None
+    error: Optional[str] = None
+    latency_ms: Optional[float] = None  # 바스켓 기록 → 전송 결과(PENDING/REJECTED) 확인
+
+
+class BasketOrderResponse(BaseModel):
+    basket_id: str
+    status: str  # PLANNED (dry_run), COMPLETED (모든 주문 전송 결과 확인), IN_PROGRESS
+    legs: List[BasketLegResult]
+    total_value: Optional[float] = None  # 비중 계산에 쓴 계좌 총평가금액
+    plan_ms: Optional[float] = None  # 잔고/현재가 조회와 수량 계산
+    sells_ms: Optional[float] = None  # 바스켓 기록 → 마지막 매도 전송 결과
+    total_ms: Optional[float] = None  # 바스켓 기록 → 마지막 주문 전송 결과
+
@@ -1,16 +1,19 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 
 class TradingAccountCreate(BaseModel):
     account_number: str
     app_key: str
     app_secret: str
+    hts_id: Optional[str] = None  # 실시간 체결통보 수신에 필요
 
 
 class TradingAccountResponse(BaseModel):
     id: int
     account_number: str
+    hts_id: Optional[str] = None
     is_active: bool
     created_at: datetime
     
@@ -0,0 +1,292 @@
+"""
+VWAP 전략 백테스트
+
+과거 분봉/일봉을 vwap_strategy의 매매 신호와 손절/익절 규칙에 통과시켜 전략을
+활성화하기 전에 평가합니다. VWAP 계열, 신호, 손익률은 모두 배열 연산으로 한 번에
+계산하고, 포지션 상태에 따라 달라지는 진입/청산만 거래 단위로 반복합니다
+(청산 검색은 max_holding_days 구간으로 제한되므로 봉 단위 반복이 없음).
+
+체결 규칙 (롱 전용, 종목별 자본 균등 배분):
+    - 봉 종가 기준으로 신호를 판단하고 다음 봉 시가에 체결 (마지막 봉이면 종가)
+    - 포지션이 없을 때 BUY 신호로 진입, 보유 중에는 손절/익절, SELL 신호,
+      max_holding_days 경과(해당 거래일 첫 봉 시가) 순으로 청산
+    - 수수료는 매수/매도 모두, 거래세는 매도에만 부과 (국내 주식형 ETF는 거래세 면제)
+"""
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional
+
+import numpy as np
+
+from app.services.kis_realtime import DAY_MS, KST_OFFSET_MS
+from app.services.vwap_strategy import (
+    ACTION_NAMES,
+    ACTION_STOP_LOSS,
+    ACTION_TAKE_PROFIT,
+    SIGNAL_BUY,
+    SIGNAL_SELL,
+    check_stop_loss_take_profit_batch,
+    generate_trading_signals,
+)
+
+KST = timezone(timedelta(hours=9))
+TRADING_DAYS_PER_YEAR = 252
+
+
+class BarSeries(NamedTuple):
+    """한 종목의 봉 배열 (시각 오름차순)"""
+    timestamps: np.ndarray  # epoch ms (int64)
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+@dataclass
+class BacktestParams:
+    """백테스트 전략 파라미터 (Strategy 컬럼과 같은 의미)"""
+    vwap_period: int = 1
+    entry_threshold: float = 0.5
+    exit_threshold: float = 1.0
+    stop_loss_percent: float = 2.0
+    take_profit_percent: float = 3.0
+    max_holding_days: int = 5
+
+    @classmethod
+    def from_strategy(cls, strategy: Any, **overrides) -> "BacktestParams":
+        values = {name: getattr(strategy, name) for name in cls.__dataclass_fields__}
+        values.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**values)
+
+
+class Trade(NamedTuple):
+    symbol: str
+    entry_index: int
+    exit_index: int
+    entry_time: int  # epoch ms
+    exit_time: int
+    entry_price: float
+    exit_price: float
+    quantity: int
+    pnl: float  # 수수료/세금 차감 후 손익
+    return_percent: float
+    fees: float
+    exit_reason: str
+
+
+def bars_from_records(records: List[Mapping[str, Any]]) -> BarSeries:
+    """{"timestamp", "open", "high", "low", "close", "volume"} 목록을 봉 배열로 변환합니다.
+
+    timestamp는 datetime(타임존이 없으면 KST로 간주) 또는 epoch ms입니다.
+    """
+    timestamps = np.empty(len(records), dtype=np.int64)
+    for index, record in enumerate(records):
+        timestamp = record["timestamp"]
+        if isinstance(timestamp, datetime):
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=KST)
+            timestamp = int(timestamp.timestamp() * 1000)
+        timestamps[index] = timestamp
+
+    order = np.argsort(timestamps, kind="stable")
+    columns = {
+        name: np.fromiter((record[name] for record in records), dtype=np.float64, count=len(records))[order]
+        for name in ("open", "high", "low", "close", "volume")
+    }
+    return BarSeries(timestamps[order], **columns)
+
+
+def session_days(timestamps: np.ndarray) -> np.ndarray:
+    """봉 시각의 KST 거래일 번호 (epoch 기준 일수)"""
+    return (timestamps + KST_OFFSET_MS) // DAY_MS
+
+
+def compute_vwap_series(bars: BarSeries, vwap_period: int = 1) -> np.ndarray:
+    """봉마다 최근 vwap_period 거래일(당일 포함) 시작부터의 누적 VWAP를 계산합니다.
+
+    가격은 대표가((고가 + 저가 + 종가) / 3)를 사용합니다.
+    """
+    if len(bars) == 0:
+        return np.empty(0)
+
+    typical = (bars.high + bars.low + bars.close) / 3
+    cum_pv = np.concatenate(([0.0], np.cumsum(typical * bars.volume)))
+    cum_v = np.concatenate(([0.0], np.cumsum(bars.volume)))
+
+    days = session_days(bars.timestamps)
+    session_first = np.flatnonzero(np.diff(days, prepend=days[0] - 1))
+    session_of_bar = np.cumsum(np.diff(days, prepend=days[0]) != 0)
+    anchor = session_first[np.maximum(session_of_bar - max(vwap_period, 1) + 1, 0)]
+
+    volume = cum_v[1:] - cum_v[anchor]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = (cum_pv[1:] - cum_pv[anchor]) / volume
+    # 거래량이 없는 구간은 종가로 대체해 신호가 나지 않도록 함
+    return np.where(volume > 0, vwap, bars.close)
+
+
+def simulate_symbol(
+    symbol: str,
+    bars: BarSeries,
+    params: BacktestParams,
+    capital: float,
+    fee_rate: float,
+    sell_tax_rate: float,
+    vwap: Optional[np.ndarray] = None
+) -> Dict[str, Any]:
+    """한 종목을 시뮬레이션합니다.
+
+    Args:
+        vwap: 미리 계산한 VWAP 계열 (파라미터 탐색 시 재사용, 없으면 계산)
+
+    Returns:
+        {"trades": List[Trade], "days": 거래일 번호 배열, "daily_equity": 거래일별 종료 시점 평가액}
+    """
+    n = len(bars)
+    if n == 0:
+        return {"trades": [], "days": np.empty(0, dtype=np.int64), "daily_equity": np.empty(0)}
+
+    close, open_ = bars.close, bars.open
+    if vwap is None:
+        vwap = compute_vwap_series(bars, params.vwap_period)
+    signals, _, _ = generate_trading_signals(close, vwap, params.entry_threshold, params.exit_threshold)
+    buy_indices = np.flatnonzero(signals == SIGNAL_BUY)
+    sell_signal = signals == SIGNAL_SELL
+
+    days = session_days(bars.timestamps)
+    session_first = np.flatnonzero(np.diff(days, prepend=days[0] - 1))
+    session_of_bar = np.cumsum(np.diff(days, prepend=days[0]) != 0)
+    sessions = len(session_first)
+
+    trades: List[Trade] = []
+    cash = capital
+    shares = np.zeros(n)
+    cash_delta = np.zeros(n)
+    cursor = 0
+    while True:
+        k = np.searchsorted(buy_indices, cursor)
+        if k >= len(buy_indices) or buy_indices[k] + 1 >= n:
+            break
+        entry = int(buy_indices[k]) + 1
+        entry_price = float(open_[entry])
+        quantity = math.floor(cash / (entry_price * (1 + fee_rate)))
+        if quantity <= 0:
+            break
+        entry_cost = quantity * entry_price * (1 + fee_rate)
+
+        # 청산 검색 구간: 진입 봉부터 보유 기한 거래일 첫 봉 직전까지
+        limit_session = session_of_bar[entry] + params.max_holding_days if params.max_holding_days else sessions
+        limit = int(session_first[limit_session]) if limit_session < sessions else n
+        window = slice(entry, limit)
+        actions, _ = check_stop_loss_take_profit_batch(
+            entry_price, close[window], params.stop_loss_percent, params.take_profit_percent
+        )
+        hits = np.flatnonzero((actions != 0) | sell_signal[window])
+        if len(hits):
+            signal_bar = entry + int(hits[0])
+            action = int(actions[hits[0]])
+            reason = ACTION_NAMES[action] if action in (ACTION_STOP_LOSS, ACTION_TAKE_PROFIT) else "SELL_SIGNAL"
+            exit_ = min(signal_bar + 1, n - 1)
+            exit_price = float(open_[exit_]) if signal_bar + 1 < n else float(close[exit_])
+        elif limit < n:
+            exit_, exit_price, reason = limit, float(open_[limit]), "MAX_HOLDING"
+        else:
+            exit_, exit_price, reason = n - 1, float(close[n - 1]), "END"
+
+        proceeds = quantity * exit_price * (1 - fee_rate - sell_tax_rate)
+        fees = quantity * entry_price * fee_rate + quantity * exit_price * (fee_rate + sell_tax_rate)
+        cash += proceeds - entry_cost
+        shares[entry:exit_] = quantity
+        cash_delta[entry] -= entry_cost
+        cash_delta[exit_] += proceeds
+        trades.append(Trade(
+            symbol, entry, exit_, int(bars.timestamps[entry]), int(bars.timestamps[exit_]),
+            entry_price, exit_price, quantity, proceeds - entry_cost,
+            (proceeds / entry_cost - 1) * 100, fees, reason
+        ))
+        cursor = exit_
+
+    equity = capital + np.cumsum(cash_delta) + shares * close
+    session_last = np.append(session_first[1:] - 1, n - 1)
+    return {"trades": trades, "days": days[session_first], "daily_equity": equity[session_last]}
+
+
+def summarize(daily_equity: np.ndarray, initial_capital: float, trades: List[Trade]) -> Dict[str, float]:
+    """평가액 곡선과 거래 목록의 요약 통계를 계산합니다."""
+    final = float(daily_equity[-1]) if len(daily_equity) else initial_capital
+    returns = np.diff(daily_equity) / daily_equity[:-1] if len(daily_equity) > 1 else np.empty(0)
+    peak = np.maximum.accumulate(daily_equity) if len(daily_equity) else np.empty(0)
+    drawdown = float(((daily_equity - peak) / peak).min()) if len(daily_equity) else 0.0
+    years = max(len(daily_equity), 1) / TRADING_DAYS_PER_YEAR
+
+    pnls = np.array([trade.pnl for trade in trades])
+    gross_profit = float(pnls[pnls > 0].sum()) if len(pnls) else 0.0
+    gross_loss = float(-pnls[pnls < 0].sum()) if len(pnls) else 0.0
+    volatility = float(returns.std(ddof=1)) if len(returns) > 1 else 0.0
+
+    return {
+        "initial_capital": initial_capital,
+        "final_equity": final,
+        "total_return_percent": (final / initial_capital - 1) * 100,
+        "annualized_return_percent": ((final / initial_capital) ** (1 / years) - 1) * 100 if final > 0 else -100.0,
+        "max_drawdown_percent": drawdown * 100,
+        "sharpe_ratio": float(returns.mean() / volatility * math.sqrt(TRADING_DAYS_PER_YEAR)) if volatility else 0.0,
+        "trades": len(trades),
+        "win_rate_percent": float((pnls > 0).mean() * 100) if len(pnls) else 0.0,
+        "avg_trade_return_percent": float(np.mean([trade.return_percent for trade in trades])) if trades else 0.0,
+        "profit_factor": gross_profit / gross_loss if gross_loss else 0.0,
+        "total_fees": float(sum(trade.fees for trade in trades)),
+    }
+
+
+def run_backtest(
+    bars_by_symbol: Mapping[str, BarSeries],
+    params: BacktestParams,
+    initial_capital: float = 10_000_000,
+    fee_rate: float = 0.00015,
+    sell_tax_rate: float = 0.0,
+    vwap_by_symbol: Optional[Mapping[str, np.ndarray]] = None
+) -> Dict[str, Any]:
+    """여러 종목을 백테스트합니다 (종목별로 자본을 균등 배분).
+
+    Args:
+        vwap_by_symbol: params.vwap_period로 미리 계산한 종목별 VWAP 계열 (없으면 계산)
+
+    Returns:
+        {"summary": dict, "trades": List[Trade], "equity_curve": [{"date", "equity"}, ...]}
+    """
+    symbols = [symbol for symbol, bars in bars_by_symbol.items() if len(bars)]
+    if not symbols:
+        return {"summary": summarize(np.empty(0), initial_capital, []), "trades": [], "equity_curve": []}
+
+    capital = initial_capital / len(symbols)
+    results = {
+        symbol: simulate_symbol(
+            symbol, bars_by_symbol[symbol], params, capital, fee_rate, sell_tax_rate,
+            vwap=vwap_by_symbol[symbol] if vwap_by_symbol is not None else None
+        )
+        for symbol in symbols
+    }
+
+    # 종목별 거래일 평가액을 전체 거래일에 맞춰 이전 값으로 채운 뒤 합산
+    all_days = np.unique(np.concatenate([result["days"] for result in results.values()]))
+    portfolio = np.zeros(len(all_days))
+    for result in results.values():
+        position = np.searchsorted(result["days"], all_days, side="right") - 1
+        portfolio += np.where(position >= 0, result["daily_equity"][np.maximum(position, 0)], capital)
+
+    trades = sorted((trade for result in results.values() for trade in result["trades"]), key=lambda t: t.entry_time)
+    epoch = datetime(1970, 1, 1).date()
+    return {
+        "summary": summarize(portfolio, initial_capital, trades),
+        "trades": trades,
+        "equity_curve": [
+            {"date": epoch + timedelta(days=int(day)), "equity": float(equity)}
+            for day, equity in zip(all_days, portfolio)
+        ],
+    }
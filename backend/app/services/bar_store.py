@@ -0,0 +1,360 @@
+"""
+과거 봉(OHLCV) 저장소 (디스크, 메모리 매핑)
+
+봉을 종목/봉 주기/연도 세그먼트로 나누고, 세그먼트마다 열별 원시 바이너리 파일
+(timestamps는 int64 epoch ms, 나머지는 float64)로 저장합니다. 조회는 파일을
+np.memmap으로 매핑한 뒤 searchsorted로 구간 경계를 찾으므로, 한 세그먼트(같은 해)
+안의 구간은 복사 없는 읽기 전용 뷰를 반환합니다. 해를 넘는 구간만 한 번 이어 붙입니다.
+
+    {root}/{interval}/{symbol}/index.json
+    {root}/{interval}/{symbol}/{YYYY}[.{gen}]/{timestamps,open,high,low,close,volume}.bin
+
+쓰기는 세그먼트 끝에 덧붙이는 것이 기본이며, 기존 봉과 시각이 겹치거나 더 이른 봉
+(과거 구간 채우기)이 들어오면 해당 세그먼트만 병합해 새 세대 디렉터리({YYYY}.{gen})에
+다시 씁니다. index.json에는 세그먼트별 디렉터리, 확정 행 수, 거래일(KST)별 (시작 행, 행 수)가
+들어가고 열 파일을 쓴 뒤 원자적으로 교체합니다. 이전 세대 디렉터리는 index.json 교체 뒤에
+지우므로, 쓰기 도중 중단되면 확정되지 않은 꼬리 데이터나 새 세대 디렉터리는 무시되고
+(다음에 index.json을 읽을 때 정리) 기존 index.json이 가리키는 데이터가 그대로 남습니다.
+"""
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from datetime import date
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.services.backtest import BarSeries, session_days
+from app.services.kis_realtime import DAY_MS, KST_OFFSET_MS
+from app.services.tick_store import TickView
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = BarSeries._fields
+COLUMN_DTYPES = {name: np.dtype(np.int64 if name == "timestamps" else np.float64) for name in COLUMNS}
+BYTES_PER_BAR = sum(dtype.itemsize for dtype in COLUMN_DTYPES.values())
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 3 * 60_000,
+    "5m": 5 * 60_000,
+    "10m": 10 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "60m": 60 * 60_000,
+    "1d": DAY_MS,
+}
+SYMBOL_PATTERN = re.compile(r"^[0-9A-Za-z]{1,12}$")
+SEGMENT_DIR_PATTERN = re.compile(r"^\d{4}(\.\d+)?(\.tmp|\.old)?$")
+
+
+def empty_bars() -> BarSeries:
+    return BarSeries(*(np.empty(0, dtype=COLUMN_DTYPES[name]) for name in COLUMNS))
+
+
+def day_key(day: int) -> str:
+    """KST 거래일 번호(epoch 기준 일수)를 "YYYYMMDD"로 변환합니다."""
+    return str(np.datetime64(int(day), "D")).replace("-", "")
+
+
+def day_start_ms(key: str) -> int:
+    """"YYYYMMDD" 거래일의 KST 자정 epoch ms"""
+    day = np.datetime64(f"{key[:4]}-{key[4:6]}-{key[6:]}", "D").astype(np.int64)
+    return int(day) * DAY_MS - KST_OFFSET_MS
+
+
+def date_range_ms(start: Optional[date], end: Optional[date]) -> Tuple[Optional[int], Optional[int]]:
+    """KST 거래일 구간 [start, end] (양 끝 포함)을 [start_ms, end_ms) epoch ms로 변환합니다."""
+    start_ms = day_start_ms(start.strftime("%Y%m%d")) if start else None
+    end_ms = day_start_ms(end.strftime("%Y%m%d")) + DAY_MS if end else None
+    return start_ms, end_ms
+
+
+def ticks_to_bars(ticks: TickView, interval_ms: int = 60_000) -> BarSeries:
+    """틱 뷰를 봉으로 집계합니다 (봉 시각은 KST 기준 구간 시작 시각)."""
+    if not len(ticks):
+        return empty_bars()
+    buckets = (ticks.timestamps + KST_OFFSET_MS) // interval_ms
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+    ends = np.append(starts[1:], len(buckets)) - 1
+    prices = ticks.prices.astype(np.float64)
+    return BarSeries(
+        buckets[starts] * interval_ms - KST_OFFSET_MS,
+        prices[starts],
+        np.maximum.reduceat(prices, starts),
+        np.minimum.reduceat(prices, starts),
+        prices[ends],
+        np.add.reduceat(ticks.volumes, starts).astype(np.float64),
+    )
+
+
+def _day_entries(timestamps: np.ndarray, offset: int = 0) -> Dict[str, List[int]]:
+    """거래일별 [시작 행, 행 수]"""
+    days = session_days(timestamps)
+    starts = np.flatnonzero(np.diff(days, prepend=days[0] - 1))
+    counts = np.diff(np.append(starts, len(days)))
+    return {day_key(days[start]): [int(start) + offset, int(count)] for start, count in zip(starts, counts)}
+
+
+class BarStore:
+    """종목별 과거 봉 저장소
+
+    Args:
+        root: 저장 디렉터리
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._indexes: Dict[str, Dict] = {}
+        self._maps: Dict[str, BarSeries] = {}
+        self._lock = threading.RLock()
+        self.writes = 0
+        self.rows_written = 0
+
+    def _base(self, symbol: str, interval: str) -> str:
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Unsupported interval: {interval}")
+        if not SYMBOL_PATTERN.match(symbol):
+            raise ValueError(f"Invalid symbol: {symbol}")
+        return os.path.join(self.root, interval, symbol)
+
+    def _index(self, base: str) -> Dict:
+        index = self._indexes.get(base)
+        if index is None:
+            path = os.path.join(base, "index.json")
+            if os.path.exists(path):
+                with open(path) as f:
+                    index = json.load(f)
+            else:
+                index = {"segments": {}}
+            self._recover(base, index)
+            self._indexes[base] = index
+        return index
+
+    def _recover(self, base: str, index: Dict) -> None:
+        """중단된 다시 쓰기의 흔적을 정리합니다 (index.json이 가리키지 않는 세그먼트 디렉터리 삭제)."""
+        if not os.path.isdir(base):
+            return
+        referenced = {segment.get("dir", year) for year, segment in index["segments"].items()}
+        for name in referenced:
+            # 이전 형식({YYYY}를 {YYYY}.old로 옮긴 직후 중단)은 옮긴 디렉터리를 되돌림
+            directory = os.path.join(base, name)
+            if not os.path.exists(directory) and os.path.isdir(directory + ".old"):
+                os.rename(directory + ".old", directory)
+        for name in os.listdir(base):
+            if SEGMENT_DIR_PATTERN.match(name) and name not in referenced:
+                logger.info(f"Removing unreferenced bar segment {os.path.join(base, name)}")
+                shutil.rmtree(os.path.join(base, name), ignore_errors=True)
+
+    def _save_index(self, base: str, index: Dict) -> None:
+        path = os.path.join(base, "index.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+
+    def _map_segment(self, directory: str, rows: int) -> BarSeries:
+        """세그먼트 열 파일을 읽기 전용으로 매핑합니다 (행 수가 같으면 재사용)."""
+        mapped = self._maps.get(directory)
+        if mapped is None or len(mapped) != rows:
+            mapped = BarSeries(*(
+                np.memmap(os.path.join(directory, f"{name}.bin"), dtype=COLUMN_DTYPES[name], mode="r", shape=(rows,))
+                for name in COLUMNS
+            ))
+            self._maps[directory] = mapped
+        return mapped
+
+    def _append_segment(self, directory: str, segment: Dict, bars: BarSeries) -> None:
+        os.makedirs(directory, exist_ok=True)
+        committed = segment["rows"]
+        for name, column in zip(COLUMNS, bars):
+            path = os.path.join(directory, f"{name}.bin")
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                # 이전에 중단된 쓰기의 확정되지 않은 꼬리를 잘라냄
+                f.truncate(committed * COLUMN_DTYPES[name].itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(np.ascontiguousarray(column, dtype=COLUMN_DTYPES[name]).tobytes())
+        for key, (start, count) in _day_entries(bars.timestamps, committed).items():
+            if key in segment["days"]:
+                segment["days"][key][1] += count
+            else:
+                segment["days"][key] = [start, count]
+        segment["rows"] = committed + len(bars)
+        segment["last"] = int(bars.timestamps[-1])
+        if not committed:
+            segment["first"] = int(bars.timestamps[0])
+
+    def _rewrite_segment(self, base: str, year: str, segment: Dict, bars: BarSeries) -> Optional[str]:
+        """기존 봉과 병합해 세그먼트를 새 세대 디렉터리에 다시 씁니다 (같은 시각은 새 봉으로 대체).
+
+        Returns:
+            index.json 교체 뒤 지울 이전 세대 디렉터리
+        """
+        previous = os.path.join(base, segment.get("dir", year))
+        if segment["rows"]:
+            existing = self._map_segment(previous, segment["rows"])
+            keep = ~np.isin(existing.timestamps, bars.timestamps)
+            merged = [np.concatenate((old[keep], new)) for old, new in zip(existing, bars)]
+            order = np.argsort(merged[0], kind="stable")
+            bars = BarSeries(*(column[order] for column in merged))
+
+        generation = segment.get("gen", 0) + 1
+        name = f"{year}.{generation}"
+        directory = os.path.join(base, name)
+        # 같은 세대의 이전 시도(중단된 쓰기)가 남아 있으면 버림
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        for column_name, column in zip(COLUMNS, bars):
+            np.ascontiguousarray(column, dtype=COLUMN_DTYPES[column_name]).tofile(
+                os.path.join(directory, f"{column_name}.bin")
+            )
+
+        segment.update(
+            dir=name,
+            gen=generation,
+            rows=len(bars),
+            first=int(bars.timestamps[0]),
+            last=int(bars.timestamps[-1]),
+            days=_day_entries(bars.timestamps),
+        )
+        return previous
+
+    def write(self, symbol: str, interval: str, bars: BarSeries) -> int:
+        """봉을 저장합니다 (시각 오름차순, 같은 시각의 기존 봉은 대체).
+
+        Returns:
+            저장한 봉 수
+        """
+        if not len(bars):
+            return 0
+        base = self._base(symbol, interval)
+        years = session_days(bars.timestamps).astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+        boundaries = np.flatnonzero(np.diff(years)) + 1
+
+        with self._lock:
+            index = self._index(base)
+            replaced = []
+            try:
+                for start, end in zip(np.concatenate(([0], boundaries)), np.append(boundaries, len(bars))):
+                    year = str(years[start])
+                    part = BarSeries(*(column[start:end] for column in bars))
+                    segment = index["segments"].setdefault(year, {"rows": 0, "days": {}})
+                    if segment["rows"] and part.timestamps[0] <= segment["last"]:
+                        replaced.append(self._rewrite_segment(base, year, segment, part))
+                    else:
+                        self._append_segment(os.path.join(base, segment.get("dir", year)), segment, part)
+                self._save_index(base, index)
+            except Exception:
+                # 메모리의 인덱스가 디스크와 어긋나지 않도록 다음 조회 때 다시 읽음
+                self._indexes.pop(base, None)
+                raise
+            for directory in replaced:
+                # 매핑된 기존 파일은 삭제 후에도 유효하므로 이미 반환한 뷰는 그대로 사용 가능
+                self._maps.pop(directory, None)
+                shutil.rmtree(directory, ignore_errors=True)
+            self.writes += 1
+            self.rows_written += len(bars)
+        return len(bars)
+
+    def write_ticks(self, views: Mapping[str, TickView], interval: str = "1m") -> int:
+        """종목별 틱 뷰를 봉으로 집계해 저장합니다 (TickStore 거래일 마감 콜백).
+
+        Returns:
+            저장한 봉 수
+        """
+        written = 0
+        for symbol, view in views.items():
+            try:
+                written += self.write(symbol, interval, ticks_to_bars(view, INTERVAL_MS[interval]))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to store {interval} bars for {symbol}: {e}")
+        return written
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
+    ) -> BarSeries:
+        """[start_ms, end_ms) 구간의 봉을 반환합니다.
+
+        한 세그먼트 안의 구간은 메모리 매핑된 파일의 읽기 전용 뷰입니다.
+        """
+        base = self._base(symbol, interval)
+        parts = []
+        with self._lock:
+            segments = self._index(base)["segments"]
+            for year in sorted(segments):
+                segment = segments[year]
+                if not segment["rows"]:
+                    continue
+                if end_ms is not None and segment["first"] >= end_ms:
+                    continue
+                if start_ms is not None and segment["last"] < start_ms:
+                    continue
+                mapped = self._map_segment(os.path.join(base, segment.get("dir", year)), segment["rows"])
+                start = 0 if start_ms is None else int(np.searchsorted(mapped.timestamps, start_ms, side="left"))
+                end = segment["rows"] if end_ms is None else int(np.searchsorted(mapped.timestamps, end_ms, side="left"))
+                if end > start:
+                    parts.append(BarSeries(*(column[start:end] for column in mapped)))
+
+        if not parts:
+            return empty_bars()
+        if len(parts) == 1:
+            return parts[0]
+        return BarSeries(*(np.concatenate(columns) for columns in zip(*parts)))
+
+    def read_sessions(self, symbol: str, interval: str, sessions: int, before_ms: int) -> BarSeries:
+        """before_ms가 속한 거래일 이전의 최근 sessions 거래일 봉을 반환합니다."""
+        if sessions <= 0:
+            return empty_bars()
+        before_key = day_key((before_ms + KST_OFFSET_MS) // DAY_MS)
+        days = [key for key in self.days(symbol, interval) if key < before_key][-sessions:]
+        if not days:
+            return empty_bars()
+        return self.read(symbol, interval, day_start_ms(days[0]), day_start_ms(before_key))
+
+    def days(self, symbol: str, interval: str) -> List[str]:
+        """저장된 거래일 목록 ("YYYYMMDD", 오름차순)"""
+        base = self._base(symbol, interval)
+        with self._lock:
+            segments = self._index(base)["segments"]
+            return sorted(key for segment in segments.values() for key in segment["days"])
+
+    def available(self, symbol: str, interval: str) -> Optional[Dict[str, object]]:
+        """저장된 구간 요약 (없으면 None)
+
+        Returns:
+            {"first": epoch ms, "last": epoch ms, "days": 거래일 수, "bars": 봉 수}
+        """
+        base = self._base(symbol, interval)
+        with self._lock:
+            segments = [segment for segment in self._index(base)["segments"].values() if segment["rows"]]
+            if not segments:
+                return None
+            return {
+                "first": min(segment["first"] for segment in segments),
+                "last": max(segment["last"] for segment in segments),
+                "days": sum(len(segment["days"]) for segment in segments),
+                "bars": sum(segment["rows"] for segment in segments),
+            }
+
+    def symbols(self, interval: str) -> List[str]:
+        directory = os.path.join(self.root, interval)
+        if interval not in INTERVAL_MS or not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory) if SYMBOL_PATTERN.match(name))
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "root": self.root,
+            "mapped_segments": len(self._maps),
+            "writes": self.writes,
+            "rows_written": self.rows_written,
+        }
+
+
+bar_store = BarStore(settings.BAR_STORE_PATH)
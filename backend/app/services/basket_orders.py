@@ -0,0 +1,266 @@
+"""
+바스켓(리밸런싱) 주문
+
+목표 비중이나 직접 지정한 주문 목록을 한 번에 받아 주문 전송 outbox(order_submitter)에 기록합니다.
+
+    - 목표 비중: 잔고 연속조회로 보유 수량/현재가/총평가금액을 읽고, 보유하지 않은 종목은 현재가를
+      동시에 조회해 종목별 목표 수량(총평가금액 × 비중 ÷ 현재가, 내림)과의 차이만큼 매도/매수
+    - 주문 순서: 매도 먼저. 같은 바스켓의 매수는 매도가 모두 전송(PENDING/REJECTED)된 뒤에
+      order_submitter가 꺼냄 (매도 대금으로 매수)
+    - 전송: order_submitter가 최대 ORDER_SUBMITTER_CONCURRENCY건씩 동시에, 앱키별 속도 제한(주문 레인)
+      안에서 보냄
+    - 응답: BASKET_ORDER_WAIT_SECONDS까지 전송 결과를 기다려 주문별 지연과 전체 완료 시간을 함께 반환
+      (다 끝나지 않으면 IN_PROGRESS, 이후 상태는 바스켓 조회로 확인)
+
+주문마다 client_order_id를 "{basket_id}:{순번}"으로 주므로 같은 client_basket_id로 다시 요청하면
+새 주문을 만들지 않습니다.
+"""
+import asyncio
+import math
+import time
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from app.database import SessionLocal
+from app.models.order import UNSENT_ORDER_STATUSES, Order
+from app.schemas.order import BasketLeg, BasketLegResult, BasketOrderResponse
+from app.services.event_bus import Subscription, event_bus
+from app.services.kis_api import AsyncKISAPIClient
+
+# 이벤트를 놓쳤거나(다른 프로세스의 전송기 등) 밀렸을 때 DB로 확인하는 주기
+WAIT_POLL_SECONDS = 0.5
+
+
+class Holding(NamedTuple):
+    quantity: int
+    price: float
+
+
+def _to_float(value: object) -> float:
+    text = str(value).strip() if value is not None else ""
+    return float(text) if text else 0.0
+
+
+def plan_rebalance(
+    targets: Mapping[str, float],
+    holdings: Mapping[str, Holding],
+    prices: Mapping[str, float],
+    total_value: float,
+    sell_unlisted: bool = True,
+    min_trade_value: float = 0.0
+) -> List[BasketLeg]:
+    """목표 비중과 현재 보유 수량의 차이로 시장가 주문 목록을 계산합니다.
+
+    Args:
+        targets: 종목 → 목표 비중 (합 1 이하)
+        holdings: 종목 → 보유 수량/현재가
+        prices: 보유하지 않은 목표 종목의 현재가
+        total_value: 계좌 총평가금액
+        sell_unlisted: 목표에 없는 보유 종목을 전량 매도
+        min_trade_value: 이보다 작은 금액의 주문은 생략
+
+    Returns:
+        매도(종목순) 다음 매수(종목순) 주문 목록
+    """
+    symbols = set(targets) | (set(holdings) if sell_unlisted else set())
+    sells: List[BasketLeg] = []
+    buys: List[BasketLeg] = []
+    for symbol in sorted(symbols):
+        held = holdings.get(symbol)
+        price = held.price if held and held.price > 0 else prices.get(symbol, 0.0)
+        if price <= 0:
+            raise ValueError(f"No price for {symbol}")
+        current = held.quantity if held else 0
+        target = math.floor(total_value * targets.get(symbol, 0.0) / price)
+        delta = target - current
+        if delta == 0 or abs(delta) * price < min_trade_value:
+            continue
+        if delta < 0:
+            sells.append(BasketLeg(symbol=symbol, order_type="SELL", quantity=-delta))
+        else:
+            buys.append(BasketLeg(symbol=symbol, order_type="BUY", quantity=delta))
+    return sells + buys
+
+
+async def load_portfolio(
+    client: AsyncKISAPIClient,
+    account_number: str,
+    symbols: Iterable[str]
+) -> Tuple[Dict[str, Holding], Dict[str, float], float]:
+    """보유 종목, 보유하지 않은 종목의 현재가, 총평가금액을 조회합니다.
+
+    Returns:
+        (종목 → 보유 수량/현재가, 종목 → 현재가, 총평가금액)
+    """
+    rows, summary = await client.get_holdings(account_number)
+    holdings = {
+        str(row.get("pdno", "")): Holding(int(_to_float(row.get("hldg_qty"))), _to_float(row.get("prpr")))
+        for row in rows
+        if _to_float(row.get("hldg_qty")) > 0
+    }
+    missing = [symbol for symbol in symbols if symbol not in holdings]
+    # 현재가 조회는 공유 캐시와 동시 요청 합류를 거침
+    quotes = await asyncio.gather(*(client.get_current_price(symbol) for symbol in missing))
+    prices = {
+        symbol: _to_float((quote.get("output") or {}).get("stck_prpr"))
+        for symbol, quote in zip(missing, quotes)
+    }
+    total_value = _to_float(summary.get("tot_evlu_amt")) or sum(
+        holding.quantity * holding.price for holding in holdings.values()
+    )
+    return holdings, prices, total_value
+
+
+def load_basket_orders(user_id: int, basket_id: str) -> List[Order]:
+    """바스켓 주문을 순번(ID)순으로 읽습니다 (세션에서 분리된 객체)."""
+    db = SessionLocal()
+    try:
+        orders = db.query(Order).filter(
+            Order.user_id == user_id,
+            Order.basket_id == basket_id
+        ).order_by(Order.id).all()
+        db.expunge_all()
+        return orders
+    finally:
+        db.close()
+
+
+def create_basket_orders(
+    user_id: int,
+    trading_account_id: int,
+    basket_id: str,
+    legs: List[BasketLeg],
+    strategy_id: Optional[int] = None
+) -> List[Order]:
+    """바스켓 주문을 QUEUED로 한 번에 기록하고 order 이벤트를 발행합니다.
+
+    Returns:
+        기록된 주문 (같은 바스켓 ID로 먼저 기록된 주문이 있으면 그 주문)
+    """
+    db = SessionLocal()
+    db.expire_on_commit = False
+    try:
+        orders = [
+            Order(
+                user_id=user_id,
+                trading_account_id=trading_account_id,
+                symbol=leg.symbol,
+                order_type=leg.order_type,
+                order_method=leg.order_method,
+                quantity=leg.quantity,
+                price=leg.price,
+                status="QUEUED",
+                client_order_id=f"{basket_id}:{index}",
+                basket_id=basket_id,
+                strategy_id=strategy_id,
+                order_metadata={}
+            )
+            for index, leg in enumerate(legs)
+        ]
+        db.add_all(orders)
+        try:
+            db.commit()
+        except IntegrityError:
+            # 같은 바스켓 ID로 동시에 들어온 요청이 먼저 기록함
+            db.rollback()
+            return load_basket_orders(user_id, basket_id)
+        for order in orders:
+            event_bus.publish_order(order)
+        db.expunge_all()
+        return orders
+    finally:
+        db.close()
+
+
+def _unsent_order_ids(order_ids: Iterable[int]) -> Set[int]:
+    db = SessionLocal()
+    try:
+        rows = db.query(Order.id).filter(
+            Order.id.in_(list(order_ids)),
+            Order.status.in_(UNSENT_ORDER_STATUSES)
+        ).all()
+        return {row[0] for row in rows}
+    finally:
+        db.close()
+
+
+async def wait_for_legs(
+    subscription: Subscription,
+    order_ids: Iterable[int],
+    started: float,
+    timeout: float
+) -> Dict[int, float]:
+    """바스켓 주문의 전송 결과를 timeout초까지 기다립니다.
+
+    Args:
+        subscription: 거래 계정 order 이벤트 구독 (주문 기록 전에 구독)
+        order_ids: 기다릴 주문 ID
+        started: 바스켓 기록 시각 (time.perf_counter())
+        timeout: 최대 대기 시간(초)
+
+    Returns:
+        전송 결과를 확인한 주문 ID → 바스켓 기록부터의 지연(ms)
+    """
+    pending = set(order_ids)
+    settled: Dict[int, float] = {}
+    deadline = started + timeout
+
+    def settle(order_id: int) -> None:
+        pending.discard(order_id)
+        settled[order_id] = (time.perf_counter() - started) * 1000
+
+    while pending:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        try:
+            events = await asyncio.wait_for(subscription.get_batch(), min(remaining, WAIT_POLL_SECONDS))
+        except asyncio.TimeoutError:
+            unsent = await asyncio.to_thread(_unsent_order_ids, pending)
+            for order_id in pending - unsent:
+                settle(order_id)
+            continue
+        for event in events:
+            order_id = event.payload.get("id")
+            if order_id in pending and event.payload.get("status") not in UNSENT_ORDER_STATUSES:
+                settle(order_id)
+    return settled
+
+
+def build_basket_response(
+    basket_id: str,
+    orders: List[Order],
+    latencies: Optional[Mapping[int, float]] = None,
+    total_value: Optional[float] = None,
+    plan_ms: Optional[float] = None
+) -> BasketOrderResponse:
+    """바스켓 주문 상태와 지연을 응답으로 묶습니다."""
+    latencies = latencies or {}
+    legs = [
+        BasketLegResult(
+            order_id=order.id,
+            symbol=order.symbol,
+            order_type=order.order_type,
+            order_method=order.order_method,
+            quantity=order.quantity,
+            price=order.price,
+            status=order.status,
+            kis_order_no=order.kis_order_no,
+            error=(order.order_metadata or {}).get("error"),
+            latency_ms=round(latencies[order.id], 3) if order.id in latencies else None,
+        )
+        for order in orders
+    ]
+    done = all(leg.status not in UNSENT_ORDER_STATUSES for leg in legs)
+    sell_latencies = [leg.latency_ms for leg in legs if leg.order_type == "SELL" and leg.latency_ms is not None]
+    all_latencies = [leg.latency_ms for leg in legs if leg.latency_ms is not None]
+    return BasketOrderResponse(
+        basket_id=basket_id,
+        status="COMPLETED" if done else "IN_PROGRESS",
+        legs=legs,
+        total_value=total_value,
+        plan_ms=round(plan_ms, 3) if plan_ms is not None else None,
+        sells_ms=max(sell_latencies) if sell_latencies else None,
+        total_ms=max(all_latencies) if done and all_latencies else None,
+    )
@@ -0,0 +1,311 @@
+"""
+프로세스 내 이벤트 버스 (시세 → 전략 실행기/화면)
+
+이벤트는 (종류, 키) 토픽으로 발행합니다.
+    - quote: 종목 코드 (TickRecord)
+    - signal: 거래 계정 ID (전략 실행기 주문 결정)
+    - order: 거래 계정 ID (주문 생성/결과, OrderResponse)
+    - balance: 거래 계정 ID (잔고 스냅샷, BalanceResponse 목록)
+    - fill: 거래 계정 ID (체결통보로 반영한 체결, fill_notices)
+
+구독자마다 크기 제한이 있는 대기열을 두어 느린 구독자가 발행자(수신기, 전략 실행기)를
+막지 않습니다. 대기열이 차면 정책(drop_oldest/drop_newest)에 따라 이벤트를 버리고,
+coalesce로 지정한 종류는 아직 전달되지 않은 같은 토픽의 이벤트를 최신 값으로 교체합니다
+(시세, 잔고처럼 마지막 값만 의미 있는 경우).
+
+구독 대기열은 이벤트 루프 스레드에서만 다루며, 다른 스레드에서 발행하면 루프로 넘겨
+처리합니다. 발행부터 전달까지의 지연과 대기열 길이는 stats()로 확인합니다.
+
+틱 단위로 모두 받아야 하는 소비자(VWAP 엔진, 틱 저장소, 평가 샤드)는 버리거나 합치면
+안 되므로 버스 대신 RealtimeQuoteIngester 구독 함수로 직접 받습니다.
+"""
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.models.order import Order
+from app.schemas.balance import BalanceResponse
+from app.schemas.order import OrderResponse
+from app.services.kis_realtime import TickRecord
+
+logger = logging.getLogger(__name__)
+
+QUOTE = "quote"
+SIGNAL = "signal"
+ORDER = "order"
+BALANCE = "balance"
+FILL = "fill"
+EVENT_KINDS = (QUOTE, SIGNAL, ORDER, BALANCE, FILL)
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST)
+
+LATENCY_SAMPLES = 4096  # 지연 시간 분위수 계산에 쓰는 최근 표본 수
+
+Topic = Tuple[str, str]  # (종류, 키)
+
+
+class Event(NamedTuple):
+    kind: str
+    key: str
+    payload: Any
+    sequence: int
+    published_ns: int  # time.perf_counter_ns()
+
+
+class Subscription:
+    """구독자 대기열 (bus.subscribe로 생성)
+
+    Args:
+        topics: {종류: 키 목록} (키 목록이 None이면 해당 종류 전체)
+        maxsize: 대기열 최대 길이
+        policy: 대기열이 찼을 때 버릴 이벤트 (drop_oldest, drop_newest)
+        coalesce: 같은 토픽의 대기 이벤트를 최신 값으로 교체할 종류
+        name: 지표에 표시할 이름
+    """
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        topics: Mapping[str, Optional[Iterable[str]]],
+        maxsize: int,
+        policy: str,
+        coalesce: Iterable[str],
+        name: str
+    ):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.bus = bus
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self.coalesce = frozenset(coalesce)
+        self.topics: Dict[str, Optional[Set[str]]] = {
+            kind: None if keys is None else set(keys) for kind, keys in topics.items()
+        }
+        # 슬롯([event])을 대기열에 넣고, 합칠 수 있는 토픽은 슬롯 내용을 교체
+        self._queue: Deque[List[Event]] = deque()
+        self._slots: Dict[Topic, List[Event]] = {}
+        self._ready = asyncio.Event()
+        self.closed = False
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.latency_ms_mean = 0.0  # 지수 이동 평균
+        self.latency_ms_max = 0.0
+
+    def _offer(self, event: Event) -> None:
+        topic = (event.kind, event.key)
+        slot = self._slots.get(topic)
+        if slot is not None:
+            slot[0] = event
+            self.coalesced += 1
+            return
+        if len(self._queue) >= self.maxsize:
+            self.dropped += 1
+            self.bus.dropped += 1
+            if self.policy == DROP_NEWEST:
+                return
+            self._forget(self._queue.popleft())
+        slot = [event]
+        self._queue.append(slot)
+        if event.kind in self.coalesce:
+            self._slots[topic] = slot
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._ready.set()
+
+    def _forget(self, slot: List[Event]) -> None:
+        topic = (slot[0].kind, slot[0].key)
+        if self._slots.get(topic) is slot:
+            del self._slots[topic]
+
+    def _deliver(self, slot: List[Event]) -> Event:
+        self._forget(slot)
+        event = slot[0]
+        latency = (time.perf_counter_ns() - event.published_ns) / 1e6
+        self.delivered += 1
+        self.latency_ms_mean += 0.05 * (latency - self.latency_ms_mean)
+        self.latency_ms_max = max(self.latency_ms_max, latency)
+        self.bus._record_delivery(latency)
+        return event
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    async def get(self) -> Event:
+        """다음 이벤트를 기다려 반환합니다."""
+        while not self._queue:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._deliver(self._queue.popleft())
+
+    async def get_batch(self, limit: Optional[int] = None) -> List[Event]:
+        """이벤트가 하나 이상 쌓일 때까지 기다려 쌓인 이벤트를 한 번에 반환합니다."""
+        while not self._queue:
+            self._ready.clear()
+            await self._ready.wait()
+        count = len(self._queue) if limit is None else min(limit, len(self._queue))
+        return [self._deliver(self._queue.popleft()) for _ in range(count)]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Event:
+        return await self.get()
+
+    def set_keys(self, kind: str, keys: Optional[Iterable[str]]) -> None:
+        """구독 중인 종류의 키 목록을 바꿉니다 (None이면 전체)."""
+        self.bus._unindex(self)
+        self.topics[kind] = None if keys is None else set(keys)
+        self.bus._index(self)
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "policy": self.policy,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "maxsize": self.maxsize,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "latency_ms_mean": round(self.latency_ms_mean, 3),
+            "latency_ms_max": round(self.latency_ms_max, 3),
+        }
+
+
+class EventBus:
+    """토픽별 발행/구독 (이벤트 루프 안에서 start)"""
+
+    def __init__(self):
+        self._by_topic: Dict[Topic, Set[Subscription]] = {}
+        self._by_kind: Dict[str, Set[Subscription]] = {}  # 키 전체 구독
+        self._subscriptions: Set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._sequence = itertools.count(1)
+        self.published: Dict[str, int] = {kind: 0 for kind in EVENT_KINDS}
+        self.delivered = 0
+        self.dropped = 0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def start(self) -> None:
+        """현재 이벤트 루프에 연결합니다 (다른 스레드의 발행을 이 루프로 넘김, subscribe에서도 호출)."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._loop_thread = threading.get_ident()
+
+    def subscribe(
+        self,
+        topics: Mapping[str, Optional[Iterable[str]]],
+        maxsize: int = settings.EVENT_BUS_QUEUE_SIZE,
+        policy: str = DROP_OLDEST,
+        coalesce: Iterable[str] = (),
+        name: str = "subscriber"
+    ) -> Subscription:
+        """구독을 만듭니다 (이벤트 루프 스레드에서 호출)."""
+        unknown = set(topics) - set(EVENT_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown event kinds: {sorted(unknown)}")
+        self.start()
+        subscription = Subscription(self, topics, maxsize, policy, coalesce, name)
+        self._subscriptions.add(subscription)
+        self._index(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._unindex(subscription)
+        self._subscriptions.discard(subscription)
+        subscription.closed = True
+
+    def _index(self, subscription: Subscription) -> None:
+        for kind, keys in subscription.topics.items():
+            if keys is None:
+                self._by_kind.setdefault(kind, set()).add(subscription)
+            else:
+                for key in keys:
+                    self._by_topic.setdefault((kind, key), set()).add(subscription)
+
+    def _unindex(self, subscription: Subscription) -> None:
+        for kind, keys in subscription.topics.items():
+            if keys is None:
+                self._by_kind.get(kind, set()).discard(subscription)
+                continue
+            for key in keys:
+                subscribers = self._by_topic.get((kind, key))
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._by_topic[(kind, key)]
+
+    def has_subscribers(self, kind: str, key: Any) -> bool:
+        return bool(self._by_kind.get(kind)) or (kind, str(key)) in self._by_topic
+
+    def publish(self, kind: str, key: Any, payload: Any) -> None:
+        """이벤트를 발행합니다 (구독자가 없으면 바로 반환, 다른 스레드에서 호출 가능)."""
+        key = str(key)
+        if not self._by_kind.get(kind) and (kind, key) not in self._by_topic:
+            return
+        event = Event(kind, key, payload, next(self._sequence), time.perf_counter_ns())
+        if threading.get_ident() == self._loop_thread:
+            self._publish(event)
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._publish, event)
+
+    def _publish(self, event: Event) -> None:
+        self.published[event.kind] += 1
+        for subscription in self._by_topic.get((event.kind, event.key), ()):
+            subscription._offer(event)
+        for subscription in self._by_kind.get(event.kind, ()):
+            subscription._offer(event)
+
+    def publish_ticks(self, ticks: Iterable[TickRecord]) -> None:
+        """틱 묶음을 종목별 quote 이벤트로 발행합니다 (RealtimeQuoteIngester 구독 함수)."""
+        for tick in ticks:
+            self.publish(QUOTE, tick.symbol, tick)
+
+    def publish_order(self, order: Order) -> None:
+        """주문 상태를 거래 계정 order 이벤트로 발행합니다 (세션이 열려 있을 때 호출)."""
+        if self.has_subscribers(ORDER, order.trading_account_id):
+            payload = OrderResponse.model_validate(order).model_dump(mode="json")
+            self.publish(ORDER, order.trading_account_id, payload)
+
+    def publish_balance(self, trading_account_id: int, balances: Sequence[BalanceResponse]) -> None:
+        """잔고 스냅샷을 거래 계정 balance 이벤트로 발행합니다."""
+        if self.has_subscribers(BALANCE, trading_account_id):
+            self.publish(BALANCE, trading_account_id, [balance.model_dump(mode="json") for balance in balances])
+
+    def _record_delivery(self, latency_ms: float) -> None:
+        self.delivered += 1
+        self._latencies.append(latency_ms)
+
+    def stats(self) -> Dict[str, object]:
+        latencies = np.fromiter(self._latencies, dtype=np.float64, count=len(self._latencies))
+        return {
+            "published": dict(self.published),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "latency_ms": {
+                "p50": round(float(np.percentile(latencies, 50)), 3) if len(latencies) else 0.0,
+                "p99": round(float(np.percentile(latencies, 99)), 3) if len(latencies) else 0.0,
+                "max": round(float(latencies.max()), 3) if len(latencies) else 0.0,
+            },
+            "subscriptions": [subscription.stats() for subscription in self._subscriptions],
+        }
+
+
+event_bus = EventBus()
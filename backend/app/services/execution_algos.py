@@ -0,0 +1,488 @@
+"""
+실행 알고리즘 (TWAP/VWAP 부모 주문 분할, asyncio)
+
+큰 부모 주문을 시간 구간 [start_time, end_time)에 slice_seconds 간격으로 나눠 시장가 자식 주문으로 냅니다.
+자식 주문은 주문 전송 outbox(order_submitter)에 QUEUED로 기록하고, 체결은 체결 대사/체결통보가
+자식 주문에 반영한 값을 모아 부모 주문에 반영합니다.
+
+    - 일정(구간별 누적 목표 비율): TWAP은 균등, VWAP은 최근 EXECUTION_ALGO_VOLUME_SESSIONS 거래일
+      1분봉(bar_store)의 분 단위 거래량 곡선 (과거 봉이 없으면 균등)
+    - 자식 수량: 구간 시작 시 목표 누적 수량 - (체결 수량 + 미체결 자식 수량). 체결이 늦으면 더 내지
+      않고, 거부/취소로 남은 수량은 다음 구간에 다시 담음. 놓친 구간은 한 번에 따라잡고, 마지막 구간은
+      남은 수량 전부
+    - 타이머: 부모 주문마다 태스크를 두지 않고 (다음 구간 시각, 부모 ID) 힙 하나로 가장 이른 시각까지만
+      잠든 뒤, 같은 시각에 도래한 부모 주문을 모아 한 번의 조회(자식 체결 집계)와 한 번의 커밋
+      (자식 주문 INSERT + 부모 일괄 UPDATE)으로 처리
+    - 자식 주문 order 이벤트가 오면 구간을 기다리지 않고 부모 체결 수량/상태만 갱신
+    - 슬리피지(bp, 불리할수록 양수): 접수 시점 현재가(arrival) 대비, 실행 구간 VWAP 대비
+      (당일 틱 저장소, 없으면 1분봉으로 vwap_strategy.calculate_vwap_array)
+
+상태: ACTIVE → COMPLETED(전량 체결) / EXPIRED(마지막 구간 뒤 미체결 자식이 없거나 유예 시간 초과) /
+CANCELLED(이후 자식 주문을 내지 않음, 이미 낸 자식 주문은 취소하지 않음)
+"""
+import asyncio
+import heapq
+import logging
+import math
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import case, func, update
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.order import OPEN_ORDER_STATUSES, Order
+from app.models.parent_order import ACTIVE_PARENT_STATUSES, ParentOrder
+from app.services.bar_store import BarStore, bar_store
+from app.services.event_bus import ORDER, Subscription, event_bus
+from app.services.kis_realtime import DAY_MS, KST_OFFSET_MS
+from app.services.order_submitter import order_submitter
+from app.services.tick_store import TickStore, tick_store
+from app.services.vwap_strategy import calculate_vwap_array
+
+logger = logging.getLogger(__name__)
+
+ALGORITHMS = ("TWAP", "VWAP")
+MAX_SLICES = 1000
+# 아직 체결될 수 있는 자식 주문 상태
+WORKING_ORDER_STATUSES = ("QUEUED", "SUBMITTING") + OPEN_ORDER_STATUSES
+LATENCY_SAMPLES = 10_000
+
+
+def twap_schedule(slices: int) -> np.ndarray:
+    """균등 분할의 구간별 누적 목표 비율"""
+    return np.arange(1, slices + 1, dtype=np.float64) / slices
+
+
+def volume_curve_schedule(
+    symbol: str,
+    start_ms: int,
+    slice_ms: int,
+    slices: int,
+    sessions: int,
+    store: BarStore = bar_store
+) -> np.ndarray:
+    """과거 1분봉 거래량 곡선을 따르는 구간별 누적 목표 비율 (과거 봉이 없으면 균등)
+
+    Args:
+        symbol: 종목 코드
+        start_ms: 실행 시작 시각 (epoch ms)
+        slice_ms: 구간 길이 (ms)
+        slices: 구간 수
+        sessions: 거래량 곡선에 쓸 과거 거래일 수
+        store: 과거 봉 저장소
+    """
+    bars = store.read_sessions(symbol, "1m", sessions, start_ms)
+    if not len(bars):
+        return twap_schedule(slices)
+    # 분(KST) 단위 거래량 합 → 누적 곡선 (자정을 넘는 구간을 위해 이틀 치)
+    minutes = ((bars.timestamps + KST_OFFSET_MS) % DAY_MS) // 60_000
+    profile = np.bincount(minutes.astype(np.int64), weights=bars.volume, minlength=1440)
+    cumulative = np.concatenate(([0.0], np.cumsum(np.tile(profile, 2))))
+    # 구간 경계(당일 KST 자정부터의 분, 분 안에서는 선형 보간)의 누적 거래량 차이가 구간 거래량
+    offset_minutes = ((start_ms + KST_OFFSET_MS) % DAY_MS) / 60_000
+    bounds = offset_minutes + np.arange(slices + 1) * slice_ms / 60_000
+    weights = np.diff(np.interp(bounds, np.arange(len(cumulative)), cumulative))
+    total = weights.sum()
+    if total <= 0:
+        return twap_schedule(slices)
+    schedule = np.cumsum(weights) / total
+    schedule[-1] = 1.0
+    return schedule
+
+
+def plan_schedule(algorithm: str, symbol: str, start: datetime, end: datetime, slice_seconds: int) -> List[float]:
+    """부모 주문의 구간별 누적 목표 비율을 계산합니다.
+
+    Raises:
+        ValueError: 알 수 없는 알고리즘, 빈 구간, 구간 수가 MAX_SLICES 초과
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if slice_seconds <= 0 or end <= start:
+        raise ValueError("end_time must be after start_time and slice_seconds positive")
+    slices = math.ceil((end - start).total_seconds() / slice_seconds)
+    if slices > MAX_SLICES:
+        raise ValueError(f"Too many slices: {slices} > {MAX_SLICES}")
+    if algorithm == "TWAP":
+        schedule = twap_schedule(slices)
+    else:
+        schedule = volume_curve_schedule(
+            symbol, _epoch_ms(start), slice_seconds * 1000, slices, settings.EXECUTION_ALGO_VOLUME_SESSIONS
+        )
+    return [round(float(value), 6) for value in schedule]
+
+
+def child_quantity(
+    quantity: int,
+    target_fraction: float,
+    executed: int,
+    working: int,
+    final: bool,
+    min_child: int = 1
+) -> int:
+    """구간 시작 시 낼 자식 주문 수량
+
+    Args:
+        quantity: 부모 주문 수량
+        target_fraction: 이번 구간까지의 누적 목표 비율
+        executed: 체결 수량
+        working: 미체결 자식 주문 수량 (전송 전 포함)
+        final: 마지막 구간 (남은 수량 전부)
+        min_child: 이보다 작으면 다음 구간으로 미룸 (마지막 구간 제외)
+    """
+    remaining = quantity - executed - working
+    target = quantity if final else int(round(quantity * target_fraction))
+    child = min(target - executed - working, remaining)
+    if child <= 0 or (not final and child < min_child):
+        return 0
+    return child
+
+
+def slippage_bps(order_type: str, price: Optional[float], reference: Optional[float]) -> Optional[float]:
+    """기준가 대비 슬리피지 (bp, 매수는 비싸게/매도는 싸게 체결될수록 양수)"""
+    if not price or not reference:
+        return None
+    side = 1 if order_type == "BUY" else -1
+    return round(side * (price - reference) / reference * 10_000, 3)
+
+
+def interval_vwap(
+    symbol: str,
+    start_ms: int,
+    end_ms: int,
+    ticks: TickStore = tick_store,
+    store: BarStore = bar_store
+) -> Optional[float]:
+    """[start_ms, end_ms) 구간 VWAP (당일 틱, 없으면 1분봉의 대표가 (고+저+종)/3)"""
+    view = ticks.view(symbol, start_ms, end_ms)
+    if view is not None and len(view):
+        vwap = calculate_vwap_array(view.prices, view.volumes)
+    else:
+        bars = store.read(symbol, "1m", start_ms, end_ms)
+        if not len(bars):
+            return None
+        vwap = calculate_vwap_array((bars.high + bars.low + bars.close) / 3, bars.volume)
+    return vwap or None
+
+
+def _epoch_ms(value: datetime) -> int:
+    # SQLite는 UTC를 naive로 반환
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+class ParentState:
+    """스케줄러가 들고 있는 부모 주문 (구간 계산에 필요한 값만)"""
+    __slots__ = (
+        "id", "user_id", "trading_account_id", "symbol", "order_type", "quantity",
+        "start_ms", "end_ms", "slice_ms", "schedule", "slices_sent", "arrival_price", "next_due",
+    )
+
+    def __init__(self, parent: ParentOrder):
+        self.id = parent.id
+        self.user_id = parent.user_id
+        self.trading_account_id = parent.trading_account_id
+        self.symbol = parent.symbol
+        self.order_type = parent.order_type
+        self.quantity = parent.quantity
+        self.start_ms = _epoch_ms(parent.start_time)
+        self.end_ms = _epoch_ms(parent.end_time)
+        self.slice_ms = parent.slice_seconds * 1000
+        self.schedule = list(parent.schedule or []) or [1.0]
+        self.slices_sent = parent.slices_sent or 0
+        self.arrival_price = parent.arrival_price
+        self.next_due = 0
+
+    def slices_due(self, now_ms: int) -> int:
+        """now_ms까지 시작된 구간 수"""
+        if now_ms < self.start_ms:
+            return 0
+        return min(len(self.schedule), (now_ms - self.start_ms) // self.slice_ms + 1)
+
+    def next_slice_ms(self) -> Optional[int]:
+        if self.slices_sent >= len(self.schedule):
+            return None
+        return self.start_ms + self.slices_sent * self.slice_ms
+
+
+class ParentResult(NamedTuple):
+    id: int
+    status: str
+    slices_sent: int
+    children: int
+
+
+def _process_parents(states: List[ParentState], now_ms: int, slice_ids: Set[int]) -> List[ParentResult]:
+    """부모 주문 묶음의 체결을 집계하고, slice_ids의 새 구간 자식 주문을 냅니다 (한 트랜잭션).
+
+    Returns:
+        처리한 부모 주문별 결과 (이미 ACTIVE가 아닌 부모 주문은 status만 채움)
+    """
+    ids = [state.id for state in states]
+    db = SessionLocal()
+    db.expire_on_commit = False
+    try:
+        # 취소된 부모 주문은 자식 주문을 더 내지 않음 (취소 API와 겹치지 않도록 잠금)
+        statuses = dict(db.query(ParentOrder.id, ParentOrder.status).filter(
+            ParentOrder.id.in_(ids)
+        ).with_for_update().all())
+        executed_quantity = func.coalesce(Order.executed_quantity, 0)
+        fills = {
+            parent_id: (int(executed or 0), float(notional or 0.0), int(working or 0))
+            for parent_id, executed, notional, working in db.query(
+                Order.parent_order_id,
+                func.sum(executed_quantity),
+                func.sum(executed_quantity * func.coalesce(Order.executed_price, 0.0)),
+                func.sum(case(
+                    (Order.status.in_(WORKING_ORDER_STATUSES), Order.quantity - executed_quantity),
+                    else_=0
+                )),
+            ).filter(Order.parent_order_id.in_(ids)).group_by(Order.parent_order_id).all()
+        }
+
+        now = datetime.fromtimestamp(now_ms / 1000, timezone.utc)
+        grace_ms = settings.EXECUTION_ALGO_COMPLETION_GRACE_SECONDS * 1000
+        children: List[Order] = []
+        changes: List[Dict[str, object]] = []
+        results: List[ParentResult] = []
+        for state in states:
+            status = statuses.get(state.id)
+            if status not in ACTIVE_PARENT_STATUSES:
+                results.append(ParentResult(state.id, status or "MISSING", state.slices_sent, 0))
+                continue
+
+            executed, notional, working = fills.get(state.id, (0, 0.0, 0))
+            slices_sent = state.slices_sent
+            created = 0
+            due = state.slices_due(now_ms)
+            if state.id in slice_ids and due > slices_sent:
+                index = due - 1
+                quantity = child_quantity(
+                    state.quantity,
+                    state.schedule[index],
+                    executed,
+                    working,
+                    final=index == len(state.schedule) - 1,
+                    min_child=settings.EXECUTION_ALGO_MIN_CHILD_QUANTITY
+                )
+                if quantity:
+                    children.append(Order(
+                        user_id=state.user_id,
+                        trading_account_id=state.trading_account_id,
+                        symbol=state.symbol,
+                        order_type=state.order_type,
+                        order_method="MARKET",
+                        quantity=quantity,
+                        status="QUEUED",
+                        client_order_id=f"algo-{state.id}:{index}",
+                        parent_order_id=state.id,
+                        order_metadata={"slice": index}
+                    ))
+                    working += quantity
+                    created = 1
+                slices_sent = due
+
+            if executed >= state.quantity:
+                status = "COMPLETED"
+            elif slices_sent >= len(state.schedule) and (working == 0 or now_ms >= state.end_ms + grace_ms):
+                status = "EXPIRED"
+            average_price = notional / executed if executed else None
+            vwap = interval_vwap(state.symbol, state.start_ms, min(now_ms, state.end_ms)) if executed else None
+            changes.append({
+                "id": state.id,
+                "status": status,
+                "slices_sent": slices_sent,
+                "ordered_quantity": executed + working,
+                "executed_quantity": executed,
+                "executed_price": average_price,
+                "interval_vwap": vwap,
+                "slippage_arrival_bps": slippage_bps(state.order_type, average_price, state.arrival_price),
+                "slippage_vwap_bps": slippage_bps(state.order_type, average_price, vwap),
+                "updated_at": now,
+            })
+            results.append(ParentResult(state.id, status, slices_sent, created))
+
+        db.add_all(children)
+        if changes:
+            db.execute(update(ParentOrder), changes, execution_options={"synchronize_session": None})
+        db.commit()
+        for child in children:
+            event_bus.publish_order(child)
+        return results
+    finally:
+        db.close()
+
+
+def _load_active_parents() -> List[ParentOrder]:
+    db = SessionLocal()
+    try:
+        parents = db.query(ParentOrder).filter(ParentOrder.status.in_(ACTIVE_PARENT_STATUSES)).all()
+        db.expunge_all()
+        return parents
+    finally:
+        db.close()
+
+
+def _percentiles(values: Iterable[float]) -> Dict[str, float]:
+    array = np.fromiter(values, dtype=np.float64)
+    return {
+        "p50": round(float(np.percentile(array, 50)), 3) if len(array) else 0.0,
+        "p99": round(float(np.percentile(array, 99)), 3) if len(array) else 0.0,
+        "max": round(float(array.max()), 3) if len(array) else 0.0,
+    }
+
+
+class ExecutionScheduler:
+    """부모 주문 구간 스케줄러 (이벤트 루프 안에서 start)"""
+
+    def __init__(self):
+        self.parents: Dict[int, ParentState] = {}
+        self.batches = 0
+        self.slices = 0
+        self.children = 0
+        self.last_error: Optional[str] = None
+        self._heap: List[Tuple[int, int]] = []  # (다음 처리 시각 epoch ms, 부모 ID)
+        self._dirty: Set[int] = set()
+        self._lateness: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._batch_ms: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._task: Optional[asyncio.Task] = None
+        self._watcher: Optional[asyncio.Task] = None
+        self._subscription: Optional[Subscription] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def _schedule(self, state: ParentState, due_ms: int) -> None:
+        # 힙에서 지우지 않고 next_due와 다른 항목은 꺼낼 때 버림
+        state.next_due = due_ms
+        heapq.heappush(self._heap, (due_ms, state.id))
+
+    def add(self, parent: ParentOrder) -> None:
+        """부모 주문을 스케줄에 넣습니다 (이벤트 루프 스레드에서 호출)."""
+        state = ParentState(parent)
+        self.parents[state.id] = state
+        self._schedule(state, state.next_slice_ms() or int(time.time() * 1000))
+        if self._wake is not None:
+            self._wake.set()
+
+    def cancel(self, parent_id: int) -> None:
+        """부모 주문을 스케줄에서 뺍니다 (DB 상태는 호출한 쪽에서 CANCELLED로 기록)."""
+        self.parents.pop(parent_id, None)
+
+    async def process_due(self, now_ms: Optional[int] = None) -> int:
+        """도래한 구간과 체결이 바뀐 부모 주문을 한 번에 처리하고 처리한 부모 주문 수를 반환합니다."""
+        now_ms = now_ms or int(time.time() * 1000)
+        slice_ids: Set[int] = set()
+        while self._heap and self._heap[0][0] <= now_ms:
+            due_ms, parent_id = heapq.heappop(self._heap)
+            state = self.parents.get(parent_id)
+            if state is not None and state.next_due == due_ms:
+                slice_ids.add(parent_id)
+                self._lateness.append(float(now_ms - due_ms))
+        batch = [self.parents[parent_id] for parent_id in slice_ids | self._dirty if parent_id in self.parents]
+        self._dirty.clear()
+        if not batch:
+            return 0
+
+        started = time.perf_counter()
+        try:
+            results = await asyncio.to_thread(_process_parents, batch, now_ms, slice_ids)
+        except Exception as e:
+            self.last_error = str(e)
+            logger.warning(f"Failed to process {len(batch)} parent orders: {e}")
+            for parent_id in slice_ids:
+                if parent_id in self.parents:
+                    self._schedule(self.parents[parent_id], now_ms + 1000)
+            return 0
+        self._batch_ms.append((time.perf_counter() - started) * 1000)
+        self.batches += 1
+        self.slices += len(slice_ids)
+
+        created = 0
+        for result in results:
+            state = self.parents.get(result.id)
+            if state is None:
+                continue
+            if result.status not in ACTIVE_PARENT_STATUSES:
+                del self.parents[result.id]
+                continue
+            state.slices_sent = result.slices_sent
+            created += result.children
+            if result.id in slice_ids:
+                # 마지막 구간 뒤에는 구간 간격마다 미체결 자식 주문 마감 여부 확인
+                self._schedule(state, state.next_slice_ms() or now_ms + state.slice_ms)
+        self.children += created
+        if created:
+            order_submitter.notify()
+        return len(batch)
+
+    async def _run(self) -> None:
+        for parent in await asyncio.to_thread(_load_active_parents):
+            self.add(parent)
+        while True:
+            self._wake.clear()
+            await self.process_due()
+            delay = None
+            if self._heap:
+                delay = max(0.0, (self._heap[0][0] - time.time() * 1000) / 1000)
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _watch_orders(self) -> None:
+        """자식 주문 order 이벤트가 오면 다음 처리 때 부모 주문 체결을 갱신합니다."""
+        while True:
+            events = await self._subscription.get_batch()
+            # 체결/거부/취소만 (전송 전후 이벤트는 체결 수량이 그대로)
+            parent_ids = {
+                event.payload.get("parent_order_id") for event in events
+                if event.payload.get("status") not in ("QUEUED", "SUBMITTING", "PENDING")
+            }
+            parent_ids = {parent_id for parent_id in parent_ids if parent_id in self.parents}
+            if parent_ids:
+                self._dirty |= parent_ids
+                self._wake.set()
+
+    def start(self) -> None:
+        """스케줄러 태스크를 시작합니다 (이벤트 루프 안에서 호출, ACTIVE 부모 주문을 다시 읽음)."""
+        if self._task is not None:
+            return
+        self._wake = asyncio.Event()
+        self._subscription = event_bus.subscribe({ORDER: None}, name="execution_algos")
+        self._watcher = asyncio.create_task(self._watch_orders())
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+        tasks = [task for task in (self._task, self._watcher) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._watcher = None
+        self._wake = None
+        self.parents.clear()
+        self._heap.clear()
+        self._dirty.clear()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "running": self._task is not None,
+            "active_parents": len(self.parents),
+            "timers": len(self._heap),
+            "batches": self.batches,
+            "slices": self.slices,
+            "children": self.children,
+            "last_error": self.last_error,
+            "lateness_ms": _percentiles(self._lateness),
+            "batch_ms": _percentiles(self._batch_ms),
+        }
+
+
+execution_scheduler = ExecutionScheduler()
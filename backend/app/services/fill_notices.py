@@ -0,0 +1,398 @@
+"""
+KIS 실시간 체결통보 수신 (asyncio)
+
+hts_id가 있는 활성 거래 계정의 체결통보(H0STCNI0)를 앱키별 WebSocket 세션으로 구독하고,
+복호화/파싱한 통보로 주문(Order)의 상태, 체결 수량, 평균 체결가를 바로 갱신한 뒤
+이벤트 버스에 order, fill 이벤트를 발행합니다.
+
+    - 세션: 실시간 시세 수신 중이고 앱키가 시세 수신기와 같으면 그 세션에 구독을 더하고,
+      아니면 앱키별로 세션을 엽니다 (앱키당 세션 하나)
+    - 반영: 밀린 통보를 모아 한 번의 조회/커밋으로 처리. 통보는 이번 체결 수량만 주므로 통보별 누적
+      수량(notice_quantity)을 따로 두고 체결 수량은 그보다 작을 때만 올림 (체결 대사가 누적 체결 수량으로
+      먼저 반영한 체결을 다시 더하지 않음), 평균 체결가는 더한 수량만큼 가중 평균
+    - 주문 기록보다 먼저 도착한 통보는 KIS_FILL_NOTICE_MATCH_TIMEOUT_SECONDS 동안 다시 맞춰 보고,
+      그래도 주문이 없으면 주문 체결 대사(order_reconciler)에 맡김
+
+통보 수신부터 DB 반영까지의 지연은 stats()로 확인합니다.
+"""
+import asyncio
+import functools
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.order import OPEN_ORDER_STATUSES, Order
+from app.models.trading_account import TradingAccount
+from app.services.event_bus import FILL, LATENCY_SAMPLES, event_bus
+from app.services.kis_realtime import (
+    ExecutionNotice,
+    KISRealtimeConnection,
+    decrypt_payload,
+    issue_approval_key,
+    notice_tr_id,
+    parse_notice_payload,
+    quote_ingester,
+)
+
+logger = logging.getLogger(__name__)
+
+RETRY_INTERVAL = 0.2  # seconds, 주문을 찾지 못한 통보를 다시 맞춰 보는 간격
+
+
+class ReceivedNotice(NamedTuple):
+    trading_account_id: int
+    notice: ExecutionNotice
+    received_ns: int  # time.perf_counter_ns()
+
+
+def _normalize_order_no(order_no: str) -> str:
+    return order_no.strip().lstrip("0")
+
+
+def _target_order_no(notice: ExecutionNotice) -> str:
+    # 취소 확인 통보의 주문번호는 취소 주문 것이므로 원주문에 반영
+    if notice.revision == "2" and not notice.filled:
+        return notice.original_order_no
+    return notice.order_no
+
+
+def is_actionable(notice: ExecutionNotice) -> bool:
+    """주문 상태를 바꾸는 통보인지 확인합니다 (주문/정정 접수 통보 제외)."""
+    return (
+        notice.filled
+        or (notice.rejected and notice.revision == "0")
+        or (notice.revision == "2" and notice.accepted == "2")
+        or notice.accepted == "3"
+    )
+
+
+def apply_notice(order: Order, notice: ExecutionNotice) -> bool:
+    """체결통보를 주문에 반영하고 바뀌었으면 True를 반환합니다.
+
+    체결 통보는 통보로 받은 누적 수량(notice_quantity, 주문 수량까지)을 늘리고, 체결 수량이 그보다
+    작을 때만 차이만큼 올려 평균 체결가를 가중 평균으로 갱신합니다. 체결 대사는 누적 체결 수량을
+    그대로 쓰므로 대사가 먼저 반영한 체결의 통보가 늦게 와도 두 번 더하지 않습니다.
+    거부는 체결이 없으면 REJECTED, 취소 확인과 IOC/FOK 잔량 취소는 CANCELLED (체결 수량 유지).
+    """
+    executed = order.executed_quantity or 0
+    if notice.filled:
+        noticed = min((order.notice_quantity or 0) + notice.quantity, order.quantity)
+        order.notice_quantity = noticed
+        quantity = noticed - executed
+        if quantity <= 0:
+            return False
+        total = executed + quantity
+        order.executed_price = ((order.executed_price or 0.0) * executed + notice.price * quantity) / total
+        order.executed_quantity = total
+        if order.status != "CANCELLED":
+            order.status = "EXECUTED" if total >= order.quantity else "PARTIAL"
+        return True
+
+    if order.status not in OPEN_ORDER_STATUSES:
+        return False
+    if notice.rejected:
+        order.status = "REJECTED" if executed == 0 else "CANCELLED"
+        return True
+    order.status = "CANCELLED"
+    return True
+
+
+def _fill_payload(order: Order, notice: ExecutionNotice) -> Dict[str, object]:
+    return {
+        "order_id": order.id,
+        "kis_order_no": order.kis_order_no,
+        "strategy_id": order.strategy_id,
+        "symbol": notice.symbol,
+        "side": "SELL" if notice.side == "01" else "BUY",
+        "quantity": notice.quantity,
+        "price": notice.price,
+        "time": notice.time,
+        "executed_quantity": order.executed_quantity,
+        "executed_price": order.executed_price,
+        "status": order.status,
+    }
+
+
+def _apply_notices(batch: List[ReceivedNotice]) -> Tuple[List[ReceivedNotice], List[float]]:
+    """통보 묶음을 한 번의 조회/커밋으로 주문에 반영하고 order, fill 이벤트를 발행합니다.
+
+    Returns:
+        (주문을 찾지 못한 통보, 체결 통보별 수신→커밋 지연 ms)
+    """
+    account_ids = {item.trading_account_id for item in batch}
+    order_nos = {_normalize_order_no(_target_order_no(item.notice)) for item in batch}
+    # 커밋 후 이벤트를 만들 때 다시 조회하지 않도록 만료하지 않음
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        orders = db.query(Order).filter(
+            Order.trading_account_id.in_(account_ids),
+            func.ltrim(Order.kis_order_no, "0").in_(order_nos)
+        ).with_for_update().all()
+        by_key = {(order.trading_account_id, _normalize_order_no(order.kis_order_no)): order for order in orders}
+
+        unmatched: List[ReceivedNotice] = []
+        changed: Dict[int, Order] = {}
+        fills: List[Tuple[Order, ReceivedNotice, Dict[str, object]]] = []
+        now = datetime.now(timezone.utc)
+        for item in batch:
+            order = by_key.get((item.trading_account_id, _normalize_order_no(_target_order_no(item.notice))))
+            if order is None:
+                unmatched.append(item)
+                continue
+            if apply_notice(order, item.notice):
+                order.updated_at = now
+                changed[order.id] = order
+                if item.notice.filled:
+                    fills.append((order, item, _fill_payload(order, item.notice)))
+        # 체결 대사가 이미 반영한 체결 통보도 누적 수량(notice_quantity)은 저장
+        if not db.dirty:
+            db.rollback()
+            return unmatched, []
+
+        db.commit()
+        committed_ns = time.perf_counter_ns()
+        for order in changed.values():
+            event_bus.publish_order(order)
+        for order, _, payload in fills:
+            event_bus.publish(FILL, order.trading_account_id, payload)
+        return unmatched, [(committed_ns - item.received_ns) / 1e6 for _, item, _ in fills]
+    finally:
+        db.close()
+
+
+def _load_notice_accounts() -> List[TradingAccount]:
+    db = SessionLocal()
+    try:
+        accounts = db.query(TradingAccount).filter(
+            TradingAccount.is_active == True,
+            TradingAccount.hts_id.isnot(None),
+            TradingAccount.hts_id != ""
+        ).all()
+        db.expunge_all()
+        return accounts
+    finally:
+        db.close()
+
+
+class _NoticeSession:
+    """앱키 하나의 체결통보 구독 (shared면 시세 수신기 세션을 함께 씀)"""
+
+    def __init__(self, app_key: str, connection: KISRealtimeConnection, shared: bool):
+        self.app_key = app_key
+        self.connection = connection
+        self.shared = shared
+        self.accounts: Dict[str, int] = {}  # 계좌번호 앞 8자리(CANO) → 거래 계정 ID
+        self.hts_ids: List[str] = []
+        self.task: Optional[asyncio.Task] = None
+
+
+class FillNoticeIngester:
+    """거래 계정별 실시간 체결통보를 받아 주문에 반영합니다 (이벤트 루프 안에서 start)."""
+
+    def __init__(self):
+        self.sessions: Dict[str, _NoticeSession] = {}
+        self._queue: List[ReceivedNotice] = []
+        self._retry: List[ReceivedNotice] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._reload: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self.notices = 0
+        self.fills = 0
+        self.applied = 0
+        self.expired = 0
+        self.decrypt_failures = 0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.latency_ms_last = 0.0
+
+    def _on_frame(self, session: _NoticeSession, encrypted: bool, count: int, payload: str) -> None:
+        received_ns = time.perf_counter_ns()
+        if encrypted:
+            cipher = session.connection.cipher_keys.get(notice_tr_id())
+            if cipher is None:
+                self.decrypt_failures += 1
+                return
+            try:
+                payload = decrypt_payload(payload, *cipher)
+            except ValueError:
+                self.decrypt_failures += 1
+                return
+
+        for notice in parse_notice_payload(payload, count):
+            self.notices += 1
+            account_id = session.accounts.get(notice.account_number[:8])
+            if account_id is None or not is_actionable(notice):
+                continue
+            self._queue.append(ReceivedNotice(account_id, notice, received_ns))
+        if self._queue and self._wake is not None:
+            self._wake.set()
+
+    async def _apply(self) -> None:
+        timeout_ns = settings.KIS_FILL_NOTICE_MATCH_TIMEOUT_SECONDS * 1e9
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), RETRY_INTERVAL if self._retry else None)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            batch, self._queue, self._retry = self._retry + self._queue, [], []
+            if not batch:
+                continue
+            try:
+                unmatched, latencies = await asyncio.to_thread(_apply_notices, batch)
+            except Exception as e:
+                logger.warning(f"Failed to apply {len(batch)} fill notices: {e}")
+                unmatched, latencies = batch, []
+
+            self.applied += len(batch) - len(unmatched)
+            self.fills += len(latencies)
+            self._latencies.extend(latencies)
+            if latencies:
+                self.latency_ms_last = latencies[-1]
+            now_ns = time.perf_counter_ns()
+            for item in unmatched:
+                if now_ns - item.received_ns < timeout_ns:
+                    self._retry.append(item)
+                else:
+                    # 체결 대사가 일별 체결 조회로 반영
+                    self.expired += 1
+
+    def _on_connection_data(
+        self,
+        session: _NoticeSession,
+        tr_id: str,
+        encrypted: bool,
+        count: int,
+        payload: str
+    ) -> None:
+        if tr_id == notice_tr_id():
+            self._on_frame(session, encrypted, count, payload)
+
+    def _open_session(self, account: TradingAccount) -> _NoticeSession:
+        if settings.KIS_REALTIME_ENABLED and account.app_key == quote_ingester.app_key:
+            session = _NoticeSession(account.app_key, quote_ingester.connection, shared=True)
+            quote_ingester.set_frame_handler(notice_tr_id(), functools.partial(self._on_frame, session))
+            return session
+
+        connection = KISRealtimeConnection(
+            settings.KIS_WS_URL,
+            functools.partial(issue_approval_key, settings.KIS_BASE_URL, account.app_key, account.app_secret),
+            lambda *frame: None,
+            settings.KIS_WS_MAX_SUBSCRIPTIONS
+        )
+        session = _NoticeSession(account.app_key, connection, shared=False)
+        connection.on_data = functools.partial(self._on_connection_data, session)
+        session.task = asyncio.create_task(connection.run())
+        return session
+
+    def _close_session(self, session: _NoticeSession) -> None:
+        if session.shared:
+            quote_ingester.set_extra_subscriptions([])
+            quote_ingester.set_frame_handler(notice_tr_id(), None)
+        elif session.task is not None:
+            session.task.cancel()
+
+    async def _sync_sessions(self) -> None:
+        """구독할 거래 계정을 다시 읽어 앱키별 세션과 구독을 맞춥니다."""
+        accounts = await asyncio.to_thread(_load_notice_accounts)
+        by_app_key: Dict[str, List[TradingAccount]] = {}
+        for account in accounts:
+            by_app_key.setdefault(account.app_key, []).append(account)
+
+        for app_key in [app_key for app_key in self.sessions if app_key not in by_app_key]:
+            self._close_session(self.sessions.pop(app_key))
+
+        tr_id = notice_tr_id()
+        for app_key, members in by_app_key.items():
+            session = self.sessions.get(app_key)
+            if session is None:
+                session = self.sessions[app_key] = self._open_session(members[0])
+            session.accounts = {account.account_number[:8]: account.id for account in members}
+            session.hts_ids = sorted({account.hts_id for account in members})
+            keys = [(tr_id, hts_id) for hts_id in session.hts_ids]
+            if session.shared:
+                quote_ingester.set_extra_subscriptions(keys)
+            else:
+                session.connection.set_subscriptions(keys)
+
+    async def _maintain(self) -> None:
+        while True:
+            self._reload.clear()
+            try:
+                await self._sync_sessions()
+            except Exception as e:
+                logger.warning(f"Failed to load fill notice accounts: {e}")
+            try:
+                await asyncio.wait_for(self._reload.wait(), settings.KIS_FILL_NOTICE_ACCOUNT_REFRESH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def notify_changed(self) -> None:
+        """거래 계정이 추가/변경되었음을 알립니다 (다른 스레드에서 호출 가능)."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._reload.set)
+
+    def live_account_ids(self) -> Set[int]:
+        """체결통보 세션이 연결된 거래 계정 ID"""
+        return {
+            account_id
+            for session in self.sessions.values() if session.connection.connected
+            for account_id in session.accounts.values()
+        }
+
+    def start(self) -> None:
+        """수신 태스크를 시작합니다 (이벤트 루프 안에서 호출)."""
+        if self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._reload = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._maintain()), asyncio.create_task(self._apply())]
+
+    async def stop(self) -> None:
+        for session in self.sessions.values():
+            self._close_session(session)
+        tasks = self._tasks + [session.task for session in self.sessions.values() if session.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.sessions.clear()
+        self._tasks = []
+        self._loop = None
+
+    def stats(self) -> Dict[str, object]:
+        latencies = np.fromiter(self._latencies, dtype=np.float64, count=len(self._latencies))
+        return {
+            "running": bool(self._tasks),
+            "sessions": [
+                {
+                    "accounts": sorted(session.accounts.values()),
+                    "shared": session.shared,
+                    "connected": session.connection.connected,
+                    "reconnects": session.connection.reconnects,
+                }
+                for session in self.sessions.values()
+            ],
+            "notices": self.notices,
+            "applied": self.applied,
+            "fills": self.fills,
+            "waiting": len(self._retry) + len(self._queue),
+            "expired": self.expired,
+            "decrypt_failures": self.decrypt_failures,
+            "fill_to_db_ms": {
+                "last": round(self.latency_ms_last, 3),
+                "p50": round(float(np.percentile(latencies, 50)), 3) if len(latencies) else 0.0,
+                "p99": round(float(np.percentile(latencies, 99)), 3) if len(latencies) else 0.0,
+                "max": round(float(latencies.max()), 3) if len(latencies) else 0.0,
+            },
+        }
+
+
+fill_notice_ingester = FillNoticeIngester()
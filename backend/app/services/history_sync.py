@@ -0,0 +1,246 @@
+"""
+KIS 차트 이력 동기화
+
+여러 종목의 일봉(기간별 시세, FHKST03010100)과 1분봉(일별 분봉, FHKST03010230)을
+동시에 받아 과거 봉 저장소에 저장합니다. 요청은 BACKGROUND 레인으로 보내므로 같은
+앱키의 주문/시세 요청보다 뒤로 밀리고, 동시에 처리하는 종목 수는 semaphore로 제한합니다.
+
+저장소에 있는 마지막 봉이 체크포인트이며 그 이후 구간만 받습니다.
+    - 일봉: 마지막 저장 거래일부터 (장중에 저장된 봉일 수 있어 그날은 다시 받음)
+    - 1분봉: 일봉 거래일 중 마지막 분봉 거래일 이후. 마지막 거래일이 장 마감 전에
+      끊겼으면 그날부터 다시 받음
+1분봉은 거래일 단위로 받고 HISTORY_SYNC_WRITE_BATCH_DAYS일씩 모아 저장하므로, 중단된
+뒤 다시 실행하면 저장이 끝난 거래일은 건너뜁니다.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.config import settings
+from app.services.backtest import KST, BarSeries
+from app.services.bar_store import BYTES_PER_BAR, BarStore, bar_store, day_key, day_start_ms, empty_bars
+from app.services.kis_api import (
+    DAILY_CHART_PAGE_SIZE,
+    MAX_PAGES,
+    MINUTE_CHART_PAGE_SIZE,
+    AsyncKISAPIClient,
+    KISAPIError,
+)
+from app.services.kis_realtime import DAY_MS, KST_OFFSET_MS
+
+logger = logging.getLogger(__name__)
+
+SESSION_OPEN = "090000"
+SESSION_CLOSE = "153000"
+SESSION_CLOSE_MS = 15 * 3600 * 1000 + 30 * 60 * 1000  # KST 자정 기준
+
+
+@dataclass
+class HistorySyncResult:
+    """동기화 결과 (처리량은 남은 야간 작업 시간 산정용)"""
+    symbols: int = 0
+    requests: int = 0
+    bars: int = 0
+    elapsed: float = 0.0  # seconds
+    failed: Dict[str, str] = field(default_factory=dict)  # 종목 -> 오류
+
+    @property
+    def bytes_written(self) -> int:
+        return self.bars * BYTES_PER_BAR
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = self.elapsed or float("inf")
+        return {
+            "symbols": self.symbols,
+            "failed": self.failed,
+            "requests": self.requests,
+            "bars": self.bars,
+            "bytes_written": self.bytes_written,
+            "elapsed_seconds": self.elapsed,
+            "symbols_per_sec": self.symbols / elapsed,
+            "requests_per_sec": self.requests / elapsed,
+            "bytes_per_sec": self.bytes_written / elapsed,
+        }
+
+
+def _check(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """차트 응답의 오류를 확인하고 봉 목록(output2)을 반환합니다."""
+    if body.get("rt_cd") not in (None, "0"):
+        raise KISAPIError(body.get("msg_cd", ""), body.get("msg1", "KIS error"), 200)
+    return [row for row in body.get("output2") or [] if row.get("stck_bsop_date")]
+
+
+def _bars_from_rows(rows: List[Dict[str, Any]], timestamps: List[int], close_field: str, volume_field: str) -> BarSeries:
+    """차트 행 목록을 시각 오름차순 봉 배열로 변환합니다 (같은 시각은 하나만)."""
+    if not rows:
+        return empty_bars()
+    timestamps, first = np.unique(np.array(timestamps, dtype=np.int64), return_index=True)
+    columns = [
+        np.array([float(rows[index][name] or 0) for index in first])
+        for name in ("stck_oprc", "stck_hgpr", "stck_lwpr", close_field, volume_field)
+    ]
+    return BarSeries(timestamps, *columns)
+
+
+def _hhmmss_ms(hhmmss: str) -> int:
+    return (int(hhmmss[:2]) * 3600 + int(hhmmss[2:4]) * 60 + int(hhmmss[4:6])) * 1000
+
+
+def _previous_second(hhmmss: str) -> str:
+    seconds = _hhmmss_ms(hhmmss) // 1000 - 1
+    return f"{seconds // 3600:02d}{seconds // 60 % 60:02d}{seconds % 60:02d}"
+
+
+class HistorySync:
+    """종목 목록의 차트 이력을 증분 동기화합니다.
+
+    Args:
+        client: 차트 조회에 사용할 KIS 클라이언트 (앱키별 속도 제한 적용)
+        store: 저장할 과거 봉 저장소
+        concurrency: 동시에 처리할 종목 수
+        today: 동기화 기준일 "YYYYMMDD" (기본값: KST 오늘)
+    """
+
+    def __init__(
+        self,
+        client: AsyncKISAPIClient,
+        store: BarStore = bar_store,
+        concurrency: int = settings.HISTORY_SYNC_CONCURRENCY,
+        today: Optional[str] = None
+    ):
+        self.client = client
+        self.store = store
+        self.concurrency = concurrency
+        self.today = today or datetime.now(KST).strftime("%Y%m%d")
+        self.result = HistorySyncResult()
+
+    async def _write(self, symbol: str, interval: str, bars: BarSeries) -> None:
+        if len(bars):
+            self.result.bars += await asyncio.to_thread(self.store.write, symbol, interval, bars)
+
+    async def fetch_daily(self, symbol: str, start_key: str, end_key: str) -> BarSeries:
+        """[start_key, end_key] 일봉을 최근 날짜부터 페이지 단위로 받습니다."""
+        rows: List[Dict[str, Any]] = []
+        for _ in range(MAX_PAGES):
+            self.result.requests += 1
+            page = _check(await self.client.get_daily_chart(symbol, start_key, end_key))
+            rows.extend(page)
+            oldest = min((row["stck_bsop_date"] for row in page), default=start_key)
+            if len(page) < DAILY_CHART_PAGE_SIZE or oldest <= start_key:
+                break
+            end_key = _shift_day(oldest, -1)
+
+        rows = [row for row in rows if row["stck_bsop_date"] >= start_key]
+        return _bars_from_rows(
+            rows, [day_start_ms(row["stck_bsop_date"]) for row in rows], "stck_clpr", "acml_vol"
+        )
+
+    async def fetch_minutes(self, symbol: str, key: str) -> BarSeries:
+        """거래일 key의 1분봉을 장 마감 시각부터 거꾸로 받습니다."""
+        rows: List[Dict[str, Any]] = []
+        hour = SESSION_CLOSE
+        for _ in range(MAX_PAGES):
+            self.result.requests += 1
+            page = [row for row in _check(await self.client.get_minute_chart(symbol, hour, key))
+                    if row["stck_bsop_date"] == key]
+            rows.extend(page)
+            oldest = min((row["stck_cntg_hour"] for row in page), default=SESSION_OPEN)
+            if len(page) < MINUTE_CHART_PAGE_SIZE or oldest <= SESSION_OPEN:
+                break
+            hour = _previous_second(oldest)
+
+        start_ms = day_start_ms(key)
+        return _bars_from_rows(
+            rows, [start_ms + _hhmmss_ms(row["stck_cntg_hour"]) for row in rows], "stck_prpr", "cntg_vol"
+        )
+
+    def minute_days(self, symbol: str, lookback_days: int) -> List[str]:
+        """1분봉을 받아야 할 거래일 목록 (일봉 거래일 기준, 없으면 평일)"""
+        start_key = _shift_day(self.today, -lookback_days)
+        available = self.store.available(symbol, "1m")
+        if available:
+            last_ms = available["last"]
+            last_key = day_key((last_ms + KST_OFFSET_MS) // DAY_MS)
+            complete = (last_ms + KST_OFFSET_MS) % DAY_MS >= SESSION_CLOSE_MS
+            start_key = max(start_key, _shift_day(last_key, 1) if complete else last_key)
+
+        trading_days = self.store.days(symbol, "1d")
+        if trading_days:
+            return [key for key in trading_days if start_key <= key <= self.today]
+        days = np.arange(
+            np.datetime64(_iso(start_key)), np.datetime64(_iso(self.today)) + 1, dtype="datetime64[D]"
+        )
+        return [key.replace("-", "") for key in days[np.is_busday(days)].astype(str)]
+
+    async def sync_symbol(
+        self,
+        symbol: str,
+        intervals: Sequence[str],
+        daily_lookback_days: int,
+        minute_lookback_days: int,
+        batch_days: int
+    ) -> None:
+        if "1d" in intervals:
+            available = self.store.available(symbol, "1d")
+            start_key = _shift_day(self.today, -daily_lookback_days)
+            if available:
+                start_key = max(start_key, day_key((available["last"] + KST_OFFSET_MS) // DAY_MS))
+            await self._write(symbol, "1d", await self.fetch_daily(symbol, start_key, self.today))
+
+        if "1m" in intervals:
+            pending: List[BarSeries] = []
+            try:
+                for key in self.minute_days(symbol, minute_lookback_days):
+                    bars = await self.fetch_minutes(symbol, key)
+                    if len(bars):
+                        pending.append(bars)
+                    if len(pending) >= batch_days:
+                        await self._write(symbol, "1m", _concat(pending))
+                        pending = []
+            finally:
+                # 중단되어도 받은 거래일까지는 저장해 다음 실행이 이어서 받도록 함
+                await self._write(symbol, "1m", _concat(pending))
+
+    async def run(
+        self,
+        symbols: Sequence[str],
+        intervals: Sequence[str] = ("1d", "1m"),
+        daily_lookback_days: int = settings.HISTORY_SYNC_DAILY_LOOKBACK_DAYS,
+        minute_lookback_days: int = settings.HISTORY_SYNC_MINUTE_LOOKBACK_DAYS,
+        batch_days: int = settings.HISTORY_SYNC_WRITE_BATCH_DAYS
+    ) -> HistorySyncResult:
+        """종목들을 동시에 동기화합니다 (종목별 실패는 result.failed에 기록하고 계속)."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.perf_counter()
+
+        async def sync(symbol: str) -> None:
+            async with semaphore:
+                try:
+                    await self.sync_symbol(symbol, intervals, daily_lookback_days, minute_lookback_days, batch_days)
+                    self.result.symbols += 1
+                except Exception as e:
+                    logger.warning(f"History sync failed for {symbol}: {e}")
+                    self.result.failed[symbol] = str(e)
+
+        await asyncio.gather(*(sync(symbol) for symbol in dict.fromkeys(symbols)))
+        self.result.elapsed = time.perf_counter() - started
+        return self.result
+
+
+def _concat(parts: List[BarSeries]) -> BarSeries:
+    if not parts:
+        return empty_bars()
+    return BarSeries(*(np.concatenate(columns) for columns in zip(*parts)))
+
+
+def _iso(key: str) -> str:
+    return f"{key[:4]}-{key[4:6]}-{key[6:]}"
+
+
+def _shift_day(key: str, days: int) -> str:
+    return (datetime.strptime(key, "%Y%m%d") + timedelta(days=days)).strftime("%Y%m%d")
@@ -1,63 +1,108 @@
-import httpx
+import asyncio
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, NamedTuple, Iterator, AsyncIterator, List, Tuple
 from sqlalchemy.orm import Session
 from app.config import settings
 from app.models.kis_token import KISToken
 from app.models.trading_account import TradingAccount
+from app.services.kis_http import get_http_client, get_async_http_client
+from app.services.kis_rate_limiter import RequestLane, get_rate_limiter
+from app.services.kis_token_cache import token_cache
+from app.services.quote_cache import quote_cache
 import hashlib
 import base64
 import json
+import httpx
+
+# KIS 오류 코드: 초당 거래건수 초과
+RATE_LIMIT_MSG_CD = "EGW00201"
+
+# 연속조회 응답 헤더 tr_cont 값 중 다음 페이지가 있음을 뜻하는 값
+TR_CONT_MORE = ("F", "M")
+# 연속조회 무한 반복 방지
+MAX_PAGES = 200
+
+# 차트 조회 응답(output2)의 최대 행 수 (이전 구간은 날짜/시각을 당겨 다시 조회)
+DAILY_CHART_PAGE_SIZE = 100
+MINUTE_CHART_PAGE_SIZE = 120
+
+
+def _balance_summary(page: Dict[str, Any]) -> Dict[str, Any]:
+    # 잔고 조회 output2는 한 행짜리 목록
+    output2 = page.get("output2") or {}
+    if isinstance(output2, list):
+        return output2[0] if output2 else {}
+    return output2
+
+
+class KISAPIError(Exception):
+    """KIS API가 오류 코드(msg_cd)와 함께 요청을 거부한 경우"""
+
+    def __init__(self, msg_cd: str, message: str, status_code: int):
+        super().__init__(f"[{msg_cd}] {message}")
+        self.msg_cd = msg_cd
+        self.message = message
+        self.status_code = status_code
+
+
+class KISRateLimitError(KISAPIError):
+    """앱키별 초당 요청 한도 초과 (EGW00201)"""
 
 
-class KISAPIClient:
+class KISRequest(NamedTuple):
+    """KIS API 요청 정의 (동기/비동기 클라이언트가 공유)"""
+    method: str
+    path: str
+    tr_id: str
+    params: Optional[Dict[str, Any]] = None
+    body: Optional[Dict[str, Any]] = None
+    use_hash: bool = False
+    lane: RequestLane = RequestLane.QUOTE
+    tr_cont: str = ""  # 연속조회 시 "N"
+
+
+class _BaseKISAPIClient:
+    """요청 구성과 토큰 저장 로직. 전송 방식은 하위 클래스가 담당합니다."""
+
     def __init__(self, trading_account: TradingAccount, db: Session):
         self.trading_account = trading_account
         self.db = db
         self.base_url = settings.KIS_BASE_URL
         self.app_key = trading_account.app_key
         self.app_secret = trading_account.app_secret
-    
-    def _get_or_refresh_token(self) -> str:
-        """토큰을 가져오거나 갱신합니다."""
-        # DB에서 최신 토큰 조회
+
+    def _load_token_from_db(self) -> Optional[str]:
+        """DB의 최신 토큰이 유효하면 캐시에 적재하고 반환합니다."""
         kis_token = self.db.query(KISToken).filter(
             KISToken.trading_account_id == self.trading_account.id
         ).order_by(KISToken.issued_at.desc()).first()
-        
-        # 토큰이 있고 유효한지 확인
-        if kis_token:
-            issued_time = kis_token.issued_at
-            expires_at = issued_time + timedelta(seconds=kis_token.expires_in)
-            now = datetime.now(timezone.utc)
-            
-            # 만료 5분 전이면 갱신
-            if now < expires_at - timedelta(minutes=5):
-                return kis_token.access_token
-        
-        # 새 토큰 발급
-        return self._issue_new_token()
-    
-    def _issue_new_token(self) -> str:
-        """새로운 Access Token을 발급합니다."""
-        url = f"{self.base_url}/oauth2/tokenP"
-        
-        headers = {
-            "content-type": "application/json"
-        }
-        
-        data = {
-            "grant_type": "client_credentials",
-            "appkey": self.app_key,
-            "appsecret": self.app_secret
-        }
-        
-        with httpx.Client() as client:
-            response = client.post(url, headers=headers, json=data)
-            response.raise_for_status()
-            token_data = response.json()
-        
-        # DB에 토큰 저장
+
+        if not kis_token:
+            return None
+
+        issued_time = kis_token.issued_at
+        if issued_time.tzinfo is None:
+            issued_time = issued_time.replace(tzinfo=timezone.utc)
+        expires_at = issued_time + timedelta(seconds=kis_token.expires_in)
+
+        token_cache.set(self.trading_account.id, kis_token.access_token, expires_at)
+        return token_cache.get(self.trading_account.id)
+
+    def _token_request(self) -> KISRequest:
+        """Access Token 발급 요청을 구성합니다."""
+        return KISRequest(
+            "POST",
+            "/oauth2/tokenP",
+            tr_id="",
+            body={
+                "grant_type": "client_credentials",
+                "appkey": self.app_key,
+                "appsecret": self.app_secret
+            }
+        )
+
+    def _store_issued_token(self, token_data: Dict[str, Any]) -> str:
+        """발급받은 토큰을 DB와 캐시에 저장합니다."""
         kis_token = KISToken(
             trading_account_id=self.trading_account.id,
             access_token=token_data["access_token"],
@@ -66,9 +111,12 @@ class KISAPIClient:
         )
         self.db.add(kis_token)
         self.db.commit()
-        
-        return token_data["access_token"]
-    
+
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=kis_token.expires_in)
+        token_cache.set(self.trading_account.id, kis_token.access_token, expires_at)
+
+        return kis_token.access_token
+
     def _generate_hashkey(self, data: Dict[str, Any]) -> str:
         """해시키를 생성합니다."""
         data_str = json.dumps(data, separators=(',', ':'))
@@ -76,46 +124,62 @@ class KISAPIClient:
         hash_output = hashlib.sha256(hash_input).digest()
         hashkey = base64.b64encode(hash_output).decode('utf-8')
         return hashkey
-    
-    def _get_headers(self, tr_id: str, use_hash: bool = False, hash_data: Optional[Dict] = None) -> Dict[str, str]:
+
+    def _build_headers(self, access_token: str, request: KISRequest) -> Dict[str, str]:
         """API 요청 헤더를 생성합니다."""
-        access_token = self._get_or_refresh_token()
-        
         headers = {
             "content-type": "application/json",
             "authorization": f"Bearer {access_token}",
             "appkey": self.app_key,
             "appsecret": self.app_secret,
-            "tr_id": tr_id
+            "tr_id": request.tr_id
         }
-        
-        if use_hash and hash_data:
+        if request.tr_cont:
+            headers["tr_cont"] = request.tr_cont
+
+        hash_data = request.body if request.body is not None else request.params
+        if request.use_hash and hash_data:
             headers["hashkey"] = self._generate_hashkey(hash_data)
-        
+
         return headers
-    
-    def get_current_price(self, symbol: str, market_code: str = "J") -> Dict[str, Any]:
-        """현재가를 조회합니다."""
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-price"
-        tr_id = "FHKST01010100"
-        
+
+    def _parse_response(self, response: httpx.Response) -> Dict[str, Any]:
+        """응답을 검사하고 JSON 본문을 반환합니다."""
+        if response.status_code >= 400:
+            try:
+                error = response.json()
+            except ValueError:
+                error = {}
+            if error.get("msg_cd") == RATE_LIMIT_MSG_CD:
+                raise KISRateLimitError(RATE_LIMIT_MSG_CD, error.get("msg1", ""), response.status_code)
+        response.raise_for_status()
+        return response.json()
+
+    def _next_page_request(
+        self,
+        request: KISRequest,
+        body: Dict[str, Any],
+        response_headers: httpx.Headers
+    ) -> Optional[KISRequest]:
+        """연속조회 키(tr_cont 헤더, CTX_AREA_*)로 다음 페이지 요청을 구성합니다."""
+        if response_headers.get("tr_cont") not in TR_CONT_MORE:
+            return None
+
+        params = dict(request.params)
+        params["CTX_AREA_FK100"] = body.get("ctx_area_fk100", "")
+        params["CTX_AREA_NK100"] = body.get("ctx_area_nk100", "")
+        return request._replace(params=params, tr_cont="N")
+
+    def _current_price_request(self, symbol: str, market_code: str) -> KISRequest:
         params = {
             "FID_COND_MRKT_DIV_CODE": market_code,  # J: 주식, Q: 코스닥
             "FID_INPUT_ISCD": symbol
         }
-        
-        headers = self._get_headers(tr_id)
-        
-        with httpx.Client() as client:
-            response = client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            return response.json()
-    
-    def get_balance(self, account_number: str) -> Dict[str, Any]:
-        """계좌 잔고를 조회합니다."""
-        url = f"{self.base_url}/uapi/domestic-stock/v1/trading/inquire-balance"
-        tr_id = "TTTC8434R"  # 주식 잔고조회
-        
+        return KISRequest(
+            "GET", "/uapi/domestic-stock/v1/quotations/inquire-price", "FHKST01010100", params=params
+        )
+
+    def _balance_request(self, account_number: str) -> KISRequest:
         params = {
             "CANO": account_number[:8],  # 계좌번호 앞 8자리
             "ACNT_PRDT_CD": account_number[8:],  # 계좌번호 뒤 2자리
@@ -129,33 +193,25 @@ class KISAPIClient:
             "CTX_AREA_FK100": "",
             "CTX_AREA_NK100": ""
         }
-        
-        headers = self._get_headers(tr_id, use_hash=True, hash_data=params)
-        
-        with httpx.Client() as client:
-            response = client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            return response.json()
-    
-    def place_order(
+        # TTTC8434R: 주식 잔고조회
+        return KISRequest(
+            "GET", "/uapi/domestic-stock/v1/trading/inquire-balance", "TTTC8434R",
+            params=params, use_hash=True, lane=RequestLane.ACCOUNT
+        )
+
+    def _order_request(
         self,
         account_number: str,
         symbol: str,
-        order_type: str,  # "01": 매도, "02": 매수
+        order_type: str,
         quantity: int,
-        price: Optional[int] = None,
-        order_method: str = "00"  # "00": 지정가, "01": 시장가
-    ) -> Dict[str, Any]:
-        """주문을 실행합니다."""
-        url = f"{self.base_url}/uapi/domestic-stock/v1/trading/order-cash"
+        price: Optional[int],
+        order_method: str
+    ) -> KISRequest:
         tr_id = "TTTC0802U"  # 주식 현금 매수 주문
-        
         if order_type == "SELL":
             tr_id = "TTTC0801U"  # 주식 현금 매도 주문
-            order_type_code = "01"
-        else:
-            order_type_code = "02"
-        
+
         data = {
             "CANO": account_number[:8],
             "ACNT_PRDT_CD": account_number[8:],
@@ -164,29 +220,409 @@ class KISAPIClient:
             "ORD_QTY": str(quantity),
             "ORD_UNPR": str(price) if price else "0"
         }
-        
-        headers = self._get_headers(tr_id, use_hash=True, hash_data=data)
-        
-        with httpx.Client() as client:
-            response = client.post(url, headers=headers, json=data)
-            response.raise_for_status()
-            return response.json()
-    
-    def get_news(self, symbol: Optional[str] = None) -> Dict[str, Any]:
-        """뉴스를 조회합니다."""
+        return KISRequest(
+            "POST", "/uapi/domestic-stock/v1/trading/order-cash", tr_id, body=data, use_hash=True,
+            lane=RequestLane.ORDER
+        )
+
+    def _daily_executions_request(self, account_number: str, start_date: str, end_date: str) -> KISRequest:
+        params = {
+            "CANO": account_number[:8],
+            "ACNT_PRDT_CD": account_number[8:],
+            "INQR_STRT_DT": start_date,  # YYYYMMDD
+            "INQR_END_DT": end_date,
+            "SLL_BUY_DVSN_CD": "00",  # 00: 전체, 01: 매도, 02: 매수
+            "INQR_DVSN": "00",  # 00: 역순
+            "PDNO": "",
+            "CCLD_DVSN": "00",  # 00: 전체, 01: 체결, 02: 미체결
+            "ORD_GNO_BRNO": "",
+            "ODNO": "",
+            "INQR_DVSN_3": "00",
+            "INQR_DVSN_1": "",
+            "CTX_AREA_FK100": "",
+            "CTX_AREA_NK100": ""
+        }
+        # TTTC8001R: 주식 일별 주문 체결 조회 (3개월 이내)
+        return KISRequest(
+            "GET", "/uapi/domestic-stock/v1/trading/inquire-daily-ccld", "TTTC8001R",
+            params=params, lane=RequestLane.ACCOUNT
+        )
+
+    def _daily_chart_request(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        period: str,
+        market_code: str
+    ) -> KISRequest:
+        params = {
+            "FID_COND_MRKT_DIV_CODE": market_code,
+            "FID_INPUT_ISCD": symbol,
+            "FID_INPUT_DATE_1": start_date,  # YYYYMMDD
+            "FID_INPUT_DATE_2": end_date,
+            "FID_PERIOD_DIV_CODE": period,  # D: 일, W: 주, M: 월, Y: 년
+            "FID_ORG_ADJ_PRC": "0"  # 0: 수정주가, 1: 원주가
+        }
+        # FHKST03010100: 국내주식 기간별 시세 (최근 날짜부터 최대 100건)
+        return KISRequest(
+            "GET", "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice", "FHKST03010100",
+            params=params, lane=RequestLane.BACKGROUND
+        )
+
+    def _minute_chart_request(self, symbol: str, hour: str, date: Optional[str], market_code: str) -> KISRequest:
+        if date is None:
+            params = {
+                "FID_ETC_CLS_CODE": "",
+                "FID_COND_MRKT_DIV_CODE": market_code,
+                "FID_INPUT_ISCD": symbol,
+                "FID_INPUT_HOUR_1": hour,  # HHMMSS 이전 봉부터
+                "FID_PW_DATA_INCU_YN": "N"
+            }
+            # FHKST03010200: 주식 당일 분봉 (최대 30건)
+            return KISRequest(
+                "GET", "/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice", "FHKST03010200",
+                params=params, lane=RequestLane.BACKGROUND
+            )
+
+        params = {
+            "FID_COND_MRKT_DIV_CODE": market_code,
+            "FID_INPUT_ISCD": symbol,
+            "FID_INPUT_HOUR_1": hour,
+            "FID_INPUT_DATE_1": date,  # YYYYMMDD
+            "FID_PW_DATA_INCU_YN": "N",  # 이전 거래일 봉 미포함
+            "FID_FAKE_TICK_INCU_YN": ""
+        }
+        # FHKST03010230: 주식 일별 분봉 (실전투자 전용, 최근 시각부터 최대 120건)
+        return KISRequest(
+            "GET", "/uapi/domestic-stock/v1/quotations/inquire-time-dailychartprice", "FHKST03010230",
+            params=params, lane=RequestLane.BACKGROUND
+        )
+
+    def _news_request(self, symbol: Optional[str]) -> KISRequest:
         # 한국투자증권 API의 뉴스 엔드포인트 사용
         # 실제 API 문서에 따라 구현 필요
-        url = f"{self.base_url}/uapi/news"
-        tr_id = "NEWS001"
-        
         params = {}
         if symbol:
             params["symbol"] = symbol
-        
-        headers = self._get_headers(tr_id)
-        
-        with httpx.Client() as client:
-            response = client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            return response.json()
+        return KISRequest("GET", "/uapi/news", "NEWS001", params=params, lane=RequestLane.BACKGROUND)
 
+
+class KISAPIClient(_BaseKISAPIClient):
+    """동기 KIS API 클라이언트 (scripts 및 스레드 기반 호출용)"""
+
+    def _get_or_refresh_token(self) -> str:
+        """토큰을 가져오거나 갱신합니다."""
+        account_id = self.trading_account.id
+
+        # 프로세스 캐시 우선 조회 (DB 조회 없음)
+        access_token = token_cache.get(account_id)
+        if access_token:
+            return access_token
+
+        # 계정별로 한 번에 하나의 갱신만 수행
+        with token_cache.lock(account_id):
+            # 락 대기 중 다른 요청이 이미 갱신했을 수 있음
+            access_token = token_cache.get(account_id)
+            if access_token:
+                return access_token
+
+            access_token = self._load_token_from_db()
+            if access_token:
+                return access_token
+
+            # 새 토큰 발급
+            return self._issue_new_token()
+
+    def _issue_new_token(self) -> str:
+        """새로운 Access Token을 발급합니다."""
+        request = self._token_request()
+        client = get_http_client(self.base_url)
+        response = client.post(
+            f"{self.base_url}{request.path}",
+            headers={"content-type": "application/json"},
+            json=request.body
+        )
+        response.raise_for_status()
+        return self._store_issued_token(response.json())
+
+    def _request(self, request: KISRequest) -> Tuple[Dict[str, Any], httpx.Headers]:
+        """요청을 앱키별 속도 제한을 거쳐 공유 커넥션 풀로 전송합니다.
+
+        Returns:
+            (응답 본문, 응답 헤더)
+        """
+        limiter = get_rate_limiter(self.app_key)
+        client = get_http_client(self.base_url)
+
+        for attempt in range(settings.KIS_RATE_LIMIT_RETRIES + 1):
+            limiter.acquire(request.lane)
+            headers = self._build_headers(self._get_or_refresh_token(), request)
+            response = client.request(
+                request.method,
+                f"{self.base_url}{request.path}",
+                headers=headers,
+                params=request.params,
+                json=request.body
+            )
+            try:
+                return self._parse_response(response), response.headers
+            except KISRateLimitError:
+                # EGW00201은 처리되지 않은 요청이므로 주문도 안전하게 재시도 가능
+                limiter.record_rate_limited(request.lane)
+                if attempt == settings.KIS_RATE_LIMIT_RETRIES:
+                    raise
+
+    def _send(self, request: KISRequest) -> Dict[str, Any]:
+        return self._request(request)[0]
+
+    def _iter_pages(self, request: KISRequest) -> Iterator[Dict[str, Any]]:
+        """연속조회 페이지를 순서대로 반환합니다."""
+        for _ in range(MAX_PAGES):
+            body, response_headers = self._request(request)
+            yield body
+            request = self._next_page_request(request, body, response_headers)
+            if request is None:
+                return
+
+    def get_current_price(self, symbol: str, market_code: str = "J") -> Dict[str, Any]:
+        """현재가를 조회합니다."""
+        return self._send(self._current_price_request(symbol, market_code))
+
+    def get_balance(self, account_number: str) -> Dict[str, Any]:
+        """계좌 잔고를 조회합니다 (첫 페이지만)."""
+        return self._send(self._balance_request(account_number))
+
+    def iter_balance(self, account_number: str) -> Iterator[List[Dict[str, Any]]]:
+        """연속조회로 전체 보유 종목을 페이지 단위로 반환합니다.
+
+        Yields:
+            페이지별 보유 종목 목록 (output1)
+        """
+        for page in self._iter_pages(self._balance_request(account_number)):
+            yield page.get("output1") or []
+
+    def get_holdings(self, account_number: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """연속조회로 전체 보유 종목과 계좌 평가 요약을 조회합니다.
+
+        Returns:
+            (보유 종목 목록 output1, 마지막 페이지의 평가 요약 output2)
+        """
+        holdings: List[Dict[str, Any]] = []
+        summary: Dict[str, Any] = {}
+        for page in self._iter_pages(self._balance_request(account_number)):
+            holdings.extend(page.get("output1") or [])
+            summary = _balance_summary(page) or summary
+        return holdings, summary
+
+    def place_order(
+        self,
+        account_number: str,
+        symbol: str,
+        order_type: str,  # "BUY", "SELL"
+        quantity: int,
+        price: Optional[int] = None,
+        order_method: str = "00"  # "00": 지정가, "01": 시장가
+    ) -> Dict[str, Any]:
+        """주문을 실행합니다."""
+        return self._send(
+            self._order_request(account_number, symbol, order_type, quantity, price, order_method)
+        )
+
+    def iter_daily_executions(
+        self,
+        account_number: str,
+        start_date: str,
+        end_date: str
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """연속조회로 기간(YYYYMMDD) 내 주문별 체결 내역을 페이지 단위로 반환합니다.
+
+        Yields:
+            페이지별 주문 목록 (output1: odno, ord_qty, tot_ccld_qty, avg_prvs, rmn_qty, cncl_yn 등)
+        """
+        for page in self._iter_pages(self._daily_executions_request(account_number, start_date, end_date)):
+            yield page.get("output1") or []
+
+    def get_daily_chart(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        period: str = "D",
+        market_code: str = "J"
+    ) -> Dict[str, Any]:
+        """기간별 시세(일/주/월/년봉)를 조회합니다 (output2, 최근 날짜부터 최대 100건)."""
+        return self._send(self._daily_chart_request(symbol, start_date, end_date, period, market_code))
+
+    def get_minute_chart(
+        self,
+        symbol: str,
+        hour: str = "153000",
+        date: Optional[str] = None,
+        market_code: str = "J"
+    ) -> Dict[str, Any]:
+        """hour(HHMMSS) 이전의 분봉을 조회합니다 (date 생략 시 당일, output2는 최근 시각부터)."""
+        return self._send(self._minute_chart_request(symbol, hour, date, market_code))
+
+    def get_news(self, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """뉴스를 조회합니다."""
+        return self._send(self._news_request(symbol))
+
+
+class AsyncKISAPIClient(_BaseKISAPIClient):
+    """asyncio KIS API 클라이언트 (KISAPIClient와 동일한 메서드 제공)
+
+    요청 대기 중 이벤트 루프를 점유하지 않으므로 하나의 워커에서 수백 개의
+    KIS 호출을 동시에 처리할 수 있습니다. DB 접근(토큰 캐시 미스)만 스레드에서 실행합니다.
+    """
+
+    async def _get_or_refresh_token(self) -> str:
+        """토큰을 가져오거나 갱신합니다."""
+        account_id = self.trading_account.id
+
+        access_token = token_cache.get(account_id)
+        if access_token:
+            return access_token
+
+        async with token_cache.async_lock(account_id):
+            access_token = token_cache.get(account_id)
+            if access_token:
+                return access_token
+
+            access_token = await asyncio.to_thread(self._load_token_from_db)
+            if access_token:
+                return access_token
+
+            return await self._issue_new_token()
+
+    async def _issue_new_token(self) -> str:
+        """새로운 Access Token을 발급합니다."""
+        request = self._token_request()
+        client = get_async_http_client(self.base_url)
+        response = await client.post(
+            f"{self.base_url}{request.path}",
+            headers={"content-type": "application/json"},
+            json=request.body
+        )
+        response.raise_for_status()
+        return await asyncio.to_thread(self._store_issued_token, response.json())
+
+    async def _request(self, request: KISRequest) -> Tuple[Dict[str, Any], httpx.Headers]:
+        """요청을 앱키별 속도 제한을 거쳐 공유 비동기 커넥션 풀로 전송합니다."""
+        limiter = get_rate_limiter(self.app_key)
+        client = get_async_http_client(self.base_url)
+
+        for attempt in range(settings.KIS_RATE_LIMIT_RETRIES + 1):
+            await limiter.acquire_async(request.lane)
+            headers = self._build_headers(await self._get_or_refresh_token(), request)
+            response = await client.request(
+                request.method,
+                f"{self.base_url}{request.path}",
+                headers=headers,
+                params=request.params,
+                json=request.body
+            )
+            try:
+                return self._parse_response(response), response.headers
+            except KISRateLimitError:
+                limiter.record_rate_limited(request.lane)
+                if attempt == settings.KIS_RATE_LIMIT_RETRIES:
+                    raise
+
+    async def _send(self, request: KISRequest) -> Dict[str, Any]:
+        return (await self._request(request))[0]
+
+    async def _iter_pages(self, request: KISRequest) -> AsyncIterator[Dict[str, Any]]:
+        """연속조회 페이지를 순서대로 반환합니다."""
+        for _ in range(MAX_PAGES):
+            body, response_headers = await self._request(request)
+            yield body
+            request = self._next_page_request(request, body, response_headers)
+            if request is None:
+                return
+
+    async def get_current_price(self, symbol: str, market_code: str = "J") -> Dict[str, Any]:
+        """현재가를 조회합니다 (공유 캐시 및 동시 요청 합류 적용)."""
+        return await quote_cache.get_or_fetch(
+            (market_code, symbol),
+            lambda: self._send(self._current_price_request(symbol, market_code))
+        )
+
+    async def get_balance(self, account_number: str) -> Dict[str, Any]:
+        """계좌 잔고를 조회합니다 (첫 페이지만)."""
+        return await self._send(self._balance_request(account_number))
+
+    async def iter_balance(self, account_number: str) -> AsyncIterator[List[Dict[str, Any]]]:
+        """연속조회로 전체 보유 종목을 페이지 단위로 반환합니다.
+
+        Yields:
+            페이지별 보유 종목 목록 (output1)
+        """
+        async for page in self._iter_pages(self._balance_request(account_number)):
+            yield page.get("output1") or []
+
+    async def get_holdings(self, account_number: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """연속조회로 전체 보유 종목과 계좌 평가 요약을 조회합니다.
+
+        Returns:
+            (보유 종목 목록 output1, 마지막 페이지의 평가 요약 output2)
+        """
+        holdings: List[Dict[str, Any]] = []
+        summary: Dict[str, Any] = {}
+        async for page in self._iter_pages(self._balance_request(account_number)):
+            holdings.extend(page.get("output1") or [])
+            summary = _balance_summary(page) or summary
+        return holdings, summary
+
+    async def place_order(
+        self,
+        account_number: str,
+        symbol: str,
+        order_type: str,  # "BUY", "SELL"
+        quantity: int,
+        price: Optional[int] = None,
+        order_method: str = "00"  # "00": 지정가, "01": 시장가
+    ) -> Dict[str, Any]:
+        """주문을 실행합니다."""
+        return await self._send(
+            self._order_request(account_number, symbol, order_type, quantity, price, order_method)
+        )
+
+    async def iter_daily_executions(
+        self,
+        account_number: str,
+        start_date: str,
+        end_date: str
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """연속조회로 기간(YYYYMMDD) 내 주문별 체결 내역을 페이지 단위로 반환합니다.
+
+        Yields:
+            페이지별 주문 목록 (output1)
+        """
+        async for page in self._iter_pages(self._daily_executions_request(account_number, start_date, end_date)):
+            yield page.get("output1") or []
+
+    async def get_daily_chart(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        period: str = "D",
+        market_code: str = "J"
+    ) -> Dict[str, Any]:
+        """기간별 시세(일/주/월/년봉)를 조회합니다 (output2, 최근 날짜부터 최대 100건)."""
+        return await self._send(self._daily_chart_request(symbol, start_date, end_date, period, market_code))
+
+    async def get_minute_chart(
+        self,
+        symbol: str,
+        hour: str = "153000",
+        date: Optional[str] = None,
+        market_code: str = "J"
+    ) -> Dict[str, Any]:
+        """hour(HHMMSS) 이전의 분봉을 조회합니다 (date 생략 시 당일, output2는 최근 시각부터)."""
+        return await self._send(self._minute_chart_request(symbol, hour, date, market_code))
+
+    async def get_news(self, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """뉴스를 조회합니다."""
+        return await self._send(self._news_request(symbol))
@@ -0,0 +1,95 @@
+"""
+KIS API 공유 HTTP 커넥션 풀
+
+KISAPIClient 인스턴스는 요청마다 생성되므로, 호출마다 httpx.Client를 새로 열면
+매번 TCP+TLS 핸드셰이크 비용을 지불하게 됩니다. 이 모듈은 프로세스 전역에서
+base URL별로 하나의 keep-alive 커넥션 풀을 유지하고, 앱 종료 시 정리합니다.
+"""
+import threading
+from typing import Any, Dict
+
+import httpx
+
+from app.config import settings
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_clients: Dict[str, httpx.Client] = {}
+_async_clients: Dict[str, httpx.AsyncClient] = {}
+_lock = threading.Lock()
+
+
+def _client_options() -> Dict[str, Any]:
+    """Settings에서 커넥션 풀 옵션을 구성합니다."""
+    return {
+        "timeout": httpx.Timeout(
+            settings.KIS_HTTP_TIMEOUT,
+            connect=settings.KIS_HTTP_CONNECT_TIMEOUT
+        ),
+        "limits": httpx.Limits(
+            max_connections=settings.KIS_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.KIS_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.KIS_HTTP_KEEPALIVE_EXPIRY
+        ),
+        "http2": settings.KIS_HTTP2 and HTTP2_AVAILABLE,
+        "verify": settings.KIS_HTTP_VERIFY_SSL,
+    }
+
+
+def get_http_client(base_url: str) -> httpx.Client:
+    """base URL에 해당하는 공유 httpx.Client를 반환합니다.
+
+    Args:
+        base_url: KIS API base URL (예: settings.KIS_BASE_URL)
+
+    Returns:
+        스레드 간에 공유되는 keep-alive httpx.Client
+    """
+    client = _clients.get(base_url)
+    if client is not None and not client.is_closed:
+        return client
+
+    with _lock:
+        client = _clients.get(base_url)
+        if client is None or client.is_closed:
+            client = httpx.Client(**_client_options())
+            _clients[base_url] = client
+        return client
+
+
+def get_async_http_client(base_url: str) -> httpx.AsyncClient:
+    """base URL에 해당하는 공유 httpx.AsyncClient를 반환합니다.
+
+    AsyncClient는 처음 사용된 이벤트 루프에 묶이므로 앱의 이벤트 루프에서만 사용합니다.
+    """
+    client = _async_clients.get(base_url)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(**_client_options())
+        _async_clients[base_url] = client
+    return client
+
+
+def close_http_clients() -> None:
+    """모든 공유 커넥션 풀을 닫습니다 (앱 종료 시 호출)."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+
+    for client in clients:
+        client.close()
+
+
+async def aclose_http_clients() -> None:
+    """동기/비동기 공유 커넥션 풀을 모두 닫습니다 (앱 종료 시 호출)."""
+    clients = list(_async_clients.values())
+    _async_clients.clear()
+
+    for client in clients:
+        await client.aclose()
+
+    close_http_clients()
@@ -0,0 +1,252 @@
+"""
+KIS API 앱키별 요청 속도 제한기
+
+KIS는 앱키 단위로 초당 요청 수를 제한하며(초과 시 EGW00201), 시세 조회가 몰리면
+주문까지 거부될 수 있습니다. 앱키별 토큰 버킷에 우선순위 대기열을 두어 토큰이
+부족할 때는 주문 요청이 시세/뉴스 요청보다 먼저 토큰을 받도록 합니다.
+
+스레드(동기 KISAPIClient)와 asyncio 태스크(AsyncKISAPIClient)가 같은 버킷을
+공유할 수 있도록 상태는 threading.Lock으로 보호합니다.
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+
+class RequestLane(IntEnum):
+    """요청 우선순위 (값이 작을수록 먼저 처리)"""
+    ORDER = 0  # 주문/정정/취소
+    ACCOUNT = 1  # 잔고/체결 조회
+    QUOTE = 2  # 시세 조회
+    BACKGROUND = 3  # 뉴스, 히스토리 동기화 등
+
+
+class _Waiter:
+    """토큰을 기다리는 요청. 대기열 선두가 되면 notify()로 깨웁니다."""
+
+    __slots__ = ("lane", "enqueued_at", "_event", "_loop")
+
+    def __init__(self, lane: RequestLane, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.lane = lane
+        self.enqueued_at = time.monotonic()
+        self._loop = loop
+        self._event = asyncio.Event() if loop else threading.Event()
+
+    def clear(self) -> None:
+        self._event.clear()
+
+    def notify(self) -> None:
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._event.set)
+        else:
+            self._event.set()
+
+    def wait(self, timeout: Optional[float]) -> None:
+        self._event.wait(timeout)
+
+    async def wait_async(self, timeout: Optional[float]) -> None:
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+class _LaneStats:
+    __slots__ = ("acquired", "rate_limited", "total_wait", "max_wait")
+
+    def __init__(self):
+        self.acquired = 0
+        self.rate_limited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class TokenBucketLimiter:
+    """우선순위 대기열을 가진 토큰 버킷
+
+    Args:
+        rate: 초당 보충되는 토큰 수
+        capacity: 버킷 최대 토큰 수 (순간 허용량)
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._queue: List[Tuple[int, int, _Waiter]] = []
+        self._seq = itertools.count()
+        self._stats = {lane: _LaneStats() for lane in RequestLane}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_fast_path(self) -> bool:
+        """대기열이 비어 있고 토큰이 있으면 즉시 차감합니다. (락 보유 상태에서 호출)"""
+        self._refill(time.monotonic())
+        if not self._queue and self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def _poll(self, waiter: _Waiter) -> Optional[float]:
+        """대기 중인 요청의 상태를 확인합니다. (락 보유 상태에서 호출)
+
+        Returns:
+            0이면 토큰 획득, 양수면 다음 토큰까지 대기 시간(초),
+            None이면 선두가 아니므로 notify()까지 대기
+        """
+        waiter.clear()
+        if self._queue[0][2] is not waiter:
+            return None
+
+        self._refill(time.monotonic())
+        if self._tokens >= 1:
+            self._tokens -= 1
+            heapq.heappop(self._queue)
+            if self._queue:
+                self._queue[0][2].notify()
+            return 0
+        return (1 - self._tokens) / self.rate
+
+    def _enqueue(self, waiter: _Waiter) -> None:
+        heapq.heappush(self._queue, (int(waiter.lane), next(self._seq), waiter))
+        # 새 요청이 선두가 되었으면 스스로 대기 시간을 계산하도록 깨움
+        if self._queue[0][2] is waiter:
+            waiter.notify()
+
+    def _discard(self, waiter: _Waiter) -> None:
+        """취소된 요청을 대기열에서 제거합니다. (락 보유 상태에서 호출)"""
+        for index, entry in enumerate(self._queue):
+            if entry[2] is waiter:
+                was_head = index == 0
+                self._queue.pop(index)
+                heapq.heapify(self._queue)
+                if was_head and self._queue:
+                    self._queue[0][2].notify()
+                return
+
+    def _record(self, lane: RequestLane, waited: float) -> None:
+        stats = self._stats[lane]
+        stats.acquired += 1
+        stats.total_wait += waited
+        stats.max_wait = max(stats.max_wait, waited)
+
+    def acquire(self, lane: RequestLane = RequestLane.QUOTE) -> float:
+        """토큰을 얻을 때까지 현재 스레드를 블록합니다.
+
+        Returns:
+            대기한 시간(초)
+        """
+        with self._lock:
+            if self._try_fast_path():
+                self._record(lane, 0.0)
+                return 0.0
+            waiter = _Waiter(lane)
+            self._enqueue(waiter)
+
+        try:
+            while True:
+                with self._lock:
+                    delay = self._poll(waiter)
+                if delay == 0:
+                    break
+                waiter.wait(delay)
+        except BaseException:
+            with self._lock:
+                self._discard(waiter)
+            raise
+
+        waited = time.monotonic() - waiter.enqueued_at
+        with self._lock:
+            self._record(lane, waited)
+        return waited
+
+    async def acquire_async(self, lane: RequestLane = RequestLane.QUOTE) -> float:
+        """토큰을 얻을 때까지 현재 태스크를 대기시킵니다.
+
+        Returns:
+            대기한 시간(초)
+        """
+        with self._lock:
+            if self._try_fast_path():
+                self._record(lane, 0.0)
+                return 0.0
+            waiter = _Waiter(lane, asyncio.get_running_loop())
+            self._enqueue(waiter)
+
+        try:
+            while True:
+                with self._lock:
+                    delay = self._poll(waiter)
+                if delay == 0:
+                    break
+                await waiter.wait_async(delay)
+        except BaseException:
+            with self._lock:
+                self._discard(waiter)
+            raise
+
+        waited = time.monotonic() - waiter.enqueued_at
+        with self._lock:
+            self._record(lane, waited)
+        return waited
+
+    def record_rate_limited(self, lane: RequestLane) -> None:
+        """KIS가 속도 제한 오류(EGW00201)를 반환한 요청을 기록합니다."""
+        with self._lock:
+            self._stats[lane].rate_limited += 1
+            # 서버 측 윈도우와 어긋났으므로 남은 토큰을 비워 속도를 늦춤
+            self._tokens = min(self._tokens, 0.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """레인별 대기열 깊이와 대기 시간 지표를 반환합니다."""
+        with self._lock:
+            depths = {lane: 0 for lane in RequestLane}
+            for _, _, waiter in self._queue:
+                depths[waiter.lane] += 1
+
+            lanes = {}
+            for lane, stats in self._stats.items():
+                lanes[lane.name.lower()] = {
+                    "queue_depth": depths[lane],
+                    "acquired": stats.acquired,
+                    "rate_limited": stats.rate_limited,
+                    "avg_wait_ms": (stats.total_wait / stats.acquired * 1000) if stats.acquired else 0.0,
+                    "max_wait_ms": stats.max_wait * 1000,
+                }
+            return {"rate_per_sec": self.rate, "capacity": self.capacity, "lanes": lanes}
+
+
+_limiters: Dict[str, TokenBucketLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(app_key: str) -> TokenBucketLimiter:
+    """앱키별 공유 속도 제한기를 반환합니다 (실전/모의투자 환경별 속도 적용)."""
+    limiter = _limiters.get(app_key)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(app_key)
+            if limiter is None:
+                rate = settings.kis_rate_limit_per_sec
+                capacity = max(1.0, settings.KIS_RATE_LIMIT_BURST)
+                limiter = TokenBucketLimiter(rate, capacity)
+                _limiters[app_key] = limiter
+    return limiter
+
+
+def rate_limiter_metrics() -> Dict[str, Any]:
+    """모든 앱키의 속도 제한 지표를 반환합니다 (앱키는 앞 6자리만 노출)."""
+    return {
+        f"{app_key[:6]}...": limiter.snapshot()
+        for app_key, limiter in list(_limiters.items())
+    }
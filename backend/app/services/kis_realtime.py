@@ -0,0 +1,488 @@
+"""
+KIS 실시간(WebSocket) 시세 수신
+
+inquire-price 폴링은 느리고 요청 한도를 많이 소모하므로, 활성 전략과 관심 종목에
+필요한 종목의 실시간 체결가(H0STCNT0)를 하나의 WebSocket 세션으로 구독하고,
+수신 프레임을 작은 틱 레코드로 파싱해 프로세스 내 구독자에게 전달합니다.
+
+KIS 실시간 프레임 형식:
+    데이터: "0|H0STCNT0|002|필드^필드^...^필드^필드..." (0: 평문, 1: 암호화, 002: 레코드 수)
+    제어: JSON (구독 응답, PINGPONG)
+
+체결통보(H0STCNI0, 모의투자 H0STCNI9)는 HTS ID로 구독하며 데이터 부분이 AES-256-CBC로
+암호화되어 옵니다 (키/IV는 구독 응답 output). 같은 앱키의 세션은 하나만 열 수 있으므로
+체결통보 구독(fill_notices)은 시세 수신기와 앱키가 같으면 이 세션을 함께 씁니다.
+"""
+import asyncio
+import base64
+import json
+import logging
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import websockets
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.strategy import Strategy
+from app.services.kis_http import get_async_http_client
+
+logger = logging.getLogger(__name__)
+
+# 실시간 체결가
+TICK_TR_ID = "H0STCNT0"
+# H0STCNT0 레코드당 필드 수
+TICK_FIELD_COUNT = 46
+# 필드 위치: 종목코드, 체결시간(HHMMSS), 현재가, 체결 거래량, 누적 거래량
+_SYMBOL, _TIME, _PRICE, _VOLUME, _CUM_VOLUME = 0, 1, 2, 12, 13
+
+# 실시간 체결통보 (실전, 모의투자)
+NOTICE_TR_ID = "H0STCNI0"
+NOTICE_TR_ID_VIRTUAL = "H0STCNI9"
+# H0STCNI0 레코드당 필드 수
+NOTICE_FIELD_COUNT = 26
+# 필드 위치: 계좌번호, 주문번호, 원주문번호, 매도매수구분, 정정구분, 종목코드, 체결수량, 체결단가,
+#           체결시간, 거부여부, 체결여부, 접수여부, 주문수량
+(
+    _N_ACCOUNT, _N_ORDER_NO, _N_ORIGINAL_ORDER_NO, _N_SIDE, _N_REVISION, _N_SYMBOL, _N_QUANTITY, _N_PRICE,
+    _N_TIME, _N_REJECTED, _N_FILLED, _N_ACCEPTED, _N_ORDER_QUANTITY
+) = 1, 2, 3, 4, 5, 8, 9, 10, 11, 12, 13, 14, 16
+
+KST_OFFSET_MS = 9 * 3600 * 1000
+DAY_MS = 24 * 3600 * 1000
+
+SubscriptionKey = Tuple[str, str]  # (tr_id, tr_key)
+
+
+class TickRecord(NamedTuple):
+    symbol: str
+    timestamp: int  # epoch ms
+    price: float
+    volume: int  # 체결 거래량
+    cumulative_volume: int
+
+
+class ExecutionNotice(NamedTuple):
+    account_number: str
+    order_no: str
+    original_order_no: str  # 정정/취소 주문의 원주문번호
+    side: str  # 01: 매도, 02: 매수
+    revision: str  # 0: 정상, 1: 정정, 2: 취소
+    symbol: str
+    quantity: int  # 체결 통보면 이번 체결 수량, 접수 통보면 주문 수량
+    price: float  # 체결 단가 (접수 통보는 주문 가격)
+    time: str  # HHMMSS
+    rejected: bool
+    filled: bool  # True: 체결 통보, False: 주문/정정/취소/거부 접수 통보
+    accepted: str  # 1: 주문 접수, 2: 확인, 3: 취소(IOC/FOK 잔량)
+    order_quantity: int
+
+
+def kst_day_start_ms(now_ms: Optional[int] = None) -> int:
+    """현재 한국 시간 기준 당일 0시의 epoch ms를 반환합니다."""
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+    return (now_ms + KST_OFFSET_MS) // DAY_MS * DAY_MS - KST_OFFSET_MS
+
+
+def parse_tick_payload(payload: str, count: int, day_start_ms: int) -> List[TickRecord]:
+    """H0STCNT0 데이터 부분('^' 구분, count개 레코드)을 틱 레코드로 변환합니다."""
+    fields = payload.split("^")
+    ticks = []
+    for index in range(count):
+        base = index * TICK_FIELD_COUNT
+        if base + TICK_FIELD_COUNT > len(fields):
+            break
+        hhmmss = fields[base + _TIME]
+        seconds = int(hhmmss[0:2]) * 3600 + int(hhmmss[2:4]) * 60 + int(hhmmss[4:6])
+        ticks.append(TickRecord(
+            fields[base + _SYMBOL],
+            day_start_ms + seconds * 1000,
+            float(fields[base + _PRICE]),
+            int(fields[base + _VOLUME]),
+            int(fields[base + _CUM_VOLUME])
+        ))
+    return ticks
+
+
+def parse_tick_frame(frame: str, day_start_ms: Optional[int] = None) -> List[TickRecord]:
+    """실시간 체결가 데이터 프레임 전체를 틱 레코드로 변환합니다."""
+    encrypted, tr_id, count, payload = frame.split("|", 3)
+    if tr_id != TICK_TR_ID:
+        return []
+    return parse_tick_payload(payload, int(count), day_start_ms or kst_day_start_ms())
+
+
+def notice_tr_id() -> str:
+    """현재 KIS_BASE_URL(실전/모의)에 맞는 체결통보 tr_id를 반환합니다."""
+    return NOTICE_TR_ID_VIRTUAL if settings.kis_is_virtual else NOTICE_TR_ID
+
+
+def decrypt_payload(payload: str, key: str, iv: str) -> str:
+    """암호화된 데이터 부분(base64, AES-256-CBC, PKCS7)을 복호화합니다."""
+    decryptor = Cipher(algorithms.AES(key.encode()), modes.CBC(iv.encode())).decryptor()
+    padded = decryptor.update(base64.b64decode(payload)) + decryptor.finalize()
+    unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+    return (unpadder.update(padded) + unpadder.finalize()).decode("utf-8")
+
+
+def _to_number(text: str) -> float:
+    return float(text) if text.strip() else 0.0
+
+
+def parse_notice_payload(payload: str, count: int) -> List[ExecutionNotice]:
+    """H0STCNI0 데이터 부분(복호화 후, '^' 구분, count개 레코드)을 체결통보로 변환합니다."""
+    fields = payload.split("^")
+    notices = []
+    for index in range(count):
+        base = index * NOTICE_FIELD_COUNT
+        if base + _N_ORDER_QUANTITY >= len(fields):
+            break
+        notices.append(ExecutionNotice(
+            fields[base + _N_ACCOUNT],
+            fields[base + _N_ORDER_NO],
+            fields[base + _N_ORIGINAL_ORDER_NO],
+            fields[base + _N_SIDE],
+            fields[base + _N_REVISION],
+            fields[base + _N_SYMBOL],
+            int(_to_number(fields[base + _N_QUANTITY])),
+            _to_number(fields[base + _N_PRICE]),
+            fields[base + _N_TIME],
+            fields[base + _N_REJECTED] == "1",
+            fields[base + _N_FILLED] == "2",
+            fields[base + _N_ACCEPTED],
+            int(_to_number(fields[base + _N_ORDER_QUANTITY]))
+        ))
+    return notices
+
+
+async def issue_approval_key(base_url: str, app_key: str, app_secret: str) -> str:
+    """실시간 접속키(approval_key)를 발급받습니다."""
+    client = get_async_http_client(base_url)
+    response = await client.post(
+        f"{base_url}/oauth2/Approval",
+        headers={"content-type": "application/json"},
+        json={
+            "grant_type": "client_credentials",
+            "appkey": app_key,
+            "secretkey": app_secret
+        }
+    )
+    response.raise_for_status()
+    return response.json()["approval_key"]
+
+
+class KISRealtimeConnection:
+    """KIS WebSocket 세션 (재접속, 재구독, 구독 수 제한, PINGPONG 처리)
+
+    Args:
+        ws_url: WebSocket 주소
+        approval_key_provider: 접속키를 반환하는 코루틴 함수 (재접속마다 호출)
+        on_data: 데이터 프레임 처리 함수 (tr_id, 암호화 여부, 레코드 수, 데이터 부분)
+        max_subscriptions: 접속키당 최대 구독 수
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        approval_key_provider: Callable[[], Awaitable[str]],
+        on_data: Callable[[str, bool, int, str], None],
+        max_subscriptions: int
+    ):
+        self.ws_url = ws_url
+        self.approval_key_provider = approval_key_provider
+        self.on_data = on_data
+        self.max_subscriptions = max_subscriptions
+        self._desired: Dict[SubscriptionKey, None] = {}
+        self._active: Set[SubscriptionKey] = set()
+        self._changed = asyncio.Event()
+        self._approval_key: Optional[str] = None
+        self.connected = False
+        self.reconnects = 0
+        self.frames = 0
+        self.dropped: List[SubscriptionKey] = []
+        # 구독 응답의 암호화 키 (tr_id별 key, iv)
+        self.cipher_keys: Dict[str, Tuple[str, str]] = {}
+
+    def set_subscriptions(self, keys: Iterable[SubscriptionKey]) -> None:
+        """원하는 구독 목록을 지정합니다. 한도를 넘는 항목은 구독하지 않고 기록합니다."""
+        keys = list(dict.fromkeys(keys))
+        self._desired = dict.fromkeys(keys[:self.max_subscriptions])
+        dropped = keys[self.max_subscriptions:]
+        changed = dropped != self.dropped
+        self.dropped = dropped
+        if dropped and changed:
+            logger.warning(
+                f"KIS realtime subscription limit {self.max_subscriptions} exceeded; "
+                f"{len(self.dropped)} subscriptions dropped"
+            )
+        self._changed.set()
+
+    @property
+    def subscribed(self) -> int:
+        return len(self._active)
+
+    def _message(self, key: SubscriptionKey, subscribe: bool) -> str:
+        tr_id, tr_key = key
+        return json.dumps({
+            "header": {
+                "approval_key": self._approval_key,
+                "custtype": "P",
+                "tr_type": "1" if subscribe else "2",
+                "content-type": "utf-8"
+            },
+            "body": {"input": {"tr_id": tr_id, "tr_key": tr_key}}
+        })
+
+    async def _apply_subscriptions(self, ws) -> None:
+        """원하는 구독 목록과 현재 구독의 차이만 전송합니다."""
+        while True:
+            await self._changed.wait()
+            self._changed.clear()
+            for key in [key for key in self._active if key not in self._desired]:
+                await ws.send(self._message(key, subscribe=False))
+                self._active.discard(key)
+            for key in [key for key in self._desired if key not in self._active]:
+                await ws.send(self._message(key, subscribe=True))
+                self._active.add(key)
+
+    def _handle_control(self, message: str) -> Optional[str]:
+        """JSON 제어 메시지를 처리합니다. 응답으로 보낼 메시지가 있으면 반환합니다."""
+        data = json.loads(message)
+        header = data.get("header", {})
+        tr_id = header.get("tr_id")
+        if tr_id == "PINGPONG":
+            return message
+
+        body = data.get("body", {})
+        if body.get("rt_cd") not in (None, "0"):
+            logger.warning(f"KIS realtime {tr_id} {header.get('tr_key')}: {body.get('msg1')}")
+            self._active.discard((tr_id, header.get("tr_key")))
+            return None
+
+        output = body.get("output") or {}
+        if output.get("key"):
+            self.cipher_keys[tr_id] = (output["key"], output["iv"])
+        return None
+
+    async def _receive(self, ws) -> None:
+        async for message in ws:
+            if message[0] in "01":
+                encrypted, tr_id, count, payload = message.split("|", 3)
+                self.frames += 1
+                try:
+                    self.on_data(tr_id, encrypted == "1", int(count), payload)
+                except Exception:
+                    logger.exception(f"Failed to handle KIS realtime frame {tr_id}")
+            else:
+                reply = self._handle_control(message)
+                if reply:
+                    await ws.send(reply)
+
+    async def run(self) -> None:
+        """연결이 끊기면 지수 백오프로 재접속하고 구독을 복구합니다 (취소될 때까지 실행)."""
+        delay = 1.0
+        while True:
+            try:
+                self._approval_key = await self.approval_key_provider()
+                async with websockets.connect(self.ws_url, ping_interval=None) as ws:
+                    self.connected = True
+                    delay = 1.0
+                    self._active.clear()
+                    self._changed.set()
+                    tasks = [
+                        asyncio.create_task(self._receive(ws)),
+                        asyncio.create_task(self._apply_subscriptions(ws))
+                    ]
+                    try:
+                        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            task.result()
+                    finally:
+                        for task in tasks:
+                            task.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"KIS realtime connection lost: {e}")
+            finally:
+                self.connected = False
+                self._active.clear()
+
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.KIS_WS_RECONNECT_MAX_DELAY)
+
+
+class RealtimeQuoteIngester:
+    """활성 전략과 관심 종목의 실시간 체결가를 수신해 프로세스 내 구독자에게 전달합니다."""
+
+    def __init__(
+        self,
+        app_key: Optional[str] = None,
+        app_secret: Optional[str] = None,
+        ws_url: Optional[str] = None,
+        base_url: Optional[str] = None
+    ):
+        self.app_key = app_key or settings.KIS_APP_KEY
+        self.app_secret = app_secret or settings.KIS_APP_SECRET
+        self.base_url = base_url or settings.KIS_BASE_URL
+        self.connection = KISRealtimeConnection(
+            ws_url or settings.KIS_WS_URL,
+            self._approval_key,
+            self._on_data,
+            settings.KIS_WS_MAX_SUBSCRIPTIONS
+        )
+        self._listeners: List[Callable[[List[TickRecord]], None]] = []
+        self._frame_handlers: Dict[str, Callable[[bool, int, str], None]] = {}
+        self._extra_subscriptions: List[SubscriptionKey] = []
+        self._strategy_symbols: Set[str] = set()
+        self._watchlist: Counter = Counter()  # 관심 종목 → 요청한 구독자 수
+        self._tasks: List[asyncio.Task] = []
+        self._refresh: Optional[asyncio.Event] = None
+        self._day_start_ms = kst_day_start_ms()
+        self.ticks = 0
+        self._rate_started = time.monotonic()
+        self._rate_ticks = 0
+        self.ticks_per_sec = 0.0
+
+    async def _approval_key(self) -> str:
+        return await issue_approval_key(self.base_url, self.app_key, self.app_secret)
+
+    def add_listener(self, listener: Callable[[List[TickRecord]], None]) -> None:
+        """틱 묶음을 받을 함수를 등록합니다."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[List[TickRecord]], None]) -> None:
+        """등록한 함수를 뺍니다 (등록되지 않았으면 무시)."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def set_frame_handler(self, tr_id: str, handler: Optional[Callable[[bool, int, str], None]]) -> None:
+        """체결가 이외의 tr_id 데이터 프레임(암호화 여부, 레코드 수, 데이터 부분)을 받을 함수를 지정합니다."""
+        if handler is None:
+            self._frame_handlers.pop(tr_id, None)
+        else:
+            self._frame_handlers[tr_id] = handler
+
+    def set_extra_subscriptions(self, keys: Iterable[SubscriptionKey]) -> None:
+        """체결가 외에 이 세션으로 구독할 항목(체결통보 등)을 지정합니다 (종목보다 먼저 구독)."""
+        self._extra_subscriptions = list(keys)
+        self._apply_symbols()
+
+    def watch(self, symbols: Iterable[str]) -> None:
+        """관심 종목을 구독 대상에 추가합니다 (종목별 참조 수, 같은 수만큼 unwatch해야 빠짐)."""
+        self._watchlist.update(set(symbols))
+        self._apply_symbols()
+
+    def unwatch(self, symbols: Iterable[str]) -> None:
+        for symbol in set(symbols):
+            if self._watchlist[symbol] <= 1:
+                self._watchlist.pop(symbol, None)
+            else:
+                self._watchlist[symbol] -= 1
+        self._apply_symbols()
+
+    def set_strategy_symbols(self, symbols: Iterable[str]) -> None:
+        """활성 전략이 필요로 하는 종목을 지정합니다 (수신 중에는 _maintain만 호출)."""
+        self._strategy_symbols = set(symbols)
+        self._apply_symbols()
+
+    def refresh_strategy_symbols(self) -> None:
+        """전략이 바뀌었음을 알려 다음 주기를 기다리지 않고 전략 종목을 다시 읽게 합니다."""
+        if self._refresh is not None:
+            self._refresh.set()
+
+    @property
+    def symbols(self) -> List[str]:
+        # 전략 종목을 먼저 구독해 한도 초과 시 관심 종목이 밀려나도록 함
+        return sorted(self._strategy_symbols) + sorted(set(self._watchlist) - self._strategy_symbols)
+
+    def _apply_symbols(self) -> None:
+        self.connection.set_subscriptions(
+            self._extra_subscriptions + [(TICK_TR_ID, symbol) for symbol in self.symbols]
+        )
+
+    def _on_data(self, tr_id: str, encrypted: bool, count: int, payload: str) -> None:
+        if tr_id != TICK_TR_ID:
+            handler = self._frame_handlers.get(tr_id)
+            if handler is not None:
+                handler(encrypted, count, payload)
+            return
+        if encrypted:
+            return
+
+        ticks = parse_tick_payload(payload, count, self._day_start_ms)
+        self.ticks += len(ticks)
+        self._rate_ticks += len(ticks)
+        for listener in self._listeners:
+            listener(ticks)
+
+    async def _maintain(self) -> None:
+        """전략 종목을 주기적으로(또는 refresh_strategy_symbols 요청 시) 다시 읽고 처리율과 날짜 기준을 갱신합니다.
+
+        전략 종목은 이 태스크만 지정합니다 (활성 전략 DB가 기준).
+        """
+        while True:
+            self._refresh.clear()
+            try:
+                symbols = await asyncio.to_thread(_load_active_strategy_symbols)
+                self.set_strategy_symbols(symbols)
+            except Exception as e:
+                logger.warning(f"Failed to load strategy symbols: {e}")
+
+            now = time.monotonic()
+            self.ticks_per_sec = self._rate_ticks / max(now - self._rate_started, 1e-9)
+            self._rate_started, self._rate_ticks = now, 0
+            self._day_start_ms = kst_day_start_ms()
+            try:
+                await asyncio.wait_for(self._refresh.wait(), settings.KIS_REALTIME_SYMBOL_REFRESH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """수신 태스크를 시작합니다 (이벤트 루프 안에서 호출)."""
+        if self._tasks:
+            return
+        self._refresh = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self.connection.run()),
+            asyncio.create_task(self._maintain())
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._refresh = None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "running": bool(self._tasks),
+            "connected": self.connection.connected,
+            "subscribed": self.connection.subscribed,
+            "dropped_symbols": [key for _, key in self.connection.dropped],
+            "reconnects": self.connection.reconnects,
+            "frames": self.connection.frames,
+            "ticks": self.ticks,
+            "ticks_per_sec": round(self.ticks_per_sec, 1),
+        }
+
+
+def _load_active_strategy_symbols() -> Set[str]:
+    db: Session = SessionLocal()
+    try:
+        symbols: Set[str] = set()
+        for strategy in db.query(Strategy).filter(Strategy.is_active == True).all():
+            symbols.update(strategy.symbols)
+        return symbols
+    finally:
+        db.close()
+
+
+quote_ingester = RealtimeQuoteIngester()
@@ -0,0 +1,65 @@
+"""
+KIS Access Token 프로세스 캐시
+
+매 API 호출마다 kis_tokens 테이블을 조회하지 않도록 거래 계정별 토큰을 메모리에
+보관합니다. KIS는 토큰 발급을 1분당 1회로 제한하므로, 계정별 락으로 갱신을
+단일화(single-flight)하여 동시 요청이 한꺼번에 토큰을 발급받지 않게 합니다.
+"""
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, NamedTuple, Optional
+
+# 만료 5분 전부터는 갱신 대상으로 간주
+REFRESH_MARGIN = timedelta(minutes=5)
+
+
+class CachedToken(NamedTuple):
+    access_token: str
+    expires_at: datetime
+
+
+class KISTokenCache:
+    def __init__(self, refresh_margin: timedelta = REFRESH_MARGIN):
+        self.refresh_margin = refresh_margin
+        self._tokens: Dict[int, CachedToken] = {}
+        self._locks: Dict[int, threading.Lock] = {}
+        self._async_locks: Dict[int, asyncio.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def get(self, trading_account_id: int, now: Optional[datetime] = None) -> Optional[str]:
+        """유효한 캐시 토큰을 반환합니다. 없거나 갱신 시점이 지났으면 None."""
+        cached = self._tokens.get(trading_account_id)
+        if cached is None:
+            return None
+
+        now = now or datetime.now(timezone.utc)
+        if now >= cached.expires_at - self.refresh_margin:
+            return None
+        return cached.access_token
+
+    def set(self, trading_account_id: int, access_token: str, expires_at: datetime) -> None:
+        """토큰을 캐시에 저장합니다."""
+        self._tokens[trading_account_id] = CachedToken(access_token, expires_at)
+
+    def invalidate(self, trading_account_id: int) -> None:
+        """계정의 캐시 토큰을 제거합니다."""
+        self._tokens.pop(trading_account_id, None)
+
+    def lock(self, trading_account_id: int) -> threading.Lock:
+        """계정별 토큰 갱신 락을 반환합니다."""
+        lock = self._locks.get(trading_account_id)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.setdefault(trading_account_id, threading.Lock())
+        return lock
+
+    def async_lock(self, trading_account_id: int) -> asyncio.Lock:
+        """계정별 토큰 갱신 asyncio 락을 반환합니다 (이벤트 루프 내 single-flight)."""
+        lock = self._async_locks.get(trading_account_id)
+        if lock is None:
+            lock = self._async_locks.setdefault(trading_account_id, asyncio.Lock())
+        return lock
+
+
+token_cache = KISTokenCache()
@@ -0,0 +1,289 @@
+"""
+전략 파라미터 탐색 (그리드/랜덤)
+
+파라미터 조합을 프로세스 풀에 나눠 백테스트합니다. 봉 배열과 종목별 VWAP 계열은
+조합마다 다시 만들지 않고 부모 프로세스에서 vwap_period별로 한 번만 계산해 공유
+메모리에 올리며, 워커는 복사 없이 그 배열을 참조합니다.
+
+결과는 평가가 끝나는 대로 스트리밍하고, StrategyEvaluation 테이블에 저장해 같은
+데이터셋에서 겹치는 조합을 다시 요청하면 저장된 결과를 재사용합니다.
+"""
+import hashlib
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.strategy_evaluation import StrategyEvaluation
+from app.services.backtest import BacktestParams, BarSeries, compute_vwap_series, run_backtest
+
+logger = logging.getLogger(__name__)
+
+PARAM_NAMES = tuple(BacktestParams.__dataclass_fields__)
+INTEGER_PARAMS = ("vwap_period", "max_holding_days")
+OBJECTIVES = ("sharpe_ratio", "total_return_percent", "annualized_return_percent", "profit_factor", "win_rate_percent")
+
+# 공유 메모리 배열 배치: (종목, 배열 이름, dtype, 바이트 오프셋, 길이)
+Layout = List[Tuple[str, str, str, int, int]]
+
+
+def combination_count(grid: Mapping[str, Sequence[float]]) -> int:
+    """전체 조합 수 (조합 목록을 만들지 않음)"""
+    return math.prod(len(values) for values in grid.values()) if grid else 0
+
+
+def grid_combinations(grid: Mapping[str, Sequence[float]]) -> List[Dict[str, float]]:
+    """파라미터별 후보 값의 모든 조합을 만듭니다."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def random_combinations(grid: Mapping[str, Sequence[float]], samples: int, seed: Optional[int] = None) -> List[Dict[str, float]]:
+    """전체 조합 중 samples개를 중복 없이 무작위로 고릅니다 (조합 목록을 만들지 않음)."""
+    names = list(grid)
+    sizes = [len(grid[name]) for name in names]
+    total = combination_count(grid)
+    combinations = []
+    for index in random.Random(seed).sample(range(total), min(samples, total)):
+        combination = {}
+        for name, size in zip(reversed(names), reversed(sizes)):
+            index, position = divmod(index, size)
+            combination[name] = grid[name][position]
+        combinations.append({name: combination[name] for name in names})
+    return combinations
+
+
+def normalize_params(params: BacktestParams) -> BacktestParams:
+    for name in INTEGER_PARAMS:
+        setattr(params, name, int(getattr(params, name)))
+    return params
+
+
+def params_key(params: BacktestParams) -> str:
+    return json.dumps(asdict(params), sort_keys=True)
+
+
+def dataset_key(
+    bars_by_symbol: Mapping[str, BarSeries],
+    initial_capital: float,
+    fee_rate: float,
+    sell_tax_rate: float
+) -> str:
+    """봉 데이터와 체결 조건이 같으면 같은 값을 갖는 해시 (평가 캐시 키)"""
+    digest = hashlib.sha1(json.dumps([initial_capital, fee_rate, sell_tax_rate]).encode())
+    for symbol in sorted(bars_by_symbol):
+        digest.update(symbol.encode())
+        for array in bars_by_symbol[symbol]:
+            digest.update(np.ascontiguousarray(array).data)
+    return digest.hexdigest()
+
+
+class SharedIndicators:
+    """봉 배열과 vwap_period별 VWAP 계열을 담은 공유 메모리 블록 (부모 프로세스 소유)"""
+
+    def __init__(self, bars_by_symbol: Mapping[str, BarSeries], vwap_periods: Iterable[int]):
+        arrays: List[Tuple[str, str, np.ndarray]] = []
+        for symbol, bars in bars_by_symbol.items():
+            for name, array in zip(BarSeries._fields, bars):
+                arrays.append((symbol, name, array))
+            for period in sorted(set(vwap_periods)):
+                arrays.append((symbol, f"vwap:{period}", compute_vwap_series(bars, period)))
+
+        self.layout: Layout = []
+        offset = 0
+        for symbol, name, array in arrays:
+            self.layout.append((symbol, name, array.dtype.str, offset, len(array)))
+            offset += array.nbytes
+        self.shm = SharedMemory(create=True, size=max(offset, 1))
+        for (symbol, name, dtype, start, length), (_, _, array) in zip(self.layout, arrays):
+            np.ndarray(length, dtype=dtype, buffer=self.shm.buf, offset=start)[:] = array
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+def attach_indicators(buffer, layout: Layout) -> Tuple[Dict[str, BarSeries], Dict[int, Dict[str, np.ndarray]]]:
+    """공유 메모리 버퍼 위에 봉/VWAP 배열 뷰를 만듭니다.
+
+    Returns:
+        (종목별 BarSeries, {vwap_period: 종목별 VWAP 배열})
+    """
+    columns: Dict[str, Dict[str, np.ndarray]] = {}
+    vwaps: Dict[int, Dict[str, np.ndarray]] = {}
+    for symbol, name, dtype, offset, length in layout:
+        array = np.ndarray(length, dtype=dtype, buffer=buffer, offset=offset)
+        if name.startswith("vwap:"):
+            vwaps.setdefault(int(name.split(":", 1)[1]), {})[symbol] = array
+        else:
+            columns.setdefault(symbol, {})[name] = array
+    bars = {symbol: BarSeries(**arrays) for symbol, arrays in columns.items()}
+    return bars, vwaps
+
+
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(shm_name: str, layout: Layout) -> None:
+    shm = SharedMemory(name=shm_name)
+    bars, vwaps = attach_indicators(shm.buf, layout)
+    _worker.update(shm=shm, bars=bars, vwaps=vwaps)
+
+
+def _evaluate(
+    bars: Mapping[str, BarSeries],
+    vwaps: Mapping[int, Mapping[str, np.ndarray]],
+    combinations: List[Dict[str, Any]],
+    initial_capital: float,
+    fee_rate: float,
+    sell_tax_rate: float
+) -> List[Tuple[Dict[str, Any], Dict[str, float]]]:
+    results = []
+    for values in combinations:
+        params = BacktestParams(**values)
+        result = run_backtest(
+            bars, params, initial_capital, fee_rate, sell_tax_rate,
+            vwap_by_symbol=vwaps[params.vwap_period]
+        )
+        results.append((values, result["summary"]))
+    return results
+
+
+def _evaluate_in_worker(combinations, initial_capital, fee_rate, sell_tax_rate):
+    return _evaluate(_worker["bars"], _worker["vwaps"], combinations, initial_capital, fee_rate, sell_tax_rate)
+
+
+def load_cached_evaluations(db: Session, dataset: str, keys: Sequence[str]) -> Dict[str, Dict[str, float]]:
+    """저장된 평가 결과를 params_key별로 반환합니다."""
+    cached = {}
+    for start in range(0, len(keys), 500):
+        rows = db.query(StrategyEvaluation.params_key, StrategyEvaluation.summary).filter(
+            StrategyEvaluation.dataset_key == dataset,
+            StrategyEvaluation.params_key.in_(keys[start:start + 500])
+        ).all()
+        cached.update({key: summary for key, summary in rows})
+    return cached
+
+
+def save_evaluations(db: Session, dataset: str, results: List[Tuple[Dict[str, Any], Dict[str, float]]]) -> None:
+    """평가 결과를 일괄 저장합니다."""
+    if not results:
+        return
+    db.bulk_insert_mappings(StrategyEvaluation, [
+        {
+            "dataset_key": dataset,
+            "params_key": params_key(BacktestParams(**values)),
+            "params": values,
+            "summary": summary,
+        }
+        for values, summary in results
+    ])
+    db.commit()
+
+
+def iter_optimize(
+    bars_by_symbol: Mapping[str, BarSeries],
+    base_params: BacktestParams,
+    combinations: List[Dict[str, float]],
+    objective: str = "sharpe_ratio",
+    initial_capital: float = 10_000_000,
+    fee_rate: float = 0.00015,
+    sell_tax_rate: float = 0.0,
+    workers: Optional[int] = None,
+    chunk_size: int = 8,
+    db: Optional[Session] = None
+) -> Iterator[Dict[str, Any]]:
+    """파라미터 조합을 평가하며 결과를 끝나는 순서대로 내보냅니다.
+
+    Args:
+        base_params: 조합에 없는 파라미터의 기본값 (보통 전략의 현재 값)
+        combinations: 덮어쓸 파라미터 조합 목록
+        objective: 순위 기준 요약 통계 이름
+        workers: 프로세스 수 (1 이하면 현재 프로세스에서 평가)
+        chunk_size: 워커 호출 한 번에 평가할 조합 수
+        db: 지정 시 StrategyEvaluation 캐시를 읽고 씀
+
+    Yields:
+        {"params": dict, "summary": dict, "objective": float, "cached": bool}
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}")
+
+    # 전체 파라미터로 펼치고 중복 조합 제거
+    unique: Dict[str, Dict[str, Any]] = {}
+    for combination in combinations:
+        params = normalize_params(BacktestParams(**{**asdict(base_params), **combination}))
+        unique.setdefault(params_key(params), asdict(params))
+
+    def emit(values, summary, cached):
+        return {"params": values, "summary": summary, "objective": summary[objective], "cached": cached}
+
+    dataset = dataset_key(bars_by_symbol, initial_capital, fee_rate, sell_tax_rate)
+    cached = load_cached_evaluations(db, dataset, list(unique)) if db is not None else {}
+    for key, summary in cached.items():
+        yield emit(unique[key], summary, True)
+    pending = [values for key, values in unique.items() if key not in cached]
+    if not pending:
+        return
+
+    workers = workers or os.cpu_count() or 1
+    periods = {values["vwap_period"] for values in pending}
+    chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+    evaluated: List[Tuple[Dict[str, Any], Dict[str, float]]] = []
+    try:
+        if workers <= 1:
+            vwaps = {
+                period: {symbol: compute_vwap_series(bars, period) for symbol, bars in bars_by_symbol.items()}
+                for period in periods
+            }
+            for chunk in chunks:
+                for values, summary in _evaluate(bars_by_symbol, vwaps, chunk, initial_capital, fee_rate, sell_tax_rate):
+                    evaluated.append((values, summary))
+                    yield emit(values, summary, False)
+        else:
+            shared = SharedIndicators(bars_by_symbol, periods)
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=min(workers, len(chunks)),
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(shared.name, shared.layout)
+                ) as executor:
+                    futures = [
+                        executor.submit(_evaluate_in_worker, chunk, initial_capital, fee_rate, sell_tax_rate)
+                        for chunk in chunks
+                    ]
+                    for future in as_completed(futures):
+                        for values, summary in future.result():
+                            evaluated.append((values, summary))
+                            yield emit(values, summary, False)
+            finally:
+                shared.close()
+    finally:
+        # 중간에 중단되어도 끝난 평가는 저장
+        if db is not None:
+            try:
+                save_evaluations(db, dataset, evaluated)
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Failed to save strategy evaluations: {getattr(e, 'orig', e)}")
+
+
+def rank_results(results: Iterable[Dict[str, Any]], top_n: Optional[int] = None) -> List[Dict[str, Any]]:
+    """목표값 내림차순으로 정렬합니다."""
+    ranked = sorted(results, key=lambda result: result["objective"], reverse=True)
+    return ranked[:top_n] if top_n else ranked
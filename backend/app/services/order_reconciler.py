@@ -0,0 +1,341 @@
+"""
+주문 체결 대사 (asyncio)
+
+미체결 주문(PENDING, PARTIAL)이 있는 거래 계정마다 KIS 일별 주문 체결 조회(TTTC8001R)를
+주기적으로 한 번씩(연속조회) 보내고, 주문번호(kis_order_no)로 맞춰 상태/체결 수량/평균 체결가를
+한 번의 일괄 UPDATE로 반영합니다. 주문 건별로 조회하지 않으므로 요청 수는 미체결 주문 수가
+아니라 계정 수에 비례합니다.
+
+    - 조회 구간: 계정의 가장 오래된 미체결 주문일(KST)부터 오늘까지
+      (ORDER_RECONCILER_LOOKBACK_DAYS보다 오래된 주문은 대사하지 않음)
+    - 주기: 미체결 주문이 있으면 ORDER_RECONCILER_INTERVAL_SECONDS, 없으면 두 배씩 늘려
+      ORDER_RECONCILER_IDLE_SECONDS까지 쉬고, 이벤트 버스로 새 주문이 들어오면 기본 주기로 돌아감
+    - 상태가 바뀐 주문은 이벤트 버스 order 이벤트로 다시 발행
+    - 체결통보(fill_notices)가 연결된 계정은 누락 대비로 ORDER_RECONCILER_IDLE_SECONDS마다만 조회하고,
+      조회 후 통보로 먼저 반영된 주문(이미 닫혔거나 체결 수량이 더 많은 주문)은 덮어쓰지 않음
+
+계정별 마지막 대사 시각과 지연은 stats()로 확인합니다.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from sqlalchemy import bindparam, func, or_, update
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.order import OPEN_ORDER_STATUSES, Order
+from app.models.trading_account import TradingAccount
+from app.services.backtest import KST
+from app.services.event_bus import ORDER, Subscription, event_bus
+from app.services.fill_notices import fill_notice_ingester
+from app.services.kis_api import AsyncKISAPIClient
+
+logger = logging.getLogger(__name__)
+
+
+class OpenOrder(NamedTuple):
+    id: int
+    kis_order_no: str
+    quantity: int
+    status: str
+    executed_quantity: int
+    executed_price: Optional[float]
+    order_date: str  # KST YYYYMMDD
+
+
+class AccountStats:
+    """계정별 대사 지표"""
+
+    def __init__(self):
+        self.open_orders = 0
+        self.last_reconciled_at: Optional[datetime] = None
+        self.last_duration_ms = 0.0
+        self.pages = 0
+        self.rows = 0
+        self.updated = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def to_dict(self, now: datetime) -> Dict[str, object]:
+        lag = (now - self.last_reconciled_at).total_seconds() if self.last_reconciled_at else None
+        return {
+            "open_orders": self.open_orders,
+            "last_reconciled_at": self.last_reconciled_at.isoformat() if self.last_reconciled_at else None,
+            "lag_seconds": round(lag, 3) if lag is not None else None,
+            "last_duration_ms": round(self.last_duration_ms, 3),
+            "pages": self.pages,
+            "rows": self.rows,
+            "updated": self.updated,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+def _normalize_order_no(order_no: str) -> str:
+    # 주문 응답(ODNO)과 체결 조회(odno)의 앞자리 0 개수가 다를 수 있음
+    return order_no.strip().lstrip("0")
+
+
+def _to_int(value: object, default: int = 0) -> int:
+    text = str(value).strip() if value is not None else ""
+    return int(float(text)) if text else default
+
+
+def next_order_state(order: OpenOrder, row: Mapping[str, str]) -> Tuple[str, int, Optional[float]]:
+    """체결 조회 행으로 주문의 다음 (상태, 체결 수량, 평균 체결가)를 계산합니다.
+
+    Args:
+        order: 미체결 주문
+        row: 일별 주문 체결 조회 output1 행 (tot_ccld_qty, avg_prvs, rmn_qty, rjct_qty, cncl_yn)
+
+    Returns:
+        전량 체결이면 EXECUTED, 거부되어 체결이 없으면 REJECTED, 잔량이 취소/거부되면
+        CANCELLED (체결 수량 유지), 일부 체결이면 PARTIAL, 그 밖에는 PENDING
+    """
+    filled = _to_int(row.get("tot_ccld_qty"))
+    average_price = float(row.get("avg_prvs") or 0) or order.executed_price
+    remaining = _to_int(row.get("rmn_qty"), default=order.quantity - filled)
+    rejected = _to_int(row.get("rjct_qty"))
+
+    if filled >= order.quantity:
+        return "EXECUTED", filled, average_price
+    if rejected > 0 and filled == 0:
+        return "REJECTED", 0, None
+    if row.get("cncl_yn") == "Y" or rejected > 0 or remaining == 0:
+        return "CANCELLED", filled, average_price if filled else None
+    if filled > 0:
+        return "PARTIAL", filled, average_price
+    return "PENDING", 0, None
+
+
+def match_executions(
+    orders: Iterable[OpenOrder],
+    rows: Iterable[Mapping[str, str]]
+) -> List[Dict[str, object]]:
+    """체결 조회 행을 주문번호로 맞춰 상태가 바뀐 주문의 UPDATE 값 목록을 만듭니다."""
+    by_order_no = {_normalize_order_no(order.kis_order_no): order for order in orders}
+    now = datetime.now(timezone.utc)
+    changes = []
+    for row in rows:
+        order = by_order_no.pop(_normalize_order_no(str(row.get("odno") or "")), None)
+        if order is None:
+            continue
+        status, executed_quantity, executed_price = next_order_state(order, row)
+        if (status, executed_quantity, executed_price) == (
+            order.status, order.executed_quantity, order.executed_price
+        ):
+            continue
+        changes.append({
+            "id": order.id,
+            "status": status,
+            "executed_quantity": executed_quantity,
+            "executed_price": executed_price,
+            "updated_at": now,
+        })
+    return changes
+
+
+def _load_open_orders(lookback_days: int) -> Dict[int, Tuple[TradingAccount, List[OpenOrder]]]:
+    """거래 계정별 미체결 주문을 읽습니다 (주문번호가 없는 주문 제외)."""
+    since = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+    db = SessionLocal()
+    try:
+        rows = db.query(Order, TradingAccount).join(
+            TradingAccount, Order.trading_account_id == TradingAccount.id
+        ).filter(
+            Order.status.in_(OPEN_ORDER_STATUSES),
+            Order.kis_order_no.isnot(None),
+            Order.created_at >= since
+        ).all()
+
+        by_account: Dict[int, Tuple[TradingAccount, List[OpenOrder]]] = {}
+        for order, account in rows:
+            created = order.created_at
+            if created.tzinfo is None:  # SQLite는 UTC를 naive로 반환
+                created = created.replace(tzinfo=timezone.utc)
+            by_account.setdefault(account.id, (account, []))[1].append(OpenOrder(
+                order.id,
+                order.kis_order_no,
+                order.quantity,
+                order.status,
+                order.executed_quantity or 0,
+                order.executed_price,
+                created.astimezone(KST).strftime("%Y%m%d"),
+            ))
+        db.expunge_all()
+        return by_account
+    finally:
+        db.close()
+
+
+def _apply_changes(changes: List[Dict[str, object]]) -> None:
+    """주문 상태 변경을 한 번의 일괄 UPDATE로 반영하고 order 이벤트를 발행합니다."""
+    # 조회 이후 체결통보로 먼저 갱신된 주문은 건너뜀 (executemany에서는 IN 대신 OR)
+    statement = update(Order).where(
+        or_(*(Order.status == status for status in OPEN_ORDER_STATUSES)),
+        func.coalesce(Order.executed_quantity, 0) <= bindparam("reconciled_quantity")
+    )
+    db = SessionLocal()
+    try:
+        db.execute(
+            statement,
+            [{**change, "reconciled_quantity": change["executed_quantity"]} for change in changes],
+            execution_options={"synchronize_session": None}
+        )
+        db.commit()
+        ids = [change["id"] for change in changes]
+        for order in db.query(Order).filter(Order.id.in_(ids)).all():
+            event_bus.publish_order(order)
+    finally:
+        db.close()
+
+
+class OrderReconciler:
+    """미체결 주문 체결 대사 실행기 (이벤트 루프 안에서 start)"""
+
+    def __init__(self):
+        self.accounts: Dict[int, AccountStats] = {}
+        self.interval = settings.ORDER_RECONCILER_INTERVAL_SECONDS
+        self.cycles = 0
+        self.requests = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._subscription: Optional[Subscription] = None
+        self._watcher: Optional[asyncio.Task] = None
+
+    async def _reconcile_account(self, account: TradingAccount, orders: List[OpenOrder]) -> int:
+        stats = self.accounts.setdefault(account.id, AccountStats())
+        stats.open_orders = len(orders)
+        started = time.perf_counter()
+        rows: List[Dict[str, str]] = []
+        pages = 0
+        db = SessionLocal()
+        try:
+            client = AsyncKISAPIClient(account, db)
+            start_date = min(order.order_date for order in orders)
+            end_date = datetime.now(KST).strftime("%Y%m%d")
+            async for page in client.iter_daily_executions(account.account_number, start_date, end_date):
+                rows.extend(page)
+                pages += 1
+        except Exception as e:
+            stats.failures += 1
+            stats.last_error = str(e)
+            logger.warning(f"Failed to inquire executions for account {account.id}: {e}")
+            return 0
+        finally:
+            db.close()
+            self.requests += pages
+
+        changes = match_executions(orders, rows)
+        if changes:
+            await asyncio.to_thread(_apply_changes, changes)
+        stats.last_reconciled_at = datetime.now(timezone.utc)
+        stats.last_duration_ms = (time.perf_counter() - started) * 1000
+        stats.pages += pages
+        stats.rows += len(rows)
+        stats.updated += len(changes)
+        stats.last_error = None
+        stats.open_orders = len(orders) - sum(
+            1 for change in changes if change["status"] not in OPEN_ORDER_STATUSES
+        )
+        return stats.open_orders
+
+    def _is_due(self, account_id: int, now: datetime) -> bool:
+        # 체결통보가 연결된 계정은 누락 대비로 가끔만 조회
+        if account_id not in fill_notice_ingester.live_account_ids():
+            return True
+        stats = self.accounts.get(account_id)
+        if stats is None or stats.last_reconciled_at is None:
+            return True
+        return (now - stats.last_reconciled_at).total_seconds() >= settings.ORDER_RECONCILER_IDLE_SECONDS
+
+    async def reconcile_once(self) -> int:
+        """대사할 계정을 한 번 대사하고 남은 미체결 주문 수를 반환합니다 (계정은 동시에 조회)."""
+        open_orders = await asyncio.to_thread(_load_open_orders, settings.ORDER_RECONCILER_LOOKBACK_DAYS)
+        for account_id, stats in self.accounts.items():
+            if account_id not in open_orders:
+                stats.open_orders = 0
+        self.cycles += 1
+        now = datetime.now(timezone.utc)
+        due = {account_id: item for account_id, item in open_orders.items() if self._is_due(account_id, now)}
+        remaining = await asyncio.gather(*(
+            self._reconcile_account(account, orders) for account, orders in due.values()
+        ))
+        skipped = 0
+        for account_id, (_, orders) in open_orders.items():
+            if account_id not in due:
+                self.accounts.setdefault(account_id, AccountStats()).open_orders = len(orders)
+                skipped += len(orders)
+        return sum(remaining) + skipped
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wake.clear()
+            started = loop.time()
+            try:
+                remaining = await self.reconcile_once()
+            except Exception as e:
+                logger.warning(f"Order reconciliation failed: {e}")
+                remaining = 1  # DB 오류 등은 기본 주기로 다시 시도
+            if remaining:
+                self.interval = settings.ORDER_RECONCILER_INTERVAL_SECONDS
+            else:
+                self.interval = min(self.interval * 2, settings.ORDER_RECONCILER_IDLE_SECONDS)
+            # 새 주문으로 깨어나면 주기만 기본값으로 줄임 (주문이 몰려도 계정당 주기마다 한 번만 조회)
+            while True:
+                delay = started + self.interval - loop.time()
+                if delay <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    break
+                self._wake.clear()
+
+    async def _watch_orders(self) -> None:
+        """새 주문(PENDING) 이벤트가 오면 늘려 둔 대사 주기를 기본값으로 되돌립니다."""
+        while True:
+            events = await self._subscription.get_batch()
+            if any(event.payload.get("status") == "PENDING" for event in events):
+                self.interval = settings.ORDER_RECONCILER_INTERVAL_SECONDS
+                self._wake.set()
+
+    def start(self) -> None:
+        """대사 태스크를 시작합니다 (이벤트 루프 안에서 호출)."""
+        if self._task is not None:
+            return
+        self._wake = asyncio.Event()
+        self.interval = settings.ORDER_RECONCILER_INTERVAL_SECONDS
+        self._subscription = event_bus.subscribe({ORDER: None}, name="order_reconciler")
+        self._watcher = asyncio.create_task(self._watch_orders())
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+        tasks = [task for task in (self._task, self._watcher) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._watcher = None
+
+    def stats(self) -> Dict[str, object]:
+        now = datetime.now(timezone.utc)
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "cycles": self.cycles,
+            "requests": self.requests,
+            "open_orders": sum(stats.open_orders for stats in self.accounts.values()),
+            "fill_notice_accounts": sorted(fill_notice_ingester.live_account_ids()),
+            "accounts": {account_id: stats.to_dict(now) for account_id, stats in self.accounts.items()},
+        }
+
+
+order_reconciler = OrderReconciler()
@@ -0,0 +1,383 @@
+"""
+주문 전송 (outbox, asyncio)
+
+주문 API는 주문을 QUEUED로 DB에 먼저 기록하고 바로 반환하며, 이 모듈이 QUEUED 주문을 꺼내
+KIS로 전송합니다. KIS 접수 후 DB 기록에 실패해 살아 있는 주문을 놓치거나, 클라이언트 재시도로
+같은 주문이 두 번 나가는 일을 막기 위한 구조입니다.
+
+    - 꺼내기: QUEUED이고 재시도 시각이 지난 주문을 SELECT ... FOR UPDATE SKIP LOCKED로 잡아
+      SUBMITTING으로 바꿈 (여러 프로세스가 함께 돌아도 한 주문은 한 곳에서만 전송)
+    - 바스켓 주문(basket_id)의 매수는 같은 바스켓의 매도가 모두 전송된 뒤에 꺼냄
+    - 동시 전송 수: ORDER_SUBMITTER_CONCURRENCY (주문 처리량은 HTTP 워커 수가 아니라 이 값이 결정)
+    - 결과
+        접수(rt_cd 0)                   → PENDING + 주문번호
+        거부(rt_cd != 0)                → REJECTED (order_metadata.error)
+        보내지 못함(속도 제한, 연결 실패) → QUEUED, 지수 백오프 후 재전송
+        결과 모름(타임아웃, HTTP 오류)    → QUEUED, 재전송 전에 일별 주문 체결 조회로 이미 접수된
+                                          주문(종목/매매구분/수량/주문 시각이 같고 다른 주문에 연결되지
+                                          않은 주문번호)을 찾아 있으면 그 주문번호를 채택
+    - ORDER_SUBMITTER_MAX_ATTEMPTS번 전송해도 접수되지 않으면 REJECTED
+    - 전송 중 프로세스가 죽어 SUBMITTING으로 남은 주문은 STALE_CLAIM_SECONDS 뒤 결과 모름으로 다시 꺼냄
+
+상태가 바뀐 주문은 이벤트 버스 order 이벤트로 발행하고, 처리 건수와 지연은 stats()로 확인합니다.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Mapping, NamedTuple, Optional, Set
+
+import httpx
+import numpy as np
+from sqlalchemy import and_, exists, func, or_
+from sqlalchemy.orm import aliased
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.order import Order
+from app.models.trading_account import TradingAccount
+from app.services.backtest import KST
+from app.services.event_bus import event_bus
+from app.services.kis_api import AsyncKISAPIClient, KISRateLimitError
+
+logger = logging.getLogger(__name__)
+
+# 전송 중(SUBMITTING)인 채로 이 시간이 지나면 전송한 프로세스가 죽은 것으로 보고 다시 꺼냄
+STALE_CLAIM_SECONDS = 60.0
+# 이미 접수된 주문을 찾을 때 주문 시각 비교 여유 (서버/KIS 시계 차이)
+MATCH_SLACK_SECONDS = 60.0
+MAX_RETRY_SECONDS = 30.0
+LATENCY_SAMPLES = 10_000
+
+# 요청이 KIS에 닿지 않은 것이 확실한 오류 (결과 조회 없이 다시 전송)
+NOT_SENT_ERRORS = (KISRateLimitError, httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class ClaimedOrder(NamedTuple):
+    id: int
+    account: TradingAccount  # 세션에서 분리된 거래 계정
+    symbol: str
+    order_type: str
+    order_method: str
+    quantity: int
+    price: Optional[float]
+    attempts: int  # 이번 전송을 포함한 시도 횟수
+    created_at: datetime  # UTC
+    uncertain: bool  # 이전 전송의 결과를 모름 (재전송 전에 접수 여부 조회)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite는 UTC를 naive로 반환
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _claim_orders(limit: int) -> List[ClaimedOrder]:
+    """전송할 주문을 최대 limit개 잡아 SUBMITTING으로 바꿉니다."""
+    now = datetime.now(timezone.utc)
+    basket_sell = aliased(Order)
+    db = SessionLocal()
+    db.expire_on_commit = False
+    try:
+        rows = db.query(Order, TradingAccount).join(
+            TradingAccount, Order.trading_account_id == TradingAccount.id
+        ).filter(or_(
+            and_(Order.status == "QUEUED", or_(Order.next_submit_at.is_(None), Order.next_submit_at <= now)),
+            and_(Order.status == "SUBMITTING", Order.last_submit_at < now - timedelta(seconds=STALE_CLAIM_SECONDS)),
+        ), or_(
+            # 바스켓 매수는 같은 바스켓의 매도가 모두 전송된 뒤에 (바스켓 ID는 클라이언트가 정하므로
+            # 다른 계정의 같은 ID 바스켓과 섞이지 않도록 거래 계정까지 맞춤)
+            Order.basket_id.is_(None),
+            Order.order_type == "SELL",
+            ~exists().where(
+                basket_sell.trading_account_id == Order.trading_account_id,
+                basket_sell.basket_id == Order.basket_id,
+                basket_sell.order_type == "SELL",
+                basket_sell.status.in_(("QUEUED", "SUBMITTING"))
+            ),
+        )).order_by(Order.id).limit(limit).with_for_update(skip_locked=True, of=Order).all()
+
+        claimed = []
+        for order, account in rows:
+            attempts = (order.submit_attempts or 0) + 1
+            claimed.append(ClaimedOrder(
+                order.id,
+                account,
+                order.symbol,
+                order.order_type,
+                order.order_method,
+                order.quantity,
+                order.price,
+                attempts,
+                _as_utc(order.created_at or now),
+                order.last_submit_at is not None,
+            ))
+            order.status = "SUBMITTING"
+            order.submit_attempts = attempts
+            order.last_submit_at = now
+            order.next_submit_at = None
+        db.commit()
+        db.expunge_all()
+        return claimed
+    finally:
+        db.close()
+
+
+def _finish_order(order_id: int, **values) -> Optional[datetime]:
+    """전송 결과를 기록하고 order 이벤트를 발행합니다 (전송 중인 주문만).
+
+    Returns:
+        주문 생성 시각 (UTC, 기록하지 않았으면 None)
+    """
+    error = values.pop("error", None)
+    db = SessionLocal()
+    try:
+        order = db.query(Order).filter(Order.id == order_id).with_for_update().first()
+        if order is None or order.status != "SUBMITTING":
+            db.rollback()
+            return None
+        for key, value in values.items():
+            setattr(order, key, value)
+        if error:
+            order.order_metadata = {**(order.order_metadata or {}), "error": error}
+        db.commit()
+        db.refresh(order)
+        event_bus.publish_order(order)
+        return _as_utc(order.created_at) if order.created_at else None
+    finally:
+        db.close()
+
+
+def _taken_order_numbers(trading_account_id: int, order_numbers: List[str]) -> Set[str]:
+    """이미 다른 주문에 연결된 주문번호(앞자리 0 제외)를 반환합니다."""
+    db = SessionLocal()
+    try:
+        rows = db.query(func.ltrim(Order.kis_order_no, "0")).filter(
+            Order.trading_account_id == trading_account_id,
+            func.ltrim(Order.kis_order_no, "0").in_(order_numbers)
+        ).all()
+        return {row[0] for row in rows}
+    finally:
+        db.close()
+
+
+def _matches(order: ClaimedOrder, row: Mapping[str, str], since: datetime) -> bool:
+    side = "01" if order.order_type == "SELL" else "02"
+    try:
+        ordered_at = datetime.strptime(f"{row.get('ord_dt')}{row.get('ord_tmd')}", "%Y%m%d%H%M%S").replace(tzinfo=KST)
+        quantity = int(float(str(row.get("ord_qty") or 0)))
+    except ValueError:
+        return False
+    return (
+        str(row.get("pdno") or "").strip() == order.symbol
+        and row.get("sll_buy_dvsn_cd") == side
+        and quantity == order.quantity
+        and ordered_at >= since
+    )
+
+
+class OrderSubmitter:
+    """QUEUED 주문 전송기 (이벤트 루프 안에서 start)"""
+
+    def __init__(self):
+        self.claimed = 0
+        self.submitted = 0
+        self.adopted = 0  # 재전송 대신 이미 접수된 주문번호를 채택
+        self.rejected = 0
+        self.retried = 0
+        self.last_error: Optional[str] = None
+        self._submit_latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._queue_latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._inflight: Set[asyncio.Task] = set()
+        self._account_locks: Dict[int, asyncio.Lock] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def notify(self) -> None:
+        """새 주문이 들어왔음을 알립니다 (다른 스레드에서 호출 가능)."""
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _find_submitted(self, client: AsyncKISAPIClient, order: ClaimedOrder) -> Optional[str]:
+        """결과를 모르는 이전 전송이 KIS에 접수되었는지 일별 주문 체결 조회로 찾습니다."""
+        since = order.created_at.astimezone(KST) - timedelta(seconds=MATCH_SLACK_SECONDS)
+        candidates = []
+        async for page in client.iter_daily_executions(
+            order.account.account_number, since.strftime("%Y%m%d"), datetime.now(KST).strftime("%Y%m%d")
+        ):
+            candidates.extend(
+                str(row.get("odno") or "").strip().lstrip("0") for row in page if _matches(order, row, since)
+            )
+        if not candidates:
+            return None
+        taken = await asyncio.to_thread(_taken_order_numbers, order.account.id, candidates)
+        # 조회는 최근 주문부터이므로 가장 오래된 미연결 주문번호를 채택
+        for order_no in reversed(candidates):
+            if order_no not in taken:
+                return order_no
+        return None
+
+    async def _submit(self, order: ClaimedOrder) -> None:
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            client = AsyncKISAPIClient(order.account, db)
+            if order.uncertain:
+                # 같은 계정의 주문이 같은 주문번호를 채택하지 않도록 조회~기록을 계정별로 직렬화
+                lock = self._account_locks.setdefault(order.account.id, asyncio.Lock())
+                async with lock:
+                    order_no = await self._find_submitted(client, order)
+                    if order_no:
+                        await self._record_submitted(order, order_no, started)
+                        self.adopted += 1
+                        return
+            if order.attempts > settings.ORDER_SUBMITTER_MAX_ATTEMPTS:
+                await self._record_rejected(order, f"Not accepted after {order.attempts - 1} attempts")
+                return
+
+            try:
+                result = await client.place_order(
+                    account_number=order.account.account_number,
+                    symbol=order.symbol,
+                    order_type=order.order_type,
+                    quantity=order.quantity,
+                    price=int(order.price) if order.price else None,
+                    order_method="01" if order.order_method == "MARKET" else "00"
+                )
+            except NOT_SENT_ERRORS as e:
+                await self._schedule_retry(order, str(e), sent=False)
+                return
+            except Exception as e:
+                await self._schedule_retry(order, str(e), sent=True)
+                return
+        except Exception as e:
+            # 접수 여부 조회 실패 등: 결과를 모르는 상태 그대로 재시도
+            await self._schedule_retry(order, str(e), sent=order.uncertain)
+            return
+        finally:
+            db.close()
+
+        if result.get("rt_cd") not in (None, "0"):
+            await self._record_rejected(order, result.get("msg1") or "KIS error")
+            return
+        order_no = (result.get("output") or {}).get("ODNO")
+        if not order_no:
+            await self._schedule_retry(order, "No order number in KIS response", sent=True)
+            return
+        await self._record_submitted(order, order_no, started)
+        self.submitted += 1
+
+    async def _record_submitted(self, order: ClaimedOrder, order_no: str, started: float) -> None:
+        created_at = await asyncio.to_thread(
+            _finish_order, order.id, status="PENDING", kis_order_no=order_no, last_submit_at=None
+        )
+        self._submit_latencies.append((time.perf_counter() - started) * 1000)
+        if created_at is not None:
+            self._queue_latencies.append((datetime.now(timezone.utc) - created_at).total_seconds() * 1000)
+
+    async def _record_rejected(self, order: ClaimedOrder, error: str) -> None:
+        await asyncio.to_thread(_finish_order, order.id, status="REJECTED", last_submit_at=None, error=error)
+        self.rejected += 1
+
+    async def _schedule_retry(self, order: ClaimedOrder, error: str, sent: bool) -> None:
+        """다시 QUEUED로 돌려 백오프 뒤 재시도합니다 (보내지 못한 채 시도를 다 쓰면 REJECTED)."""
+        self.last_error = error
+        logger.warning(f"Order {order.id} submission attempt {order.attempts} failed: {error}")
+        if not sent and order.attempts >= settings.ORDER_SUBMITTER_MAX_ATTEMPTS:
+            await self._record_rejected(order, error)
+            return
+        delay = min(settings.ORDER_SUBMITTER_RETRY_BASE_SECONDS * 2 ** (order.attempts - 1), MAX_RETRY_SECONDS)
+        now = datetime.now(timezone.utc)
+        # 결과를 모르면 last_submit_at을 남겨 다음 시도 전에 접수 여부를 조회
+        await asyncio.to_thread(
+            _finish_order,
+            order.id,
+            status="QUEUED",
+            next_submit_at=now + timedelta(seconds=delay),
+            last_submit_at=now if sent else None,
+            error=error
+        )
+        self.retried += 1
+
+    async def drain_once(self, limit: int) -> int:
+        """전송할 주문을 최대 limit개 꺼내 전송 태스크를 시작하고 꺼낸 수를 반환합니다."""
+        claimed = await asyncio.to_thread(_claim_orders, limit)
+        self.claimed += len(claimed)
+        for order in claimed:
+            task = asyncio.create_task(self._submit(order))
+            self._inflight.add(task)
+            task.add_done_callback(self._on_done)
+        return len(claimed)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._inflight.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Order submission task failed: {task.exception()}")
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            free = settings.ORDER_SUBMITTER_CONCURRENCY - len(self._inflight)
+            if free > 0:
+                try:
+                    await self.drain_once(free)
+                except Exception as e:
+                    self.last_error = str(e)
+                    logger.warning(f"Failed to claim queued orders: {e}")
+            # 새 주문 알림이나 전송 완료(빈 슬롯)로 깨어나고, 다른 프로세스가 넣은 주문/재시도 예정 주문은 주기적으로 확인
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.ORDER_SUBMITTER_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """전송 태스크를 시작합니다 (이벤트 루프 안에서 호출)."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """새 주문은 꺼내지 않고, 전송 중인 주문은 timeout초까지 기다린 뒤 중단합니다."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._inflight:
+            # 중단된 주문은 SUBMITTING으로 남아 다음 실행에서 접수 여부 조회 후 처리
+            _, pending = await asyncio.wait(set(self._inflight), timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._loop = None
+
+    def stats(self) -> Dict[str, object]:
+        submit = np.fromiter(self._submit_latencies, dtype=np.float64, count=len(self._submit_latencies))
+        queue = np.fromiter(self._queue_latencies, dtype=np.float64, count=len(self._queue_latencies))
+        return {
+            "running": self._task is not None,
+            "in_flight": len(self._inflight),
+            "concurrency": settings.ORDER_SUBMITTER_CONCURRENCY,
+            "claimed": self.claimed,
+            "submitted": self.submitted,
+            "adopted": self.adopted,
+            "rejected": self.rejected,
+            "retried": self.retried,
+            "last_error": self.last_error,
+            # 꺼낸 시점 → PENDING 기록 (KIS 왕복 포함)
+            "submit_ms": {
+                "p50": round(float(np.percentile(submit, 50)), 3) if len(submit) else 0.0,
+                "p99": round(float(np.percentile(submit, 99)), 3) if len(submit) else 0.0,
+            },
+            # 주문 생성(DB 시각) → PENDING 기록
+            "queue_to_pending_ms": {
+                "p50": round(float(np.percentile(queue, 50)), 3) if len(queue) else 0.0,
+                "p99": round(float(np.percentile(queue, 99)), 3) if len(queue) else 0.0,
+            },
+        }
+
+
+order_submitter = OrderSubmitter()
@@ -0,0 +1,98 @@
+"""
+현재가 조회 공유 캐시
+
+여러 사용자가 같은 ETF를 조회하므로 짧은 TTL 동안 KIS 응답을 공유합니다.
+같은 종목에 대한 동시 요청은 하나의 업스트림 호출로 합쳐집니다(coalescing).
+캐시는 크기 제한이 있으며 가장 오래 사용되지 않은 항목부터 제거합니다(LRU).
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from app.config import settings
+
+
+class QuoteCache:
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _get_fresh(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: Hashable, value: Dict[str, Any]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """캐시된 값을 반환하거나, 없으면 fetch()를 한 번만 호출해 채웁니다.
+
+        Args:
+            key: 캐시 키 (예: (market_code, symbol))
+            fetch: 업스트림 조회 코루틴 함수
+
+        Returns:
+            조회 결과 (오류는 캐시하지 않고 대기 중인 모든 요청에 전파)
+        """
+        value = self._get_fresh(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # 최초 요청자가 취소되어도 합류한 요청들이 결과를 받도록 별도 태스크로 실행
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._on_fetched(key, done))
+
+        return await asyncio.shield(task)
+
+    def _on_fetched(self, key: Hashable, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self._store(key, task.result())
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중/미스/합류 카운터를 반환합니다."""
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+        }
+
+
+quote_cache = QuoteCache(settings.QUOTE_CACHE_TTL_SECONDS, settings.QUOTE_CACHE_MAX_ENTRIES)
@@ -0,0 +1,817 @@
+"""
+활성 전략 실행기 (asyncio)
+
+is_active 전략을 읽어 종목별 가격이 갱신될 때마다 VWAP 매매 신호와 손절/익절,
+보유 기한을 평가하고 시장가 주문을 냅니다.
+
+    - 가격: 실시간 수신(KIS_REALTIME_ENABLED)이면 RealtimeQuoteIngester 틱 묶음을 받고,
+      아니면 STRATEGY_RUNNER_POLL_SECONDS마다 현재가를 조회해 VWAP 엔진에 함께 반영
+    - 평가: 틱은 종목별 최신 가격만 남기고, 실행 루프가 깨어날 때마다 갱신된 종목이
+      있는 전략만 배열로 한 번에 평가 (evaluate_strategy는 상태를 바꾸지 않는 순수 함수)
+    - 주문: 평가 루프를 막지 않도록 별도 태스크에서 주문 전송 outbox(order_submitter)에 QUEUED로
+      기록하고 전송은 order_submitter에 맡김. client_order_id를 "strategy-{전략}:{종목}:{신호 시각 ms}"로
+      주므로 기록을 다시 시도해도 주문이 두 번 나가지 않음. 주문 중인 (전략, 종목)은 전송 결과
+      (order 이벤트, 다른 프로세스의 전송기를 위해 ORDER_POLL_SECONDS마다 DB 확인)가 나올 때까지
+      다시 평가하지 않고, 거부되면 잠시 쉬었다가 다시 평가
+    - 포지션: 전략의 주문 내역(거부 제외, 끝나지 않은 주문은 주문 수량, 끝난 주문은 체결 수량)에서
+      종목별 순매수 수량으로 복원하고, 전략 주문의 전송 결과/체결 이벤트가 오면 해당 종목만 DB에서
+      다시 계산
+    - 샤드: STRATEGY_RUNNER_SHARDS > 0이면 평가를 종목 해시별 워커 프로세스로 나누고
+      (strategy_shards), 주문은 이 프로세스에서만 보내 앱키별 속도 제한을 한 곳에서 적용
+
+전략 API가 생성/수정/삭제 시 notify_changed를 호출하면 재시작 없이 해당 전략만 다시 읽습니다.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.order import OPEN_ORDER_STATUSES, UNSENT_ORDER_STATUSES, Order
+from app.models.strategy import Strategy
+from app.models.trading_account import TradingAccount
+from app.services.backtest import KST, BacktestParams
+from app.services.event_bus import ORDER, QUOTE, SIGNAL, Event, Subscription, event_bus
+from app.services.kis_api import AsyncKISAPIClient
+from app.services.kis_realtime import TickRecord, quote_ingester
+from app.services.order_submitter import order_submitter
+from app.services.strategy_shards import MSG_DECISIONS, MSG_STATS, ShardPool
+from app.services.vwap_engine import VWAPEngine, vwap_engine
+from app.services.vwap_strategy import (
+    ACTION_HOLD,
+    SIGNAL_BUY,
+    SIGNAL_SELL,
+    check_stop_loss_take_profit_batch,
+    format_action_reason,
+    format_signal_reason,
+    generate_trading_signals,
+)
+
+logger = logging.getLogger(__name__)
+
+LAG_PROBE_INTERVAL = 0.5  # seconds
+# 포지션 계산에서 제외하는 주문 상태
+INACTIVE_ORDER_STATUSES = ("CANCELLED", "REJECTED")
+# 포지션(체결 수량)이 바뀔 수 있는 주문 상태
+FILL_ORDER_STATUSES = OPEN_ORDER_STATUSES + ("EXECUTED", "CANCELLED")
+# 다른 프로세스의 전송기가 보낸 주문처럼 이벤트가 오지 않는 경우 전송 결과를 DB로 확인하는 주기
+ORDER_POLL_SECONDS = 1.0
+
+
+class Position(NamedTuple):
+    quantity: int
+    entry_price: float
+    entry_day: date  # KST
+
+
+class Decision(NamedTuple):
+    """평가 결과로 낼 주문"""
+    symbol: str
+    order_type: str  # BUY, SELL
+    quantity: int
+    price: float  # 평가 시점 가격
+    reason: str
+
+
+@dataclass
+class StrategyState:
+    """실행 중인 전략의 파라미터, 포지션, 평가 지표"""
+    strategy_id: int
+    user_id: int
+    trading_account_id: int
+    params: BacktestParams
+    symbols: List[str]
+    order_amount: float  # 1회 매수 금액
+    positions: Dict[str, Position] = field(default_factory=dict)
+    evaluations: int = 0
+    evaluation_ms_total: float = 0.0
+    evaluation_ms_max: float = 0.0
+    evaluation_ms_last: float = 0.0
+    orders: int = 0
+    order_failures: int = 0
+
+    def record_evaluation(self, elapsed_ms: float) -> None:
+        self.evaluations += 1
+        self.evaluation_ms_total += elapsed_ms
+        self.evaluation_ms_last = elapsed_ms
+        self.evaluation_ms_max = max(self.evaluation_ms_max, elapsed_ms)
+
+    def inherit_metrics(self, previous: "StrategyState") -> None:
+        for name in ("evaluations", "evaluation_ms_total", "evaluation_ms_max", "evaluation_ms_last",
+                     "orders", "order_failures"):
+            setattr(self, name, getattr(previous, name))
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "symbols": len(self.symbols),
+            "positions": len(self.positions),
+            "evaluations": self.evaluations,
+            "evaluation_ms_last": round(self.evaluation_ms_last, 3),
+            "evaluation_ms_mean": round(self.evaluation_ms_total / self.evaluations, 3) if self.evaluations else 0.0,
+            "evaluation_ms_max": round(self.evaluation_ms_max, 3),
+            "orders": self.orders,
+            "order_failures": self.order_failures,
+        }
+
+
+def evaluate_strategy(
+    state: StrategyState,
+    prices: Dict[str, float],
+    vwaps: Dict[str, Optional[float]],
+    today: date,
+    skip: Iterable[str] = ()
+) -> List[Decision]:
+    """전략의 종목을 한 번에 평가해 낼 주문 목록을 반환합니다.
+
+    Args:
+        prices: 종목별 최신 가격
+        vwaps: 종목별 VWAP (없으면 신호 없음)
+        today: 보유 기한 계산 기준일 (KST)
+        skip: 평가하지 않을 종목 (주문 중 등)
+    """
+    skip = set(skip)
+    symbols = [symbol for symbol in state.symbols if symbol in prices and symbol not in skip]
+    if not symbols:
+        return []
+
+    params = state.params
+    current = np.array([prices[symbol] for symbol in symbols], dtype=np.float64)
+    vwap = np.array([vwaps.get(symbol) or np.nan for symbol in symbols], dtype=np.float64)
+    entry = np.array([
+        state.positions[symbol].entry_price if symbol in state.positions else np.nan for symbol in symbols
+    ])
+    signals, reasons, diffs = generate_trading_signals(current, vwap, params.entry_threshold, params.exit_threshold)
+    actions, pnl = check_stop_loss_take_profit_batch(
+        entry, current, params.stop_loss_percent, params.take_profit_percent
+    )
+
+    decisions = []
+    for index, symbol in enumerate(symbols):
+        price = float(current[index])
+        position = state.positions.get(symbol)
+        if position is None:
+            quantity = int(state.order_amount // price) if price > 0 else 0
+            if signals[index] == SIGNAL_BUY and quantity > 0:
+                decisions.append(Decision(
+                    symbol, "BUY", quantity, price, format_signal_reason(reasons[index], diffs[index])
+                ))
+            continue
+
+        if actions[index] != ACTION_HOLD:
+            reason = format_action_reason(actions[index], pnl[index])
+        elif signals[index] == SIGNAL_SELL:
+            reason = format_signal_reason(reasons[index], diffs[index])
+        elif params.max_holding_days and np.busday_count(position.entry_day, today) >= params.max_holding_days:
+            reason = f"보유 기한 도달: {params.max_holding_days}거래일"
+        else:
+            continue
+        decisions.append(Decision(symbol, "SELL", position.quantity, price, reason))
+    return decisions
+
+
+def _in_session(now: datetime) -> bool:
+    start, end = settings.STRATEGY_RUNNER_SESSION.split("-")
+    return start <= now.strftime("%H%M") < end
+
+
+def _load_positions(db: Session, strategy_id: int, symbols: Optional[Iterable[str]] = None) -> Dict[str, Position]:
+    """전략의 주문 내역에서 종목별 보유 수량과 마지막 매수가를 복원합니다 (symbols가 있으면 그 종목만)."""
+    query = db.query(Order).filter(
+        Order.strategy_id == strategy_id,
+        # 잔량이 취소된 주문도 체결된 수량은 포지션에 반영
+        or_(Order.status.notin_(INACTIVE_ORDER_STATUSES), Order.executed_quantity > 0)
+    )
+    if symbols is not None:
+        query = query.filter(Order.symbol.in_(list(symbols)))
+    orders = query.order_by(Order.created_at, Order.id).all()
+
+    quantities: Dict[str, int] = {}
+    entries: Dict[str, Tuple[float, date]] = {}
+    for order in orders:
+        if order.status in UNSENT_ORDER_STATUSES + OPEN_ORDER_STATUSES:
+            # 끝나지 않은 주문은 전량 (부분 체결된 매도를 체결분만 빼면 아직 매도 중인 잔량을 다시 매도함)
+            quantity = order.quantity
+        elif order.status == "CANCELLED":
+            quantity = order.executed_quantity or 0
+        else:
+            quantity = order.executed_quantity or order.quantity
+        if order.order_type == "BUY":
+            quantities[order.symbol] = quantities.get(order.symbol, 0) + quantity
+            price = order.executed_price or order.price or (order.order_metadata or {}).get("signal_price") or 0.0
+            created = order.created_at or datetime.now(timezone.utc)
+            if created.tzinfo is None:  # SQLite는 UTC를 naive로 반환
+                created = created.replace(tzinfo=timezone.utc)
+            entries[order.symbol] = (float(price), created.astimezone(KST).date())
+        else:
+            quantities[order.symbol] = quantities.get(order.symbol, 0) - quantity
+
+    return {
+        symbol: Position(quantity, *entries[symbol])
+        for symbol, quantity in quantities.items()
+        if quantity > 0 and symbol in entries
+    }
+
+
+def _load_states(
+    strategy_ids: Optional[Set[int]]
+) -> Tuple[Dict[int, Optional[StrategyState]], Dict[int, TradingAccount]]:
+    """전략 상태를 DB에서 읽습니다.
+
+    Args:
+        strategy_ids: 다시 읽을 전략 ID (None이면 전체 활성 전략)
+
+    Returns:
+        ({전략 ID: 상태 (비활성/삭제되었거나 거래 계정이 없으면 None)}, {거래 계정 ID: 계정})
+    """
+    db = SessionLocal()
+    try:
+        query = db.query(Strategy)
+        if strategy_ids is None:
+            query = query.filter(Strategy.is_active == True)
+        else:
+            query = query.filter(Strategy.id.in_(strategy_ids))
+        strategies = {strategy.id: strategy for strategy in query.all()}
+
+        states: Dict[int, Optional[StrategyState]] = {strategy_id: None for strategy_id in strategy_ids or ()}
+        accounts: Dict[int, TradingAccount] = {}
+        for strategy_id, strategy in strategies.items():
+            if not strategy.is_active or not strategy.symbols:
+                continue
+            additional = strategy.additional_params or {}
+            account_query = db.query(TradingAccount).filter(
+                TradingAccount.user_id == strategy.user_id,
+                TradingAccount.is_active == True
+            )
+            if additional.get("trading_account_id"):
+                account_query = account_query.filter(TradingAccount.id == additional["trading_account_id"])
+            account = account_query.first()
+            if account is None:
+                logger.warning(f"Strategy {strategy_id} has no active trading account")
+                continue
+
+            accounts[account.id] = account
+            states[strategy_id] = StrategyState(
+                strategy_id=strategy_id,
+                user_id=strategy.user_id,
+                trading_account_id=account.id,
+                params=BacktestParams.from_strategy(strategy),
+                symbols=strategy.symbols,
+                order_amount=float(additional.get("order_amount") or settings.STRATEGY_RUNNER_ORDER_AMOUNT),
+                positions=_load_positions(db, strategy_id)
+            )
+        db.expunge_all()
+        return states, accounts
+    finally:
+        db.close()
+
+
+def _queue_order(state: StrategyState, decision: Decision, client_order_id: str) -> None:
+    """전략 주문을 outbox에 QUEUED로 기록하고 order 이벤트를 발행합니다 (같은 키가 있으면 그대로 둠)."""
+    db = SessionLocal()
+    try:
+        order = Order(
+            user_id=state.user_id,
+            trading_account_id=state.trading_account_id,
+            symbol=decision.symbol,
+            order_type=decision.order_type,
+            order_method="MARKET",
+            quantity=decision.quantity,
+            status="QUEUED",
+            client_order_id=client_order_id,
+            strategy_id=state.strategy_id,
+            order_metadata={
+                "source": "strategy_runner",
+                "reason": decision.reason,
+                "signal_price": decision.price
+            }
+        )
+        db.add(order)
+        try:
+            db.commit()
+        except IntegrityError:
+            # 이전 시도가 이미 기록함
+            db.rollback()
+            return
+        event_bus.publish_order(order)
+    finally:
+        db.close()
+
+
+def _load_symbol_positions(keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], Optional[Position]]:
+    """(전략, 종목)별 포지션을 주문 내역에서 다시 계산합니다."""
+    by_strategy: Dict[int, Set[str]] = {}
+    for strategy_id, symbol in keys:
+        by_strategy.setdefault(strategy_id, set()).add(symbol)
+    db = SessionLocal()
+    try:
+        positions: Dict[Tuple[int, str], Optional[Position]] = {}
+        for strategy_id, symbols in by_strategy.items():
+            loaded = _load_positions(db, strategy_id, symbols)
+            positions.update({(strategy_id, symbol): loaded.get(symbol) for symbol in symbols})
+        return positions
+    finally:
+        db.close()
+
+
+def _load_order_outcomes(client_order_ids: Iterable[str]) -> Dict[str, Tuple[str, Optional[str]]]:
+    """전송 결과가 나온 주문의 client_order_id → (상태, 오류)"""
+    db = SessionLocal()
+    try:
+        rows = db.query(Order.client_order_id, Order.status, Order.order_metadata).filter(
+            Order.client_order_id.in_(list(client_order_ids)),
+            Order.status.notin_(UNSENT_ORDER_STATUSES)
+        ).all()
+        return {
+            client_order_id: (status, (metadata or {}).get("error"))
+            for client_order_id, status, metadata in rows
+        }
+    finally:
+        db.close()
+
+
+class StrategyBook:
+    """종목별 최신 가격과 전략 상태를 두고 가격이 갱신된 종목의 전략을 평가합니다.
+
+    앱 프로세스(StrategyRunner)와 평가 샤드 워커(strategy_shards)가 함께 사용합니다.
+    평가에서 나온 주문은 order_done으로 결과를 받을 때까지 같은 (전략, 종목)을 다시
+    평가하지 않습니다.
+
+    Args:
+        engine: VWAP 조회에 사용할 엔진
+    """
+
+    def __init__(self, engine: VWAPEngine):
+        self.engine = engine
+        self.states: Dict[int, StrategyState] = {}
+        self.symbols: Set[str] = set()
+        self.prices: Dict[str, float] = {}
+        self.dirty: Set[str] = set()
+        self.pending: Set[Tuple[int, str]] = set()  # 주문 결과를 기다리는 (전략, 종목)
+        self.cooldown: Dict[Tuple[int, str], float] = {}  # (전략, 종목) -> 재평가 가능 시각 (monotonic)
+
+    def on_ticks(self, ticks: Iterable[TickRecord]) -> bool:
+        """전략 종목의 최신 가격만 남기고, 갱신된 종목이 있으면 True를 반환합니다."""
+        updated = False
+        for tick in ticks:
+            if tick.symbol in self.symbols:
+                self.prices[tick.symbol] = tick.price
+                self.dirty.add(tick.symbol)
+                updated = True
+        return updated
+
+    def set_states(self, states: Dict[int, Optional[StrategyState]]) -> None:
+        """전략 상태를 교체합니다 (None이면 제거). 교체된 전략은 마지막 가격으로 다시 평가합니다."""
+        for strategy_id, state in states.items():
+            previous = self.states.pop(strategy_id, None)
+            if state is None:
+                continue
+            if previous is not None and previous is not state:
+                state.inherit_metrics(previous)
+            self.states[strategy_id] = state
+            self.dirty.update(symbol for symbol in state.symbols if symbol in self.prices)
+        self.symbols = {symbol for state in self.states.values() for symbol in state.symbols}
+
+    def order_done(
+        self,
+        strategy_id: int,
+        symbol: str,
+        position: Optional[Position],
+        cooldown: float = 0.0
+    ) -> None:
+        """주문 결과를 반영합니다.
+
+        Args:
+            position: 주문 후 포지션 (None이면 미보유)
+            cooldown: 실패한 경우 재평가까지 기다릴 시간 (초)
+        """
+        key = (strategy_id, symbol)
+        self.pending.discard(key)
+        state = self.states.get(strategy_id)
+        if state is not None:
+            if position is None:
+                state.positions.pop(symbol, None)
+            else:
+                state.positions[symbol] = position
+        if cooldown:
+            self.cooldown[key] = time.monotonic() + cooldown
+
+    def evaluate(self) -> List[Tuple[int, Decision]]:
+        """가격이 갱신된 종목이 있는 전략을 평가해 (전략 ID, 주문) 목록을 반환합니다 (거래 시간대만)."""
+        if not self.dirty or not _in_session(datetime.now(KST)):
+            return []
+        dirty, self.dirty = self.dirty, set()
+        today = datetime.now(KST).date()
+        now = time.monotonic()
+        decisions = []
+        for state in self.states.values():
+            if dirty.isdisjoint(state.symbols):
+                continue
+            skip = {
+                symbol for symbol in state.symbols
+                if (state.strategy_id, symbol) in self.pending
+                or self.cooldown.get((state.strategy_id, symbol), 0) > now
+            }
+            started = time.perf_counter()
+            vwaps = {symbol: self.engine.vwap(symbol, vwap_period=state.params.vwap_period) for symbol in state.symbols}
+            result = evaluate_strategy(state, self.prices, vwaps, today, skip)
+            state.record_evaluation((time.perf_counter() - started) * 1000)
+
+            for decision in result:
+                self.pending.add((state.strategy_id, decision.symbol))
+                decisions.append((state.strategy_id, decision))
+        return decisions
+
+
+class StrategyRunner:
+    """활성 전략 실행기 (이벤트 루프 안에서 start)
+
+    Args:
+        shards: 평가 워커 프로세스 수 (0이면 이 프로세스에서 평가)
+    """
+
+    def __init__(self, shards: int = settings.STRATEGY_RUNNER_SHARDS):
+        self.shards = shards
+        self.states: Dict[int, StrategyState] = {}
+        self.book = StrategyBook(vwap_engine)
+        self._pool: Optional[ShardPool] = None
+        self._subscription: Optional[Subscription] = None
+        self._order_subscription: Optional[Subscription] = None
+        self._working: Dict[str, Tuple[int, str]] = {}  # 전송 결과를 기다리는 client_order_id -> (전략, 종목)
+        self._accounts: Dict[int, TradingAccount] = {}
+        self._symbols: Set[str] = set()
+        self._reload_ids: Set[int] = set()
+        self._reload_all = True
+        self._cumulative_volumes: Dict[str, int] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._order_tasks: Set[asyncio.Task] = set()
+        self.loop_lag_ms_last = 0.0
+        self.loop_lag_ms_max = 0.0
+        self.loop_lag_ms_mean = 0.0  # 지수 이동 평균
+        self.cycles = 0
+
+    def on_ticks(self, ticks: List[TickRecord]) -> None:
+        """전략 종목의 틱을 평가 대상으로 반영합니다.
+
+        앱 프로세스에서 평가하면 이벤트 버스의 종목별 최신 시세를 받고, 샤드를 쓰면 워커의
+        VWAP 엔진이 모든 틱을 받아야 하므로 RealtimeQuoteIngester 구독 함수로 받아
+        샤드별로 모아 두었다가 평가 주기마다 한 번에 보냅니다.
+        """
+        if self._pool is not None:
+            updated = self._pool.add_ticks([tick for tick in ticks if tick.symbol in self._symbols])
+        else:
+            updated = self.book.on_ticks(ticks)
+        if updated and self._wake is not None:
+            self._wake.set()
+
+    def notify_changed(self, strategy_id: Optional[int] = None) -> None:
+        """전략이 생성/수정/삭제되었음을 알립니다 (다른 스레드에서 호출 가능).
+
+        Args:
+            strategy_id: 변경된 전략 ID (None이면 전체 활성 전략을 다시 읽음)
+        """
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._request_reload, strategy_id)
+
+    def _request_reload(self, strategy_id: Optional[int]) -> None:
+        if strategy_id is None:
+            self._reload_all = True
+        else:
+            self._reload_ids.add(strategy_id)
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _reload(self) -> None:
+        ids = None if self._reload_all else set(self._reload_ids)
+        self._reload_all = False
+        self._reload_ids.clear()
+        states, accounts = await asyncio.to_thread(_load_states, ids)
+        if ids is None:
+            states.update({strategy_id: None for strategy_id in self.states if strategy_id not in states})
+
+        for strategy_id, state in states.items():
+            previous = self.states.pop(strategy_id, None)
+            if state is None:
+                continue
+            if previous is not None:
+                state.inherit_metrics(previous)
+            self.states[strategy_id] = state
+        self._accounts.update(accounts)
+        if self._pool is not None:
+            self._pool.set_states(states)
+        else:
+            self.book.set_states(states)
+
+        self._symbols = {symbol for state in self.states.values() for symbol in state.symbols}
+        if self._subscription is not None:
+            self._subscription.set_keys(QUOTE, self._symbols)
+        if settings.KIS_REALTIME_ENABLED:
+            # 실시간 구독 종목은 수신기가 활성 전략에서 직접 읽음 (바뀐 전략을 바로 반영하도록 요청만)
+            quote_ingester.refresh_strategy_symbols()
+
+    def _dispatch(self, decisions: List[Tuple[int, Decision]]) -> None:
+        """평가 결과 주문을 별도 태스크로 보냅니다 (평가 루프를 막지 않도록)."""
+        for strategy_id, decision in decisions:
+            state = self.states.get(strategy_id)
+            if state is None:
+                # 평가 후 전략이 비활성/삭제됨
+                self._order_done(strategy_id, decision.symbol, None)
+                continue
+            client_order_id = f"strategy-{strategy_id}:{decision.symbol}:{int(time.time() * 1000)}"
+            self._working[client_order_id] = (strategy_id, decision.symbol)
+            event_bus.publish(SIGNAL, state.trading_account_id, {
+                "strategy_id": strategy_id, "client_order_id": client_order_id, **decision._asdict()
+            })
+            task = asyncio.create_task(self._submit(state, decision, client_order_id))
+            self._order_tasks.add(task)
+            task.add_done_callback(self._order_tasks.discard)
+
+    def _order_done(self, strategy_id: int, symbol: str, position: Optional[Position], cooldown: float = 0.0) -> None:
+        if self._pool is not None:
+            self._pool.order_done(strategy_id, symbol, position, cooldown)
+        else:
+            self.book.order_done(strategy_id, symbol, position, cooldown)
+
+    def _on_shard_message(self, message: Tuple[str, int, object]) -> None:
+        kind, _, payload = message
+        if kind == MSG_DECISIONS:
+            self._dispatch(payload)
+        elif kind == MSG_STATS:
+            # 샤드별 평가 지표를 전략 단위로 합산
+            totals: Dict[int, List[float]] = {}
+            for stats in self._pool.shard_stats.values():
+                for strategy_id, (count, total_ms, max_ms, last_ms) in stats["evaluations"].items():
+                    merged = totals.setdefault(strategy_id, [0, 0.0, 0.0, 0.0])
+                    merged[0] += count
+                    merged[1] += total_ms
+                    merged[2] = max(merged[2], max_ms)
+                    merged[3] = max(merged[3], last_ms)
+            for strategy_id, (count, total_ms, max_ms, last_ms) in totals.items():
+                state = self.states.get(strategy_id)
+                if state is not None:
+                    state.evaluations, state.evaluation_ms_total = int(count), total_ms
+                    state.evaluation_ms_max, state.evaluation_ms_last = max_ms, last_ms
+
+    async def _submit(self, state: StrategyState, decision: Decision, client_order_id: str) -> None:
+        """주문을 outbox에 기록합니다 (KIS 전송은 order_submitter, 결과는 _watch_orders가 반영)."""
+        try:
+            await asyncio.to_thread(_queue_order, state, decision, client_order_id)
+        except Exception as e:
+            # 기록하지 못한 주문은 전송되지 않으므로 실패로 처리
+            if self._working.pop(client_order_id, None) is not None:
+                current = self.states.get(state.strategy_id, state)
+                self._order_result(current, decision.symbol, current.positions.get(decision.symbol), str(e))
+            return
+        order_submitter.notify()
+
+    def _order_result(
+        self,
+        state: StrategyState,
+        symbol: str,
+        position: Optional[Position],
+        error: Optional[str] = None
+    ) -> None:
+        """전략 주문의 전송 결과를 반영하고 (전략, 종목)을 다시 평가 대상으로 돌립니다."""
+        cooldown = 0.0
+        if error is not None:
+            state.order_failures += 1
+            cooldown = settings.STRATEGY_RUNNER_ORDER_COOLDOWN_SECONDS
+            logger.warning(f"Strategy {state.strategy_id} order for {symbol} failed: {error}")
+        else:
+            state.orders += 1
+        self._set_position(state, symbol, position)
+        self._order_done(state.strategy_id, symbol, position, cooldown)
+
+    @staticmethod
+    def _set_position(state: StrategyState, symbol: str, position: Optional[Position]) -> None:
+        if position is None:
+            state.positions.pop(symbol, None)
+        else:
+            state.positions[symbol] = position
+
+    def _collect_order_events(
+        self,
+        events: List[Event],
+        outcomes: Dict[str, Tuple[str, Optional[str]]],
+        refresh: Set[Tuple[int, str]]
+    ) -> None:
+        for event in events:
+            payload = event.payload
+            status = payload.get("status")
+            if status in UNSENT_ORDER_STATUSES:
+                continue
+            client_order_id = payload.get("client_order_id")
+            if client_order_id in self._working:
+                outcomes[client_order_id] = (status, (payload.get("order_metadata") or {}).get("error"))
+            elif payload.get("strategy_id") in self.states and status in FILL_ORDER_STATUSES:
+                # 이미 결과를 반영한 주문의 체결/잔량 취소
+                refresh.add((payload["strategy_id"], payload.get("symbol")))
+
+    async def _apply_order_events(
+        self,
+        outcomes: Dict[str, Tuple[str, Optional[str]]],
+        refresh: Set[Tuple[int, str]]
+    ) -> None:
+        results = [(self._working.pop(client_order_id), result) for client_order_id, result in outcomes.items()]
+        # 아직 결과를 기다리는 주문이 있는 (전략, 종목)은 그 결과가 올 때 갱신
+        refresh = refresh - set(self._working.values())
+        positions = await asyncio.to_thread(_load_symbol_positions, {key for key, _ in results} | refresh)
+
+        for (strategy_id, symbol), (status, error) in results:
+            state = self.states.get(strategy_id)
+            if state is None:
+                self._order_done(strategy_id, symbol, None)
+                continue
+            if status in INACTIVE_ORDER_STATUSES:
+                error = error or status
+            else:
+                error = None
+            self._order_result(state, symbol, positions.get((strategy_id, symbol)), error)
+        for strategy_id, symbol in refresh:
+            state = self.states.get(strategy_id)
+            if state is not None and (strategy_id, symbol) not in self._working.values():
+                position = positions.get((strategy_id, symbol))
+                self._set_position(state, symbol, position)
+                self._order_done(strategy_id, symbol, position)
+
+    async def _watch_orders(self) -> None:
+        """전략 주문의 order 이벤트로 전송 결과와 체결을 포지션에 반영합니다.
+
+        다른 프로세스의 전송기가 보낸 주문은 이 프로세스에 이벤트가 오지 않으므로
+        ORDER_POLL_SECONDS마다 결과를 기다리는 주문을 DB에서 확인합니다.
+        """
+        next_poll = time.monotonic() + ORDER_POLL_SECONDS
+        while True:
+            try:
+                events = await asyncio.wait_for(
+                    self._order_subscription.get_batch(), max(0.0, next_poll - time.monotonic())
+                )
+            except asyncio.TimeoutError:
+                events = []
+            outcomes: Dict[str, Tuple[str, Optional[str]]] = {}
+            refresh: Set[Tuple[int, str]] = set()
+            try:
+                self._collect_order_events(events, outcomes, refresh)
+                if time.monotonic() >= next_poll:
+                    next_poll = time.monotonic() + ORDER_POLL_SECONDS
+                    waiting = [client_order_id for client_order_id in self._working if client_order_id not in outcomes]
+                    if waiting:
+                        outcomes.update(await asyncio.to_thread(_load_order_outcomes, waiting))
+                if outcomes or refresh:
+                    await self._apply_order_events(outcomes, refresh)
+            except Exception as e:
+                logger.warning(f"Failed to apply strategy order results: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            try:
+                if self._reload_all or self._reload_ids:
+                    await self._reload()
+                if self._pool is not None:
+                    self._pool.flush()
+                else:
+                    self._dispatch(self.book.evaluate())
+                self.cycles += 1
+            except Exception as e:
+                logger.exception(f"Strategy runner cycle failed: {e}")
+
+    async def _probe_lag(self) -> None:
+        """이벤트 루프 지연 측정 (예정보다 늦게 깨어난 시간)"""
+        while True:
+            started = self._loop.time()
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            lag = max(0.0, (self._loop.time() - started - LAG_PROBE_INTERVAL) * 1000)
+            self.loop_lag_ms_last = lag
+            self.loop_lag_ms_max = max(self.loop_lag_ms_max, lag)
+            self.loop_lag_ms_mean += 0.1 * (lag - self.loop_lag_ms_mean)
+
+    async def _poll_quotes(self) -> None:
+        """실시간 수신을 쓰지 않을 때 현재가를 주기적으로 조회해 틱으로 반영합니다."""
+        while True:
+            await asyncio.sleep(settings.STRATEGY_RUNNER_POLL_SECONDS)
+            symbol_accounts = {
+                symbol: state.trading_account_id for state in self.states.values() for symbol in state.symbols
+            }
+            if not symbol_accounts:
+                continue
+            db = SessionLocal()
+            try:
+                clients = {
+                    account_id: AsyncKISAPIClient(self._accounts[account_id], db)
+                    for account_id in set(symbol_accounts.values())
+                }
+                symbols = list(symbol_accounts)
+                results = await asyncio.gather(
+                    *(clients[symbol_accounts[symbol]].get_current_price(symbol) for symbol in symbols),
+                    return_exceptions=True
+                )
+            finally:
+                db.close()
+
+            now_ms = int(time.time() * 1000)
+            ticks = []
+            for symbol, result in zip(symbols, results):
+                if isinstance(result, Exception) or result.get("rt_cd") not in (None, "0"):
+                    continue
+                output = result.get("output") or {}
+                if not output.get("stck_prpr"):
+                    continue
+                cumulative = int(output.get("acml_vol") or 0)
+                previous = self._cumulative_volumes.get(symbol)
+                self._cumulative_volumes[symbol] = cumulative
+                # 첫 조회는 기준값으로만 사용 (장중 재시작 시 누적 거래량 전체가 한 틱에 몰리지 않도록)
+                volume = cumulative - previous if previous is not None and cumulative >= previous else 0
+                ticks.append(TickRecord(symbol, now_ms, float(output["stck_prpr"]), volume, cumulative))
+            if ticks:
+                vwap_engine.on_ticks(ticks)
+                event_bus.publish_ticks(ticks)
+                if self._pool is not None:
+                    self.on_ticks(ticks)
+
+    async def _consume_quotes(self) -> None:
+        """이벤트 버스에서 종목별 최신 시세를 받아 반영합니다."""
+        while True:
+            events = await self._subscription.get_batch()
+            self.on_ticks([event.payload for event in events])
+
+    def start(self) -> None:
+        """실행 태스크를 시작합니다 (이벤트 루프 안에서 호출)."""
+        if self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._reload_all = True
+        self._wake.set()
+        if self.shards > 0:
+            loop = self._loop
+            self.states.clear()  # 새 워커에 전체 전략을 다시 보냄
+            self._pool = ShardPool(
+                self.shards, lambda message: loop.call_soon_threadsafe(self._on_shard_message, message)
+            )
+            self._pool.start()
+        self._order_subscription = event_bus.subscribe({ORDER: None}, name="strategy_runner:orders")
+        self._tasks = [
+            asyncio.create_task(self._run()),
+            asyncio.create_task(self._probe_lag()),
+            asyncio.create_task(self._watch_orders())
+        ]
+        if self._pool is None:
+            # 평가 사이에 밀린 같은 종목 시세는 최신 값 하나로 합침
+            self._subscription = event_bus.subscribe(
+                {QUOTE: ()}, maxsize=100000, coalesce=(QUOTE,), name="strategy_runner"
+            )
+            self._tasks.append(asyncio.create_task(self._consume_quotes()))
+        elif settings.KIS_REALTIME_ENABLED:
+            quote_ingester.add_listener(self.on_ticks)
+        if not settings.KIS_REALTIME_ENABLED:
+            self._tasks.append(asyncio.create_task(self._poll_quotes()))
+
+    async def stop(self) -> None:
+        quote_ingester.remove_listener(self.on_ticks)
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+        if self._order_subscription is not None:
+            self._order_subscription.close()
+            self._order_subscription = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        # 평가한 주문은 outbox 기록까지 마치도록 기다림 (전송은 order_submitter가 이어서 함)
+        await asyncio.gather(*self._order_tasks, return_exceptions=True)
+        self._working.clear()
+        if self._pool is not None:
+            await asyncio.to_thread(self._pool.stop)
+            self._pool = None
+        self._tasks = []
+        self._loop = None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "running": bool(self._tasks),
+            "strategies": len(self.states),
+            "symbols": len(self._symbols),
+            "cycles": self.cycles,
+            "orders_in_flight": len(self._working),
+            "shards": self._pool.stats() if self._pool is not None else None,
+            "loop_lag_ms": {
+                "last": round(self.loop_lag_ms_last, 3),
+                "mean": round(self.loop_lag_ms_mean, 3),
+                "max": round(self.loop_lag_ms_max, 3),
+            },
+            "per_strategy": {strategy_id: state.stats() for strategy_id, state in self.states.items()},
+        }
+
+
+strategy_runner = StrategyRunner()
@@ -0,0 +1,308 @@
+"""
+전략 평가 샤드 (워커 프로세스)
+
+(전략, 종목) 평가를 종목 코드의 crc32 해시로 워커 프로세스에 나눕니다. 앱 프로세스는
+전략 종목의 틱을 샤드별로 모아 평가 주기마다 한 번에 보내고, 각 워커는 자기 종목만의
+VWAP 엔진과 StrategyBook으로 평가해 주문 결정만 돌려보냅니다. 주문은 앱 프로세스의
+StrategyRunner가 보내므로 앱키별 속도 제한기는 프로세스 하나에서만 사용됩니다.
+
+한 전략의 종목이 여러 샤드에 걸치면 샤드마다 그 샤드 종목만 가진 사본을 평가합니다.
+워커가 죽으면 flush에서 감지해 다시 띄우고, 그 샤드 종목의 현재 전략 상태(포지션 포함)와
+주문 결과를 기다리는 (전략, 종목)을 다시 보냅니다 (같은 샤드는 RESPAWN_SECONDS에 한 번까지).
+
+메시지 (종류, 내용):
+    앱 → 워커: ticks(List[TickRecord]), states({전략 ID: 상태 또는 None}),
+               order_done((전략 ID, 종목, 포지션, 대기 초)), pending([(전략 ID, 종목)]),
+               barrier(토큰), stop
+    워커 → 앱: (종류, 샤드 번호, 내용) - decisions([(전략 ID, Decision)]), stats(dict), barrier(토큰)
+"""
+import dataclasses
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+import zlib
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.services.bar_store import BarStore
+from app.services.kis_realtime import TickRecord
+from app.services.vwap_engine import VWAPEngine
+
+if TYPE_CHECKING:
+    from app.services.strategy_runner import Position, StrategyState
+
+logger = logging.getLogger(__name__)
+
+MSG_TICKS = "ticks"
+MSG_STATES = "states"
+MSG_ORDER_DONE = "order_done"
+MSG_PENDING = "pending"
+MSG_BARRIER = "barrier"
+MSG_STOP = "stop"
+MSG_DECISIONS = "decisions"
+MSG_STATS = "stats"
+
+Message = Tuple[str, int, Any]
+
+RESPAWN_SECONDS = 5.0  # 같은 샤드 워커를 다시 띄우는 최소 간격
+
+
+def shard_of(symbol: str, shards: int) -> int:
+    """종목이 속한 샤드 번호 (프로세스가 달라도 같은 값)"""
+    return zlib.crc32(symbol.encode()) % shards
+
+
+def _subset(state: "StrategyState", symbols: List[str]) -> "StrategyState":
+    """샤드 종목만 가진 전략 사본 (평가 지표는 샤드에서 새로 셈)"""
+    return dataclasses.replace(
+        state,
+        symbols=symbols,
+        positions={symbol: position for symbol, position in state.positions.items() if symbol in symbols},
+        evaluations=0,
+        evaluation_ms_total=0.0,
+        evaluation_ms_max=0.0,
+        evaluation_ms_last=0.0,
+        orders=0,
+        order_failures=0
+    )
+
+
+def _shard_stats(book, ticks: int) -> Dict[str, Any]:
+    return {
+        "ticks": ticks,
+        "strategies": len(book.states),
+        "symbols": len(book.symbols),
+        "evaluations": {
+            strategy_id: (state.evaluations, state.evaluation_ms_total, state.evaluation_ms_max, state.evaluation_ms_last)
+            for strategy_id, state in book.states.items()
+        },
+    }
+
+
+def _run_shard(shard: int, inbox, outbox, bar_store_path: str, stats_interval: float) -> None:
+    """워커 프로세스 본체. 쌓인 메시지를 한 번에 반영한 뒤 평가합니다."""
+    from app.services.strategy_runner import StrategyBook
+
+    book = StrategyBook(VWAPEngine(history=BarStore(bar_store_path)))
+    ticks = 0
+    last_stats = time.monotonic()
+    while True:
+        messages = [inbox.get()]
+        while True:
+            try:
+                messages.append(inbox.get_nowait())
+            except queue.Empty:
+                break
+
+        barriers = []
+        for kind, payload in messages:
+            if kind == MSG_TICKS:
+                book.engine.on_ticks(payload)
+                book.on_ticks(payload)
+                ticks += len(payload)
+            elif kind == MSG_STATES:
+                book.set_states(payload)
+            elif kind == MSG_ORDER_DONE:
+                book.order_done(*payload)
+            elif kind == MSG_PENDING:
+                book.pending.update(payload)
+            elif kind == MSG_BARRIER:
+                barriers.append(payload)
+            elif kind == MSG_STOP:
+                outbox.put((MSG_STATS, shard, _shard_stats(book, ticks)))
+                return
+
+        try:
+            decisions = book.evaluate()
+        except Exception as e:
+            logger.exception(f"Strategy shard {shard} evaluation failed: {e}")
+            decisions = []
+        if decisions:
+            outbox.put((MSG_DECISIONS, shard, decisions))
+        now = time.monotonic()
+        if barriers or now - last_stats >= stats_interval:
+            outbox.put((MSG_STATS, shard, _shard_stats(book, ticks)))
+            last_stats = now
+        for token in barriers:
+            outbox.put((MSG_BARRIER, shard, token))
+
+
+class ShardPool:
+    """평가 워커 프로세스 묶음
+
+    Args:
+        shards: 워커 프로세스 수
+        handler: 워커 메시지 (종류, 샤드 번호, 내용)를 받을 함수 (수신 스레드에서 호출)
+        bar_store_path: 워커 VWAP 엔진이 이전 거래일 봉을 읽을 저장소
+        stats_interval: 워커가 평가 지표를 보내는 주기 (초)
+    """
+
+    def __init__(
+        self,
+        shards: int,
+        handler: Callable[[Message], None],
+        bar_store_path: str = settings.BAR_STORE_PATH,
+        stats_interval: float = 1.0
+    ):
+        self.shards = shards
+        self.handler = handler
+        self.bar_store_path = bar_store_path
+        self.stats_interval = stats_interval
+        self.shard_stats: Dict[int, Dict[str, Any]] = {}
+        self.ticks_sent = 0
+        self.restarts = 0
+        self._shard_by_symbol: Dict[str, int] = {}
+        self._buffers: List[List[TickRecord]] = [[] for _ in range(shards)]
+        self._inboxes: List[Any] = []
+        self._outbox = None
+        self._context = None
+        self._processes: List[multiprocessing.Process] = []
+        self._respawn_at: List[float] = [0.0] * shards  # 샤드별 다시 띄울 수 있는 시각 (monotonic)
+        self._reader: Optional[threading.Thread] = None
+        # 워커가 죽었을 때 다시 보낼 상태 (전략 상태는 StrategyRunner와 같은 객체라 포지션이 최신)
+        self._states: Dict[int, "StrategyState"] = {}
+        self._pending: Set[Tuple[int, str]] = set()  # 주문 결과를 기다리는 (전략, 종목)
+        self._pending_lock = threading.Lock()
+
+    def _spawn(self, index: int) -> None:
+        self._inboxes[index] = self._context.Queue()
+        self._processes[index] = self._context.Process(
+            target=_run_shard,
+            args=(index, self._inboxes[index], self._outbox, self.bar_store_path, self.stats_interval),
+            name=f"strategy-shard-{index}",
+            daemon=True
+        )
+        self._processes[index].start()
+
+    def start(self) -> None:
+        self._context = multiprocessing.get_context("spawn")
+        self._outbox = self._context.Queue()
+        self._inboxes = [None] * self.shards
+        self._processes = [None] * self.shards
+        for index in range(self.shards):
+            self._spawn(index)
+        self._reader = threading.Thread(target=self._read, name="strategy-shard-reader", daemon=True)
+        self._reader.start()
+
+    def _read(self) -> None:
+        while True:
+            message = self._outbox.get()
+            if message is None:
+                return
+            if message[0] == MSG_STATS:
+                self.shard_stats[message[1]] = message[2]
+            elif message[0] == MSG_DECISIONS:
+                with self._pending_lock:
+                    self._pending.update((strategy_id, decision.symbol) for strategy_id, decision in message[2])
+            try:
+                self.handler(message)
+            except Exception as e:
+                logger.warning(f"Strategy shard message handling failed: {e}")
+
+    def shard_of(self, symbol: str) -> int:
+        shard = self._shard_by_symbol.get(symbol)
+        if shard is None:
+            shard = self._shard_by_symbol[symbol] = shard_of(symbol, self.shards)
+        return shard
+
+    def add_ticks(self, ticks: Iterable[TickRecord]) -> bool:
+        """틱을 샤드별로 모아 둡니다 (flush에서 전송). 추가된 틱이 있으면 True를 반환합니다."""
+        added = False
+        for tick in ticks:
+            self._buffers[self.shard_of(tick.symbol)].append(tick)
+            added = True
+        return added
+
+    def _respawn_dead(self) -> None:
+        """죽은 워커를 다시 띄우고 그 샤드 종목의 전략 상태와 주문 중인 (전략, 종목)을 다시 보냅니다."""
+        now = time.monotonic()
+        for index, process in enumerate(self._processes):
+            if process.exitcode is None or now < self._respawn_at[index]:
+                continue
+            logger.error(f"Strategy shard {index} exited with code {process.exitcode}, restarting")
+            self._respawn_at[index] = now + RESPAWN_SECONDS
+            self.restarts += 1
+            # 죽은 워커의 받은편지함에 남은 메시지는 버림
+            self._inboxes[index].cancel_join_thread()
+            self._inboxes[index].close()
+            self._spawn(index)
+            states = {}
+            for strategy_id, state in self._states.items():
+                symbols = [symbol for symbol in state.symbols if self.shard_of(symbol) == index]
+                if symbols:
+                    states[strategy_id] = _subset(state, symbols)
+            with self._pending_lock:
+                pending = [key for key in self._pending if self.shard_of(key[1]) == index]
+            if states:
+                self._inboxes[index].put((MSG_STATES, states))
+            if pending:
+                self._inboxes[index].put((MSG_PENDING, pending))
+
+    def flush(self) -> None:
+        """모아 둔 틱을 샤드마다 메시지 하나로 보냅니다 (죽은 워커는 다시 띄운 뒤 보냄)."""
+        self._respawn_dead()
+        for index, buffer in enumerate(self._buffers):
+            if buffer:
+                self._inboxes[index].put((MSG_TICKS, buffer))
+                self.ticks_sent += len(buffer)
+                self._buffers[index] = []
+
+    def set_states(self, states: Dict[int, Optional["StrategyState"]]) -> None:
+        """전략 상태를 샤드별 사본으로 나눠 보냅니다 (None이면 모든 샤드에서 제거)."""
+        per_shard: List[Dict[int, Optional["StrategyState"]]] = [{} for _ in range(self.shards)]
+        for strategy_id, state in states.items():
+            if state is None:
+                self._states.pop(strategy_id, None)
+            else:
+                self._states[strategy_id] = state
+            symbols: List[List[str]] = [[] for _ in range(self.shards)]
+            for symbol in state.symbols if state is not None else ():
+                symbols[self.shard_of(symbol)].append(symbol)
+            for index in range(self.shards):
+                per_shard[index][strategy_id] = _subset(state, symbols[index]) if symbols[index] else None
+        for index, payload in enumerate(per_shard):
+            if payload:
+                self._inboxes[index].put((MSG_STATES, payload))
+
+    def order_done(self, strategy_id: int, symbol: str, position: Optional["Position"], cooldown: float = 0.0) -> None:
+        with self._pending_lock:
+            self._pending.discard((strategy_id, symbol))
+        self._inboxes[self.shard_of(symbol)].put((MSG_ORDER_DONE, (strategy_id, symbol, position, cooldown)))
+
+    def barrier(self, token: Any) -> None:
+        """모든 샤드가 앞서 보낸 메시지를 처리하면 (barrier, 샤드, token)을 돌려보내도록 요청합니다."""
+        self.flush()
+        for inbox in self._inboxes:
+            inbox.put((MSG_BARRIER, token))
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """워커를 종료합니다 (블로킹)."""
+        self.flush()
+        for inbox in self._inboxes:
+            inbox.put((MSG_STOP, None))
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        if self._reader is not None:
+            self._outbox.put(None)
+            self._reader.join(timeout)
+        self._processes = []
+        self._reader = None
+        self._states.clear()
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "shards": self.shards,
+            "alive": sum(process.is_alive() for process in self._processes),
+            "restarts": self.restarts,
+            "ticks_sent": self.ticks_sent,
+            "ticks_evaluated": sum(stats["ticks"] for stats in self.shard_stats.values()),
+            "per_shard": {
+                index: {"strategies": stats["strategies"], "symbols": stats["symbols"], "ticks": stats["ticks"]}
+                for index, stats in sorted(self.shard_stats.items())
+            },
+        }
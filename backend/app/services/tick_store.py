@@ -0,0 +1,210 @@
+"""
+종목별 당일 틱 저장소 (열 지향, 메모리 내)
+
+틱마다 dict를 만드는 대신 종목별로 미리 할당한 NumPy 배열(시각, 가격, 거래량)에
+추가합니다. 배열이 가득 차면 두 배로 늘리므로 추가는 평균 O(1)이며, 시간 구간
+조회는 searchsorted로 경계를 찾아 복사 없는 뷰를 반환합니다.
+
+전체 할당량이 메모리 한도를 넘으면 더 이상 늘리지 않고 해당 틱을 버린 뒤
+dropped 카운터에 기록합니다. 새 거래일의 첫 틱이 들어오면 on_session_end 콜백
+(예: 과거 봉 저장소에 1분봉으로 저장)에 전날 틱을 넘긴 뒤 모든 종목을 비웁니다.
+"""
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.services.kis_realtime import TickRecord, kst_day_start_ms
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_DTYPE = np.int64  # epoch ms
+PRICE_DTYPE = np.float64
+VOLUME_DTYPE = np.int64
+BYTES_PER_TICK = (
+    np.dtype(TIMESTAMP_DTYPE).itemsize + np.dtype(PRICE_DTYPE).itemsize + np.dtype(VOLUME_DTYPE).itemsize
+)
+
+
+class TickView(NamedTuple):
+    """틱 버퍼의 구간 뷰 (배열은 저장소 메모리를 공유하므로 수정하지 말 것)"""
+    timestamps: np.ndarray
+    prices: np.ndarray
+    volumes: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+class SymbolTickBuffer:
+    """한 종목의 틱을 담는 가변 길이 배열"""
+
+    __slots__ = ("timestamps", "prices", "volumes", "length")
+
+    def __init__(self, capacity: int):
+        self.timestamps = np.empty(capacity, dtype=TIMESTAMP_DTYPE)
+        self.prices = np.empty(capacity, dtype=PRICE_DTYPE)
+        self.volumes = np.empty(capacity, dtype=VOLUME_DTYPE)
+        self.length = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def nbytes(self) -> int:
+        return self.capacity * BYTES_PER_TICK
+
+    def grow(self, capacity: int) -> None:
+        for name in ("timestamps", "prices", "volumes"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.length] = old[:self.length]
+            setattr(self, name, new)
+
+    def append(self, timestamp: int, price: float, volume: int) -> None:
+        """틱을 추가합니다 (용량 확인은 호출자가 함)."""
+        index = self.length
+        # 시각은 단조 증가로 유지해 searchsorted 조회가 가능하도록 함
+        if index and timestamp < self.timestamps[index - 1]:
+            timestamp = self.timestamps[index - 1]
+        self.timestamps[index] = timestamp
+        self.prices[index] = price
+        self.volumes[index] = volume
+        self.length = index + 1
+
+    def view(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> TickView:
+        """[start_ms, end_ms) 구간의 뷰를 반환합니다."""
+        timestamps = self.timestamps[:self.length]
+        start = 0 if start_ms is None else int(np.searchsorted(timestamps, start_ms, side="left"))
+        end = self.length if end_ms is None else int(np.searchsorted(timestamps, end_ms, side="left"))
+        return TickView(timestamps[start:end], self.prices[start:end], self.volumes[start:end])
+
+
+class TickStore:
+    """종목별 당일 틱 저장소
+
+    Args:
+        memory_budget_bytes: 모든 종목 버퍼의 최대 할당 바이트 수
+        initial_capacity: 종목별 최초 할당 틱 수
+    """
+
+    def __init__(self, memory_budget_bytes: int, initial_capacity: int = 4096):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.initial_capacity = initial_capacity
+        self._buffers: Dict[str, SymbolTickBuffer] = {}
+        self._allocated = 0
+        self._session_start_ms: Optional[int] = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+        # 거래일이 바뀌어 버퍼를 비우기 직전에 {종목: 전날 틱 뷰}로 호출
+        self.on_session_end: Optional[Callable[[Dict[str, TickView]], object]] = None
+
+    def _reserve(self, nbytes: int) -> bool:
+        if self._allocated + nbytes > self.memory_budget_bytes:
+            return False
+        self._allocated += nbytes
+        return True
+
+    def _buffer_for_append(self, symbol: str) -> Optional[SymbolTickBuffer]:
+        """추가할 공간이 있는 버퍼를 반환합니다. 메모리 한도를 넘으면 None."""
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            if not self._reserve(self.initial_capacity * BYTES_PER_TICK):
+                return None
+            buffer = SymbolTickBuffer(self.initial_capacity)
+            self._buffers[symbol] = buffer
+        elif buffer.length == buffer.capacity:
+            # 두 배로 늘리되, 한도에 가까우면 남은 만큼만 늘림
+            extra = min(buffer.capacity, (self.memory_budget_bytes - self._allocated) // BYTES_PER_TICK)
+            if extra < 1 or not self._reserve(extra * BYTES_PER_TICK):
+                return None
+            buffer.grow(buffer.capacity + extra)
+        return buffer
+
+    def _roll_session(self, timestamp: int) -> None:
+        """새 거래일의 틱이면 전날 데이터를 비웁니다 (할당된 배열은 재사용)."""
+        session_start = kst_day_start_ms(timestamp)
+        if self._session_start_ms != session_start:
+            if self._session_start_ms is not None and session_start < self._session_start_ms:
+                return
+            if self._session_start_ms is not None and self.on_session_end is not None:
+                try:
+                    self.on_session_end(self._views())
+                except Exception as e:
+                    logger.warning(f"Tick session end callback failed: {e}")
+            for buffer in self._buffers.values():
+                buffer.length = 0
+            self._session_start_ms = session_start
+
+    def append(self, symbol: str, timestamp: int, price: float, volume: int) -> bool:
+        """틱을 추가합니다.
+
+        Returns:
+            저장 여부 (메모리 한도 초과로 버려지면 False)
+        """
+        with self._lock:
+            self._roll_session(timestamp)
+            buffer = self._buffer_for_append(symbol)
+            if buffer is None:
+                self.dropped += 1
+                return False
+            buffer.append(timestamp, price, volume)
+            return True
+
+    def append_ticks(self, ticks: Iterable[TickRecord]) -> None:
+        """실시간 수신기의 틱 묶음을 추가합니다 (RealtimeQuoteIngester 구독 함수)."""
+        with self._lock:
+            for tick in ticks:
+                self._roll_session(tick.timestamp)
+                buffer = self._buffer_for_append(tick.symbol)
+                if buffer is None:
+                    self.dropped += 1
+                    continue
+                buffer.append(tick.timestamp, tick.price, tick.volume)
+
+    def view(self, symbol: str, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> Optional[TickView]:
+        """종목의 [start_ms, end_ms) 구간 틱 뷰를 반환합니다 (틱이 없으면 None).
+
+        뷰는 복사 없이 버퍼를 참조하므로, 버퍼가 늘어나거나 거래일이 바뀐 뒤에는
+        다시 조회해야 합니다.
+        """
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            return None
+        with self._lock:
+            return buffer.view(start_ms, end_ms)
+
+    def _views(self) -> Dict[str, TickView]:
+        return {symbol: buffer.view() for symbol, buffer in self._buffers.items() if buffer.length}
+
+    def views(self) -> Dict[str, TickView]:
+        """틱이 있는 모든 종목의 당일 뷰"""
+        with self._lock:
+            return self._views()
+
+    def symbols(self) -> List[str]:
+        return list(self._buffers)
+
+    def reset(self) -> None:
+        """모든 종목의 틱을 비웁니다."""
+        with self._lock:
+            for buffer in self._buffers.values():
+                buffer.length = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "symbols": len(self._buffers),
+            "ticks": sum(buffer.length for buffer in self._buffers.values()),
+            "allocated_bytes": self._allocated,
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "dropped": self.dropped,
+        }
+
+
+tick_store = TickStore(
+    settings.TICK_STORE_MEMORY_MB * 1024 * 1024,
+    settings.TICK_STORE_INITIAL_CAPACITY
+)
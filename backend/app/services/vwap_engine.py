@@ -0,0 +1,302 @@
+"""
+증분 VWAP 엔진
+
+calculate_vwap은 호출마다 전체 이력을 DataFrame으로 만들어 병합하므로 틱마다
+다시 계산하면 O(n)입니다. 이 엔진은 종목별로 거래량 가중 평균(VWAP)과 가중 편차
+제곱합을 Welford/West 방식으로 유지해 틱당 O(1)로 VWAP와 밴드를 갱신합니다.
+기존 calculate_vwap/calculate_vwap_bands는 일괄 계산 기준 구현으로 남겨 둡니다
+(calculate_vwap_bands는 비가중 표준편차를 사용하므로 밴드 폭이 다를 수 있음).
+
+거래일(KST)이 바뀌면 종목별 세션 누적값을 초기화합니다. 설정된 롤링 윈도우
+(VWAP_ROLLING_WINDOWS_MINUTES)는 윈도우를 벗어난 틱을 누적값에서 제거합니다.
+하루보다 긴 VWAP(Strategy.vwap_period)는 과거 봉 저장소의 이전 거래일 봉으로 만든
+누적값을 거래일마다 한 번 계산해 두고 세션 누적값과 결합합니다.
+"""
+import math
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.services.bar_store import BarStore, bar_store
+from app.services.kis_realtime import TickRecord, kst_day_start_ms
+
+# 롤링 윈도우에서 제거를 이만큼 반복하면 남은 틱으로 다시 계산해 부동소수점 오차를 정리
+RECOMPUTE_EVERY = 10000
+# 여러 거래일 VWAP에 사용할 과거 봉 주기 (앞에서부터 저장된 것을 사용)
+HISTORY_INTERVALS = ("1m", "1d")
+
+
+class VWAPAccumulator:
+    """거래량 가중 평균/분산 누적기 (West의 가중 Welford 알고리즘)"""
+
+    __slots__ = ("volume", "mean", "m2", "count", "last_price")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.volume = 0.0
+        self.mean = 0.0  # = VWAP
+        self.m2 = 0.0  # Σ w·(x - mean)²
+        self.count = 0
+        self.last_price = 0.0
+
+    def update(self, price: float, volume: float) -> float:
+        """틱 하나를 반영하고 갱신된 VWAP를 반환합니다."""
+        self.count += 1
+        self.last_price = price
+        if volume <= 0:
+            return self.mean
+        total = self.volume + volume
+        delta = price - self.mean
+        self.mean += delta * volume / total
+        self.m2 += volume * delta * (price - self.mean)
+        self.volume = total
+        return self.mean
+
+    def remove(self, price: float, volume: float) -> None:
+        """이전에 반영한 틱을 제거합니다 (롤링 윈도우)."""
+        self.count -= 1
+        if volume <= 0:
+            return
+        total = self.volume - volume
+        if total <= 0 or self.count <= 0:
+            last_price = self.last_price
+            self.reset()
+            self.last_price = last_price
+            return
+        delta = price - self.mean
+        previous_mean = self.mean - delta * volume / total
+        self.m2 = max(0.0, self.m2 - volume * (price - previous_mean) * delta)
+        self.mean = previous_mean
+        self.volume = total
+
+    def update_many(self, prices: np.ndarray, volumes: np.ndarray) -> float:
+        """틱 배열(예: TickStore 뷰)을 한 번에 반영합니다 (병렬 분산 결합 공식)."""
+        batch_volume = float(volumes.sum())
+        if len(prices):
+            self.count += len(prices)
+            self.last_price = float(prices[-1])
+        if batch_volume <= 0:
+            return self.mean
+
+        batch_mean = float(np.dot(prices, volumes)) / batch_volume
+        batch_m2 = float(np.dot(volumes, (prices - batch_mean) ** 2))
+        self._combine(batch_volume, batch_mean, batch_m2)
+        return self.mean
+
+    def merge(self, other: "VWAPAccumulator") -> None:
+        """다른 누적기의 값을 결합합니다 (예: 이전 거래일 누적값 + 당일 세션)."""
+        self.count += other.count
+        if other.count:
+            self.last_price = other.last_price
+        if other.volume > 0:
+            self._combine(other.volume, other.mean, other.m2)
+
+    def _combine(self, volume: float, mean: float, m2: float) -> None:
+        total = self.volume + volume
+        delta = mean - self.mean
+        self.mean += delta * volume / total
+        self.m2 += m2 + delta * delta * self.volume * volume / total
+        self.volume = total
+
+    @property
+    def vwap(self) -> float:
+        return self.mean
+
+    @property
+    def std(self) -> float:
+        """거래량 가중 표준편차"""
+        return math.sqrt(self.m2 / self.volume) if self.volume else 0.0
+
+    def bands(self, std_devs: Sequence[float] = (2.0,)) -> Dict[str, object]:
+        """여러 표준편차 배수의 밴드를 한 번에 계산합니다 (O(배수 개수)).
+
+        Returns:
+            {"vwap": float, "std": float, "upper": [float, ...], "lower": [float, ...]}
+            (upper/lower는 std_devs 순서)
+        """
+        std = self.std
+        return {
+            "vwap": self.mean,
+            "std": std,
+            "upper": [self.mean + multiplier * std for multiplier in std_devs],
+            "lower": [self.mean - multiplier * std for multiplier in std_devs],
+        }
+
+
+class RollingVWAPAccumulator(VWAPAccumulator):
+    """최근 window_ms 동안의 틱만 반영하는 누적기"""
+
+    __slots__ = ("window_ms", "_ticks", "_removed")
+
+    def __init__(self, window_ms: int):
+        self.window_ms = window_ms
+        self._ticks: Deque[Tuple[int, float, float]] = deque()
+        self._removed = 0
+        super().__init__()
+
+    def reset(self) -> None:
+        super().reset()
+        self._ticks.clear()
+        self._removed = 0
+
+    def update_at(self, timestamp: int, price: float, volume: float) -> float:
+        """틱을 반영하고 윈도우를 벗어난 틱을 제거한 뒤 VWAP를 반환합니다."""
+        self._ticks.append((timestamp, price, volume))
+        self.update(price, volume)
+        self.evict(timestamp)
+        return self.mean
+
+    def evict(self, now_ms: int) -> None:
+        cutoff = now_ms - self.window_ms
+        ticks = self._ticks
+        while ticks and ticks[0][0] <= cutoff:
+            _, price, volume = ticks.popleft()
+            self.remove(price, volume)
+            self._removed += 1
+        if self._removed >= RECOMPUTE_EVERY:
+            self._recompute()
+
+    def _recompute(self) -> None:
+        ticks = list(self._ticks)
+        last_price = self.last_price
+        VWAPAccumulator.reset(self)
+        self._removed = 0
+        if ticks:
+            data = np.array(ticks, dtype=np.float64)
+            self.update_many(data[:, 1], data[:, 2])
+        self.last_price = last_price
+
+
+class VWAPEngine:
+    """종목별 당일 세션 VWAP/밴드 엔진
+
+    Args:
+        rolling_windows_ms: 종목마다 함께 유지할 롤링 윈도우 길이 목록 (ms)
+        history: 여러 거래일 VWAP에 사용할 과거 봉 저장소
+    """
+
+    def __init__(self, rolling_windows_ms: Sequence[int] = (), history: Optional[BarStore] = None):
+        self.rolling_windows_ms = list(rolling_windows_ms)
+        self.history = history
+        self._sessions: Dict[str, VWAPAccumulator] = {}
+        self._rolling: Dict[Tuple[str, int], RollingVWAPAccumulator] = {}
+        # (종목, 이전 거래일 수) -> 과거 봉 누적값 (거래일이 바뀌면 비움)
+        self._history: Dict[Tuple[str, int], VWAPAccumulator] = {}
+        self._session_start_ms: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _roll_session(self, timestamp: int) -> None:
+        session_start = kst_day_start_ms(timestamp)
+        if self._session_start_ms is None or session_start > self._session_start_ms:
+            for accumulator in self._sessions.values():
+                accumulator.reset()
+            for accumulator in self._rolling.values():
+                accumulator.reset()
+            self._history.clear()
+            self._session_start_ms = session_start
+
+    def _accumulator(self, symbol: str) -> VWAPAccumulator:
+        accumulator = self._sessions.get(symbol)
+        if accumulator is None:
+            accumulator = self._sessions[symbol] = VWAPAccumulator()
+            for window_ms in self.rolling_windows_ms:
+                self._rolling[(symbol, window_ms)] = RollingVWAPAccumulator(window_ms)
+        return accumulator
+
+    def _apply(self, symbol: str, timestamp: int, price: float, volume: float) -> float:
+        vwap = self._accumulator(symbol).update(price, volume)
+        for window_ms in self.rolling_windows_ms:
+            self._rolling[(symbol, window_ms)].update_at(timestamp, price, volume)
+        return vwap
+
+    def update(self, symbol: str, timestamp: int, price: float, volume: float) -> float:
+        """틱 하나를 반영하고 종목의 세션 VWAP를 반환합니다."""
+        with self._lock:
+            self._roll_session(timestamp)
+            return self._apply(symbol, timestamp, price, volume)
+
+    def on_ticks(self, ticks: Iterable[TickRecord]) -> None:
+        """실시간 수신기의 틱 묶음을 반영합니다 (RealtimeQuoteIngester 구독 함수)."""
+        with self._lock:
+            for tick in ticks:
+                self._roll_session(tick.timestamp)
+                self._apply(tick.symbol, tick.timestamp, tick.price, tick.volume)
+
+    def seed(self, symbol: str, timestamp: int, prices: np.ndarray, volumes: np.ndarray) -> float:
+        """재시작 시 이미 지난 당일 틱(또는 분봉)으로 세션 누적값을 채웁니다."""
+        with self._lock:
+            self._roll_session(timestamp)
+            accumulator = self._accumulator(symbol)
+            accumulator.reset()
+            return accumulator.update_many(prices, volumes)
+
+    def _history_accumulator(self, symbol: str, sessions: int) -> VWAPAccumulator:
+        """당일 이전 sessions 거래일 봉의 누적값 (거래일마다 한 번 저장소에서 읽음)"""
+        key = (symbol, sessions)
+        accumulator = self._history.get(key)
+        if accumulator is not None:
+            return accumulator
+
+        accumulator = VWAPAccumulator()
+        if self.history is not None:
+            session_start = self._session_start_ms or kst_day_start_ms(int(time.time() * 1000))
+            for interval in HISTORY_INTERVALS:
+                bars = self.history.read_sessions(symbol, interval, sessions, session_start)
+                if len(bars):
+                    accumulator.update_many((bars.high + bars.low + bars.close) / 3, bars.volume)
+                    break
+        return self._history.setdefault(key, accumulator)
+
+    def _get(self, symbol: str, window_ms: Optional[int], vwap_period: int = 1) -> Optional[VWAPAccumulator]:
+        if window_ms is not None:
+            accumulator = self._rolling.get((symbol, window_ms))
+        elif vwap_period > 1:
+            accumulator = VWAPAccumulator()
+            accumulator.merge(self._history_accumulator(symbol, vwap_period - 1))
+            session = self._sessions.get(symbol)
+            if session is not None:
+                accumulator.merge(session)
+        else:
+            accumulator = self._sessions.get(symbol)
+        if accumulator is None or not accumulator.volume:
+            return None
+        return accumulator
+
+    def vwap(self, symbol: str, window_ms: Optional[int] = None, vwap_period: int = 1) -> Optional[float]:
+        """종목의 세션(또는 롤링 윈도우) VWAP (틱이 없으면 None)
+
+        Args:
+            window_ms: 롤링 윈도우 길이 (지정 시 vwap_period는 무시)
+            vwap_period: 당일을 포함한 거래일 수 (2 이상이면 과거 봉 저장소의 이전 거래일 포함)
+        """
+        accumulator = self._get(symbol, window_ms, vwap_period)
+        return accumulator.vwap if accumulator else None
+
+    def bands(
+        self,
+        symbol: str,
+        std_devs: Sequence[float] = (2.0,),
+        window_ms: Optional[int] = None,
+        vwap_period: int = 1
+    ) -> Optional[Dict[str, object]]:
+        """종목의 거래량 가중 VWAP 밴드 (틱이 없으면 None)"""
+        accumulator = self._get(symbol, window_ms, vwap_period)
+        return accumulator.bands(std_devs) if accumulator else None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "symbols": len(self._sessions),
+            "ticks": sum(accumulator.count for accumulator in self._sessions.values()),
+            "rolling_windows_ms": self.rolling_windows_ms,
+            "rolling_ticks": sum(len(accumulator._ticks) for accumulator in self._rolling.values()),
+            "history_entries": len(self._history),
+        }
+
+
+vwap_engine = VWAPEngine(settings.vwap_rolling_windows_ms, history=bar_store)
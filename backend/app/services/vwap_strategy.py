@@ -1,7 +1,40 @@
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 
+# 매매 신호 코드 (배치 평가 결과)
+SIGNAL_HOLD = 0
+SIGNAL_BUY = 1
+SIGNAL_SELL = -1
+SIGNAL_NAMES = {SIGNAL_HOLD: "HOLD", SIGNAL_BUY: "BUY", SIGNAL_SELL: "SELL"}
+
+# 신호 사유 코드
+REASON_NONE = 0
+REASON_BELOW_VWAP = 1  # VWAP 아래, 상승 돌파 대기
+REASON_ABOVE_VWAP = 2  # VWAP 위, 하락 이탈 대기
+REASON_REVERSION_SELL = 3  # VWAP 위로 크게 벗어남
+REASON_REVERSION_BUY = 4  # VWAP 아래로 크게 벗어남
+REASON_SIGNALS = np.array([SIGNAL_HOLD, SIGNAL_BUY, SIGNAL_SELL, SIGNAL_SELL, SIGNAL_BUY], dtype=np.int8)
+_SIGNAL_REASON_FORMATS = [
+    "신호 없음",
+    "가격이 VWAP 아래 {:.2f}% 위치, 상승 돌파 대기",
+    "가격이 VWAP 위 {:.2f}% 위치, 하락 이탈 대기",
+    "가격이 VWAP 위 {:.2f}% 벗어남, Mean Reversion 매도",
+    "가격이 VWAP 아래 {:.2f}% 벗어남, Mean Reversion 매수",
+]
+
+# 손절/익절 코드
+ACTION_HOLD = 0
+ACTION_STOP_LOSS = 1
+ACTION_TAKE_PROFIT = 2
+ACTION_NAMES = {ACTION_HOLD: "HOLD", ACTION_STOP_LOSS: "STOP_LOSS", ACTION_TAKE_PROFIT: "TAKE_PROFIT"}
+_ACTION_REASON_FORMATS = [
+    "보유 중",
+    "손절매 조건 달성: {:.2f}%",
+    "익절매 조건 달성: {:.2f}%",
+]
+
 
 def calculate_vwap(price_data: List[Dict], volume_data: List[Dict]) -> float:
     """
@@ -76,6 +109,49 @@ def calculate_vwap_bands(vwap: float, price_data: List[Dict], volume_data: List[
     }
 
 
+def calculate_vwap_array(prices: np.ndarray, volumes: np.ndarray) -> float:
+    """
+    가격/거래량 배열로 VWAP를 계산합니다 (TickStore 뷰를 복사 없이 사용).
+    
+    Args:
+        prices: 가격 배열
+        volumes: 거래량 배열 (prices와 같은 길이)
+    
+    Returns:
+        VWAP 값
+    """
+    total_volume = volumes.sum()
+    if len(prices) == 0 or total_volume == 0:
+        return 0.0
+    
+    return float(np.dot(prices, volumes) / total_volume)
+
+
+def calculate_vwap_bands_array(vwap: float, prices: np.ndarray, volumes: np.ndarray,
+                               std_dev: float = 2.0) -> Dict[str, float]:
+    """
+    가격/거래량 배열로 VWAP 밴드를 계산합니다 (calculate_vwap_bands와 같은 표본 표준편차).
+    
+    Args:
+        vwap: VWAP 값
+        prices: 가격 배열
+        volumes: 거래량 배열
+        std_dev: 표준편차 배수 (기본값: 2.0)
+    
+    Returns:
+        {"upper": float, "lower": float, "vwap": float}
+    """
+    if len(prices) < 2:
+        return {"upper": vwap, "lower": vwap, "vwap": vwap}
+    
+    price_std = float(prices.std(ddof=1))
+    return {
+        "upper": vwap + std_dev * price_std,
+        "lower": vwap - std_dev * price_std,
+        "vwap": vwap
+    }
+
+
 def generate_trading_signal(
     current_price: float,
     vwap: float,
@@ -103,39 +179,20 @@ def generate_trading_signal(
     
     # 매수 신호: 가격이 VWAP 아래에서 VWAP로 상승 돌파
     if price_diff_percent < -entry_threshold and price_diff_percent > -exit_threshold:
-        return {
-            "signal": "BUY",
-            "price_diff_percent": price_diff_percent,
-            "reason": f"가격이 VWAP 아래 {abs(price_diff_percent):.2f}% 위치, 상승 돌파 대기"
-        }
-    
+        reason = REASON_BELOW_VWAP
     # 매도 신호: 가격이 VWAP 위에서 VWAP로 하락 이탈
-    if price_diff_percent > entry_threshold and price_diff_percent < exit_threshold:
-        return {
-            "signal": "SELL",
-            "price_diff_percent": price_diff_percent,
-            "reason": f"가격이 VWAP 위 {price_diff_percent:.2f}% 위치, 하락 이탈 대기"
-        }
-    
+    elif price_diff_percent > entry_threshold and price_diff_percent < exit_threshold:
+        reason = REASON_ABOVE_VWAP
     # Mean Reversion: 가격이 VWAP에서 크게 벗어난 경우
-    if abs(price_diff_percent) > exit_threshold:
-        if price_diff_percent > 0:
-            return {
-                "signal": "SELL",
-                "price_diff_percent": price_diff_percent,
-                "reason": f"가격이 VWAP 위 {price_diff_percent:.2f}% 벗어남, Mean Reversion 매도"
-            }
-        else:
-            return {
-                "signal": "BUY",
-                "price_diff_percent": price_diff_percent,
-                "reason": f"가격이 VWAP 아래 {abs(price_diff_percent):.2f}% 벗어남, Mean Reversion 매수"
-            }
+    elif abs(price_diff_percent) > exit_threshold:
+        reason = REASON_REVERSION_SELL if price_diff_percent > 0 else REASON_REVERSION_BUY
+    else:
+        reason = REASON_NONE
     
     return {
-        "signal": "HOLD",
+        "signal": SIGNAL_NAMES[int(REASON_SIGNALS[reason])],
         "price_diff_percent": price_diff_percent,
-        "reason": "신호 없음"
+        "reason": format_signal_reason(reason, price_diff_percent)
     }
 
 
@@ -164,22 +221,105 @@ def check_stop_loss_take_profit(
     profit_loss_percent = ((current_price - entry_price) / entry_price) * 100
     
     if profit_loss_percent <= -stop_loss_percent:
-        return {
-            "action": "STOP_LOSS",
-            "profit_loss_percent": profit_loss_percent,
-            "reason": f"손절매 조건 달성: {profit_loss_percent:.2f}%"
-        }
-    
-    if profit_loss_percent >= take_profit_percent:
-        return {
-            "action": "TAKE_PROFIT",
-            "profit_loss_percent": profit_loss_percent,
-            "reason": f"익절매 조건 달성: {profit_loss_percent:.2f}%"
-        }
+        action = ACTION_STOP_LOSS
+    elif profit_loss_percent >= take_profit_percent:
+        action = ACTION_TAKE_PROFIT
+    else:
+        action = ACTION_HOLD
     
     return {
-        "action": "HOLD",
+        "action": ACTION_NAMES[action],
         "profit_loss_percent": profit_loss_percent,
-        "reason": "보유 중"
+        "reason": format_action_reason(action, profit_loss_percent)
     }
 
+
+def format_signal_reason(reason: int, price_diff_percent: float) -> str:
+    """신호 사유 코드를 설명 문자열로 변환합니다 (신호가 실제로 나갈 때만 호출)."""
+    return _SIGNAL_REASON_FORMATS[reason].format(abs(price_diff_percent))
+
+
+def format_action_reason(action: int, profit_loss_percent: float) -> str:
+    """손절/익절 코드를 설명 문자열로 변환합니다."""
+    return _ACTION_REASON_FORMATS[action].format(profit_loss_percent)
+
+
+def generate_trading_signals(
+    current_prices: np.ndarray,
+    vwaps: np.ndarray,
+    entry_thresholds: np.ndarray,
+    exit_thresholds: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    generate_trading_signal의 배열 버전. 여러 (전략, 종목) 쌍을 한 번에 평가합니다.
+    임계값은 쌍마다 다르거나 스칼라일 수 있습니다 (NumPy 브로드캐스팅).
+    
+    Args:
+        current_prices: 현재 가격 배열
+        vwaps: VWAP 배열 (0 이하나 NaN이면 HOLD)
+        entry_thresholds: 진입 임계값 (%)
+        exit_thresholds: 청산 임계값 (%)
+    
+    Returns:
+        (signals, reasons, price_diff_percent)
+        signals: SIGNAL_BUY/SIGNAL_SELL/SIGNAL_HOLD 코드 (int8)
+        reasons: REASON_* 코드 (int8, format_signal_reason으로 문자열 변환)
+        price_diff_percent: VWAP 대비 괴리율 (%)
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        price_diff_percent = (current_prices - vwaps) / vwaps * 100
+    distance = np.abs(price_diff_percent)
+    above = price_diff_percent > 0
+    # 진입 구간(entry < |괴리율| < exit)과 Mean Reversion 구간(|괴리율| > exit)은 겹치지 않으므로
+    # 위/아래 여부와 조합해 사유 코드를 산술로 계산 (np.select보다 빠름)
+    approaching = (distance > entry_thresholds) & (distance < exit_thresholds)
+    reverting = distance > exit_thresholds
+    reasons = (approaching * (REASON_BELOW_VWAP + above) + reverting * (REASON_REVERSION_BUY - above)).astype(np.int8)
+    reasons[~(vwaps > 0)] = REASON_NONE
+    return REASON_SIGNALS[reasons], reasons, price_diff_percent
+
+
+def check_stop_loss_take_profit_batch(
+    entry_prices: np.ndarray,
+    current_prices: np.ndarray,
+    stop_loss_percents: np.ndarray,
+    take_profit_percents: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    check_stop_loss_take_profit의 배열 버전.
+    
+    Args:
+        entry_prices: 진입 가격 배열 (포지션이 없으면 NaN 또는 0 → HOLD)
+        current_prices: 현재 가격 배열
+        stop_loss_percents: 손절매 비율 (%)
+        take_profit_percents: 익절매 비율 (%)
+    
+    Returns:
+        (actions, profit_loss_percent)
+        actions: ACTION_STOP_LOSS/ACTION_TAKE_PROFIT/ACTION_HOLD 코드 (int8)
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profit_loss_percent = (current_prices - entry_prices) / entry_prices * 100
+    held = entry_prices > 0
+    actions = np.select(
+        [
+            held & (profit_loss_percent <= -stop_loss_percents),
+            held & (profit_loss_percent >= take_profit_percents),
+        ],
+        [ACTION_STOP_LOSS, ACTION_TAKE_PROFIT],
+        default=ACTION_HOLD
+    ).astype(np.int8)
+    return actions, profit_loss_percent
+
+
+def strategy_parameter_arrays(strategies: Sequence[Any]) -> Dict[str, np.ndarray]:
+    """
+    Strategy 목록의 임계값을 배치 평가용 배열로 모읍니다.
+    
+    Returns:
+        {"entry_threshold", "exit_threshold", "stop_loss_percent", "take_profit_percent"}: 전략 순서의 배열
+    """
+    return {
+        name: np.array([getattr(strategy, name) for strategy in strategies], dtype=np.float64)
+        for name in ("entry_threshold", "exit_threshold", "stop_loss_percent", "take_profit_percent")
+    }
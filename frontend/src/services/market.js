@@ -7,5 +7,12 @@ export const marketService = {
     });
     return response.data;
   },
+
+  getPrices: async (symbols, marketCode = 'J') => {
+    const response = await api.post('/api/market/prices', {
+      symbols: symbols.map((symbol) => ({ symbol, market_code: marketCode })),
+    });
+    return response.data;
+  },
 };
 
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+VWAP 백테스트 벤치마크
+합성 1분봉(기본: 50개 ETF × 1년)으로 run_backtest의 실행 시간을 측정하고,
+봉마다 generate_trading_signal/check_stop_loss_take_profit을 호출하는 단순 반복
+구현과 한 종목의 거래 결과가 같은지 확인합니다.
+
+사용법: python scripts/bench-backtest.py [--symbols 50] [--days 250]
+"""
+import argparse
+import math
+import os
+import tempfile
+import time
+
+from bench_utils import make_minute_bars, setup_backend_path, use_bench_database
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-backtest.db"))
+
+from app.services.backtest import BacktestParams, compute_vwap_series, run_backtest, session_days, simulate_symbol
+from app.services.vwap_strategy import check_stop_loss_take_profit, generate_trading_signal
+
+FEE_RATE = 0.00015
+
+
+def loop_backtest(bars, params: BacktestParams, capital: float):
+    """봉 단위 반복 기준 구현 (청산 사유와 체결 봉 인덱스 목록 반환)"""
+    vwap = compute_vwap_series(bars, params.vwap_period)
+    days = session_days(bars.timestamps)
+    day_numbers = {day: number for number, day in enumerate(sorted(set(days.tolist())))}
+    n = len(bars)
+    trades = []
+    position = None  # (entry_index, entry_price, quantity, entry_session)
+    pending = None  # 다음 봉 시가에 체결할 주문
+    cash = capital
+    for i in range(n):
+        session = day_numbers[days[i]]
+        if pending is not None:
+            kind, reason = pending
+            pending = None
+            if kind == "BUY":
+                price = bars.open[i]
+                quantity = math.floor(cash / (price * (1 + FEE_RATE)))
+                if quantity <= 0:
+                    break
+                cash -= quantity * price * (1 + FEE_RATE)
+                position = (i, price, quantity, session)
+            else:
+                cash += position[2] * bars.open[i] * (1 - FEE_RATE)
+                trades.append((position[0], i, reason))
+                position = None
+
+        if position and params.max_holding_days and session - position[3] >= params.max_holding_days:
+            cash += position[2] * bars.open[i] * (1 - FEE_RATE)
+            trades.append((position[0], i, "MAX_HOLDING"))
+            position = None
+
+        signal = generate_trading_signal(bars.close[i], vwap[i], params.entry_threshold, params.exit_threshold)
+        if position is None:
+            if signal["signal"] == "BUY" and i + 1 < n:
+                pending = ("BUY", None)
+            continue
+        action = check_stop_loss_take_profit(
+            position[1], bars.close[i], params.stop_loss_percent, params.take_profit_percent
+        )["action"]
+        if action != "HOLD" or signal["signal"] == "SELL":
+            reason = action if action != "HOLD" else "SELL_SIGNAL"
+            if i + 1 < n:
+                pending = ("SELL", reason)
+            else:
+                trades.append((position[0], i, reason))
+                position = None
+    if position:
+        trades.append((position[0], n - 1, "END"))
+    return trades
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--days", type=int, default=250)
+    args = parser.parse_args()
+
+    params = BacktestParams(vwap_period=1, entry_threshold=0.3, exit_threshold=0.8,
+                            stop_loss_percent=2.0, take_profit_percent=3.0, max_holding_days=5)
+    start = time.perf_counter()
+    bars_by_symbol = {f"{index:06d}": make_minute_bars(args.days, seed=index) for index in range(args.symbols)}
+    generate_s = time.perf_counter() - start
+    total_bars = sum(len(bars) for bars in bars_by_symbol.values())
+    print(f"합성 1분봉: {args.symbols}종목 × {args.days}일 = {total_bars:,}개 ({generate_s:.1f}s)")
+
+    start = time.perf_counter()
+    result = run_backtest(bars_by_symbol, params, fee_rate=FEE_RATE)
+    backtest_s = time.perf_counter() - start
+    summary = result["summary"]
+    print(f"run_backtest: {backtest_s:.2f}s ({total_bars / backtest_s / 1e6:.1f}M bars/s), "
+          f"거래 {summary['trades']}건, 수익률 {summary['total_return_percent']:.2f}%, "
+          f"MDD {summary['max_drawdown_percent']:.2f}%")
+
+    bars = next(iter(bars_by_symbol.values()))
+    start = time.perf_counter()
+    expected = loop_backtest(bars, params, 1_000_000)
+    loop_s = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = simulate_symbol("bench", bars, params, 1_000_000, FEE_RATE, 0.0)["trades"]
+    vector_s = time.perf_counter() - start
+    assert [(t.entry_index, t.exit_index, t.exit_reason) for t in actual] == expected, "loop/vector mismatch"
+    print(f"1종목 봉 단위 반복: {loop_s:.2f}s, 배열 연산: {vector_s * 1000:.1f}ms ({loop_s / vector_s:.0f}x), "
+          f"거래 {len(actual)}건 일치")
+
+
+if __name__ == "__main__":
+    main()
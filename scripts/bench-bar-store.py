@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+과거 봉 저장소 벤치마크
+합성 1분봉(기본: 20종목 × 1년)을 거래일 단위로 저장한 뒤 1년치 조회 시간을 측정하고,
+같은 데이터를 CSV(pandas)와 JSON 봉 목록(bars_from_records, 백테스트 API 요청 형식)으로
+읽는 경우와 비교합니다.
+
+사용법: python scripts/bench-bar-store.py [--symbols 20] [--days 250]
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from bench_utils import make_minute_bars, setup_backend_path, use_bench_database
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-bar-store.db"))
+ROOT = os.path.join(tempfile.gettempdir(), "bench-bar-store")
+shutil.rmtree(ROOT, ignore_errors=True)
+os.environ["BAR_STORE_PATH"] = ROOT
+
+import pandas as pd
+
+from app.services.backtest import BacktestParams, BarSeries, bars_from_records, run_backtest, session_days
+from app.services.bar_store import BarStore
+
+
+def timed(function, repeat: int = 5) -> float:
+    """최소 실행 시간(ms)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--days", type=int, default=250)
+    args = parser.parse_args()
+
+    series = {f"{index:06d}": make_minute_bars(args.days, seed=index) for index in range(args.symbols)}
+    rows = len(next(iter(series.values())))
+    print(f"{args.symbols}종목 × {args.days}일 1분봉 (종목당 {rows:,}봉)")
+
+    # 거래일 단위 추가 저장 (장 마감 후 당일 봉을 덧붙이는 경우)
+    store = BarStore(ROOT)
+    start = time.perf_counter()
+    for symbol, bars in series.items():
+        days = session_days(bars.timestamps)
+        boundaries = np.flatnonzero(np.diff(days)) + 1
+        for part in zip(*(np.split(column, boundaries) for column in bars)):
+            store.write(symbol, "1m", BarSeries(*part))
+    write_s = time.perf_counter() - start
+    writes = args.symbols * args.days
+    disk_bytes = sum(
+        os.path.getsize(os.path.join(directory, name))
+        for directory, _, names in os.walk(ROOT) for name in names
+    )
+    print(f"거래일 단위 저장:        {write_s * 1000 / writes:8.3f} ms/일 ({disk_bytes / 1e6:.1f} MB)")
+
+    symbol = next(iter(series))
+    middle = series[symbol]
+    patch = BarSeries(*(column[rows // 2:rows // 2 + 390] for column in middle))
+    print(f"과거 거래일 덮어쓰기:    {timed(lambda: store.write(symbol, '1m', patch), 3):8.1f} ms (세그먼트 재작성)")
+
+    def read_all(target: BarStore):
+        return [float(target.read(name, "1m").close.sum()) for name in series]
+
+    cold_ms = timed(lambda: read_all(BarStore(ROOT)), 3)
+    warm_ms = timed(lambda: read_all(store))
+    print(f"1년 조회 (새 인스턴스):  {cold_ms / args.symbols:8.3f} ms/종목 (index 로드 + 매핑)")
+    print(f"1년 조회 (매핑 재사용):  {warm_ms / args.symbols:8.3f} ms/종목")
+    month_ms = timed(lambda: store.read(symbol, "1m", int(middle.timestamps[rows // 2]), int(middle.timestamps[rows // 2 + 390 * 21])))
+    print(f"1개월 구간 조회:         {month_ms:8.3f} ms")
+
+    bars = series[symbol]
+    frame = pd.DataFrame(bars._asdict())
+    csv_path = os.path.join(ROOT, "bars.csv")
+    frame.to_csv(csv_path, index=False)
+    csv_ms = timed(lambda: float(pd.read_csv(csv_path)["close"].sum()), 3)
+    print(f"CSV 1년 조회 (pandas):   {csv_ms:8.1f} ms/종목 ({csv_ms / (warm_ms / args.symbols):,.0f}x)")
+
+    payload = json.dumps([
+        {"timestamp": int(t), "open": o, "high": h, "low": l, "close": c, "volume": v}
+        for t, o, h, l, c, v in zip(*(column.tolist() for column in bars))
+    ])
+    json_ms = timed(lambda: bars_from_records(json.loads(payload)), 3)
+    print(f"JSON 봉 목록 변환:       {json_ms:8.1f} ms/종목 ({json_ms / (warm_ms / args.symbols):,.0f}x)")
+
+    stored = {name: store.read(name, "1m") for name in series}
+    start = time.perf_counter()
+    result = run_backtest(stored, BacktestParams(vwap_period=5))
+    print(f"저장소 봉으로 백테스트:  {time.perf_counter() - start:8.2f} s ({result['summary']['trades']}건 거래)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+이벤트 버스 벤치마크
+합성 틱을 프레임 단위로 quote 이벤트로 발행하면서 세 구독자의 전달 지연과 대기열 상태를 측정합니다.
+    - fast: 모든 이벤트를 바로 소비
+    - slow-coalesce: 소비가 느리고 종목별 최신 시세만 필요 (coalesce)
+    - slow-drop: 소비가 느리고 대기열이 작음 (drop_oldest)
+
+사용법: python scripts/bench-event-bus.py [--symbols 200] [--ticks 200000] [--frame 20] [--slow-ms 5]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from bench_utils import setup_backend_path, use_bench_database
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-event-bus.db"))
+
+from app.services.event_bus import DROP_OLDEST, QUOTE, EventBus
+from app.services.kis_realtime import TickRecord
+
+
+async def consume(subscription, slow_ms: float, counts: dict) -> None:
+    while True:
+        events = await subscription.get_batch()
+        counts[subscription.name] = counts.get(subscription.name, 0) + len(events)
+        if slow_ms:
+            await asyncio.sleep(slow_ms / 1000)
+
+
+async def run(args) -> None:
+    bus = EventBus()
+    symbols = [f"{index:06d}" for index in range(args.symbols)]
+    subscriptions = [
+        (bus.subscribe({QUOTE: None}, maxsize=1_000_000, name="fast"), 0.0),
+        (bus.subscribe({QUOTE: None}, maxsize=10_000, coalesce=(QUOTE,), name="slow-coalesce"), args.slow_ms),
+        (bus.subscribe({QUOTE: None}, maxsize=1_000, policy=DROP_OLDEST, name="slow-drop"), args.slow_ms),
+    ]
+    counts: dict = {}
+    consumers = [asyncio.create_task(consume(subscription, slow_ms, counts)) for subscription, slow_ms in subscriptions]
+
+    rng = random.Random(0)
+    frames = [
+        [TickRecord(rng.choice(symbols), index, 10000.0, 1, 1) for index in range(args.frame)]
+        for _ in range(256)
+    ]
+    publish_s = 0.0
+    started = time.perf_counter()
+    for index in range(args.ticks // args.frame):
+        start = time.perf_counter()
+        bus.publish_ticks(frames[index % len(frames)])
+        publish_s += time.perf_counter() - start
+        # 수신 루프처럼 프레임마다 다른 태스크에 실행 기회를 줌
+        await asyncio.sleep(0)
+    await asyncio.sleep(args.slow_ms / 1000 * 2)
+    elapsed = time.perf_counter() - started
+    for task in consumers:
+        task.cancel()
+
+    stats = bus.stats()
+    print(f"틱 {args.ticks:,} ({args.frame}개/프레임), 종목 {args.symbols}, {elapsed:.2f}s")
+    print(f"발행 비용: {publish_s * 1e6 / args.ticks:.2f} µs/이벤트 (구독자 3)")
+    print(f"전달 지연: p50 {stats['latency_ms']['p50']:.3f} ms, p99 {stats['latency_ms']['p99']:.3f} ms (최근 표본)")
+    print(f"{'구독자':<14} {'전달':>9} {'합침':>9} {'버림':>9} {'최대 대기':>9} {'평균 지연 ms':>12}")
+    for item in sorted(stats["subscriptions"], key=lambda item: item["name"]):
+        print(
+            f"{item['name']:<14} {item['delivered']:>9,} {item['coalesced']:>9,} {item['dropped']:>9,} "
+            f"{item['max_depth']:>9,} {item['latency_ms_mean']:>12.3f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--ticks", type=int, default=200000)
+    parser.add_argument("--frame", type=int, default=20, help="프레임당 틱 수")
+    parser.add_argument("--slow-ms", type=float, default=5.0, help="느린 구독자의 배치당 처리 시간")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
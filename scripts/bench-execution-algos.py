@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+실행 알고리즘(TWAP/VWAP) 스케줄러 벤치마크
+
+1) 타이머: 부모 주문 N개(같은 시각 시작, --slice초 간격 --slices구간)의 구간 처리를
+    - per-task: 부모 주문마다 asyncio 태스크가 구간 시각까지 잠든 뒤 부모 주문 하나씩 처리
+    - heap:     execution_scheduler (힙 하나, 같은 시각에 도래한 부모 주문을 한 트랜잭션으로)
+   로 돌려 구간 지연(예정 시각 → 처리 시작) p50/p99, DB 트랜잭션 수, CPU 시간을 비교합니다.
+   (자식 주문은 QUEUED로만 기록, KIS 전송 없음)
+2) --e2e: 백엔드 앱과 로컬 대역 서버(시장가 주문은 fill_delay초 뒤 체결)를 띄우고 TWAP 부모 주문을
+   API로 낸 뒤 자식 주문 전송/체결 대사까지 거쳐 부모 주문의 체결 평균가와 슬리피지(접수 시점가,
+   실행 구간 VWAP 대비)를 출력합니다. 구간 VWAP용 틱은 대역 서버 현재가를 폴링해 틱 저장소에 넣습니다.
+
+사용법: python scripts/bench-execution-algos.py [--parents 300] [--slices 5] [--slice 1] [--e2e]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from bench_utils import create_bench_account, percentile, setup_backend_path, use_bench_database
+from kis_fake_server import create_app, running_fake_server
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-execution-algos.db"))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Order, ParentOrder, TradingAccount, User
+from app.services.event_bus import event_bus
+from app.services.execution_algos import ParentState, _process_parents, execution_scheduler, twap_schedule
+from app.services.kis_rate_limiter import get_rate_limiter
+from app.services.tick_store import tick_store
+from app.utils.auth import create_access_token
+
+
+def create_parents(account_id: int, count: int, slices: int, slice_seconds: int) -> list:
+    """다음 정각 초에 시작하는 TWAP 부모 주문을 기록합니다."""
+    db = SessionLocal()
+    db.expire_on_commit = False
+    account = db.get(TradingAccount, account_id)
+    start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(seconds=1)
+    parents = [
+        ParentOrder(
+            user_id=account.user_id,
+            trading_account_id=account_id,
+            symbol=f"{index % 50:06d}",
+            order_type="BUY" if index % 2 else "SELL",
+            quantity=100 + index,
+            algorithm="TWAP",
+            start_time=start,
+            end_time=start + timedelta(seconds=slices * slice_seconds),
+            slice_seconds=slice_seconds,
+            schedule=[float(value) for value in twap_schedule(slices)],
+        )
+        for index in range(count)
+    ]
+    db.add_all(parents)
+    db.commit()
+    db.expunge_all()
+    db.close()
+    return parents
+
+
+def finish_parents() -> int:
+    """남은 ACTIVE 부모 주문을 정리하고 지금까지 기록된 자식 주문 수를 반환합니다."""
+    db = SessionLocal()
+    db.query(ParentOrder).filter(ParentOrder.status == "ACTIVE").update({"status": "CANCELLED"})
+    db.commit()
+    children = db.query(Order).filter(Order.parent_order_id.isnot(None)).count()
+    db.close()
+    return children
+
+
+async def run_per_task(parents: list) -> tuple:
+    lateness = []
+    transactions = 0
+
+    async def run_parent(state: ParentState) -> None:
+        nonlocal transactions
+        while state.slices_sent < len(state.schedule):
+            due_ms = state.next_slice_ms()
+            await asyncio.sleep(max(0.0, due_ms / 1000 - time.time()))
+            now_ms = int(time.time() * 1000)
+            lateness.append(float(now_ms - due_ms))
+            results = await asyncio.to_thread(_process_parents, [state], now_ms, {state.id})
+            transactions += 1
+            state.slices_sent = results[0].slices_sent
+
+    event_bus.start()
+    await asyncio.gather(*(run_parent(ParentState(parent)) for parent in parents))
+    return lateness, transactions
+
+
+async def run_heap(parents: list, slices: int) -> tuple:
+    total = len(parents) * slices
+    execution_scheduler.start()
+    # 시작 시 ACTIVE 부모 주문을 DB에서 다시 읽음
+    while execution_scheduler.slices < total:
+        await asyncio.sleep(0.05)
+    stats = execution_scheduler.stats()
+    lateness = list(execution_scheduler._lateness)
+    await execution_scheduler.stop()
+    return lateness, stats["batches"]
+
+
+def measure(name: str, runner, *args) -> None:
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    lateness, transactions = asyncio.run(runner(*args))
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    print(
+        f"{name:<9} 구간 {len(lateness):5d}  지연 p50 {percentile(lateness, 50):7.1f} ms  "
+        f"p99 {percentile(lateness, 99):7.1f} ms  max {max(lateness):7.1f} ms  "
+        f"트랜잭션 {transactions:5d}  CPU {cpu:5.2f}s (경과 {wall:5.1f}s)"
+    )
+
+
+async def poll_prices(kis_url: str, symbol: str, stop: asyncio.Event) -> None:
+    """대역 서버 현재가를 폴링해 틱 저장소에 넣습니다 (누적 거래량 차이를 틱 거래량으로)."""
+    last_volume = None
+    async with httpx.AsyncClient(base_url=kis_url) as client:
+        while not stop.is_set():
+            output = (await client.get(
+                "/uapi/domestic-stock/v1/quotations/inquire-price", params={"FID_INPUT_ISCD": symbol}
+            )).json()["output"]
+            volume = int(output["acml_vol"])
+            if last_volume is not None:
+                tick_store.append(symbol, int(time.time() * 1000), float(output["stck_prpr"]), volume - last_volume)
+            last_volume = volume
+            await asyncio.sleep(0.05)
+
+
+async def run_e2e(base_url: str, kis_url: str, token: str, account_id: int, args) -> None:
+    symbol = "069500"
+    stop = asyncio.Event()
+    poller = asyncio.create_task(poll_prices(kis_url, symbol, stop))
+    await asyncio.sleep(0.5)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=30.0) as client:
+        response = await client.post("/api/execution/orders", json={
+            "trading_account_id": account_id,
+            "symbol": symbol,
+            "order_type": "BUY",
+            "quantity": 1000,
+            "algorithm": "TWAP",
+            "duration_minutes": args.slices * args.slice / 60,
+            "slice_seconds": args.slice,
+        })
+        response.raise_for_status()
+        parent_id = response.json()["id"]
+        started = time.perf_counter()
+        while True:
+            parent = (await client.get(f"/api/execution/orders/{parent_id}")).json()
+            if parent["status"] != "ACTIVE" or time.perf_counter() - started > args.slices * args.slice + 60:
+                break
+            await asyncio.sleep(0.2)
+    stop.set()
+    await poller
+
+    print(
+        f"e2e       {parent['algorithm']} {parent['order_type']} {parent['quantity']}주, 구간 {len(parent['schedule'])}, "
+        f"자식 주문 {len(parent['children'])} → {parent['status']} ({time.perf_counter() - started:.1f}s)"
+    )
+    print(
+        f"          체결 {parent['executed_quantity']}주 평균 {parent['executed_price'] or 0:,.1f}, "
+        f"접수 시점가 {parent['arrival_price'] or 0:,.1f} ({parent['slippage_arrival_bps']} bp), "
+        f"구간 VWAP {parent['interval_vwap'] or 0:,.1f} ({parent['slippage_vwap_bps']} bp)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parents", type=int, default=300, help="동시에 실행할 부모 주문 수")
+    parser.add_argument("--slices", type=int, default=5, help="부모 주문당 구간 수")
+    parser.add_argument("--slice", type=int, default=1, help="구간 길이(초)")
+    parser.add_argument("--e2e", action="store_true", help="대역 서버로 전송/체결까지 실행해 슬리피지 출력")
+    args = parser.parse_args()
+
+    account_id = create_bench_account()
+    settings.EXECUTION_ALGO_COMPLETION_GRACE_SECONDS = 0.0
+
+    print(f"부모 주문 {args.parents}개 x 구간 {args.slices} (간격 {args.slice}s), 같은 시각 시작")
+    measure("per-task", run_per_task, create_parents(account_id, args.parents, args.slices, args.slice))
+    finish_parents()
+    measure("heap", run_heap, create_parents(account_id, args.parents, args.slices, args.slice), args.slices)
+    print(f"자식 주문 {finish_parents()}건 기록")
+
+    if not args.e2e:
+        return
+
+    db = SessionLocal()
+    username = db.get(User, db.get(TradingAccount, account_id).user_id).username
+    db.close()
+    token = create_access_token({"sub": username})
+    get_rate_limiter("bench-app-key").rate = 1000.0
+
+    settings.KIS_REALTIME_ENABLED = False
+    settings.STRATEGY_RUNNER_ENABLED = False
+    settings.KIS_FILL_NOTICES_ENABLED = False
+    settings.ORDER_RECONCILER_INTERVAL_SECONDS = 0.5
+    settings.ORDER_RECONCILER_IDLE_SECONDS = 0.5
+    settings.EXECUTION_ALGO_COMPLETION_GRACE_SECONDS = 30.0
+
+    from app.main import app
+
+    fake_app = create_app(latency="fixed:5", fill_delay=0.5)
+    with running_fake_server(fake_app) as kis_url:
+        settings.KIS_BASE_URL = kis_url
+        with running_fake_server(app) as base_url:
+            asyncio.run(run_e2e(base_url, kis_url, token, account_id, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+체결 반영 지연 벤치마크 (체결통보 vs 체결 대사)
+로컬 대역 서버에 주문을 낸 뒤, 대역 서버의 전량 체결 시각부터 주문이 EXECUTED로 DB에 반영되어
+order 이벤트가 발행될 때까지의 지연을 측정합니다.
+    - push: 실시간 체결통보(H0STCNI0, 암호화) 수신 → 주문 갱신 (fill_notices)
+    - poll: 일별 주문 체결 조회 주기 대사 (order_reconciler)
+
+사용법: python scripts/bench-fill-notices.py [--orders 200] [--spread 2] [--fill-delay 1] [--poll-interval 5]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from bench_utils import create_bench_account, percentile, setup_backend_path, use_bench_database
+from kis_fake_server import create_app, running_fake_server
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-fill-notices.db"))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Order, TradingAccount
+from app.services.event_bus import ORDER, event_bus
+from app.services.fill_notices import FillNoticeIngester
+from app.services.kis_api import AsyncKISAPIClient
+from app.services.kis_http import aclose_http_clients
+from app.services.kis_rate_limiter import get_rate_limiter
+from app.services.order_reconciler import OrderReconciler
+
+
+async def place_order(account: TradingAccount, index: int) -> None:
+    """주문 API처럼 주문을 내고 PENDING으로 기록한 뒤 order 이벤트를 발행합니다."""
+    db = SessionLocal()
+    try:
+        client = AsyncKISAPIClient(account, db)
+        symbol = f"{index % 50:06d}"
+        result = await client.place_order(account.account_number, symbol, "BUY", 10, None, "01")
+        order = Order(
+            user_id=account.user_id,
+            trading_account_id=account.id,
+            symbol=symbol,
+            order_type="BUY",
+            order_method="MARKET",
+            quantity=10,
+            status="PENDING",
+            kis_order_no=result["output"]["ODNO"]
+        )
+        db.add(order)
+        db.commit()
+        db.refresh(order)
+        event_bus.publish_order(order)
+    finally:
+        db.close()
+
+
+async def run_mode(mode: str, args, account: TradingAccount, fill_times: dict) -> None:
+    service = FillNoticeIngester() if mode == "push" else OrderReconciler()
+    subscription = event_bus.subscribe({ORDER: [str(account.id)]}, maxsize=1_000_000, name="bench")
+    service.start()
+    try:
+        if mode == "push":
+            # 구독 응답(암호화 키)까지 받은 뒤 주문
+            while not (service.live_account_ids() and service.sessions[account.app_key].connection.cipher_keys):
+                await asyncio.sleep(0.05)
+
+        latencies = []
+
+        async def collect() -> None:
+            while len(latencies) < args.orders:
+                events = await subscription.get_batch()
+                now = time.monotonic()
+                for event in events:
+                    if event.payload["status"] == "EXECUTED":
+                        latencies.append((now - fill_times[event.payload["kis_order_no"]]) * 1000)
+
+        collector = asyncio.create_task(collect())
+        # 주문 시점을 spread초 동안 고르게 퍼뜨림
+        tasks = []
+        started = time.monotonic()
+        for index in range(args.orders):
+            await asyncio.sleep(max(0.0, started + args.spread * index / args.orders - time.monotonic()))
+            tasks.append(asyncio.create_task(place_order(account, index)))
+        await asyncio.gather(*tasks)
+        try:
+            await asyncio.wait_for(collector, args.fill_delay + args.poll_interval * 3 + 5)
+        except asyncio.TimeoutError:
+            pass
+
+        print(
+            f"{mode:<6}{len(latencies):>8}{percentile(latencies, 50):>10.1f}"
+            f"{percentile(latencies, 99):>10.1f}{max(latencies, default=0.0):>10.1f}"
+        )
+        if mode == "push":
+            await asyncio.sleep(0.1)  # 마지막 묶음의 집계 반영 대기 (이벤트는 커밋 직후 발행)
+            stats = service.stats()
+            print(
+                f"       통보 {stats['notices']}, 반영 {stats['applied']}, 다시 맞춤 대기 후 만료 {stats['expired']}, "
+                f"수신→커밋 p50 {stats['fill_to_db_ms']['p50']:.2f} ms / p99 {stats['fill_to_db_ms']['p99']:.2f} ms"
+            )
+    finally:
+        subscription.close()
+        await service.stop()
+
+
+async def run(args, account_id: int, fill_times: dict) -> None:
+    db = SessionLocal()
+    account = db.get(TradingAccount, account_id)
+    db.expunge_all()
+    db.close()
+    try:
+        print(f"주문 {args.orders} ({args.spread}s 동안), 전량 체결 {args.fill_delay}s, 대사 주기 {args.poll_interval}s")
+        print(f"{'방식':<6}{'체결':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}  (전량 체결 → EXECUTED 반영)")
+        for mode in args.modes:
+            await run_mode(mode, args, account, fill_times)
+    finally:
+        await aclose_http_clients()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--spread", type=float, default=2.0, help="주문을 나눠 낼 시간(초)")
+    parser.add_argument("--fill-delay", type=float, default=1.0, help="대역 서버 전량 체결 시간(초)")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="ORDER_RECONCILER_INTERVAL_SECONDS")
+    parser.add_argument("--modes", nargs="+", default=["push", "poll"], choices=["push", "poll"])
+    args = parser.parse_args()
+
+    account_id = create_bench_account()
+    db = SessionLocal()
+    db.get(TradingAccount, account_id).hts_id = "benchhts"
+    db.commit()
+    db.close()
+    get_rate_limiter("bench-app-key").rate = 1000.0
+    settings.KIS_REALTIME_ENABLED = False  # 체결통보 전용 세션 사용
+    settings.ORDER_RECONCILER_INTERVAL_SECONDS = args.poll_interval
+
+    fake_app = create_app(fill_delay=args.fill_delay)
+    with running_fake_server(fake_app) as base_url:
+        settings.KIS_BASE_URL = base_url
+        settings.KIS_WS_URL = base_url.replace("http", "ws", 1)
+        asyncio.run(run(args, account_id, fake_app.state.fill_times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+KIS 잔고 연속조회 벤치마크
+보유 종목 수가 많은 계좌를 흉내 내는 로컬 대역 서버를 대상으로,
+연속조회(AsyncKISAPIClient.iter_balance)로 전체 보유 종목을 받는 데 걸리는
+시간과 최대 메모리 사용량을 측정합니다.
+
+사용법: python scripts/bench-kis-balance.py [--holdings 50 500 5000] [--latency-ms 20]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+from bench_utils import create_bench_account, setup_backend_path, use_bench_database
+from kis_fake_server import create_app, running_fake_server
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-kis-balance.db"))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import TradingAccount
+from app.services.kis_api import AsyncKISAPIClient
+from app.services.kis_http import aclose_http_clients
+from app.services.kis_rate_limiter import get_rate_limiter
+
+
+async def measure(account_id: int) -> tuple:
+    db = SessionLocal()
+    account = db.get(TradingAccount, account_id)
+    client = AsyncKISAPIClient(account, db)
+    try:
+        await client.get_current_price("069500")  # 토큰 발급 제외
+        tracemalloc.start()
+        start = time.perf_counter()
+        pages = holdings = 0
+        async for page in client.iter_balance(account.account_number):
+            pages += 1
+            holdings += len(page)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return pages, holdings, elapsed, peak
+    finally:
+        await aclose_http_clients()
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--holdings", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    account_id = create_bench_account()
+    # 연속조회 페이지 수 자체를 측정하기 위해 클라이언트 측 속도 제한은 넉넉하게 설정
+    get_rate_limiter("bench-app-key").rate = 1000.0
+
+    print(f"{'holdings':>10}{'pages':>8}{'elapsed(ms)':>14}{'peak mem(KB)':>15}")
+    for holdings in args.holdings:
+        fake_app = create_app(latency_ms=args.latency_ms, holdings=holdings)
+        with running_fake_server(fake_app) as base_url:
+            settings.KIS_BASE_URL = base_url
+            pages, count, elapsed, peak = asyncio.run(measure(account_id))
+        print(f"{count:>10}{pages:>8}{elapsed * 1000:>14.1f}{peak / 1024:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+KIS API 동시성 벤치마크
+지연 시간이 있는 로컬 대역 서버를 대상으로, 스레드풀에서 동기 KISAPIClient를
+호출하는 방식(기존 sync 엔드포인트)과 AsyncKISAPIClient를 하나의 이벤트 루프에서
+동시에 호출하는 방식의 처리량을 비교합니다.
+
+사용법: python scripts/bench-kis-concurrency.py [--requests 2000] [--latency-ms 50]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_utils import create_bench_account, setup_backend_path, use_bench_database
+from kis_fake_server import create_app, running_fake_server
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-kis-concurrency.db"))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import TradingAccount
+from app.services.kis_api import AsyncKISAPIClient, KISAPIClient
+from app.services.kis_http import aclose_http_clients
+from app.services.kis_rate_limiter import get_rate_limiter
+from app.services.quote_cache import quote_cache
+
+# Starlette가 sync 엔드포인트에 사용하는 기본 스레드풀 크기
+THREADPOOL_SIZE = 40
+
+
+def bench_threadpool(account_id: int, requests: int) -> float:
+    """스레드풀 + 동기 클라이언트의 초당 처리량을 측정합니다."""
+    def call(index: int) -> None:
+        db = SessionLocal()
+        try:
+            account = db.get(TradingAccount, account_id)
+            KISAPIClient(account, db).get_current_price(f"{index:06d}")
+        finally:
+            db.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADPOOL_SIZE) as executor:
+        list(executor.map(call, range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+async def bench_asyncio(account_id: int, requests: int, concurrency: int) -> float:
+    """단일 이벤트 루프 + 비동기 클라이언트의 초당 처리량을 측정합니다."""
+    db = SessionLocal()
+    account = db.get(TradingAccount, account_id)
+    client = AsyncKISAPIClient(account, db)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(index: int) -> None:
+        async with semaphore:
+            await client.get_current_price(f"{index:06d}")
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(call(index) for index in range(requests)))
+        return requests / (time.perf_counter() - start)
+    finally:
+        await aclose_http_clients()
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, default=100, help="asyncio 동시 요청 수")
+    args = parser.parse_args()
+
+    account_id = create_bench_account()
+    # 전송 방식 자체를 비교하기 위해 속도 제한과 현재가 캐시는 끔
+    get_rate_limiter("bench-app-key").rate = 1_000_000.0
+    quote_cache.ttl_seconds = 0
+    with running_fake_server(create_app(latency_ms=args.latency_ms)) as base_url:
+        settings.KIS_BASE_URL = base_url
+        threadpool_rps = bench_threadpool(account_id, args.requests)
+        asyncio_rps = asyncio.run(bench_asyncio(account_id, args.requests, args.concurrency))
+
+    print(f"대역 서버 지연: {args.latency_ms}ms, 요청 수: {args.requests}")
+    print(f"threadpool ({THREADPOOL_SIZE} threads): {threadpool_rps:10.1f} req/s")
+    print(f"asyncio (concurrency {args.concurrency}):  {asyncio_rps:10.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+KIS API 커넥션 풀 벤치마크
+로컬 대역 서버를 대상으로 호출당 새 httpx.Client(기존 방식)와
+공유 커넥션 풀(get_http_client)의 현재가 조회 p50/p99 지연 시간을 비교합니다.
+
+사용법: python scripts/bench-kis-http-pool.py [--requests 500] [--no-tls]
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("KIS_HTTP_VERIFY_SSL", "false")
+
+from bench_utils import print_latency_table, setup_backend_path
+from kis_fake_server import running_fake_server
+
+setup_backend_path()
+
+import httpx
+from app.services.kis_http import close_http_clients, get_http_client
+
+PRICE_PATH = "/uapi/domestic-stock/v1/quotations/inquire-price"
+PARAMS = {"FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": "069500"}
+
+
+def bench_new_client_per_call(base_url: str, requests: int) -> list:
+    """기존 방식: 호출마다 httpx.Client를 열고 닫습니다."""
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        with httpx.Client(verify=False) as client:
+            response = client.get(f"{base_url}{PRICE_PATH}", params=PARAMS)
+            response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def bench_shared_pool(base_url: str, requests: int) -> list:
+    """공유 커넥션 풀을 사용합니다 (첫 호출의 연결 수립 포함)."""
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client = get_http_client(base_url)
+        response = client.get(f"{base_url}{PRICE_PATH}", params=PARAMS)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--no-tls", action="store_true", help="HTTP로 측정 (TLS 핸드셰이크 제외)")
+    args = parser.parse_args()
+
+    with running_fake_server(tls=not args.no_tls) as base_url:
+        print(f"대역 서버: {base_url}, 요청 수: {args.requests}")
+        before = bench_new_client_per_call(base_url, args.requests)
+        after = bench_shared_pool(base_url, args.requests)
+        close_http_clients()
+
+    print_latency_table({
+        "new client per call (ms)": before,
+        "shared pool (ms)": after,
+    })
+
+
+if __name__ == "__main__":
+    main()
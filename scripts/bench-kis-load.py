@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+KIS 연동 경로 부하 테스트
+로컬 대역 서버(지연 분포, 속도 제한, 실패율 주입)를 대상으로 시세/잔고/주문
+호출을 섞어 일정 시간 동안 보내고, 경로별 처리량과 꼬리 지연 시간을 출력합니다.
+네트워크 없이 CI에서 실행할 수 있습니다.
+
+사용법: python scripts/bench-kis-load.py [--duration 10] [--workers 50] \\
+    [--latency lognormal:20:0.5] [--failure-rate 0.01] [--client-rate 1000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+
+from bench_utils import create_bench_account, print_latency_table, setup_backend_path, use_bench_database
+from kis_fake_server import FakeKISConfig, create_app, running_fake_server
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-kis-load.db"))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import TradingAccount
+from app.services.kis_api import AsyncKISAPIClient
+from app.services.kis_http import aclose_http_clients
+from app.services.kis_rate_limiter import get_rate_limiter
+from app.services.quote_cache import quote_cache
+
+SYMBOLS = [f"{index:06d}" for index in range(100, 400)]
+WORKLOAD = {"quote": 0.85, "balance": 0.10, "order": 0.05}
+
+
+async def run(account_id: int, duration: float, workers: int) -> tuple:
+    db = SessionLocal()
+    account = db.get(TradingAccount, account_id)
+    client = AsyncKISAPIClient(account, db)
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    operations = list(WORKLOAD)
+    weights = list(WORKLOAD.values())
+
+    async def call(operation: str) -> None:
+        if operation == "quote":
+            await client.get_current_price(random.choice(SYMBOLS))
+        elif operation == "balance":
+            async for _ in client.iter_balance(account.account_number):
+                pass
+        else:
+            await client.place_order(account.account_number, random.choice(SYMBOLS), "BUY", 1, 10000)
+
+    async def worker(deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            operation = random.choices(operations, weights)[0]
+            start = time.perf_counter()
+            try:
+                await call(operation)
+                latencies[f"{operation} (ms)"].append((time.perf_counter() - start) * 1000)
+            except Exception:
+                errors[operation] += 1
+
+    try:
+        await client.get_current_price(SYMBOLS[0])  # 토큰 발급
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(start + duration) for _ in range(workers)))
+        return latencies, errors, time.perf_counter() - start
+    finally:
+        await aclose_http_clients()
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=50)
+    parser.add_argument("--latency", default="lognormal:20:0.5")
+    parser.add_argument("--failure-rate", type=float, default=0.01)
+    parser.add_argument("--server-rate-limit", type=int, default=None)
+    parser.add_argument("--holdings", type=int, default=120)
+    parser.add_argument("--client-rate", type=float, default=None, help="클라이언트 초당 요청 제한 (기본값: Settings)")
+    parser.add_argument("--no-quote-cache", action="store_true")
+    args = parser.parse_args()
+
+    account_id = create_bench_account()
+    if args.client_rate:
+        get_rate_limiter("bench-app-key").rate = args.client_rate
+    if args.no_quote_cache:
+        quote_cache.ttl_seconds = 0
+
+    fake_app = create_app(FakeKISConfig(
+        latency=args.latency,
+        rate_limit_per_sec=args.server_rate_limit,
+        failure_rate=args.failure_rate,
+        holdings=args.holdings,
+        seed=42
+    ))
+    with running_fake_server(fake_app) as base_url:
+        settings.KIS_BASE_URL = base_url
+        latencies, errors, elapsed = asyncio.run(run(account_id, args.duration, args.workers))
+
+    print(f"지연 분포: {args.latency}, 실패율: {args.failure_rate}, 워커: {args.workers}, {elapsed:.1f}s")
+    print_latency_table(latencies)
+    for name, values in latencies.items():
+        print(f"{name:<28}{len(values) / elapsed:>10.1f} ops/s")
+    print(f"오류: {dict(errors)}")
+    print(f"대역 서버 통계: {dict(fake_app.state.stats)}")
+    print(f"현재가 캐시: {quote_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
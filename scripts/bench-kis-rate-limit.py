@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+KIS API 속도 제한기 검증/벤치마크
+앱키별 초당 요청 수를 제한하는 로컬 대역 서버(EGW00201 반환)를 대상으로
+대량의 시세 조회와 소수의 주문을 동시에 보내고, 레인별 대기 시간과
+서버 측 속도 제한 오류 수를 출력합니다.
+
+사용법: python scripts/bench-kis-rate-limit.py [--quotes 200] [--orders 10] [--server-limit 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from bench_utils import create_bench_account, print_latency_table, setup_backend_path, use_bench_database
+from kis_fake_server import create_app, running_fake_server
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-kis-rate-limit.db"))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import TradingAccount
+from app.services.kis_api import AsyncKISAPIClient
+from app.services.kis_http import aclose_http_clients
+from app.services.kis_rate_limiter import get_rate_limiter
+
+
+async def run(account_id: int, quotes: int, orders: int) -> dict:
+    db = SessionLocal()
+    account = db.get(TradingAccount, account_id)
+    client = AsyncKISAPIClient(account, db)
+    latencies = {"quote (ms)": [], "order (ms)": []}
+
+    async def quote(index: int) -> None:
+        start = time.perf_counter()
+        # 현재가 캐시에 걸리지 않도록 종목을 모두 다르게 조회
+        await client.get_current_price(f"{index:06d}")
+        latencies["quote (ms)"].append((time.perf_counter() - start) * 1000)
+
+    async def order() -> None:
+        # 시세 조회가 먼저 대기열을 채운 뒤 주문이 도착하도록 지연
+        await asyncio.sleep(0.2)
+        start = time.perf_counter()
+        await client.place_order(account.account_number, "069500", "BUY", 1, 10000)
+        latencies["order (ms)"].append((time.perf_counter() - start) * 1000)
+
+    try:
+        await client.get_current_price("069500")  # 토큰 발급
+        await asyncio.gather(
+            *(quote(index) for index in range(quotes)),
+            *(order() for _ in range(orders))
+        )
+        return latencies
+    finally:
+        await aclose_http_clients()
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quotes", type=int, default=200)
+    parser.add_argument("--orders", type=int, default=10)
+    parser.add_argument("--server-limit", type=int, default=20, help="대역 서버의 앱키별 초당 허용 수")
+    args = parser.parse_args()
+
+    account_id = create_bench_account()
+    fake_app = create_app(latency_ms=5, rate_limit_per_sec=args.server_limit)
+    with running_fake_server(fake_app) as base_url:
+        settings.KIS_BASE_URL = base_url
+        latencies = asyncio.run(run(account_id, args.quotes, args.orders))
+
+    print(f"클라이언트 제한: {settings.kis_rate_limit_per_sec}/s, 서버 제한: {args.server_limit}/s")
+    print_latency_table(latencies)
+    print(f"서버 측 EGW00201 응답 수: {fake_app.state.stats['rate_limited']}")
+    print(json.dumps(get_rate_limiter("bench-app-key").snapshot(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
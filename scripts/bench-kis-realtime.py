@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+KIS 실시간 체결가 수신 벤치마크
+1) 파싱: 미리 만든 H0STCNT0 프레임을 틱 레코드로 변환하는 초당 틱 수
+2) 수신: 로컬 대역 서버의 WebSocket 피드를 RealtimeQuoteIngester로 구독해
+   실제로 파싱/전달된 초당 틱 수와 재접속 횟수
+
+사용법: python scripts/bench-kis-realtime.py [--symbols 40] [--ticks-per-sec 20000] \\
+            [--records-per-frame 5] [--seconds 10] [--disconnect-after 3]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from bench_utils import setup_backend_path, use_bench_database
+from kis_fake_server import build_tick_frame, build_tick_record, create_app, running_fake_server
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-kis-realtime.db"))
+
+from app.config import settings
+from app.database import Base, engine
+from app.services.kis_http import aclose_http_clients
+from app.services.kis_realtime import RealtimeQuoteIngester, parse_tick_frame
+
+
+def bench_parse(symbols: int, records_per_frame: int, frames: int) -> float:
+    """프레임 파싱 처리량(초당 틱 수)을 측정합니다."""
+    records = [
+        build_tick_record(f"{index % symbols:06d}", "093000", 10000 + index, 10, 1000 + index)
+        for index in range(records_per_frame * 100)
+    ]
+    payloads = [
+        build_tick_frame(records[start:start + records_per_frame])
+        for start in range(0, len(records), records_per_frame)
+    ]
+    day_start_ms = 0
+    ticks = 0
+    start = time.perf_counter()
+    for index in range(frames):
+        ticks += len(parse_tick_frame(payloads[index % len(payloads)], day_start_ms))
+    return ticks / (time.perf_counter() - start)
+
+
+async def bench_feed(ws_url: str, symbols: int, seconds: float) -> dict:
+    """대역 피드를 구독해 수신 처리량을 측정합니다."""
+    ingester = RealtimeQuoteIngester(app_key="bench-app-key", app_secret="bench-app-secret", ws_url=ws_url)
+    received = 0
+
+    def on_ticks(ticks) -> None:
+        nonlocal received
+        received += len(ticks)
+
+    ingester.add_listener(on_ticks)
+    ingester.watch(f"{index:06d}" for index in range(symbols))
+    ingester.start()
+    try:
+        while not ingester.connection.connected:
+            await asyncio.sleep(0.01)
+        start, received = time.perf_counter(), 0
+        await asyncio.sleep(seconds)
+        elapsed = time.perf_counter() - start
+        stats = ingester.stats()
+        stats["ticks_per_sec"] = received / elapsed
+        return stats
+    finally:
+        await ingester.stop()
+        await aclose_http_clients()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=40)
+    parser.add_argument("--ticks-per-sec", type=float, default=20000.0, help="대역 피드 송신 속도")
+    parser.add_argument("--records-per-frame", type=int, default=5)
+    parser.add_argument("--frames", type=int, default=200000, help="파싱 벤치마크 프레임 수")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--disconnect-after", type=float, default=None, help="대역 피드가 N초마다 연결을 끊음")
+    args = parser.parse_args()
+
+    parse_rate = bench_parse(args.symbols, args.records_per_frame, args.frames)
+    print(f"파싱 (레코드 {args.records_per_frame}개/프레임): {parse_rate:12.0f} ticks/s")
+
+    Base.metadata.create_all(bind=engine)
+    app = create_app(
+        ws_ticks_per_sec=args.ticks_per_sec,
+        ws_records_per_frame=args.records_per_frame,
+        ws_disconnect_after=args.disconnect_after
+    )
+    with running_fake_server(app) as base_url:
+        settings.KIS_BASE_URL = base_url
+        settings.KIS_WS_RECONNECT_MAX_DELAY = 1.0
+        stats = asyncio.run(bench_feed(base_url.replace("http", "ws", 1), args.symbols, args.seconds))
+
+    print(f"수신 (송신 {args.ticks_per_sec:.0f} ticks/s, 종목 {args.symbols}개): "
+          f"{stats['ticks_per_sec']:12.0f} ticks/s")
+    print(f"구독 {stats['subscribed']}, 제외 종목 {len(stats['dropped_symbols'])}, "
+          f"재접속 {stats['reconnects']}, 프레임 {stats['frames']}")
+
+
+if __name__ == "__main__":
+    main()
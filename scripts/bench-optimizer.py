@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+전략 파라미터 탐색 벤치마크
+합성 1분봉으로 같은 그리드를 다음 방식으로 평가해 초당 조합 수를 비교합니다.
+- naive: 조합마다 run_backtest (VWAP 계열을 매번 다시 계산)
+- optimizer (workers=1): vwap_period별 VWAP를 한 번만 계산해 재사용
+- optimizer (workers=N): 공유 메모리 + 프로세스 풀
+- cached: 같은 그리드를 다시 요청 (StrategyEvaluation 캐시 재사용)
+
+사용법: python scripts/bench-optimizer.py [--symbols 10] [--days 120] [--workers 4]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from bench_utils import make_minute_bars, setup_backend_path, use_bench_database
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-optimizer.db"))
+
+from app.database import Base, SessionLocal, engine
+from app.services.backtest import BacktestParams, run_backtest
+from app.services.optimizer import grid_combinations, iter_optimize, rank_results
+
+GRID = {
+    "vwap_period": [1, 2, 5],
+    "entry_threshold": [0.2, 0.3, 0.5],
+    "exit_threshold": [0.8, 1.2],
+    "stop_loss_percent": [1.5, 2.5],
+    "take_profit_percent": [2.0, 3.0],
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    bars_by_symbol = {f"{index:06d}": make_minute_bars(args.days, seed=index) for index in range(args.symbols)}
+    combinations = grid_combinations(GRID)
+    base = BacktestParams()
+    print(f"{args.symbols}종목 × {args.days}일 1분봉, 조합 {len(combinations)}개")
+
+    start = time.perf_counter()
+    for combination in combinations:
+        run_backtest(bars_by_symbol, BacktestParams(**{**base.__dict__, **combination}))
+    naive_s = time.perf_counter() - start
+    print(f"naive:                   {naive_s:7.2f}s ({len(combinations) / naive_s:7.1f} combos/s)")
+
+    start = time.perf_counter()
+    list(iter_optimize(bars_by_symbol, base, combinations, workers=1))
+    shared_s = time.perf_counter() - start
+    print(f"optimizer (workers=1):   {shared_s:7.2f}s ({len(combinations) / shared_s:7.1f} combos/s)")
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        first = None
+        results = []
+        for result in iter_optimize(bars_by_symbol, base, combinations, workers=args.workers, db=db):
+            first = first or time.perf_counter() - start
+            results.append(result)
+        parallel_s = time.perf_counter() - start
+        print(f"optimizer (workers={args.workers}):   {parallel_s:7.2f}s ({len(combinations) / parallel_s:7.1f} combos/s, "
+              f"첫 결과 {first:.2f}s)")
+
+        start = time.perf_counter()
+        cached = list(iter_optimize(bars_by_symbol, base, combinations, workers=args.workers, db=db))
+        cached_s = time.perf_counter() - start
+        print(f"cached:                  {cached_s:7.2f}s ({sum(r['cached'] for r in cached)}개 재사용)")
+    finally:
+        db.close()
+
+    best = rank_results(results, 1)[0]
+    print(f"최고 sharpe {best['objective']:.2f}: {best['params']}")
+
+
+if __name__ == "__main__":
+    main()
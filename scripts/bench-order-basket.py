@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+바스켓(리밸런싱) 주문 벤치마크
+백엔드 앱과 로컬 대역 서버(보유 종목 30개)를 띄우고, 같은 리밸런싱을
+    - individual: 목표 비중으로 계산한 주문을 POST /api/order로 하나씩 (매도 먼저), 이후 전송 결과 폴링
+    - basket:     POST /api/order/basket 한 번 (목표 비중, 서버가 잔고/현재가 조회 후 계산)
+으로 낸 뒤 전체 완료 시간(모든 주문 PENDING/REJECTED)과 주문별 지연을 비교합니다.
+
+사용법: python scripts/bench-order-basket.py [--new-symbols 10] [--latency lognormal:50:0.3] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+
+from bench_utils import create_bench_account, percentile, setup_backend_path, use_bench_database
+from kis_fake_server import create_app, running_fake_server
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-order-basket.db"))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import TradingAccount, User
+from app.services.kis_rate_limiter import get_rate_limiter
+from app.utils.auth import create_access_token
+
+HOLDINGS = 30
+
+
+def build_targets(new_symbols: int) -> dict:
+    """보유 종목 앞쪽 절반은 비중을 늘리고 나머지는 전량 매도, 새 종목을 편입하는 목표 비중"""
+    kept = [f"{index:06d}" for index in range(HOLDINGS // 2)]
+    added = [f"{100000 + index:06d}" for index in range(new_symbols)]
+    weight = 0.95 / (len(kept) + len(added))
+    return {symbol: weight for symbol in kept + added}
+
+
+async def wait_settled(client: httpx.AsyncClient, order_ids: set) -> None:
+    while True:
+        response = await client.get("/api/order", params={"limit": 1000})
+        if not any(
+            order["id"] in order_ids and order["status"] in ("QUEUED", "SUBMITTING") for order in response.json()
+        ):
+            return
+        await asyncio.sleep(0.02)
+
+
+async def run_individual(client: httpx.AsyncClient, account_id: int, targets: dict) -> tuple:
+    # 같은 주문 목록을 서버에서 계산 (주문 없이)
+    plan = (await client.post("/api/order/basket", json={
+        "trading_account_id": account_id, "targets": targets, "dry_run": True
+    })).json()
+    started = time.perf_counter()
+    order_ids = set()
+    post_latencies = []
+    for leg in plan["legs"]:
+        start = time.perf_counter()
+        response = await client.post("/api/order", json={
+            "trading_account_id": account_id,
+            "symbol": leg["symbol"],
+            "order_type": leg["order_type"],
+            "order_method": "MARKET",
+            "quantity": leg["quantity"],
+        })
+        post_latencies.append((time.perf_counter() - start) * 1000)
+        order_ids.add(response.json()["id"])
+    await wait_settled(client, order_ids)
+    return len(plan["legs"]), (time.perf_counter() - started) * 1000, post_latencies
+
+
+async def run_basket(client: httpx.AsyncClient, account_id: int, targets: dict) -> dict:
+    started = time.perf_counter()
+    response = await client.post("/api/order/basket", json={"trading_account_id": account_id, "targets": targets})
+    result = response.json()
+    result["request_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+async def run(base_url: str, token: str, account_id: int, args) -> None:
+    targets = build_targets(args.new_symbols)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=60.0) as client:
+        legs, individual_ms, post_latencies = await run_individual(client, account_id, targets)
+        result = await run_basket(client, account_id, targets)
+
+    latencies = [leg["latency_ms"] for leg in result["legs"] if leg["latency_ms"] is not None]
+    sells = sum(1 for leg in result["legs"] if leg["order_type"] == "SELL")
+    print(
+        f"주문 {legs} (매도 {sells}, 매수 {legs - sells}), 대역 지연 {args.latency}, "
+        f"동시 전송 {args.concurrency}"
+    )
+    print(
+        f"individual  POST {len(post_latencies)}회 (p50 {percentile(post_latencies, 50):.1f} ms), "
+        f"완료 {individual_ms:8.1f} ms"
+    )
+    print(
+        f"basket      POST 1회 ({result['status']}), 계산 {result['plan_ms']:.1f} ms, "
+        f"매도 완료 {result['sells_ms'] or 0:.1f} ms, 완료 {result['total_ms'] or 0:8.1f} ms "
+        f"(응답 {result['request_ms']:.1f} ms)"
+    )
+    print(
+        f"            주문별 지연 p50 {percentile(latencies, 50):.1f} ms / p99 {percentile(latencies, 99):.1f} ms, "
+        f"REJECTED {sum(1 for leg in result['legs'] if leg['status'] == 'REJECTED')}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--new-symbols", type=int, default=10, help="새로 편입할 종목 수")
+    parser.add_argument("--latency", default="lognormal:50:0.3", help="대역 서버 지연 모델")
+    parser.add_argument("--concurrency", type=int, default=8, help="ORDER_SUBMITTER_CONCURRENCY")
+    args = parser.parse_args()
+
+    account_id = create_bench_account()
+    db = SessionLocal()
+    username = db.get(User, db.get(TradingAccount, account_id).user_id).username
+    db.close()
+    token = create_access_token({"sub": username})
+    get_rate_limiter("bench-app-key").rate = 1000.0
+
+    settings.KIS_REALTIME_ENABLED = False
+    settings.STRATEGY_RUNNER_ENABLED = False
+    settings.ORDER_RECONCILER_ENABLED = False
+    settings.KIS_FILL_NOTICES_ENABLED = False
+    settings.ORDER_SUBMITTER_CONCURRENCY = args.concurrency
+    settings.BASKET_ORDER_WAIT_SECONDS = 30.0
+
+    from app.main import app
+
+    fake_app = create_app(latency=args.latency, holdings=HOLDINGS, fill_delay=3600.0)
+    with running_fake_server(fake_app) as kis_url:
+        settings.KIS_BASE_URL = kis_url
+        with running_fake_server(app) as base_url:
+            asyncio.run(run(base_url, token, account_id, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+주문 체결 대사 벤치마크
+로컬 대역 서버에 계정별로 주문을 낸 뒤 체결이 끝나면, 주문 건별 체결 조회(ODNO 지정)와
+계정별 일괄 조회(OrderReconciler.reconcile_once, 일괄 UPDATE)의 요청 수와 소요 시간을 비교합니다.
+
+사용법: python scripts/bench-order-reconciler.py [--accounts 5] [--orders 200] [--latency-ms 20]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from bench_utils import create_bench_account, setup_backend_path, use_bench_database
+from kis_fake_server import create_app, running_fake_server
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-order-reconciler.db"))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Order, TradingAccount
+from app.services.kis_api import AsyncKISAPIClient
+from app.services.kis_http import aclose_http_clients
+from app.services.kis_rate_limiter import get_rate_limiter
+from app.services.order_reconciler import OpenOrder, OrderReconciler, next_order_state
+
+
+async def place_orders(account: TradingAccount, count: int) -> None:
+    db = SessionLocal()
+    try:
+        client = AsyncKISAPIClient(account, db)
+        results = await asyncio.gather(*(
+            client.place_order(account.account_number, f"{index % 50:06d}", "BUY", 10, None, "01")
+            for index in range(count)
+        ))
+        db.add_all([
+            Order(
+                user_id=account.user_id,
+                trading_account_id=account.id,
+                symbol=f"{index % 50:06d}",
+                order_type="BUY",
+                order_method="MARKET",
+                quantity=10,
+                status="PENDING",
+                kis_order_no=result["output"]["ODNO"]
+            )
+            for index, result in enumerate(results)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+async def reconcile_per_order(account: TradingAccount) -> int:
+    """주문 건별로 체결 조회를 보내 다음 상태를 계산합니다 (DB 반영 없음, 비교 기준)."""
+    db = SessionLocal()
+    try:
+        client = AsyncKISAPIClient(account, db)
+        orders = db.query(Order).filter(Order.trading_account_id == account.id).all()
+        today = time.strftime("%Y%m%d")
+        base = client._daily_executions_request(account.account_number, today, today)
+
+        async def inquire(order: Order) -> None:
+            request = base._replace(params={**base.params, "ODNO": order.kis_order_no})
+            rows = (await client._send(request)).get("output1") or []
+            if rows:
+                open_order = OpenOrder(order.id, order.kis_order_no, order.quantity, order.status, 0, None, today)
+                next_order_state(open_order, rows[0])
+
+        await asyncio.gather(*(inquire(order) for order in orders))
+        return len(orders)
+    finally:
+        db.close()
+
+
+async def run(args, account_ids) -> None:
+    db = SessionLocal()
+    accounts = [db.get(TradingAccount, account_id) for account_id in account_ids]
+    db.expunge_all()
+    db.close()
+    try:
+        await asyncio.gather(*(place_orders(account, args.orders) for account in accounts))
+        await asyncio.sleep(args.fill_delay)
+
+        start = time.perf_counter()
+        requests = sum(await asyncio.gather(*(reconcile_per_order(account) for account in accounts)))
+        per_order_s = time.perf_counter() - start
+
+        reconciler = OrderReconciler()
+        start = time.perf_counter()
+        remaining = await reconciler.reconcile_once()
+        bulk_s = time.perf_counter() - start
+        stats = reconciler.stats()
+
+        db = SessionLocal()
+        executed = db.query(Order).filter(Order.status == "EXECUTED").count()
+        db.close()
+
+        total = args.accounts * args.orders
+        print(f"계정 {args.accounts}, 계정당 주문 {args.orders} (총 {total:,}), 지연 {args.latency_ms}ms")
+        print(f"{'방식':<10}{'요청 수':>10}{'소요(ms)':>12}")
+        print(f"{'주문별':<10}{requests:>10,}{per_order_s * 1000:>12.1f}")
+        print(f"{'계정별':<10}{stats['requests']:>10,}{bulk_s * 1000:>12.1f}")
+        updated = sum(item["updated"] for item in stats["accounts"].values())
+        print(f"일괄 UPDATE 반영 {updated:,}건, EXECUTED {executed:,}건, 남은 미체결 {remaining}")
+        for account_id, item in sorted(stats["accounts"].items()):
+            print(f"  계정 {account_id}: 페이지 {item['pages']}, {item['last_duration_ms']:.1f}ms")
+    finally:
+        await aclose_http_clients()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accounts", type=int, default=5)
+    parser.add_argument("--orders", type=int, default=200, help="계정당 주문 수")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--fill-delay", type=float, default=1.0, help="대역 서버 전량 체결 시간(초)")
+    args = parser.parse_args()
+
+    account_ids = []
+    for index in range(args.accounts):
+        app_key = f"bench-app-key-{index}"
+        account_ids.append(create_bench_account(app_key, f"{50000000 + index:08d}01"))
+        # 요청 수 차이 자체를 보기 위해 클라이언트 측 속도 제한은 넉넉하게 설정
+        get_rate_limiter(app_key).rate = 1000.0
+
+    fake_app = create_app(latency_ms=args.latency_ms, fill_delay=args.fill_delay)
+    with running_fake_server(fake_app) as base_url:
+        settings.KIS_BASE_URL = base_url
+        asyncio.run(run(args, account_ids))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+주문 접수(outbox) 벤치마크
+백엔드 앱과 로컬 대역 서버를 띄우고 POST /api/order를 동시에 보내
+    - 주문 API 응답 지연 (QUEUED 기록 후 202, KIS 왕복을 기다리지 않음)
+    - order_submitter가 모든 주문을 PENDING/REJECTED로 만들기까지의 처리량
+    - 주문 응답 유실(접수 후 HTTP 500) 상황에서 KIS 중복 주문 수 (일별 체결 조회로 채택)
+    - 같은 멱등성 키로 다시 보낸 요청이 새 주문을 만들지 않는지
+를 확인합니다. KIS 왕복을 기다리던 기존 API의 응답 지연은 submit_ms(KIS 왕복 + 기록)와 비슷합니다.
+
+사용법: python scripts/bench-order-submit.py [--orders 500] [--clients 32] [--latency lognormal:50:0.3] [--lost-rate 0.05]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+
+from bench_utils import create_bench_account, percentile, setup_backend_path, use_bench_database
+from kis_fake_server import create_app, running_fake_server
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-order-submit.db"))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Order, TradingAccount, User
+from app.services.kis_rate_limiter import get_rate_limiter
+from app.services.order_submitter import order_submitter
+from app.utils.auth import create_access_token
+
+
+async def post_orders(base_url: str, token: str, account_id: int, args) -> tuple:
+    latencies = []
+    order_ids = []
+    index_iter = iter(range(args.orders))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=30.0) as client:
+        async def worker() -> None:
+            for index in index_iter:
+                body = {
+                    "trading_account_id": account_id,
+                    "symbol": f"{index % 50:06d}",
+                    "order_type": "BUY" if index % 2 else "SELL",
+                    "order_method": "MARKET",
+                    "quantity": 1 + index % 7,
+                    "client_order_id": f"bench-{index}",
+                }
+                start = time.perf_counter()
+                response = await client.post("/api/order", json=body)
+                latencies.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+                order_ids.append(response.json()["id"])
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.clients)))
+        post_s = time.perf_counter() - started
+
+        # 모든 주문이 전송될 때까지 대기
+        while True:
+            response = await client.get("/api/order", params={"limit": args.orders * 2})
+            statuses = [order["status"] for order in response.json()]
+            if not any(status in ("QUEUED", "SUBMITTING") for status in statuses):
+                break
+            await asyncio.sleep(0.05)
+        drain_s = time.perf_counter() - started
+
+        # 같은 키로 재시도 (클라이언트 타임아웃 후 재전송 상황)
+        retry_ids = []
+        for index in range(min(args.orders, 50)):
+            response = await client.post("/api/order", headers={"Idempotency-Key": f"bench-{index}"}, json={
+                "trading_account_id": account_id,
+                "symbol": f"{index % 50:06d}",
+                "order_type": "BUY" if index % 2 else "SELL",
+                "order_method": "MARKET",
+                "quantity": 1 + index % 7,
+            })
+            retry_ids.append(response.json()["id"])
+
+    return latencies, post_s, drain_s, set(retry_ids) <= set(order_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--clients", type=int, default=32, help="동시에 주문을 보내는 클라이언트 수")
+    parser.add_argument("--latency", default="lognormal:50:0.3", help="대역 서버 지연 모델")
+    parser.add_argument("--lost-rate", type=float, default=0.05, help="주문 접수 후 응답 유실 비율")
+    parser.add_argument("--concurrency", type=int, default=8, help="ORDER_SUBMITTER_CONCURRENCY")
+    args = parser.parse_args()
+
+    account_id = create_bench_account()
+    db = SessionLocal()
+    username = db.get(User, db.get(TradingAccount, account_id).user_id).username
+    db.close()
+    token = create_access_token({"sub": username})
+    get_rate_limiter("bench-app-key").rate = 1000.0
+
+    settings.KIS_REALTIME_ENABLED = False
+    settings.STRATEGY_RUNNER_ENABLED = False
+    settings.ORDER_RECONCILER_ENABLED = False
+    settings.KIS_FILL_NOTICES_ENABLED = False
+    settings.ORDER_SUBMITTER_CONCURRENCY = args.concurrency
+    settings.ORDER_SUBMITTER_RETRY_BASE_SECONDS = 0.2
+
+    from app.main import app
+
+    fake_app = create_app(latency=args.latency, lost_order_response_rate=args.lost_rate, fill_delay=3600.0)
+    with running_fake_server(fake_app) as kis_url:
+        settings.KIS_BASE_URL = kis_url
+        with running_fake_server(app) as base_url:
+            latencies, post_s, drain_s, idempotent = asyncio.run(post_orders(base_url, token, account_id, args))
+            stats = order_submitter.stats()
+
+    db = SessionLocal()
+    rows = db.query(Order).filter(Order.trading_account_id == account_id).all()
+    db.close()
+    pending = sum(1 for order in rows if order.status == "PENDING")
+    rejected = sum(1 for order in rows if order.status == "REJECTED")
+    order_numbers = {order.kis_order_no for order in rows if order.kis_order_no}
+    kis_orders = fake_app.state.stats["orders"]
+
+    print(f"주문 {args.orders}, 클라이언트 {args.clients}, 대역 지연 {args.latency}, 응답 유실 {args.lost_rate:.0%}")
+    print(
+        f"POST /api/order     p50 {percentile(latencies, 50):7.2f} ms  p99 {percentile(latencies, 99):7.2f} ms"
+        f"  ({args.orders / post_s:,.0f} req/s)"
+    )
+    print(
+        f"KIS 전송(submit_ms)  p50 {stats['submit_ms']['p50']:7.2f} ms  p99 {stats['submit_ms']['p99']:7.2f} ms"
+        f"  (동시 전송 {args.concurrency})"
+    )
+    print(f"전부 전송까지 {drain_s:.2f}s ({args.orders / drain_s:,.0f} orders/s)")
+    print(
+        f"PENDING {pending}, REJECTED {rejected}, 재시도 {stats['retried']}, 응답 유실 "
+        f"{fake_app.state.stats['lost_order_responses']} → 채택 {stats['adopted']}"
+    )
+    print(
+        f"KIS 접수 {kis_orders}, DB 주문번호 {len(order_numbers)} → 중복 주문 {kis_orders - len(order_numbers)}; "
+        f"같은 키 재요청: {'기존 주문 반환' if idempotent else '새 주문 생성!'} (총 행 {len(rows)})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+매매 신호 배치 평가 벤치마크
+(전략, 종목) 쌍마다 generate_trading_signal/check_stop_loss_take_profit을 호출하는
+기존 방식과, 배열로 한 번에 평가하는 generate_trading_signals/
+check_stop_loss_take_profit_batch의 틱당 평가 시간을 비교합니다.
+
+사용법: python scripts/bench-signals.py [--strategies 50] [--symbols 100]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from bench_utils import setup_backend_path, use_bench_database
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-signals.db"))
+
+from app.services.vwap_strategy import (
+    check_stop_loss_take_profit,
+    check_stop_loss_take_profit_batch,
+    format_signal_reason,
+    generate_trading_signal,
+    generate_trading_signals,
+    SIGNAL_HOLD,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--strategies", type=int, default=50)
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # 전략별 임계값, 종목별 현재가/VWAP, (전략, 종목) 쌍별 진입가
+    entry = rng.uniform(0.2, 1.0, args.strategies)
+    exit_ = entry + rng.uniform(0.5, 2.0, args.strategies)
+    stop_loss = rng.uniform(1.0, 3.0, args.strategies)
+    take_profit = rng.uniform(2.0, 5.0, args.strategies)
+    vwaps = rng.uniform(5000, 50000, args.symbols)
+    prices = vwaps * (1 + rng.normal(0, 0.01, args.symbols))
+
+    strategy_index = np.repeat(np.arange(args.strategies), args.symbols)
+    symbol_index = np.tile(np.arange(args.symbols), args.strategies)
+    pairs = len(strategy_index)
+    entry_prices = np.where(rng.random(pairs) < 0.3, prices[symbol_index] * (1 + rng.normal(0, 0.02, pairs)), np.nan)
+
+    start = time.perf_counter()
+    for _ in range(max(1, args.repeat // 20)):
+        for pair in range(pairs):
+            s, k = strategy_index[pair], symbol_index[pair]
+            generate_trading_signal(prices[k], vwaps[k], entry[s], exit_[s])
+            if not np.isnan(entry_prices[pair]):
+                check_stop_loss_take_profit(entry_prices[pair], prices[k], stop_loss[s], take_profit[s])
+    scalar_us = (time.perf_counter() - start) / max(1, args.repeat // 20) * 1e6
+
+    # 쌍 배열은 전략/종목 구성이 바뀔 때만 다시 만들면 되므로 미리 모아 둠
+    pair_entry, pair_exit = entry[strategy_index], exit_[strategy_index]
+    pair_stop_loss, pair_take_profit = stop_loss[strategy_index], take_profit[strategy_index]
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        pair_prices = prices[symbol_index]
+        signals, reasons, diffs = generate_trading_signals(pair_prices, vwaps[symbol_index], pair_entry, pair_exit)
+        actions, _ = check_stop_loss_take_profit_batch(entry_prices, pair_prices, pair_stop_loss, pair_take_profit)
+        emitted = np.flatnonzero(signals != SIGNAL_HOLD)
+    batch_us = (time.perf_counter() - start) / args.repeat * 1e6
+
+    start = time.perf_counter()
+    messages = [format_signal_reason(reasons[index], diffs[index]) for index in emitted]
+    format_us = (time.perf_counter() - start) * 1e6
+
+    print(f"(전략, 종목) 쌍: {pairs}")
+    print(f"scalar loop:  {scalar_us:12.1f} us/tick")
+    print(f"batch:        {batch_us:12.1f} us/tick ({scalar_us / batch_us:.0f}x)")
+    print(f"신호 {len(messages)}건 사유 문자열 생성: {format_us:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+전략 평가 샤드 벤치마크
+합성 틱 피드를 전략 실행기와 같은 방식(평가 주기마다 틱 묶음)으로 보내
+앱 프로세스 평가(샤드 0)와 워커 프로세스 1/2/4/8개의 초당 처리 틱 수, 앱 프로세스가
+틱당 쓰는 CPU 시간을 측정합니다. 주문 결정은 즉시 체결된 것으로 돌려보냅니다.
+워커는 밀린 틱 메시지를 모아 한 번에 평가하므로 부하가 클수록 전략 평가 횟수가 줄어듭니다.
+
+사용법: python scripts/bench-strategy-shards.py [--strategies 500] [--symbols 200] \\
+            [--ticks 200000] [--batch 500] [--shards 0 1 2 4 8]
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import date
+
+from bench_utils import setup_backend_path, use_bench_database
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-strategy-shards.db"))
+os.environ["STRATEGY_RUNNER_SESSION"] = "0000-2400"
+os.environ["BAR_STORE_PATH"] = os.path.join(tempfile.gettempdir(), "bench-strategy-shards-bars")
+
+from app.services.backtest import BacktestParams
+from app.services.kis_realtime import TickRecord
+from app.services.strategy_runner import Position, StrategyBook, StrategyState
+from app.services.strategy_shards import MSG_BARRIER, MSG_DECISIONS, ShardPool
+from app.services.vwap_engine import VWAPEngine
+
+
+def make_states(strategies: int, symbols: int, per_strategy: int = 10):
+    universe = [f"{index:06d}" for index in range(symbols)]
+    rng = random.Random(0)
+    params = BacktestParams(entry_threshold=0.05, exit_threshold=0.5, stop_loss_percent=0.5, take_profit_percent=0.5)
+    return {
+        index: StrategyState(index, 1, 1, params, rng.sample(universe, min(per_strategy, symbols)), 1000000)
+        for index in range(strategies)
+    }
+
+
+def make_feed(symbols: int, ticks: int, batch: int):
+    """종목별 랜덤 워크 틱을 batch개씩 묶은 목록"""
+    rng = random.Random(1)
+    prices = [10000.0 + 50 * index for index in range(symbols)]
+    cumulative = [0] * symbols
+    start_ms = int(time.time() * 1000)
+    feed, records = [], []
+    for index in range(ticks):
+        symbol = rng.randrange(symbols)
+        prices[symbol] *= 1 + rng.gauss(0.0, 0.001)
+        volume = rng.randint(1, 500)
+        cumulative[symbol] += volume
+        records.append(TickRecord(f"{symbol:06d}", start_ms + index, round(prices[symbol]), volume, cumulative[symbol]))
+        if len(records) == batch:
+            feed.append(records)
+            records = []
+    return feed + ([records] if records else [])
+
+
+def fill(decision) -> Position:
+    return Position(decision.quantity, decision.price, date.today()) if decision.order_type == "BUY" else None
+
+
+def bench_in_process(states, feed) -> dict:
+    book = StrategyBook(VWAPEngine())
+    book.set_states(states)
+    decisions = 0
+    cpu, start = time.process_time(), time.perf_counter()
+    for batch in feed:
+        book.engine.on_ticks(batch)
+        book.on_ticks(batch)
+        for strategy_id, decision in book.evaluate():
+            book.order_done(strategy_id, decision.symbol, fill(decision))
+            decisions += 1
+    return {
+        "elapsed": time.perf_counter() - start,
+        "cpu": time.process_time() - cpu,
+        "decisions": decisions,
+        "evaluations": sum(state.evaluations for state in book.states.values()),
+    }
+
+
+def bench_shards(shards: int, states, feed) -> dict:
+    decisions = 0
+    arrived = {}
+    done = threading.Condition()
+
+    def handler(message) -> None:
+        nonlocal decisions
+        kind, shard, payload = message
+        if kind == MSG_DECISIONS:
+            for strategy_id, decision in payload:
+                pool.order_done(strategy_id, decision.symbol, fill(decision))
+            decisions += len(payload)
+        elif kind == MSG_BARRIER:
+            with done:
+                arrived.setdefault(payload, set()).add(shard)
+                done.notify_all()
+
+    def wait_barrier(token) -> None:
+        pool.barrier(token)
+        with done:
+            done.wait_for(lambda: len(arrived.get(token, ())) == shards)
+
+    pool = ShardPool(shards, handler)
+    pool.start()
+    try:
+        pool.set_states(states)
+        wait_barrier("ready")  # 워커 기동(spawn, import) 시간 제외
+        cpu, start = time.process_time(), time.perf_counter()
+        for batch in feed:
+            pool.add_ticks(batch)
+            pool.flush()
+        wait_barrier("done")
+        return {
+            "elapsed": time.perf_counter() - start,
+            "cpu": time.process_time() - cpu,
+            "decisions": decisions,
+            "evaluations": sum(
+                count for stats in pool.shard_stats.values() for count, *_ in stats["evaluations"].values()
+            ),
+        }
+    finally:
+        pool.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--strategies", type=int, default=500)
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--ticks", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=500, help="평가 주기당 틱 수")
+    parser.add_argument("--shards", type=int, nargs="+", default=[0, 1, 2, 4, 8])
+    args = parser.parse_args()
+
+    feed = make_feed(args.symbols, args.ticks, args.batch)
+    print(f"전략 {args.strategies}개 × 10종목, 종목 {args.symbols}개, 틱 {args.ticks:,} ({args.batch}개씩), CPU {os.cpu_count()}개")
+    print(f"{'샤드':>6} {'틱/s':>10} {'앱 CPU µs/틱':>14} {'전략 평가':>10} {'주문 결정':>10}")
+    for shards in args.shards:
+        states = make_states(args.strategies, args.symbols)
+        result = bench_in_process(states, feed) if shards == 0 else bench_shards(shards, states, feed)
+        label = "앱" if shards == 0 else str(shards)
+        print(
+            f"{label:>6} {args.ticks / result['elapsed']:>10,.0f} "
+            f"{result['cpu'] * 1e6 / args.ticks:>14.2f} {result['evaluations']:>10,} {result['decisions']:>10,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
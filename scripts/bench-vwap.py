@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+VWAP 계산 벤치마크
+틱이 하나 들어올 때마다 VWAP를 갱신하는 비용을 비교합니다.
+- calculate_vwap: 전체 이력을 dict 리스트 → DataFrame 병합으로 다시 계산 (기존 방식)
+- calculate_vwap_array: TickStore 뷰 배열로 다시 계산
+- VWAPAccumulator.update: 누적값만 갱신 (틱당 O(1))
+밴드도 같은 방식으로 calculate_vwap_bands 재계산과 증분 밴드(배수 3개)를 비교합니다.
+
+사용법: python scripts/bench-vwap.py [--ticks 10000 20000 50000]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from bench_utils import setup_backend_path, use_bench_database
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "bench-vwap.db"))
+
+from app.services.vwap_engine import VWAPAccumulator
+from app.services.vwap_strategy import calculate_vwap, calculate_vwap_array, calculate_vwap_bands
+
+STD_DEVS = (1.0, 2.0, 3.0)
+
+
+def make_ticks(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    prices = 10000 * np.exp(np.cumsum(rng.normal(0, 0.0005, count)))
+    volumes = rng.integers(1, 500, count).astype(np.int64)
+    return prices, volumes
+
+
+def time_per_call(fn, repeat: int) -> float:
+    """fn을 repeat번 호출한 평균 시간(µs)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, nargs="+", default=[10000, 20000, 50000])
+    parser.add_argument("--repeat", type=int, default=20, help="재계산 방식 반복 횟수")
+    args = parser.parse_args()
+
+    rows = []
+    print(f"{'ticks':>8}{'calculate_vwap':>18}{'vwap_array':>14}{'incremental':>14}{'speedup':>10}")
+    for count in args.ticks:
+        prices, volumes = make_ticks(count)
+        start_time = datetime(2024, 1, 2, 9, 0)
+        timestamps = [start_time + timedelta(milliseconds=200 * index) for index in range(count)]
+        price_data = [{"price": float(p), "timestamp": t} for p, t in zip(prices, timestamps)]
+        volume_data = [{"volume": int(v), "timestamp": t} for v, t in zip(volumes, timestamps)]
+
+        pandas_us = time_per_call(lambda: calculate_vwap(price_data, volume_data), args.repeat)
+        array_us = time_per_call(lambda: calculate_vwap_array(prices, volumes), args.repeat * 10)
+
+        accumulator = VWAPAccumulator()
+        price_list, volume_list = prices.tolist(), volumes.tolist()
+        start = time.perf_counter()
+        for price, volume in zip(price_list, volume_list):
+            accumulator.update(price, volume)
+        incremental_us = (time.perf_counter() - start) / count * 1e6
+
+        reference = calculate_vwap(price_data, volume_data)
+        assert abs(accumulator.vwap - reference) < 1e-6 * reference, (accumulator.vwap, reference)
+        print(
+            f"{count:>8}{pandas_us:>16.1f}us{array_us:>12.1f}us{incremental_us:>12.3f}us"
+            f"{pandas_us / incremental_us:>9.0f}x"
+        )
+        rows.append((price_data, volume_data, reference, price_list, volume_list))
+
+    print(f"\n{'ticks':>8}{'bands x3 (pandas)':>20}{'incremental':>14}{'speedup':>10}")
+    for price_data, volume_data, reference, price_list, volume_list in rows:
+        pandas_us = time_per_call(
+            lambda: [calculate_vwap_bands(reference, price_data, volume_data, k) for k in STD_DEVS],
+            max(1, args.repeat // 2)
+        )
+        accumulator = VWAPAccumulator()
+        start = time.perf_counter()
+        for price, volume in zip(price_list, volume_list):
+            accumulator.update(price, volume)
+            accumulator.bands(STD_DEVS)
+        incremental_us = (time.perf_counter() - start) / len(price_list) * 1e6
+        print(
+            f"{len(price_list):>8}{pandas_us:>18.1f}us{incremental_us:>12.3f}us"
+            f"{pandas_us / incremental_us:>9.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
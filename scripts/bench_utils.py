@@ -0,0 +1,104 @@
+"""
+벤치마크 스크립트 공용 유틸리티
+"""
+import os
+import statistics
+import sys
+from typing import Dict, List
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), '..', 'backend')
+
+
+def setup_backend_path() -> None:
+    """backend 패키지를 import할 수 있도록 경로를 추가합니다."""
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """정렬된 값 목록에서 백분위수를 계산합니다 (nearest-rank)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize_latencies(latencies_ms: List[float]) -> Dict[str, float]:
+    """지연 시간 목록의 요약 통계(ms)를 반환합니다."""
+    return {
+        "count": len(latencies_ms),
+        "mean": statistics.fmean(latencies_ms) if latencies_ms else 0.0,
+        "p50": percentile(latencies_ms, 50),
+        "p99": percentile(latencies_ms, 99),
+        "max": max(latencies_ms) if latencies_ms else 0.0,
+    }
+
+
+def print_latency_table(rows: Dict[str, List[float]]) -> None:
+    """이름별 지연 시간 요약을 표로 출력합니다."""
+    print(f"{'case':<28}{'n':>7}{'mean':>10}{'p50':>10}{'p99':>10}{'max':>10}")
+    for name, latencies in rows.items():
+        s = summarize_latencies(latencies)
+        print(
+            f"{name:<28}{s['count']:>7}{s['mean']:>10.3f}{s['p50']:>10.3f}"
+            f"{s['p99']:>10.3f}{s['max']:>10.3f}"
+        )
+
+
+def use_bench_database(path: str) -> None:
+    """벤치마크용 SQLite DB를 사용하도록 설정합니다 (app import 전에 호출)."""
+    url = f"sqlite:///{path}"
+    # spawn된 워커 프로세스가 스크립트를 다시 import할 때(환경 변수 상속)는 부모의 DB를 지우지 않음
+    if os.environ.get("DATABASE_URL") != url and os.path.exists(path):
+        os.remove(path)
+    os.environ["DATABASE_URL"] = url
+
+
+def create_bench_account(app_key: str = "bench-app-key", account_number: str = "5000000001") -> int:
+    """벤치마크용 사용자와 거래 계정을 생성하고 거래 계정 ID를 반환합니다."""
+    setup_backend_path()
+    from app.database import Base, SessionLocal, engine
+    from app.models import TradingAccount, User
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = User(email=f"{app_key}@bench.local", username=app_key, hashed_password="-")
+        db.add(user)
+        db.commit()
+        account = TradingAccount(
+            user_id=user.id,
+            account_number=account_number,
+            app_key=app_key,
+            app_secret="bench-app-secret"
+        )
+        db.add(account)
+        db.commit()
+        return account.id
+    finally:
+        db.close()
+
+
+def make_minute_bars(days: int = 250, seed: int = 0, start: str = "2024-01-02", bars_per_day: int = 390):
+    """합성 1분봉(09:00부터 bars_per_day개, 평일만)을 만들어 BarSeries로 반환합니다."""
+    import numpy as np
+
+    setup_backend_path()
+    from app.services.backtest import BarSeries
+    from app.services.kis_realtime import KST_OFFSET_MS
+
+    rng = np.random.default_rng(seed)
+    dates = np.busday_offset(np.datetime64(start), np.arange(days), roll="forward")
+    day_ms = dates.astype("datetime64[ms]").astype(np.int64) - KST_OFFSET_MS + 9 * 3600 * 1000
+    timestamps = (day_ms[:, None] + np.arange(bars_per_day)[None, :] * 60_000).ravel()
+
+    count = len(timestamps)
+    base = 10000.0 + (seed % 50) * 500
+    close = base * np.exp(np.cumsum(rng.normal(0, 0.0008, count)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = close * np.abs(rng.normal(0, 0.0005, count))
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.integers(100, 5000, count).astype(np.float64)
+    return BarSeries(timestamps, open_, high, low, close, volume)
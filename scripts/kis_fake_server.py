@@ -0,0 +1,685 @@
+#!/usr/bin/env python3
+"""
+한국투자증권 API 로컬 대역 서버 (부하 테스트/벤치마크용)
+실제 증권사 서버 대신 KIS_BASE_URL을 이 서버로 지정해 네트워크 없이 사용합니다.
+
+지원 API: 토큰 발급, 현재가 조회, 잔고 조회(연속조회), 현금 주문,
+         일별 주문 체결 조회(연속조회, 주문 후 fill_delay초가 지나면 전량 체결),
+         기간별 시세(일봉)/일별 분봉 차트 조회,
+         실시간 접속키 발급 및 실시간 체결가(H0STCNT0) WebSocket 피드,
+         실시간 체결통보(H0STCNI0/H0STCNI9, AES-256-CBC 암호화): 주문 접수 즉시 접수 통보,
+         fill_delay/2초에 절반, fill_delay초에 나머지 체결 통보 (일별 주문 체결 조회와 같은 시점)
+주입 가능한 조건: 지연 시간 분포, 앱키별 초당 요청 제한(EGW00201), 임의 실패율,
+                  실시간 피드 틱 속도와 주기적 연결 끊김
+
+사용법:
+    python scripts/kis_fake_server.py --port 9443 --latency lognormal:20:0.5 \\
+        --rate-limit 20 --failure-rate 0.01 --holdings 120
+    KIS_BASE_URL=http://127.0.0.1:9443 KIS_WS_URL=ws://127.0.0.1:9443 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import base64
+import contextlib
+import datetime
+import itertools
+import json
+import math
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+import uvicorn
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+
+RATE_LIMIT_ERROR = {
+    "rt_cd": "1",
+    "msg_cd": "EGW00201",
+    "msg1": "초당 거래건수를 초과하였습니다."
+}
+
+INJECTED_FAILURE = {
+    "rt_cd": "1",
+    "msg_cd": "EGW00203",
+    "msg1": "OPS라우팅 중 오류가 발생했습니다."
+}
+
+
+class LatencyModel:
+    """응답 지연 시간 분포
+
+    spec 형식 (단위 ms):
+        fixed:5             항상 5ms
+        uniform:2:20        2~20ms 균등 분포
+        lognormal:20:0.5    중앙값 20ms, 로그 표준편차 0.5 (긴 꼬리)
+    """
+
+    def __init__(self, spec: str = "fixed:0"):
+        kind, *params = spec.split(":")
+        self.spec = spec
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        if kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency model: {spec}")
+
+    def sample(self) -> float:
+        """지연 시간(초)을 하나 뽑습니다."""
+        if self.kind == "fixed":
+            ms = self.params[0] if self.params else 0.0
+        elif self.kind == "uniform":
+            ms = random.uniform(self.params[0], self.params[1])
+        else:
+            ms = self.params[0] * math.exp(random.gauss(0.0, self.params[1]))
+        return ms / 1000
+
+
+@dataclass
+class FakeKISConfig:
+    latency: str = "fixed:0"  # LatencyModel spec
+    rate_limit_per_sec: Optional[int] = None  # 앱키별 초당 허용 요청 수 (None이면 제한 없음)
+    failure_rate: float = 0.0  # HTTP 500 + EGW00203을 반환할 확률
+    holdings: int = 30  # 잔고 조회 보유 종목 수
+    balance_page_size: int = 50  # 잔고 조회 페이지당 종목 수 (초과분은 연속조회)
+    seed: Optional[int] = None
+    ws_ticks_per_sec: float = 1000.0  # 실시간 피드 연결당 초당 틱 수
+    ws_records_per_frame: int = 1  # 프레임당 체결 레코드 수
+    ws_max_subscriptions: int = 41  # 접속키당 최대 실시간 등록 수
+    ws_disconnect_after: Optional[float] = None  # 지정 시 N초마다 연결을 끊음 (재접속 테스트)
+    fill_delay: float = 1.0  # 주문 후 전량 체결까지 걸리는 시간(초), 절반이 지나면 절반 체결
+    executions_page_size: int = 100  # 일별 주문 체결 조회 페이지당 주문 수
+    lost_order_response_rate: float = 0.0  # 주문을 접수한 뒤 HTTP 500을 반환할 확률 (응답 유실)
+
+
+class _PriceBook:
+    """종목별 현재가를 랜덤 워크로 생성합니다."""
+
+    def __init__(self):
+        self._prices: Dict[str, float] = {}
+        self._volumes: Dict[str, int] = defaultdict(int)
+
+    def tick(self, symbol: str) -> Tuple[int, int]:
+        price = self._prices.get(symbol)
+        if price is None:
+            price = 10000.0 + (sum(map(ord, symbol)) % 50) * 500
+        price = max(100.0, price * (1 + random.gauss(0.0, 0.001)))
+        self._prices[symbol] = price
+        self._volumes[symbol] += random.randint(1, 500)
+        # 호가 단위(5원)로 반올림
+        return int(round(price / 5) * 5), self._volumes[symbol]
+
+
+def build_tick_record(symbol: str, hhmmss: str, price: int, volume: int, cumulative_volume: int) -> str:
+    """H0STCNT0 형식의 체결 레코드(46개 필드, '^' 구분)를 만듭니다."""
+    fields = ["0"] * 46
+    fields[0] = symbol
+    fields[1] = hhmmss
+    fields[2] = str(price)
+    fields[3] = "2"
+    fields[7] = fields[8] = fields[9] = str(price)
+    fields[12] = str(volume)
+    fields[13] = str(cumulative_volume)
+    return "^".join(fields)
+
+
+def build_tick_frame(records: List[str]) -> str:
+    """체결 레코드 묶음을 실시간 데이터 프레임으로 만듭니다."""
+    return f"0|H0STCNT0|{len(records):03d}|" + "^".join(records)
+
+
+def _chart_price(symbol: str, key: str) -> Tuple[random.Random, float]:
+    """종목/날짜별로 항상 같은 값을 내는 난수 생성기와 기준가"""
+    rng = random.Random(zlib.crc32(f"{symbol}:{key}".encode()))
+    day = datetime.date(int(key[:4]), int(key[4:6]), int(key[6:])).toordinal()
+    base = 10000.0 + (sum(map(ord, symbol)) % 50) * 500
+    return rng, base * (1 + 0.1 * math.sin(day / 30))
+
+
+def build_daily_chart_rows(symbol: str, start_key: str, end_key: str, limit: int = 100) -> List[Dict[str, str]]:
+    """[start_key, end_key] 평일 일봉 행 (최근 날짜부터 limit개)"""
+    rows = []
+    day = datetime.datetime.strptime(end_key, "%Y%m%d").date()
+    start = datetime.datetime.strptime(start_key, "%Y%m%d").date()
+    while day >= start and len(rows) < limit:
+        if day.weekday() < 5:
+            key = day.strftime("%Y%m%d")
+            rng, price = _chart_price(symbol, key)
+            open_, close = price * (1 + rng.gauss(0, 0.005)), price * (1 + rng.gauss(0, 0.005))
+            rows.append({
+                "stck_bsop_date": key,
+                "stck_oprc": str(int(open_)),
+                "stck_hgpr": str(int(max(open_, close) * 1.003)),
+                "stck_lwpr": str(int(min(open_, close) * 0.997)),
+                "stck_clpr": str(int(close)),
+                "acml_vol": str(rng.randint(100_000, 2_000_000)),
+            })
+        day -= datetime.timedelta(days=1)
+    return rows
+
+
+def build_minute_chart_rows(symbol: str, key: str, hour: str, limit: int = 120) -> List[Dict[str, str]]:
+    """거래일 key의 hour(HHMMSS) 이전 1분봉 행 (09:00~15:30, 최근 시각부터 limit개)"""
+    if datetime.datetime.strptime(key, "%Y%m%d").weekday() >= 5:
+        return []
+    rng, price = _chart_price(symbol, key)
+    bars = []
+    for minute in range(9 * 60, 15 * 60 + 31):
+        open_ = price
+        price = price * (1 + rng.gauss(0, 0.0008))
+        bars.append({
+            "stck_bsop_date": key,
+            "stck_cntg_hour": f"{minute // 60:02d}{minute % 60:02d}00",
+            "stck_oprc": str(int(open_)),
+            "stck_hgpr": str(int(max(open_, price) + 5)),
+            "stck_lwpr": str(int(min(open_, price) - 5)),
+            "stck_prpr": str(int(price)),
+            "cntg_vol": str(rng.randint(100, 5000)),
+        })
+    return [bar for bar in reversed(bars) if bar["stck_cntg_hour"] <= hour][:limit]
+
+
+NOTICE_TR_IDS = ("H0STCNI0", "H0STCNI9")
+
+
+def build_notice_record(
+    hts_id: str,
+    order: Dict[str, object],
+    filled: bool,
+    quantity: int,
+    price: int
+) -> str:
+    """체결통보(H0STCNI0) 레코드 하나를 만듭니다 (26개 필드, '^' 구분)."""
+    fields = [""] * 26
+    fields[0] = hts_id
+    fields[1] = str(order["account"])
+    fields[2] = str(order["odno"])
+    fields[4] = str(order["side"])
+    fields[5] = "0"  # 정정구분: 정상
+    fields[6] = "01" if not order["limit_price"] else "00"
+    fields[7] = "0"
+    fields[8] = str(order["symbol"])
+    fields[9] = str(quantity)
+    fields[10] = str(price)
+    fields[11] = time.strftime("%H%M%S")
+    fields[12] = "0"  # 거부여부
+    fields[13] = "2" if filled else "1"  # 체결여부
+    fields[14] = "2" if filled else "1"  # 접수여부
+    fields[16] = str(order["quantity"])
+    fields[25] = str(order["limit_price"])
+    return "^".join(fields)
+
+
+def encrypt_payload(payload: str, key: str, iv: str) -> str:
+    """데이터 부분을 KIS 체결통보처럼 AES-256-CBC(PKCS7) + base64로 암호화합니다."""
+    padder = padding.PKCS7(algorithms.AES.block_size).padder()
+    padded = padder.update(payload.encode("utf-8")) + padder.finalize()
+    encryptor = Cipher(algorithms.AES(key.encode()), modes.CBC(iv.encode())).encryptor()
+    return base64.b64encode(encryptor.update(padded) + encryptor.finalize()).decode("ascii")
+
+
+def build_execution_row(order: Dict[str, object], fill_delay: float, now: float) -> Dict[str, str]:
+    """대역 서버 주문의 현재 체결 상태를 일별 주문 체결 조회(output1) 행으로 만듭니다."""
+    quantity = int(order["quantity"])
+    elapsed = now - float(order["created"])
+    if elapsed >= fill_delay:
+        filled = quantity
+    elif elapsed >= fill_delay / 2:
+        filled = quantity // 2
+    else:
+        filled = 0
+    price = int(order["price"])
+    return {
+        "ord_dt": str(order["date"]),
+        "ord_tmd": str(order["time"]),
+        "odno": str(order["odno"]),
+        "orgn_odno": "",
+        "sll_buy_dvsn_cd": str(order["side"]),  # 01: 매도, 02: 매수
+        "pdno": str(order["symbol"]),
+        "ord_qty": str(quantity),
+        "ord_unpr": str(order["limit_price"]),
+        "tot_ccld_qty": str(filled),
+        "avg_prvs": str(price if filled else 0),
+        "tot_ccld_amt": str(price * filled),
+        "rmn_qty": str(quantity - filled),
+        "rjct_qty": "0",
+        "cncl_yn": "N"
+    }
+
+
+def create_app(config: Optional[FakeKISConfig] = None, **overrides) -> FastAPI:
+    """대역 서버 FastAPI 앱을 생성합니다.
+
+    Args:
+        config: 대역 서버 설정
+        **overrides: config 대신 개별 설정 지정 (예: latency="fixed:5", holdings=500).
+            latency_ms=5는 latency="fixed:5"와 같습니다.
+    """
+    if "latency_ms" in overrides:
+        overrides["latency"] = f"fixed:{overrides.pop('latency_ms')}"
+    config = config or FakeKISConfig(**overrides)
+    if config.seed is not None:
+        random.seed(config.seed)
+
+    latency = LatencyModel(config.latency)
+    app = FastAPI(title="KIS fake server")
+    app.state.config = config
+    app.state.stats = defaultdict(int)
+    request_times: Dict[str, Deque[float]] = defaultdict(deque)
+    order_numbers = itertools.count(1)
+    prices = _PriceBook()
+    orders: Dict[str, List[Dict[str, object]]] = defaultdict(list)  # 계좌번호(CANO) → 접수 순 주문
+    # 체결통보 구독 연결 → (tr_id, HTS ID, 암호화 키, IV)
+    notice_subscribers: Dict[WebSocket, Tuple[str, str, str, str]] = {}
+    # 주문번호 → 전량 체결 시각 (time.monotonic, 체결 반영 지연 측정용)
+    app.state.fill_times = {}
+
+    async def send_notice(order: Dict[str, object], filled: bool, quantity: int, price: int) -> None:
+        for websocket, (tr_id, hts_id, key, iv) in list(notice_subscribers.items()):
+            record = build_notice_record(hts_id, order, filled, quantity, price)
+            with contextlib.suppress(Exception):
+                await websocket.send_text(f"1|{tr_id}|001|{encrypt_payload(record, key, iv)}")
+            app.state.stats["ws_notices"] += 1
+
+    async def publish_notices(order: Dict[str, object]) -> None:
+        # 접수 통보 후 일별 주문 체결 조회와 같은 시점에 절반/나머지 체결 통보
+        quantity, price = int(order["quantity"]), int(order["price"])
+        await send_notice(order, False, quantity, int(order["limit_price"]))
+        half = quantity // 2
+        if half:
+            await asyncio.sleep(config.fill_delay / 2)
+            await send_notice(order, True, half, price)
+        await asyncio.sleep(max(0.0, app.state.fill_times[order["odno"]] - time.monotonic()))
+        await send_notice(order, True, quantity - half, price)
+
+    @app.middleware("http")
+    async def inject_conditions(request: Request, call_next):
+        stats = app.state.stats
+        app_key = request.headers.get("appkey")
+        if config.rate_limit_per_sec and app_key:
+            now = time.monotonic()
+            window = request_times[app_key]
+            while window and now - window[0] >= 1.0:
+                window.popleft()
+            if len(window) >= config.rate_limit_per_sec:
+                stats["rate_limited"] += 1
+                return JSONResponse(RATE_LIMIT_ERROR, status_code=500)
+            window.append(now)
+
+        delay = latency.sample()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if config.failure_rate and random.random() < config.failure_rate:
+            stats["failures"] += 1
+            return JSONResponse(INJECTED_FAILURE, status_code=500)
+
+        stats["requests"] += 1
+        stats[request.url.path] += 1
+        return await call_next(request)
+
+    @app.post("/oauth2/tokenP")
+    async def issue_token():
+        return {
+            "access_token": f"fake-token-{time.time_ns()}",
+            "token_type": "Bearer",
+            "expires_in": 86400
+        }
+
+    @app.post("/oauth2/Approval")
+    async def issue_approval_key():
+        return {"approval_key": f"fake-approval-{time.time_ns()}"}
+
+    @app.websocket("/")
+    async def realtime_feed(websocket: WebSocket):
+        await websocket.accept()
+        app.state.stats["ws_connections"] += 1
+        subscribed: Dict[str, None] = {}
+
+        async def receive_subscriptions():
+            while True:
+                message = json.loads(await websocket.receive_text())
+                if message["header"].get("tr_id") == "PINGPONG":
+                    continue
+                header = message["header"]
+                tr_input = message["body"]["input"]
+                symbol = tr_input["tr_key"]
+                ok = True
+                output = {"iv": "0123456789abcdef", "key": "fakekey"}
+                if tr_input["tr_id"] in NOTICE_TR_IDS:
+                    # 체결통보는 연결별 키로 암호화
+                    if header["tr_type"] == "1":
+                        key = "".join(random.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=32))
+                        iv = "".join(random.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=16))
+                        notice_subscribers[websocket] = (tr_input["tr_id"], symbol, key, iv)
+                        output = {"iv": iv, "key": key}
+                    else:
+                        notice_subscribers.pop(websocket, None)
+                elif header["tr_type"] == "1":
+                    ok = symbol in subscribed or len(subscribed) < config.ws_max_subscriptions
+                    if ok:
+                        subscribed[symbol] = None
+                else:
+                    subscribed.pop(symbol, None)
+                await websocket.send_text(json.dumps({
+                    "header": {"tr_id": tr_input["tr_id"], "tr_key": symbol, "encrypt": "N"},
+                    "body": {
+                        "rt_cd": "0" if ok else "1",
+                        "msg_cd": "OPSP0000" if ok else "OPSP0008",
+                        "msg1": "SUBSCRIBE SUCCESS" if ok else "MAX SUBSCRIBE OVER",
+                        "output": output
+                    }
+                }))
+
+        async def publish_ticks():
+            # 10ms마다 밀린 틱을 프레임 단위로 몰아서 전송
+            started = last_ping = time.monotonic()
+            sent = 0
+            cursor = itertools.count()
+            while True:
+                await asyncio.sleep(0.01)
+                now = time.monotonic()
+                if config.ws_disconnect_after and now - started >= config.ws_disconnect_after:
+                    app.state.stats["ws_disconnects"] += 1
+                    await websocket.close()
+                    return
+                if now - last_ping >= 10:
+                    last_ping = now
+                    await websocket.send_text(json.dumps({
+                        "header": {"tr_id": "PINGPONG", "datetime": time.strftime("%Y%m%d%H%M%S")}
+                    }))
+                symbols = list(subscribed)
+                if not symbols:
+                    sent = int((now - started) * config.ws_ticks_per_sec)
+                    continue
+                due = int((now - started) * config.ws_ticks_per_sec) - sent
+                hhmmss = time.strftime("%H%M%S")
+                while due > 0:
+                    records = []
+                    for _ in range(min(due, config.ws_records_per_frame)):
+                        symbol = symbols[next(cursor) % len(symbols)]
+                        price, cumulative = prices.tick(symbol)
+                        records.append(build_tick_record(symbol, hhmmss, price, random.randint(1, 500), cumulative))
+                    await websocket.send_text(build_tick_frame(records))
+                    due -= len(records)
+                    sent += len(records)
+                    app.state.stats["ws_ticks"] += len(records)
+
+        tasks = [asyncio.create_task(receive_subscriptions()), asyncio.create_task(publish_ticks())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            notice_subscribers.pop(websocket, None)
+            for task in tasks:
+                task.cancel()
+
+    @app.get("/uapi/domestic-stock/v1/quotations/inquire-price")
+    async def inquire_price(FID_INPUT_ISCD: str, FID_COND_MRKT_DIV_CODE: str = "J"):
+        price, volume = prices.tick(FID_INPUT_ISCD)
+        return {
+            "rt_cd": "0",
+            "msg_cd": "MCA00000",
+            "msg1": "정상처리 되었습니다.",
+            "output": {
+                "stck_shrn_iscd": FID_INPUT_ISCD,
+                "stck_prpr": str(price),
+                "prdy_vrss": "0",
+                "prdy_ctrt": "0.00",
+                "acml_vol": str(volume)
+            }
+        }
+
+    @app.get("/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice")
+    async def inquire_daily_chart(FID_INPUT_ISCD: str, FID_INPUT_DATE_1: str, FID_INPUT_DATE_2: str):
+        return {
+            "rt_cd": "0",
+            "msg_cd": "MCA00000",
+            "msg1": "정상처리 되었습니다.",
+            "output1": {"stck_shrn_iscd": FID_INPUT_ISCD},
+            "output2": build_daily_chart_rows(FID_INPUT_ISCD, FID_INPUT_DATE_1, FID_INPUT_DATE_2)
+        }
+
+    @app.get("/uapi/domestic-stock/v1/quotations/inquire-time-dailychartprice")
+    async def inquire_minute_chart(FID_INPUT_ISCD: str, FID_INPUT_DATE_1: str, FID_INPUT_HOUR_1: str):
+        return {
+            "rt_cd": "0",
+            "msg_cd": "MCA00000",
+            "msg1": "정상처리 되었습니다.",
+            "output1": {"stck_shrn_iscd": FID_INPUT_ISCD},
+            "output2": build_minute_chart_rows(FID_INPUT_ISCD, FID_INPUT_DATE_1, FID_INPUT_HOUR_1)
+        }
+
+    @app.get("/uapi/domestic-stock/v1/trading/inquire-balance")
+    async def inquire_balance(CTX_AREA_NK100: str = ""):
+        # 연속조회 키에는 다음 페이지 시작 위치를 담아 둠
+        start = int(CTX_AREA_NK100) if CTX_AREA_NK100.strip() else 0
+        end = min(start + config.balance_page_size, config.holdings)
+        items = [
+            {
+                "pdno": f"{index:06d}",
+                "prdt_name": f"ETF {index}",
+                "hldg_qty": "10",
+                "pchs_avg_pric": "10000.0000",
+                "prpr": "10100",
+                "evlu_amt": "101000",
+                "evlu_pfls_amt": "1000",
+                "evlu_pfls_rt": "1.00"
+            }
+            for index in range(start, end)
+        ]
+        has_more = end < config.holdings
+        body = {
+            "rt_cd": "0",
+            "msg_cd": "KIOK0510" if has_more else "KIOK0460",
+            "msg1": "조회가 계속됩니다.." if has_more else "조회가 완료되었습니다.",
+            "ctx_area_fk100": "FAKE",
+            "ctx_area_nk100": str(end) if has_more else "",
+            "output1": items,
+            "output2": [{"tot_evlu_amt": str(101000 * config.holdings)}]
+        }
+        return JSONResponse(body, headers={"tr_cont": "M" if has_more else "D"})
+
+    @app.get("/uapi/domestic-stock/v1/trading/inquire-daily-ccld")
+    async def inquire_daily_executions(
+        CANO: str,
+        INQR_STRT_DT: str,
+        INQR_END_DT: str,
+        ODNO: str = "",
+        CTX_AREA_NK100: str = ""
+    ):
+        # 최근 주문부터 (INQR_DVSN=00: 역순), 연속조회 키에는 다음 페이지 시작 위치를 담아 둠
+        matched = [
+            order for order in reversed(orders[CANO])
+            if INQR_STRT_DT <= str(order["date"]) <= INQR_END_DT and (not ODNO or order["odno"] == ODNO)
+        ]
+        start = int(CTX_AREA_NK100) if CTX_AREA_NK100.strip() else 0
+        end = min(start + config.executions_page_size, len(matched))
+        now = time.monotonic()
+        has_more = end < len(matched)
+        body = {
+            "rt_cd": "0",
+            "msg_cd": "KIOK0510" if has_more else "KIOK0460",
+            "msg1": "조회가 계속됩니다.." if has_more else "조회가 완료되었습니다.",
+            "ctx_area_fk100": "FAKE",
+            "ctx_area_nk100": str(end) if has_more else "",
+            "output1": [build_execution_row(order, config.fill_delay, now) for order in matched[start:end]],
+            "output2": {"tot_ord_qty": str(sum(int(order["quantity"]) for order in matched))}
+        }
+        return JSONResponse(body, headers={"tr_cont": "M" if has_more else "D"})
+
+    @app.post("/uapi/domestic-stock/v1/trading/order-cash")
+    async def order_cash(request: Request):
+        body = await request.json()
+        app.state.stats["orders"] += 1
+        odno = f"{next(order_numbers):010d}"
+        symbol = str(body.get("PDNO"))
+        limit_price = int(body.get("ORD_UNPR") or 0)
+        # KIS 주문 일시는 KST
+        ordered_at = datetime.datetime.now(KST)
+        ord_tmd = ordered_at.strftime("%H%M%S")
+        order = {
+            "odno": odno,
+            "account": f"{body.get('CANO')}{body.get('ACNT_PRDT_CD') or ''}",
+            "date": ordered_at.strftime("%Y%m%d"),
+            "time": ord_tmd,
+            "side": "01" if request.headers.get("tr_id") == "TTTC0801U" else "02",
+            "symbol": symbol,
+            "quantity": int(body.get("ORD_QTY") or 0),
+            "limit_price": limit_price,
+            # 시장가 주문은 접수 시점 현재가로 체결
+            "price": limit_price or prices.tick(symbol)[0],
+            "created": time.monotonic()
+        }
+        orders[str(body.get("CANO"))].append(order)
+        app.state.fill_times[odno] = float(order["created"]) + config.fill_delay
+        if notice_subscribers:
+            asyncio.create_task(publish_notices(order))
+        if config.lost_order_response_rate and random.random() < config.lost_order_response_rate:
+            app.state.stats["lost_order_responses"] += 1
+            return JSONResponse(INJECTED_FAILURE, status_code=500)
+        return {
+            "rt_cd": "0",
+            "msg_cd": "APBK0013",
+            "msg1": "주문 전송 완료 되었습니다.",
+            "output": {
+                "KRX_FWDG_ORD_ORGNO": "91252",
+                "ODNO": odno,
+                "ORD_TMD": ord_tmd,
+                "PDNO": body.get("PDNO")
+            }
+        }
+
+    return app
+
+
+def generate_self_signed_cert(directory: str) -> Tuple[str, str]:
+    """localhost용 자체 서명 인증서를 생성합니다 (TLS 핸드셰이크 비용 측정용).
+
+    Returns:
+        (certfile, keyfile) 경로
+    """
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=30))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+
+    certfile = os.path.join(directory, "fake-kis.crt")
+    keyfile = os.path.join(directory, "fake-kis.key")
+    with open(certfile, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(keyfile, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ))
+    return certfile, keyfile
+
+
+@contextlib.contextmanager
+def running_fake_server(app: Optional[FastAPI] = None, tls: bool = False) -> Iterator[str]:
+    """대역 서버를 백그라운드 스레드에서 실행하고 base URL을 반환합니다.
+
+    Args:
+        app: 실행할 앱 (기본값: create_app())
+        tls: True이면 자체 서명 인증서로 HTTPS 서빙
+
+    Yields:
+        base URL (예: "https://localhost:54321")
+    """
+    app = app or create_app()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ssl_kwargs = {}
+        if tls:
+            certfile, keyfile = generate_self_signed_cert(tmpdir)
+            ssl_kwargs = {"ssl_certfile": certfile, "ssl_keyfile": keyfile}
+
+        config = uvicorn.Config(app, log_level="warning", **ssl_kwargs)
+        server = uvicorn.Server(config)
+        thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.01)
+
+        scheme = "https" if tls else "http"
+        try:
+            yield f"{scheme}://localhost:{port}"
+        finally:
+            server.should_exit = True
+            thread.join(timeout=5)
+            sock.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="KIS API 로컬 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9443)
+    parser.add_argument("--tls", action="store_true", help="자체 서명 인증서로 HTTPS 서빙")
+    parser.add_argument("--latency", default="fixed:0", help="fixed:MS | uniform:LO:HI | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--rate-limit", type=int, default=None, help="앱키별 초당 허용 요청 수")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="임의 실패(HTTP 500) 비율")
+    parser.add_argument("--holdings", type=int, default=30, help="잔고 조회 보유 종목 수")
+    parser.add_argument("--page-size", type=int, default=50, help="잔고 조회 페이지당 종목 수")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--ws-ticks", type=float, default=1000.0, help="실시간 피드 연결당 초당 틱 수")
+    parser.add_argument("--ws-records-per-frame", type=int, default=1, help="실시간 프레임당 체결 레코드 수")
+    parser.add_argument("--ws-disconnect-after", type=float, default=None, help="N초마다 실시간 연결을 끊음")
+    parser.add_argument("--fill-delay", type=float, default=1.0, help="주문 후 전량 체결까지 걸리는 시간(초)")
+    parser.add_argument("--lost-order-response-rate", type=float, default=0.0, help="주문 접수 후 응답 유실(HTTP 500) 비율")
+    args = parser.parse_args()
+
+    app = create_app(FakeKISConfig(
+        latency=args.latency,
+        rate_limit_per_sec=args.rate_limit,
+        failure_rate=args.failure_rate,
+        holdings=args.holdings,
+        balance_page_size=args.page_size,
+        seed=args.seed,
+        ws_ticks_per_sec=args.ws_ticks,
+        ws_records_per_frame=args.ws_records_per_frame,
+        ws_disconnect_after=args.ws_disconnect_after,
+        fill_delay=args.fill_delay,
+        lost_order_response_rate=args.lost_order_response_rate
+    ))
+    if args.tls:
+        tmpdir = tempfile.mkdtemp()
+        certfile, keyfile = generate_self_signed_cert(tmpdir)
+        uvicorn.run(app, host=args.host, port=args.port, ssl_certfile=certfile, ssl_keyfile=keyfile)
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+활성 전략 실행기 단독 실행
+API 서버와 별도 프로세스로 실시간 수신(또는 현재가 조회), VWAP 엔진, 전략 실행기만 띄웁니다.
+API 서버는 STRATEGY_RUNNER_ENABLED=false로 두고 이 스크립트를 하나만 실행하세요.
+(이 경우 전략 변경은 API 서버 프로세스에서 알릴 수 없으므로 --reload-seconds 주기로 다시 읽음)
+전략 주문은 outbox에 기록하고 이 프로세스의 주문 전송기(ORDER_SUBMITTER_ENABLED)가 보냅니다
+(API 서버의 전송기와 함께 돌아도 주문을 나눠 꺼내므로 중복 전송하지 않음).
+
+사용법:
+    python scripts/run-strategies.py [--report-seconds 30] [--reload-seconds 30]
+    python scripts/run-strategies.py --fake [--strategies 20] [--symbols 40] [--seconds 10] [--polling]
+        (로컬 대역 서버 피드로 평가 시간, 이벤트 루프 지연, 주문 수 측정)
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+
+from bench_utils import create_bench_account, setup_backend_path, use_bench_database
+from kis_fake_server import create_app, running_fake_server
+
+setup_backend_path()
+
+
+async def run(args) -> dict:
+    from app.config import settings
+    from app.services.bar_store import bar_store
+    from app.services.event_bus import event_bus
+    from app.services.kis_http import aclose_http_clients
+    from app.services.kis_realtime import quote_ingester
+    from app.services.order_submitter import order_submitter
+    from app.services.strategy_runner import strategy_runner
+    from app.services.tick_store import tick_store
+    from app.services.vwap_engine import vwap_engine
+
+    # app.main lifespan과 같은 순서로 구독 (VWAP 엔진 다음에 실행기)
+    event_bus.start()
+    if settings.KIS_REALTIME_ENABLED:
+        quote_ingester.add_listener(tick_store.append_ticks)
+        quote_ingester.add_listener(vwap_engine.on_ticks)
+        quote_ingester.add_listener(event_bus.publish_ticks)
+        if settings.BAR_STORE_RECORD_TICKS:
+            tick_store.on_session_end = bar_store.write_ticks
+        quote_ingester.start()
+    strategy_runner.start()
+    if settings.ORDER_SUBMITTER_ENABLED:
+        order_submitter.start()
+
+    async def reload_periodically() -> None:
+        while True:
+            await asyncio.sleep(args.reload_seconds)
+            strategy_runner.notify_changed()
+
+    reloader = asyncio.create_task(reload_periodically())
+    elapsed = 0.0
+    try:
+        while args.seconds is None or elapsed < args.seconds:
+            interval = args.report_seconds if args.seconds is None else min(args.report_seconds, args.seconds - elapsed)
+            await asyncio.sleep(interval)
+            elapsed += interval
+            if args.seconds is None:
+                print(json.dumps(strategy_runner.stats(), ensure_ascii=False), flush=True)
+    finally:
+        reloader.cancel()
+        # 평가한 주문을 outbox에 기록하고 전송까지 마친 뒤 지표를 반환
+        await strategy_runner.stop()
+        if settings.ORDER_SUBMITTER_ENABLED:
+            await wait_orders_sent(args.drain_seconds)
+        await order_submitter.stop()
+        ticks = quote_ingester.ticks
+        await quote_ingester.stop()
+        if tick_store.on_session_end is not None:
+            tick_store.on_session_end(tick_store.views())
+        await aclose_http_clients()
+    return {"strategy_runner": strategy_runner.stats(), "ticks": ticks}
+
+
+async def wait_orders_sent(timeout: float) -> None:
+    """outbox에 남은 주문이 전송될 때까지 최대 timeout초 기다립니다."""
+    from app.database import SessionLocal
+    from app.models import Order
+    from app.models.order import UNSENT_ORDER_STATUSES
+
+    def unsent() -> int:
+        db = SessionLocal()
+        try:
+            return db.query(Order).filter(Order.status.in_(UNSENT_ORDER_STATUSES)).count()
+        finally:
+            db.close()
+
+    deadline = asyncio.get_running_loop().time() + timeout
+    while await asyncio.to_thread(unsent) and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.1)
+
+
+def count_orders() -> dict:
+    from app.database import SessionLocal
+    from app.models import Order
+
+    db = SessionLocal()
+    try:
+        counts = {}
+        for (status,) in db.query(Order.status).filter(Order.strategy_id.isnot(None)).all():
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+    finally:
+        db.close()
+
+
+def create_fake_strategies(account_id: int, strategies: int, symbols: int) -> None:
+    from app.database import SessionLocal
+    from app.models import Strategy, TradingAccount
+
+    db = SessionLocal()
+    try:
+        user_id = db.get(TradingAccount, account_id).user_id
+        universe = [f"{index:06d}" for index in range(100, 100 + symbols)]
+        rng = random.Random(0)
+        for index in range(strategies):
+            db.add(Strategy(
+                user_id=user_id,
+                name=f"bench-{index}",
+                is_active=True,
+                # 대역 피드 가격 변동이 작으므로 임계값을 낮춰 주문이 나도록 함
+                entry_threshold=0.02,
+                exit_threshold=0.3,
+                stop_loss_percent=0.3,
+                take_profit_percent=0.3,
+                additional_params={"symbols": rng.sample(universe, min(len(universe), 10))}
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_fake(args) -> None:
+    use_bench_database(os.path.join(tempfile.gettempdir(), "run-strategies.db"))
+    fake_app = create_app(ws_ticks_per_sec=args.ticks_per_sec, ws_records_per_frame=5)
+    with running_fake_server(fake_app) as base_url:
+        # settings/싱글톤이 만들어지기 전에 대역 서버 주소를 지정
+        os.environ.update({
+            "KIS_BASE_URL": base_url,
+            "KIS_WS_URL": base_url.replace("http", "ws"),
+            "KIS_APP_KEY": "bench-app-key",
+            "KIS_APP_SECRET": "bench-app-secret",
+            "KIS_REALTIME_ENABLED": "false" if args.polling else "true",
+            "STRATEGY_RUNNER_SESSION": "0000-2400",
+            "STRATEGY_RUNNER_POLL_SECONDS": "0.5",
+            "BAR_STORE_RECORD_TICKS": "false",
+        })
+        account_id = create_bench_account()
+        create_fake_strategies(account_id, args.strategies, args.symbols)
+        mode = "현재가 조회" if args.polling else "실시간 피드"
+        print(f"전략 {args.strategies}개, 종목 {args.symbols}개, {mode}, {args.seconds:.0f}초")
+
+        result = asyncio.run(run(args))
+        runner = result["strategy_runner"]
+        per_strategy = runner["per_strategy"].values()
+        evaluations = sum(item["evaluations"] for item in per_strategy)
+        mean_ms = sum(item["evaluation_ms_mean"] * item["evaluations"] for item in per_strategy) / max(evaluations, 1)
+        print(f"평가 주기 {runner['cycles']:,}회, 전략 평가 {evaluations:,}회 "
+              f"(평균 {mean_ms:.3f} ms, 최대 {max((item['evaluation_ms_max'] for item in per_strategy), default=0):.3f} ms)")
+        print(f"이벤트 루프 지연: 평균 {runner['loop_lag_ms']['mean']:.2f} ms, 최대 {runner['loop_lag_ms']['max']:.2f} ms")
+        counts = count_orders()
+        print(f"주문 결과 {sum(item['orders'] for item in per_strategy)}건 "
+              f"(실패 {sum(item['order_failures'] for item in per_strategy)}), 기록 {sum(counts.values())}건 {counts}, "
+              f"대역 서버 수신 {fake_app.state.stats['orders']}건")
+        if not args.polling:
+            print(f"수신 틱 {result['ticks']:,}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--report-seconds", type=float, default=30.0, help="실행 지표 출력 주기")
+    parser.add_argument("--reload-seconds", type=float, default=30.0, help="전략 재조회 주기")
+    parser.add_argument("--fake", action="store_true", help="로컬 대역 서버 대상으로 실행")
+    parser.add_argument("--strategies", type=int, default=20)
+    parser.add_argument("--symbols", type=int, default=40)
+    parser.add_argument("--seconds", type=float, default=None, help="실행 시간 (기본값: 종료할 때까지, --fake는 10초)")
+    parser.add_argument("--ticks-per-sec", type=float, default=2000.0, help="대역 피드 송신 속도")
+    parser.add_argument("--polling", action="store_true", help="실시간 피드 대신 현재가 조회 사용")
+    parser.add_argument("--drain-seconds", type=float, default=30.0, help="종료 시 남은 주문 전송을 기다리는 시간")
+    args = parser.parse_args()
+
+    if args.fake:
+        args.seconds = args.seconds or 10.0
+        run_fake(args)
+        return
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+KIS 차트 이력 동기화 (야간 작업용)
+과거 봉 저장소(BAR_STORE_PATH)의 마지막 봉 이후 구간만 받아 저장하고, 종목/초와
+바이트/초를 출력해 야간 작업 시간을 산정할 수 있게 합니다.
+
+사용법:
+    python scripts/sync-history.py --account-id 1 [--symbols 069500 102110] [--intervals 1d 1m]
+        (종목을 생략하면 활성 전략의 종목)
+    python scripts/sync-history.py --fake [--fake-symbols 10] [--latency-ms 20] [--client-rate 18]
+        (로컬 대역 서버로 전체 동기화 후 증분 동기화 처리량 측정)
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+
+from bench_utils import create_bench_account, setup_backend_path, use_bench_database
+
+setup_backend_path()
+
+
+async def sync(account_id: int, symbols, args) -> dict:
+    from app.database import SessionLocal
+    from app.models import TradingAccount
+    from app.services.history_sync import HistorySync
+    from app.services.kis_api import AsyncKISAPIClient
+    from app.services.kis_http import aclose_http_clients
+
+    db = SessionLocal()
+    try:
+        account = db.get(TradingAccount, account_id)
+        if account is None:
+            raise SystemExit(f"Trading account {account_id} not found")
+        job = HistorySync(AsyncKISAPIClient(account, db), concurrency=args.concurrency, today=args.today)
+        result = await job.run(
+            symbols,
+            intervals=args.intervals,
+            daily_lookback_days=args.daily_days,
+            minute_lookback_days=args.minute_days
+        )
+        return result.as_dict()
+    finally:
+        await aclose_http_clients()
+        db.close()
+
+
+def print_result(label: str, result: dict) -> None:
+    print(
+        f"{label:<10} 종목 {result['symbols']:>4} (실패 {len(result['failed'])}), 요청 {result['requests']:>6}, "
+        f"봉 {result['bars']:>9,}, {result['elapsed_seconds']:7.2f}s | "
+        f"{result['symbols_per_sec']:6.2f} 종목/s, {result['requests_per_sec']:6.1f} 요청/s, "
+        f"{result['bytes_per_sec'] / 1024:8.1f} KB/s"
+    )
+    for symbol, error in list(result["failed"].items())[:5]:
+        print(f"  {symbol}: {error}")
+
+
+def use_fake_environment() -> None:
+    """대역 서버 측정용 임시 DB와 봉 저장소를 사용하도록 설정합니다 (app import 전에 호출)."""
+    use_bench_database(os.path.join(tempfile.gettempdir(), "sync-history.db"))
+    root = os.path.join(tempfile.gettempdir(), "sync-history-bars")
+    shutil.rmtree(root, ignore_errors=True)
+    os.environ["BAR_STORE_PATH"] = root
+
+
+def run_fake(args) -> None:
+    from kis_fake_server import FakeKISConfig, create_app, running_fake_server
+    from app.config import settings
+    from app.services.kis_rate_limiter import get_rate_limiter
+
+    account_id = create_bench_account()
+    get_rate_limiter("bench-app-key").rate = args.client_rate
+    symbols = args.symbols or [f"{index:06d}" for index in range(100, 100 + args.fake_symbols)]
+    fake_app = create_app(FakeKISConfig(latency=f"fixed:{args.latency_ms}", rate_limit_per_sec=args.rate_limit))
+    with running_fake_server(fake_app) as base_url:
+        settings.KIS_BASE_URL = base_url
+        print(f"{len(symbols)}종목, 일봉 {args.daily_days}일 + 1분봉 {args.minute_days}일, 클라이언트 {args.client_rate}/s")
+        print_result("전체", asyncio.run(sync(account_id, symbols, args)))
+        # 같은 날 다시 실행하면 마지막 거래일만 다시 받음
+        print_result("증분", asyncio.run(sync(account_id, symbols, args)))
+        print(f"EGW00201: {fake_app.state.stats['rate_limited']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--account-id", type=int, help="차트 조회에 사용할 거래 계정 ID")
+    parser.add_argument("--symbols", nargs="*", default=None)
+    parser.add_argument("--intervals", nargs="+", default=["1d", "1m"], choices=["1d", "1m"])
+    parser.add_argument("--daily-days", type=int, default=None, help="저장된 일봉이 없을 때 받을 기간 (일)")
+    parser.add_argument("--minute-days", type=int, default=None, help="저장된 분봉이 없을 때 받을 기간 (일)")
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--today", default=None, help="기준일 YYYYMMDD (기본값: KST 오늘)")
+    parser.add_argument("--fake", action="store_true", help="로컬 대역 서버 대상으로 처리량 측정")
+    parser.add_argument("--fake-symbols", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--rate-limit", type=int, default=20, help="대역 서버의 앱키별 초당 허용 요청 수")
+    parser.add_argument("--client-rate", type=float, default=18.0, help="클라이언트 측 초당 요청 수")
+    args = parser.parse_args()
+
+    if args.fake:
+        use_fake_environment()
+        args.daily_days = args.daily_days or 365
+        args.minute_days = args.minute_days or 5
+    from app.config import settings
+    args.daily_days = args.daily_days or settings.HISTORY_SYNC_DAILY_LOOKBACK_DAYS
+    args.minute_days = args.minute_days or settings.HISTORY_SYNC_MINUTE_LOOKBACK_DAYS
+    args.concurrency = args.concurrency or settings.HISTORY_SYNC_CONCURRENCY
+
+    if args.fake:
+        run_fake(args)
+        return
+
+    if args.account_id is None:
+        parser.error("--account-id is required (or use --fake)")
+    symbols = args.symbols
+    if not symbols:
+        from app.services.kis_realtime import _load_active_strategy_symbols
+        symbols = sorted(_load_active_strategy_symbols())
+    result = asyncio.run(sync(args.account_id, symbols, args))
+    print_result("동기화", result)
+    print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
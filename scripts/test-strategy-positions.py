@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+전략 실행기 포지션 복원 회귀 테스트
+
+전략 주문 내역에서 포지션을 복원할 때 끝나지 않은 주문(QUEUED/SUBMITTING/PENDING/PARTIAL)은
+주문 수량 전체를, 끝난 주문(EXECUTED/CANCELLED)은 체결 수량을 반영하는지 확인합니다.
+부분 체결된 매도를 체결분만 빼면 아직 매도 중인 잔량을 다시 매도해 공매도가 됩니다.
+
+사용법: python scripts/test-strategy-positions.py
+"""
+import os
+import sys
+import tempfile
+
+from bench_utils import create_bench_account, setup_backend_path, use_bench_database
+
+setup_backend_path()
+use_bench_database(os.path.join(tempfile.gettempdir(), "test-strategy-positions.db"))
+
+from app.database import SessionLocal
+from app.models import Order, Strategy, TradingAccount
+from app.services.strategy_runner import _load_positions
+
+# (이름, [(매수/매도, 상태, 주문 수량, 체결 수량)], 기대 보유 수량 (None이면 미보유))
+CASES = [
+    ("매수 체결 + 매도 부분 체결", [("BUY", "EXECUTED", 10, 10), ("SELL", "PARTIAL", 10, 5)], None),
+    ("매수 체결 + 매도 접수", [("BUY", "EXECUTED", 10, 10), ("SELL", "PENDING", 10, 0)], None),
+    ("매수 체결 + 매도 전송 전", [("BUY", "EXECUTED", 10, 10), ("SELL", "QUEUED", 10, 0)], None),
+    ("매수 체결 + 매도 잔량 취소", [("BUY", "EXECUTED", 10, 10), ("SELL", "CANCELLED", 10, 5)], 5),
+    ("매수 체결 + 매도 거부", [("BUY", "EXECUTED", 10, 10), ("SELL", "REJECTED", 10, 0)], 10),
+    ("매수 접수", [("BUY", "PENDING", 10, 0)], 10),
+    ("매수 잔량 취소", [("BUY", "CANCELLED", 10, 4)], 4),
+    ("매수 체결 + 매도 체결", [("BUY", "EXECUTED", 10, 10), ("SELL", "EXECUTED", 10, 10)], None),
+]
+
+
+def main() -> int:
+    account_id = create_bench_account()
+    db = SessionLocal()
+    try:
+        user_id = db.get(TradingAccount, account_id).user_id
+        strategy = Strategy(user_id=user_id, name="positions")
+        db.add(strategy)
+        db.commit()
+        for index, (_, orders, _) in enumerate(CASES):
+            db.add_all([
+                Order(
+                    user_id=user_id,
+                    trading_account_id=account_id,
+                    strategy_id=strategy.id,
+                    symbol=f"{index:06d}",
+                    order_type=order_type,
+                    order_method="MARKET",
+                    quantity=quantity,
+                    executed_quantity=executed,
+                    executed_price=10000.0 if executed else None,
+                    status=status,
+                    client_order_id=f"positions-{index}-{number}",
+                )
+                for number, (order_type, status, quantity, executed) in enumerate(orders)
+            ])
+        db.commit()
+        positions = _load_positions(db, strategy.id)
+    finally:
+        db.close()
+
+    failures = 0
+    for index, (name, _, expected) in enumerate(CASES):
+        position = positions.get(f"{index:06d}")
+        quantity = position.quantity if position else None
+        ok = quantity == expected
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {name}: 보유 {quantity} (기대 {expected})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())